@@ -1,22 +1,212 @@
 import concurrent.futures
-import os
 import time
 import typing as t
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import cached_property
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import precision_score, recall_score
+from numpy.typing import NDArray
 from tqdm import tqdm
 
 from prediction_market_agent_tooling.benchmark.agents import AbstractBenchmarkedAgent
 from prediction_market_agent_tooling.benchmark.utils import Prediction, PredictionsCache
 from prediction_market_agent_tooling.gtypes import OutcomeStr
 from prediction_market_agent_tooling.markets.agent_market import AgentMarket
-from prediction_market_agent_tooling.tools.utils import (
-    check_not_none,
-    should_not_happen,
-)
+from prediction_market_agent_tooling.markets.data_models import Resolution
+from prediction_market_agent_tooling.tools.utils import should_not_happen
+
+
+class PredictionArrays:
+    """
+    Predictions of all agents for all markets materialised once into arrays of shape (agents, markets[, outcomes]),
+    so that the metrics can be computed without iterating over the individual predictions.
+
+    Outcomes are matched case-insensitively. Missing values are NaN, and -1 for the encoded resolutions.
+    """
+
+    def __init__(
+        self,
+        predictions: t.Sequence[t.Sequence[Prediction]],
+        markets: t.Sequence[AgentMarket],
+    ) -> None:
+        outcome_index = {
+            outcome: i
+            for i, outcome in enumerate(
+                dict.fromkeys(o for m in markets for o in m.outcomes_lowercase)
+            )
+        }
+        # Resolutions and their outcomes are encoded as integers, to be compared exactly as the original objects.
+        resolution_codes: dict[tuple[OutcomeStr | None, bool], int] = {}
+        outcome_codes: dict[OutcomeStr, int] = {}
+
+        def encode(resolution: Resolution) -> tuple[int, int]:
+            code = resolution_codes.setdefault(
+                (resolution.outcome, resolution.invalid), len(resolution_codes)
+            )
+            outcome_code = (
+                outcome_codes.setdefault(resolution.outcome, len(outcome_codes))
+                if resolution.outcome is not None
+                else -1
+            )
+            return code, outcome_code
+
+        n_agents, n_markets, n_outcomes = (
+            len(predictions),
+            len(markets),
+            len(outcome_index),
+        )
+
+        self.market_probs: NDArray[np.float64] = np.full(
+            (n_markets, n_outcomes), np.nan
+        )
+        self.market_resolution: NDArray[np.int_] = np.full(n_markets, -1)
+        self.market_resolution_outcome: NDArray[np.int_] = np.full(n_markets, -1)
+        for j, market in enumerate(markets):
+            probs_lowercase: dict[str, float] = {}
+            for outcome, probability in market.probabilities.items():
+                probs_lowercase.setdefault(outcome.lower(), probability)
+            for outcome_lowercase in market.outcomes_lowercase:
+                self.market_probs[j, outcome_index[outcome_lowercase]] = (
+                    probs_lowercase[outcome_lowercase]
+                )
+            self.market_resolution[j], self.market_resolution_outcome[j] = encode(
+                market.probable_resolution
+            )
+
+        self.predictable: NDArray[np.bool_] = np.zeros(
+            (n_agents, n_markets), dtype=bool
+        )
+        self.answered: NDArray[np.bool_] = np.zeros((n_agents, n_markets), dtype=bool)
+        self.confidence: NDArray[np.float64] = np.full((n_agents, n_markets), np.nan)
+        self.time: NDArray[np.float64] = np.full((n_agents, n_markets), np.nan)
+        self.pred_probs: NDArray[np.float64] = np.full(
+            (n_agents, n_markets, n_outcomes), np.nan
+        )
+        self.pred_resolution: NDArray[np.int_] = np.full((n_agents, n_markets), -1)
+        self.pred_resolution_outcome: NDArray[np.int_] = np.full(
+            (n_agents, n_markets), -1
+        )
+        for i, agent_predictions in enumerate(predictions):
+            for j, prediction in enumerate(agent_predictions):
+                self.predictable[i, j] = prediction.is_predictable
+                # Note: times are optional
+                if prediction.time:
+                    self.time[i, j] = prediction.time
+                answer = prediction.outcome_prediction
+                if answer is None:
+                    continue
+                self.answered[i, j] = True
+                self.confidence[i, j] = answer.confidence
+                for outcome, probability in answer.probabilities.items():
+                    k = outcome_index.get(outcome.lower())
+                    if k is not None:
+                        self.pred_probs[i, j, k] = probability
+                self.pred_resolution[i, j], self.pred_resolution_outcome[i, j] = encode(
+                    answer.probable_resolution
+                )
+
+    @cached_property
+    def n_answered(self) -> NDArray[np.int_]:
+        return self.answered.sum(axis=1)
+
+    @cached_property
+    def errors(self) -> NDArray[np.float64]:
+        # NaN for outcomes that aren't both in the prediction and in the market.
+        return self.pred_probs - self.market_probs[np.newaxis]
+
+    @cached_property
+    def squared_errors(self) -> NDArray[np.float64]:
+        return np.nansum(self.errors**2, axis=2)
+
+    @cached_property
+    def mean_abs_errors(self) -> NDArray[np.float64]:
+        common = ~np.isnan(self.errors)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_abs_errors: NDArray[np.float64] = np.nansum(
+                np.abs(self.errors), axis=2
+            ) / common.sum(axis=2)
+        return mean_abs_errors
+
+    def _per_agent(
+        self, values: NDArray[np.float64], defined: NDArray[np.bool_] | None = None
+    ) -> list[float | None]:
+        defined = self.n_answered > 0 if defined is None else defined
+        return [float(v) if d else None for v, d in zip(values, defined)]
+
+    def _answered_mean(self, values: NDArray[t.Any]) -> NDArray[np.float64]:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean: NDArray[np.float64] = (
+                np.where(self.answered, values, 0).sum(axis=1) / self.n_answered
+            )
+        return mean
+
+    def mse(self) -> list[float | None]:
+        return self._per_agent(np.where(self.answered, self.squared_errors, 0).sum(1))
+
+    def mean_confidence(self) -> list[float | None]:
+        return self._per_agent(self._answered_mean(self.confidence))
+
+    def percentage_within_range(
+        self, average_error_tolerance: float = 0.05
+    ) -> list[float | None]:
+        within = self.squared_errors <= average_error_tolerance**2
+        return self._per_agent(100 * self._answered_mean(within))
+
+    def correct_outcome_percentage(self) -> list[float | None]:
+        correct = self.pred_resolution == self.market_resolution[np.newaxis]
+        return self._per_agent(100 * self._answered_mean(correct))
+
+    def precision_and_recall_percentages(
+        self,
+    ) -> tuple[list[float | None], list[float | None]]:
+        # With micro averaging, both precision and recall are the accuracy on predictions where both outcomes are known.
+        valid = (
+            self.answered
+            & (self.pred_resolution_outcome >= 0)
+            & (self.market_resolution_outcome[np.newaxis] >= 0)
+        )
+        correct = (
+            self.pred_resolution_outcome == self.market_resolution_outcome[np.newaxis]
+        ) & valid
+        n_valid = valid.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            accuracy = 100 * correct.sum(axis=1) / n_valid
+        values = self._per_agent(accuracy, defined=n_valid > 0)
+        return values, values
+
+    def confidence_p_yes_error_correlation(self) -> list[float | None]:
+        mask = self.answered
+        confidence = np.where(mask, self.confidence, 0)
+        errors = np.where(mask, self.mean_abs_errors, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            d_confidence = np.where(
+                mask, confidence - self._answered_mean(confidence)[:, np.newaxis], 0
+            )
+            d_errors = np.where(
+                mask, errors - self._answered_mean(errors)[:, np.newaxis], 0
+            )
+            correlation = (d_confidence * d_errors).sum(axis=1) / np.sqrt(
+                (d_confidence**2).sum(axis=1) * (d_errors**2).sum(axis=1)
+            )
+        return self._per_agent(np.clip(correlation, -1, 1))
+
+    def mean_time(self) -> list[float | None]:
+        has_time = ~np.isnan(self.time)
+        n_times = has_time.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_time = np.nansum(self.time, axis=1) / n_times
+        return self._per_agent(mean_time, defined=n_times > 0)
+
+    def ratio_evaluated_as_answerable(self) -> list[float | None]:
+        return self._per_agent(
+            self.predictable.mean(axis=1), defined=np.ones(len(self.predictable), bool)
+        )
+
+    def ratio_answered(self) -> list[float | None]:
+        return self._per_agent(
+            self.answered.mean(axis=1), defined=np.ones(len(self.answered), bool)
+        )
 
 
 class Benchmarker:
@@ -30,7 +220,13 @@ class Benchmarker:
         ] = {},
         cache_path: t.Optional[str] = None,
         only_cached: bool = False,
+        max_workers: t.Optional[int] = None,
+        compact_every: int = 100,
     ):
+        """
+        `max_workers` limits the number of predictions running at once across all the agents (None for the default of `ThreadPoolExecutor`).
+        Every prediction is appended to a log next to `cache_path` and the log is compacted into the cache file every `compact_every` predictions.
+        """
         self.registered_agents: t.List[AbstractBenchmarkedAgent] = agents
         if len(set(a.agent_name for a in self.registered_agents)) != len(
             self.registered_agents
@@ -43,7 +239,9 @@ class Benchmarker:
 
         # Predictions
         self.cache_path = cache_path
-        if self.cache_path and os.path.exists(self.cache_path):
+        self.max_workers = max_workers
+        self.compact_every = compact_every
+        if self.cache_path and PredictionsCache.exists(self.cache_path):
             self.predictions = PredictionsCache.load(path=self.cache_path)
         else:
             self.predictions = PredictionsCache(predictions={})
@@ -65,46 +263,45 @@ class Benchmarker:
         )
 
         # Metrics
-        self.metric_fns = metric_fns
-        predefined_metric_fns = {
-            "MSE for `p_yes`": self._compute_mse,
-            "Mean confidence": self._compute_mean_confidence,
-            "% within +-0.05": lambda predictions, markets: self._compute_percentage_within_range(
-                predictions, markets, average_error_tolerance=0.05
+        # Predefined metrics are computed at once for all the agents from `PredictionArrays`.
+        self.vectorised_metric_fns: dict[
+            str, t.Callable[[PredictionArrays], list[float | None]]
+        ] = {
+            "MSE for `p_yes`": PredictionArrays.mse,
+            "Mean confidence": PredictionArrays.mean_confidence,
+            "% within +-0.05": lambda arrays: arrays.percentage_within_range(
+                average_error_tolerance=0.05
             ),
-            "% within +-0.1": lambda predictions, markets: self._compute_percentage_within_range(
-                predictions, markets, average_error_tolerance=0.1
+            "% within +-0.1": lambda arrays: arrays.percentage_within_range(
+                average_error_tolerance=0.1
             ),
-            "% within +-0.2": lambda predictions, markets: self._compute_percentage_within_range(
-                predictions, markets, average_error_tolerance=0.2
+            "% within +-0.2": lambda arrays: arrays.percentage_within_range(
+                average_error_tolerance=0.2
             ),
-            "% correct outcome": self._compute_correct_outcome_percentage,
-            "% precision for `yes`": lambda predictions, markets: self._compute_precision_and_recall_percentages(
-                predictions, markets
-            )[
+            "% correct outcome": PredictionArrays.correct_outcome_percentage,
+            "% precision for `yes`": lambda arrays: arrays.precision_and_recall_percentages()[
                 0
             ],
-            "% precision for `no`": lambda predictions, markets: self._compute_precision_and_recall_percentages(
-                predictions, markets
-            )[
+            "% precision for `no`": lambda arrays: arrays.precision_and_recall_percentages()[
                 0
             ],
-            "% recall for `yes`": lambda predictions, markets: self._compute_precision_and_recall_percentages(
-                predictions, markets
-            )[
+            "% recall for `yes`": lambda arrays: arrays.precision_and_recall_percentages()[
                 1
             ],
-            "% recall for `no`": lambda predictions, markets: self._compute_precision_and_recall_percentages(
-                predictions, markets
-            )[
+            "% recall for `no`": lambda arrays: arrays.precision_and_recall_percentages()[
                 1
             ],
-            "confidence/p_yes error correlation": self._compute_confidence_p_yes_error_correlation,
-            "Proportion answerable": self._compute_ratio_evaluated_as_answerable,
-            "Proportion answered": self._compute_ratio_answered,
-            "Mean time (s)": self._compute_mean_time,
+            "confidence/p_yes error correlation": PredictionArrays.confidence_p_yes_error_correlation,
+            "Proportion answerable": PredictionArrays.ratio_evaluated_as_answerable,
+            "Proportion answered": PredictionArrays.ratio_answered,
+            "Mean time (s)": PredictionArrays.mean_time,
+        }
+        # Custom metrics are computed per agent from its predictions.
+        self.metric_fns = {
+            name: fn
+            for name, fn in metric_fns.items()
+            if name not in self.vectorised_metric_fns
         }
-        self.metric_fns.update(predefined_metric_fns)
 
     def add_prediction(
         self,
@@ -112,265 +309,138 @@ class Benchmarker:
         prediction: Prediction,
         market_question: str,
     ) -> None:
-        self.predictions.add_prediction(
-            agent_name=agent.agent_name,
-            question=market_question,
-            prediction=prediction,
-        )
+        if self.cache_path:
+            self.predictions.append(
+                path=self.cache_path,
+                agent_name=agent.agent_name,
+                question=market_question,
+                prediction=prediction,
+            )
+        else:
+            self.predictions.add_prediction(
+                agent_name=agent.agent_name,
+                question=market_question,
+                prediction=prediction,
+            )
 
     def get_prediction(self, agent_name: str, question: str) -> Prediction:
         return self.predictions.get_prediction(agent_name=agent_name, question=question)
 
     def run_agents(self, enable_timing: bool = True) -> None:
-        agent: AbstractBenchmarkedAgent  # Fix for mypy issue with tqdm.
-        for agent in tqdm(self.registered_agents, desc="Running agents"):
-            # Filter out cached predictions
-            markets_to_run = [
+        """
+        Runs all (agent, market) pairs that aren't cached yet in a single shared pool of `max_workers` threads,
+        while every agent has at most `agent.max_workers` predictions in flight.
+        """
+        # Filter out cached predictions
+        queues: dict[str, deque[AgentMarket]] = {
+            agent.agent_name: deque(
                 m
                 for m in self.markets
                 if not self.predictions.has_market(
                     agent_name=agent.agent_name, question=m.question
                 )
-            ]
-
-            def get_prediction_result(
-                market: AgentMarket,
-            ) -> tuple[str, Prediction]:
-                start_time = time.time()
-                prediction = (
-                    agent.check_and_predict(market_question=market.question)
-                    if not market.is_resolved()
-                    else (
-                        agent.check_and_predict_restricted(
-                            market=market,
-                            time_restriction_up_to=market.created_time,  # TODO: Add support for resolved_at and any time in between.
+            )
+            for agent in self.registered_agents
+        }
+        in_flight: dict[str, int] = defaultdict(int)
+        futures: dict[
+            concurrent.futures.Future[tuple[str, Prediction]],
+            AbstractBenchmarkedAgent,
+        ] = {}
+        completed_since_save = 0
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor, tqdm(
+            total=sum(len(q) for q in queues.values()), desc="Running agents"
+        ) as progress:
+
+            def submit_ready() -> None:
+                # Round-robin over the agents, so that all of them progress at the same time.
+                submitted = True
+                while submitted:
+                    submitted = False
+                    for agent in self.registered_agents:
+                        queue = queues[agent.agent_name]
+                        if not queue or (
+                            agent.max_workers is not None
+                            and in_flight[agent.agent_name] >= agent.max_workers
+                        ):
+                            continue
+                        future = executor.submit(
+                            self._get_prediction_result, agent, queue.popleft()
                         )
-                        if market.created_time is not None
-                        else should_not_happen()
-                    )
+                        futures[future] = agent
+                        in_flight[agent.agent_name] += 1
+                        submitted = True
+
+            submit_ready()
+            while futures:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
                 )
-                prediction.time = time.time() - start_time
-                return market.question, prediction
-
-            # Run agents in parallel
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=agent.max_workers
-            ) as executor:
-                futures = [
-                    executor.submit(get_prediction_result, market)
-                    for market in markets_to_run
-                ]
-                for future in tqdm(
-                    concurrent.futures.as_completed(futures),
-                    total=len(futures),
-                    desc=f"Running {agent.agent_name}",
-                ):
+                for future in done:
+                    agent = futures.pop(future)
+                    in_flight[agent.agent_name] -= 1
                     market_question, prediction = future.result()
                     self.add_prediction(
                         agent=agent,
                         prediction=prediction,
                         market_question=market_question,
                     )
-                    if self.cache_path:
-                        self.predictions.save(self.cache_path)
+                    completed_since_save += 1
+                    progress.update()
+                submit_ready()
 
-    @staticmethod
-    def filter_predictions_for_answered(
-        predictions: list[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> t.Tuple[list[Prediction], list[AgentMarket]]:
-        filtered_predictions, filtered_markets = [], []
-        for p, m in zip(predictions, markets):
-            if p.is_answered:
-                filtered_predictions.append(p)
-                filtered_markets.append(m)
-        return filtered_predictions, filtered_markets
-
-    def _compute_mse(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float | None:
-        predictions, markets = self.filter_predictions_for_answered(
-            predictions, markets
-        )
-        if not predictions:
-            return None
-
-        total_squared_errors = 0.0
-        for prediction, market in zip(predictions, markets):
-            squared_errors = self.calculate_squared_errors(prediction, market)
-            total_squared_errors += squared_errors
-
-        return total_squared_errors
-
-    @staticmethod
-    def calculate_errors_between_prediction_and_market(
-        prediction: Prediction, market: AgentMarket
-    ) -> list[float]:
-        pred_probs = check_not_none(prediction.outcome_prediction).probabilities
-        pred_probs_lower = {OutcomeStr(k.lower()): v for k, v in pred_probs.items()}
-
-        # Get common outcomes between prediction and market
-        common_outcomes = set(pred_probs_lower.keys()) & set(market.outcomes_lowercase)
-
-        errors = [
-            (pred_probs_lower[outcome] - market.probability_for_market_outcome(outcome))
-            for outcome in common_outcomes
-        ]
+                if self.cache_path and completed_since_save >= self.compact_every:
+                    self.predictions.save(self.cache_path)
+                    completed_since_save = 0
 
-        return errors
+        if self.cache_path and completed_since_save:
+            self.predictions.save(self.cache_path)
 
     @staticmethod
-    def calculate_squared_errors(prediction: Prediction, market: AgentMarket) -> float:
-        errors = Benchmarker.calculate_errors_between_prediction_and_market(
-            prediction, market
-        )
-        squared_errors = sum([err**2 for err in errors], 0.0)
-        return squared_errors
-
-    def _compute_mean_confidence(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float | None:
-        predictions, _ = self.filter_predictions_for_answered(predictions, markets)
-        if not predictions:
-            return None
-        mean_confidence = sum(
-            [check_not_none(p.outcome_prediction).confidence for p in predictions]
-        ) / len(predictions)
-        return mean_confidence
-
-    def _compute_percentage_within_range(
-        self,
-        predictions: t.List[Prediction],
-        markets: t.Sequence[AgentMarket],
-        average_error_tolerance: float = 0.05,
-    ) -> float | None:
-        predictions, markets = self.filter_predictions_for_answered(
-            predictions, markets
-        )
-        if not predictions:
-            return None
-
-        predictions_within_range = 0.0
-        for prediction, market in zip(predictions, markets):
-            squared_errors = self.calculate_squared_errors(prediction, market)
-            if squared_errors <= (average_error_tolerance**2):
-                predictions_within_range += 1
-
-        return (100 * predictions_within_range) / len(predictions)
-
-    def _compute_correct_outcome_percentage(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float | None:
-        predictions, markets = self.filter_predictions_for_answered(
-            predictions, markets
-        )
-        if not predictions:
-            return None
-
-        correct_outcome_count = 0
-        for p, m in zip(predictions, markets):
-            if (
-                check_not_none(p.outcome_prediction).probable_resolution
-                == m.probable_resolution
-            ):
-                correct_outcome_count += 1
-
-        return (100 * correct_outcome_count) / len(predictions)
-
-    def _compute_precision_and_recall_percentages(
-        self,
-        predictions: t.List[Prediction],
-        markets: t.Sequence[AgentMarket],
-    ) -> tuple[float | None, float | None]:
-        predictions, markets = self.filter_predictions_for_answered(
-            predictions, markets
-        )
-        if not predictions:
-            return None, None
-
-        ground_truth = [
-            m.probable_resolution.outcome if m.probable_resolution else None
-            for m in markets
-        ]
-        y_pred = [
-            (
-                p.outcome_prediction.probable_resolution.outcome
-                if p.outcome_prediction is not None
-                else None
+    def _get_prediction_result(
+        agent: AbstractBenchmarkedAgent, market: AgentMarket
+    ) -> tuple[str, Prediction]:
+        start_time = time.time()
+        prediction = (
+            agent.check_and_predict(market_question=market.question)
+            if not market.is_resolved()
+            else (
+                agent.check_and_predict_restricted(
+                    market=market,
+                    time_restriction_up_to=market.created_time,  # TODO: Add support for resolved_at and any time in between.
+                )
+                if market.created_time is not None
+                else should_not_happen()
             )
-            for p in predictions
-        ]
-
-        # Filter out None values
-        valid_indices = [
-            i
-            for i, (gt, pred) in enumerate(zip(ground_truth, y_pred))
-            if gt is not None and pred is not None
-        ]
-        if not valid_indices:
-            return None, None
-
-        ground_truth = [ground_truth[i] for i in valid_indices]
-        y_pred = [y_pred[i] for i in valid_indices]
-        precision = precision_score(
-            ground_truth, y_pred, average="micro", zero_division=0.0
-        )
-        recall = recall_score(ground_truth, y_pred, average="micro", zero_division=0.0)
-        return precision * 100, recall * 100
-
-    def _compute_confidence_p_yes_error_correlation(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float | None:
-        predictions, markets = self.filter_predictions_for_answered(
-            predictions, markets
         )
-        if not predictions:
-            return None
-
-        p_yes_errors = []
-        for p, m in zip(predictions, markets):
-            errors = self.calculate_errors_between_prediction_and_market(p, m)
-            mean_error = sum([abs(i) for i in errors]) / len(errors)
-            p_yes_errors.append(mean_error)
-
-        confidences = [
-            check_not_none(p.outcome_prediction).confidence for p in predictions
-        ]
-        return float(np.corrcoef(confidences, p_yes_errors)[0, 1])
-
-    def _compute_mean_time(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float | None:
-        # Note: times are optional
-        times = [p.time for p in predictions if p.time]
-        if times:
-            return sum(times) / len(times)
-        else:
-            return None
-
-    def _compute_ratio_evaluated_as_answerable(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float:
-        return sum(1 for p in predictions if p.is_predictable) / len(predictions)
-
-    def _compute_ratio_answered(
-        self, predictions: t.List[Prediction], markets: t.Sequence[AgentMarket]
-    ) -> float:
-        return sum(1 for p in predictions if p.is_answered) / len(predictions)
+        prediction.time = time.time() - start_time
+        return market.question, prediction
 
     def compute_metrics(self) -> t.Dict[str, t.List[t.Any]]:
         metrics: dict[str, list[str | float | None]] = {}
         metrics["Agents"] = [a.agent_name for a in self.registered_agents]
 
+        ordered_predictions = [
+            [
+                self.get_prediction(
+                    question=market.question, agent_name=agent.agent_name
+                )
+                for market in self.markets
+            ]
+            for agent in self.registered_agents
+        ]
         for name, fn in self.metric_fns.items():
-            metrics[name] = []
-            for agent in self.registered_agents:
-                ordered_predictions = [
-                    self.get_prediction(
-                        question=market.question, agent_name=agent.agent_name
-                    )
-                    for market in self.markets
-                ]
-                metrics[name].append(fn(ordered_predictions, self.markets))
+            metrics[name] = [
+                fn(agent_predictions, self.markets)
+                for agent_predictions in ordered_predictions
+            ]
+
+        arrays = PredictionArrays(ordered_predictions, self.markets)
+        for name, vectorised_fn in self.vectorised_metric_fns.items():
+            metrics[name] = list(vectorised_fn(arrays))
 
         return metrics
 
@@ -1,9 +1,11 @@
 import json
+import os
 import typing as t
 
 from pydantic import BaseModel
 
 from prediction_market_agent_tooling.gtypes import OutcomeStr, Probability
+from prediction_market_agent_tooling.loggers import logger
 from prediction_market_agent_tooling.markets.data_models import (
     CategoricalProbabilisticAnswer,
     ScalarProbabilisticAnswer,
@@ -44,6 +46,12 @@ AgentPredictions = t.Dict[str, Prediction]
 Predictions = t.Dict[str, AgentPredictions]
 
 
+class PredictionsLogEntry(BaseModel):
+    agent_name: str
+    question: str
+    prediction: Prediction
+
+
 class PredictionsCache(BaseModel):
     predictions: Predictions
 
@@ -65,14 +73,71 @@ class PredictionsCache(BaseModel):
         ), f"Question `{question}` already exists in the cache."
         self.predictions[agent_name][question] = prediction
 
+    @staticmethod
+    def log_path(path: str) -> str:
+        """
+        Path of the append-only log with predictions added since the last `save` of the cache at `path`.
+        """
+        return f"{path}.log.jsonl"
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(path) or os.path.exists(PredictionsCache.log_path(path))
+
+    def append(
+        self, path: str, agent_name: str, question: str, prediction: Prediction
+    ) -> None:
+        """
+        Adds the prediction and persists it by appending a single line to the log, instead of rewriting the whole cache file.
+        """
+        self.add_prediction(
+            agent_name=agent_name, question=question, prediction=prediction
+        )
+        entry = PredictionsLogEntry(
+            agent_name=agent_name, question=question, prediction=prediction
+        )
+        with open(self.log_path(path), "ab+") as f:
+            # Last line can be incomplete if a previous process crashed while writing it, start a new one so this entry isn't glued to it.
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write((entry.model_dump_json() + "\n").encode())
+
     def save(self, path: str) -> None:
-        with open(path, "w") as f:
+        """
+        Writes the full cache and compacts the log, as all its entries are now part of the cache file.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
             json.dump(self.model_dump(), f, indent=2)
+        os.replace(tmp_path, path)
+        if os.path.exists(self.log_path(path)):
+            os.remove(self.log_path(path))
 
     @staticmethod
     def load(path: str) -> "PredictionsCache":
-        with open(path, "r") as f:
-            return PredictionsCache.model_validate(json.load(f))
+        cache = PredictionsCache(predictions={})
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                cache = PredictionsCache.model_validate(json.load(f))
+
+        log_path = PredictionsCache.log_path(path)
+        if os.path.exists(log_path):
+            with open(log_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = PredictionsLogEntry.model_validate_json(line)
+                    except ValueError:
+                        # Last line can be incomplete if the process crashed while writing it.
+                        logger.warning(f"Skipping corrupted line in {log_path}.")
+                        continue
+                    # Entries can be already in the cache file, if the process crashed during compaction.
+                    cache.predictions.setdefault(entry.agent_name, {})[
+                        entry.question
+                    ] = entry.prediction
+
+        return cache
 
 
 def get_llm_api_call_cost(
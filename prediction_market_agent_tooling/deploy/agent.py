@@ -1,3 +1,4 @@
+import asyncio
 import getpass
 import os
 import time
@@ -22,11 +23,17 @@ from prediction_market_agent_tooling.deploy.betting_strategy import (
     CategoricalMaxAccuracyBettingStrategy,
     TradeType,
 )
+from prediction_market_agent_tooling.deploy.run_context import AgentRunContext
 from prediction_market_agent_tooling.deploy.trade_interval import (
     FixedInterval,
     TradeInterval,
 )
-from prediction_market_agent_tooling.gtypes import USD, OutcomeToken, xDai
+from prediction_market_agent_tooling.gtypes import (
+    USD,
+    CollateralToken,
+    OutcomeToken,
+    xDai,
+)
 from prediction_market_agent_tooling.loggers import logger
 from prediction_market_agent_tooling.markets.agent_market import (
     AgentMarket,
@@ -90,6 +97,13 @@ def initialize_langfuse(enable_langfuse: bool) -> None:
         os.environ[LANGFUSE_SECRET_KEY] = "same here"
 
 
+def _is_overridden(obj: object, method_name: str, base: type) -> bool:
+    """
+    Returns True if the class of `obj` overrides `base`'s implementation of `method_name`.
+    """
+    return getattr(type(obj), method_name) is not getattr(base, method_name)
+
+
 class AnsweredEnum(str, Enum):
     ANSWERED = "answered"
     NOT_ANSWERED = "not_answered"
@@ -174,13 +188,18 @@ class DeployableAgent:
         market_type: MarketType,
         sleep_time: float,
         run_time: float | None,
+        use_async: bool = False,
     ) -> None:
         """
         Run the agent in the forever cycle every `sleep_time` seconds, until the `run_time` is met.
+        If `use_async` is set, each iteration is executed using `arun`.
         """
         start_time = time.time()
         while run_time is None or time.time() - start_time < run_time:
-            self.run(market_type=market_type)
+            if use_async:
+                asyncio.run(self.arun(market_type=market_type))
+            else:
+                self.run(market_type=market_type)
             time.sleep(sleep_time)
 
     def run(self, market_type: MarketType) -> None:
@@ -189,6 +208,12 @@ class DeployableAgent:
         """
         raise NotImplementedError("This method must be implemented by the subclass.")
 
+    async def arun(self, market_type: MarketType) -> None:
+        """
+        Async variant of `run`. By default, it executes `run` in a worker thread.
+        """
+        await asyncio.to_thread(self.run, market_type)
+
     def get_gcloud_fname(self, market_type: MarketType) -> str:
         return f"{self.__class__.__name__.lower()}-{market_type}-{utcnow().strftime('%Y-%m-%d--%H-%M-%S')}"
 
@@ -221,6 +246,9 @@ class DeployablePredictionAgent(DeployableAgent):
 
     just_warn_on_unexpected_model_behavior: bool = False
 
+    # How many markets can be processed at once when the agent is executed using `arun`.
+    max_concurrent_markets: int = 5
+
     # Only Metaculus allows to post predictions without trading (buying/selling of outcome tokens).
     supported_markets: t.Sequence[MarketType] = [MarketType.METACULUS]
 
@@ -231,6 +259,7 @@ class DeployablePredictionAgent(DeployableAgent):
     ) -> None:
         super().__init__(enable_langfuse=enable_langfuse)
         self.store_predictions = store_predictions
+        self.run_context = AgentRunContext()
 
     def initialize_langfuse(self) -> None:
         super().initialize_langfuse()
@@ -241,6 +270,7 @@ class DeployablePredictionAgent(DeployableAgent):
         self.answer_scalar_market = observe()(self.answer_scalar_market)  # type: ignore[method-assign]
         self.process_market = observe()(self.process_market)  # type: ignore[method-assign]
         self.rephrase_market_to_unconditional = observe()(self.rephrase_market_to_unconditional)  # type: ignore[method-assign]
+        self.aprocess_market = observe()(self.aprocess_market)  # type: ignore[method-assign]
 
     def update_langfuse_trace_by_market(
         self, market_type: MarketType, market: AgentMarket
@@ -287,9 +317,13 @@ class DeployablePredictionAgent(DeployableAgent):
         Subclasses can implement their own logic instead of this one, or on top of this one.
         By default, it allows only markets where user didn't bet recently and it's a reasonable question.
         """
-        if market.have_bet_on_market_since(
-            keys=APIKeys(), since=self.same_market_trade_interval.get(market=market)
-        ):
+        have_bet = self.run_context.have_bet_on_market(market)
+        if have_bet is None:
+            have_bet = market.have_bet_on_market_since(
+                keys=APIKeys(),
+                since=self.same_market_trade_interval.get(market=market),
+            )
+        if have_bet:
             logger.info(
                 f"Market already bet on within {self.same_market_trade_interval}."
             )
@@ -365,20 +399,61 @@ class DeployablePredictionAgent(DeployableAgent):
             "Either this method, or answer_categorical_market, must be implemented by the subclass."
         )
 
+    async def averify_market(
+        self, market_type: MarketType, market: AgentMarket
+    ) -> bool:
+        """
+        Async variant of `verify_market`, used when the agent is executed using `arun`.
+        By default, it executes `verify_market` in a worker thread.
+        """
+        return await asyncio.to_thread(self.verify_market, market_type, market)
+
+    async def aanswer_categorical_market(
+        self, market: AgentMarket
+    ) -> CategoricalProbabilisticAnswer | None:
+        """
+        Async variant of `answer_categorical_market`, used when the agent is executed using `arun`.
+        By default, it executes `answer_categorical_market` in a worker thread.
+        """
+        return await asyncio.to_thread(self.answer_categorical_market, market)
+
+    async def aanswer_scalar_market(
+        self, market: AgentMarket
+    ) -> ScalarProbabilisticAnswer | None:
+        """
+        Async variant of `answer_scalar_market`, used when the agent is executed using `arun`.
+        By default, it executes `answer_scalar_market` in a worker thread.
+        """
+        return await asyncio.to_thread(self.answer_scalar_market, market)
+
+    async def aanswer_binary_market(
+        self, market: AgentMarket
+    ) -> ProbabilisticAnswer | None:
+        """
+        Async variant of `answer_binary_market`, used when the agent is executed using `arun`.
+        By default, it executes `answer_binary_market` in a worker thread.
+        """
+        return await asyncio.to_thread(self.answer_binary_market, market)
+
     @property
     def fetch_categorical_markets(self) -> bool:
-        # Check if the subclass has implemented the answer_categorical_market method, if yes, fetch categorical markets as well.
+        # Check if the subclass has implemented the answer_categorical_market method (or its async variant), if yes, fetch categorical markets as well.
         if (
             self.answer_categorical_market.__wrapped__.__func__  # type: ignore[attr-defined] # This works just fine, but mypy doesn't know about it for some reason.
             is not DeployablePredictionAgent.answer_categorical_market
+        ) or _is_overridden(
+            self, "aanswer_categorical_market", DeployablePredictionAgent
         ):
             return True
         return False
 
     @property
     def fetch_scalar_markets(self) -> bool:
-        # Check if the subclass has implemented the answer_scalar_market method, if yes, fetch scalar markets as well.
-        if self.answer_scalar_market.__wrapped__.__func__ is not DeployablePredictionAgent.answer_scalar_market:  # type: ignore[attr-defined] # This works just fine, but mypy doesn't know about it for some reason.
+        # Check if the subclass has implemented the answer_scalar_market method (or its async variant), if yes, fetch scalar markets as well.
+        if (
+            self.answer_scalar_market.__wrapped__.__func__  # type: ignore[attr-defined] # This works just fine, but mypy doesn't know about it for some reason.
+            is not DeployablePredictionAgent.answer_scalar_market
+        ) or _is_overridden(self, "aanswer_scalar_market", DeployablePredictionAgent):
             return True
         return False
 
@@ -417,6 +492,23 @@ class DeployablePredictionAgent(DeployableAgent):
         )
         return available_markets
 
+    async def aget_markets(
+        self,
+        market_type: MarketType,
+    ) -> t.Sequence[AgentMarket]:
+        """
+        Async variant of `get_markets`, by default executed in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_markets, market_type)
+
+    async def abefore_process_market(
+        self, market_type: MarketType, market: AgentMarket
+    ) -> None:
+        """
+        Async variant of `before_process_market`, by default executed in a worker thread.
+        """
+        await asyncio.to_thread(self.before_process_market, market_type, market)
+
     def before_process_market(
         self, market_type: MarketType, market: AgentMarket
     ) -> None:
@@ -474,6 +566,59 @@ class DeployablePredictionAgent(DeployableAgent):
             )
         return self.answer_categorical_market(market)
 
+    async def abuild_answer(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        verify_market: bool = True,
+    ) -> CategoricalProbabilisticAnswer | None:
+        """
+        Async variant of `build_answer`, that uses the async answering hooks.
+        If the subclass customized `build_answer`, that one is executed in a worker thread instead.
+        """
+        if _is_overridden(self, "build_answer", DeployablePredictionAgent):
+            return await asyncio.to_thread(
+                self.build_answer, market_type, market, verify_market
+            )
+
+        if verify_market and not await self.averify_market(market_type, market):
+            logger.info(f"Market '{market.question}' doesn't meet the criteria.")
+            return None
+
+        logger.info(f"Answering market '{market.question}'.")
+
+        if self.rephrase_conditional_markets and market.parent is not None:
+            market = await asyncio.to_thread(
+                self.rephrase_market_to_unconditional, market
+            )
+
+        if market.is_binary:
+            try:
+                binary_answer = await self.aanswer_binary_market(market)
+                return (
+                    CategoricalProbabilisticAnswer.from_probabilistic_answer(
+                        binary_answer,
+                        market.outcomes,
+                    )
+                    if binary_answer is not None
+                    else None
+                )
+            except NotImplementedError:
+                logger.info(
+                    "aanswer_binary_market() not implemented, falling back to aanswer_categorical_market()"
+                )
+        elif market.is_scalar:
+            scalar_answer = await self.aanswer_scalar_market(market)
+            return (
+                CategoricalProbabilisticAnswer.from_scalar_answer(
+                    scalar_answer,
+                    market.outcomes,
+                )
+                if scalar_answer is not None
+                else None
+            )
+        return await self.aanswer_categorical_market(market)
+
     def verify_answer_outcomes(
         self, market: AgentMarket, answer: CategoricalProbabilisticAnswer
     ) -> None:
@@ -495,41 +640,108 @@ class DeployablePredictionAgent(DeployableAgent):
                 f"Some of market's outcomes ({market.outcomes=}) isn't included in the probability map ({outcomes_from_prob_map=})."
             )
 
-    def process_market(
+    def _start_processing_market(
+        self, market_type: MarketType, market: AgentMarket, liquidity: CollateralToken
+    ) -> None:
+        self.update_langfuse_trace_by_market(market_type, market)
+        logger.info(
+            f"Processing market {market.question=} from {market.url=} with liquidity {liquidity}."
+        )
+
+    def _log_unexpected_model_behavior(self) -> None:
+        (
+            logger.warning
+            if self.just_warn_on_unexpected_model_behavior
+            else logger.exception
+        )(f"Unexpected model behaviour in {self.__class__.__name__}.")
+
+    def _finish_processing_market(
         self,
         market_type: MarketType,
         market: AgentMarket,
-        verify_market: bool = True,
+        answer: CategoricalProbabilisticAnswer | None,
     ) -> ProcessedMarket | None:
-        self.update_langfuse_trace_by_market(market_type, market)
+        if answer is not None:
+            self.verify_answer_outcomes(market=market, answer=answer)
+
+        processed_market = (
+            ProcessedMarket(answer=answer, trades=[]) if answer is not None else None
+        )
+
+        self.update_langfuse_trace_by_processed_market(market_type, processed_market)
         logger.info(
-            f"Processing market {market.question=} from {market.url=} with liquidity {market.get_liquidity()}."
+            f"Processed market {market.question=} from {market.url=} with {processed_market=}."
         )
+        return processed_market
+
+    def process_market(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        verify_market: bool = True,
+    ) -> ProcessedMarket | None:
+        self._start_processing_market(market_type, market, market.get_liquidity())
 
         try:
             answer = self.build_answer(
                 market=market, market_type=market_type, verify_market=verify_market
             )
         except UnexpectedModelBehavior:
-            (
-                logger.warning
-                if self.just_warn_on_unexpected_model_behavior
-                else logger.exception
-            )(f"Unexpected model behaviour in {self.__class__.__name__}.")
+            self._log_unexpected_model_behavior()
             answer = None
 
-        if answer is not None:
-            self.verify_answer_outcomes(market=market, answer=answer)
+        return self._finish_processing_market(market_type, market, answer)
 
-        processed_market = (
-            ProcessedMarket(answer=answer, trades=[]) if answer is not None else None
+    async def aprocess_market(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        verify_market: bool = True,
+    ) -> ProcessedMarket | None:
+        """
+        Async variant of `process_market`, used when the agent is executed using `arun`.
+        If the subclass customized `process_market`, that one is executed in a worker thread instead.
+        """
+        if _is_overridden(self, "process_market", DeployablePredictionAgent):
+            return await asyncio.to_thread(
+                self.process_market, market_type, market, verify_market
+            )
+        return await self._aprocess_market_prediction(
+            market_type, market, verify_market
         )
 
-        self.update_langfuse_trace_by_processed_market(market_type, processed_market)
-        logger.info(
-            f"Processed market {market.question=} from {market.url=} with {processed_market=}."
+    async def _aprocess_market_prediction(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        verify_market: bool,
+    ) -> ProcessedMarket | None:
+        self._start_processing_market(
+            market_type, market, await asyncio.to_thread(market.get_liquidity)
+        )
+
+        try:
+            answer = await self.abuild_answer(
+                market=market, market_type=market_type, verify_market=verify_market
+            )
+        except UnexpectedModelBehavior:
+            self._log_unexpected_model_behavior()
+            answer = None
+
+        return self._finish_processing_market(market_type, market, answer)
+
+    async def aafter_process_market(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        processed_market: ProcessedMarket | None,
+    ) -> None:
+        """
+        Async variant of `after_process_market`, by default executed in a worker thread.
+        """
+        await asyncio.to_thread(
+            self.after_process_market, market_type, market, processed_market
         )
-        return processed_market
 
     def after_process_market(
         self,
@@ -558,12 +770,55 @@ class DeployablePredictionAgent(DeployableAgent):
         self.check_min_required_balance_to_operate(market_type)
         market_type.market_class.redeem_winnings(api_keys)
 
+    def prefetch_markets_data(
+        self, market_type: MarketType, markets: t.Sequence[AgentMarket]
+    ) -> None:
+        """
+        Bulk-loads data needed by the per-market checks into `self.run_context`, instead of querying them for every market separately.
+        Platforms that don't support the bulk queries are skipped and the per-market queries are used instead.
+        """
+        if not markets:
+            return
+
+        intervals = {
+            market.id: self.same_market_trade_interval.get(market=market)
+            for market in markets
+        }
+        try:
+            # One query over the widest interval, each market is then checked against its own interval.
+            last_bet_times = market_type.market_class.markets_bet_on_since(
+                keys=APIKeys(),
+                market_ids=[m.id for m in markets],
+                since=max(intervals.values()),
+            )
+        except NotImplementedError:
+            logger.debug(f"Batched bets fetching not supported for {market_type}.")
+            return
+
+        now = utcnow()
+        for market in markets:
+            last_bet_time = last_bet_times.get(market.id)
+            self.run_context.recently_bet_on[market.id] = (
+                last_bet_time is not None
+                and last_bet_time >= now - intervals[market.id]
+            )
+
+    async def aprefetch_markets_data(
+        self, market_type: MarketType, markets: t.Sequence[AgentMarket]
+    ) -> None:
+        """
+        Async variant of `prefetch_markets_data`, by default executed in a worker thread.
+        """
+        await asyncio.to_thread(self.prefetch_markets_data, market_type, markets)
+
     def process_markets(self, market_type: MarketType) -> None:
         """
         Processes bets placed by agents on a given market.
         """
         logger.info("Start processing of markets.")
         available_markets = self.get_markets(market_type)
+        self.run_context = AgentRunContext()
+        self.prefetch_markets_data(market_type, available_markets)
 
         logger.info(
             f"Fetched {len(available_markets)=} markets to process, going to process {self.bet_on_n_markets_per_run=}."
@@ -575,8 +830,11 @@ class DeployablePredictionAgent(DeployableAgent):
                 f"Going to process market {market.url}: {market_idx+1} / {len(available_markets)}."
             )
             self.before_process_market(market_type, market)
-            processed_market = self.process_market(market_type, market)
-            self.after_process_market(market_type, market, processed_market)
+            try:
+                processed_market = self.process_market(market_type, market)
+                self.after_process_market(market_type, market, processed_market)
+            finally:
+                self.run_context.release_trade_balance(market)
 
             if processed_market is not None:
                 processed += 1
@@ -593,6 +851,81 @@ class DeployablePredictionAgent(DeployableAgent):
         Executed after market processing loop ends.
         """
 
+    async def abefore_process_markets(self, market_type: MarketType) -> None:
+        """
+        Async variant of `before_process_markets`, by default executed in a worker thread.
+        """
+        await asyncio.to_thread(self.before_process_markets, market_type)
+
+    async def aafter_process_markets(self, market_type: MarketType) -> None:
+        """
+        Async variant of `after_process_markets`, by default executed in a worker thread.
+        """
+        await asyncio.to_thread(self.after_process_markets, market_type)
+
+    async def _aprocess_market_pipeline(
+        self, market_type: MarketType, market: AgentMarket
+    ) -> ProcessedMarket | None:
+        await self.abefore_process_market(market_type, market)
+        try:
+            processed_market = await self.aprocess_market(market_type, market)
+            await self.aafter_process_market(market_type, market, processed_market)
+        finally:
+            self.run_context.release_trade_balance(market)
+        return processed_market
+
+    async def aprocess_markets(self, market_type: MarketType) -> None:
+        """
+        Async variant of `process_markets`, that processes up to `max_concurrent_markets` markets at once.
+        """
+        logger.info("Start processing of markets.")
+        available_markets = await self.aget_markets(market_type)
+        self.run_context = AgentRunContext()
+        await self.aprefetch_markets_data(market_type, available_markets)
+
+        logger.info(
+            f"Fetched {len(available_markets)=} markets to process, going to process {self.bet_on_n_markets_per_run=}."
+        )
+        processed = 0
+        markets_to_process = iter(enumerate(available_markets))
+        pending: set[asyncio.Task[ProcessedMarket | None]] = set()
+
+        while True:
+            # Never have more markets in flight than is needed to reach `bet_on_n_markets_per_run`.
+            while len(pending) < min(
+                self.max_concurrent_markets,
+                self.bet_on_n_markets_per_run - processed,
+            ):
+                next_market = next(markets_to_process, None)
+                if next_market is None:
+                    break
+                market_idx, market = next_market
+                logger.info(
+                    f"Going to process market {market.url}: {market_idx+1} / {len(available_markets)}."
+                )
+                pending.add(
+                    asyncio.create_task(
+                        self._aprocess_market_pipeline(market_type, market)
+                    )
+                )
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            try:
+                processed += sum(task.result() is not None for task in done)
+            except BaseException:
+                for task in pending:
+                    task.cancel()
+                raise
+
+        logger.info(
+            f"All markets processed. Successfully processed {processed}/{len(available_markets)}."
+        )
+
     def run(self, market_type: MarketType) -> None:
         if market_type not in self.supported_markets:
             raise ValueError(
@@ -602,6 +935,20 @@ class DeployablePredictionAgent(DeployableAgent):
         self.process_markets(market_type)
         self.after_process_markets(market_type)
 
+    async def arun(self, market_type: MarketType) -> None:
+        """
+        Run single iteration of the agent, processing markets concurrently.
+        Subclasses can override the async hooks (`aprocess_market`, `aanswer_binary_market`, ...) with native implementations,
+        by default they execute their sync counterparts in a worker thread.
+        """
+        if market_type not in self.supported_markets:
+            raise ValueError(
+                f"Only {self.supported_markets} are supported by this agent."
+            )
+        await self.abefore_process_markets(market_type)
+        await self.aprocess_markets(market_type)
+        await self.aafter_process_markets(market_type)
+
 
 class DeployableTraderAgent(DeployablePredictionAgent):
     """
@@ -639,6 +986,11 @@ class DeployableTraderAgent(DeployablePredictionAgent):
         self.build_trades = observe()(self.build_trades)  # type: ignore[method-assign]
         self.execute_trades = observe()(self.execute_trades)  # type: ignore[method-assign]
 
+    def before_process_markets(self, market_type: MarketType) -> None:
+        super().before_process_markets(market_type)
+        if self.place_trades:
+            market_type.market_class.prepare_trading(APIKeys())
+
     def check_min_required_balance_to_trade(self, market: AgentMarket) -> None:
         api_keys = APIKeys()
 
@@ -647,17 +999,36 @@ class DeployableTraderAgent(DeployablePredictionAgent):
         # Have a little bandwidth after the bet.
         min_required_balance_to_trade = strategy.maximum_possible_bet_amount * 1.01
 
-        if market.get_trade_balance(api_keys) < min_required_balance_to_trade:
+        available_balance = self.run_context.reserve_trade_balance(
+            market,
+            min_required_balance_to_trade,
+            lambda: market.get_trade_balance(api_keys),
+        )
+
+        if available_balance < min_required_balance_to_trade:
             raise OutOfFundsError(
-                f"Minimum required balance {min_required_balance_to_trade} for agent {api_keys.bet_from_address=} is not met."
+                f"Minimum required balance {min_required_balance_to_trade} for agent {api_keys.bet_from_address=} is not met, {available_balance=} after the reservations of concurrently processed markets."
             )
 
     @staticmethod
-    def get_total_amount_to_bet(market: AgentMarket) -> USD:
+    def get_total_amount_to_bet(
+        market: AgentMarket, run_context: AgentRunContext | None = None
+    ) -> USD:
         user_id = market.get_user_id(api_keys=APIKeys())
 
-        total_amount = market.get_in_usd(market.get_tiny_bet_amount())
-        existing_position = market.get_position(user_id=user_id)
+        tiny_bet_amount = market.get_tiny_bet_amount()
+        total_amount = (
+            run_context.get_token_in_usd(market, tiny_bet_amount)
+            if run_context is not None
+            else None
+        )
+        if total_amount is None:
+            total_amount = market.get_in_usd(tiny_bet_amount)
+        existing_position = (
+            run_context.get_position(market)
+            if run_context is not None and run_context.has_position(market)
+            else market.get_position(user_id=user_id)
+        )
 
         if existing_position and existing_position.total_amount_current > USD(0):
             total_amount += existing_position.total_amount_current
@@ -670,7 +1041,7 @@ class DeployableTraderAgent(DeployablePredictionAgent):
 
         Given the market and prediction, agent uses this method to calculate optimal outcome and bet size.
         """
-        total_amount = self.get_total_amount_to_bet(market)
+        total_amount = self.get_total_amount_to_bet(market, self.run_context)
         return CategoricalMaxAccuracyBettingStrategy(max_position_amount=total_amount)
 
     def get_betting_strategy_supported(self, market: AgentMarket) -> BettingStrategy:
@@ -694,6 +1065,27 @@ class DeployableTraderAgent(DeployablePredictionAgent):
         trades = strategy.calculate_trades(existing_position, answer, market)
         return trades
 
+    async def abuild_trades(
+        self,
+        market: AgentMarket,
+        answer: CategoricalProbabilisticAnswer,
+        existing_position: ExistingPosition | None,
+    ) -> list[Trade]:
+        """
+        Async variant of `build_trades`, by default executed in a worker thread.
+        """
+        return await asyncio.to_thread(
+            self.build_trades, market, answer, existing_position
+        )
+
+    async def aexecute_trades(
+        self, market: AgentMarket, trades: list[Trade]
+    ) -> list[PlacedTrade]:
+        """
+        Async variant of `execute_trades`, by default executed in a worker thread.
+        """
+        return await asyncio.to_thread(self.execute_trades, market, trades)
+
     def execute_trades(
         self, market: AgentMarket, trades: list[Trade]
     ) -> list[PlacedTrade]:
@@ -754,6 +1146,27 @@ class DeployableTraderAgent(DeployablePredictionAgent):
 
         return placed_trades
 
+    def prefetch_markets_data(
+        self, market_type: MarketType, markets: t.Sequence[AgentMarket]
+    ) -> None:
+        super().prefetch_markets_data(market_type, markets)
+        if not markets:
+            return
+
+        market_class = market_type.market_class
+        try:
+            self.run_context.positions = market_class.get_positions_for_markets(
+                user_id=market_class.get_user_id(api_keys=APIKeys()), markets=markets
+            )
+        except NotImplementedError:
+            logger.debug(f"Bulk positions fetching not supported for {market_type}.")
+        try:
+            self.run_context.token_usd_rates = market_class.get_token_in_usd_rates(
+                markets
+            )
+        except NotImplementedError:
+            logger.debug(f"Bulk USD rates fetching not supported for {market_type}.")
+
     def before_process_market(
         self, market_type: MarketType, market: AgentMarket
     ) -> None:
@@ -770,12 +1183,10 @@ class DeployableTraderAgent(DeployablePredictionAgent):
         if processed_market is None:
             return None
 
-        user_id = market.get_user_id(api_keys=self.api_keys)
-
         try:
-            existing_position = market.get_position(user_id=user_id)
+            existing_position = self._get_existing_position(market)
         except Exception as e:
-            logger.warning(f"Could not get position for user {user_id}, exception {e}")
+            logger.warning(f"Could not get position on {market.url=}, exception {e}")
             return None
 
         trades = self.build_trades(
@@ -784,13 +1195,63 @@ class DeployableTraderAgent(DeployablePredictionAgent):
             existing_position=existing_position,
         )
         placed_trades = self.execute_trades(market, trades)
-
-        traded_market = ProcessedMarket(
-            answer=processed_market.answer, trades=placed_trades
+        return self._finish_trading_market(
+            market, processed_market.answer, placed_trades
         )
+
+    def _get_existing_position(self, market: AgentMarket) -> ExistingPosition | None:
+        if self.run_context.has_position(market):
+            return self.run_context.get_position(market)
+        return market.get_position(user_id=market.get_user_id(api_keys=self.api_keys))
+
+    def _finish_trading_market(
+        self,
+        market: AgentMarket,
+        answer: CategoricalProbabilisticAnswer,
+        placed_trades: list[PlacedTrade],
+    ) -> ProcessedMarket:
+        if placed_trades:
+            self.run_context.record_trades(market)
+
+        traded_market = ProcessedMarket(answer=answer, trades=placed_trades)
         logger.info(f"Traded market {market.question=} from {market.url=}.")
         return traded_market
 
+    async def aprocess_market(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        verify_market: bool = True,
+    ) -> ProcessedMarket | None:
+        if _is_overridden(self, "process_market", DeployableTraderAgent):
+            return await asyncio.to_thread(
+                self.process_market, market_type, market, verify_market
+            )
+
+        processed_market = await self._aprocess_market_prediction(
+            market_type, market, verify_market
+        )
+        if processed_market is None:
+            return None
+
+        try:
+            existing_position = await asyncio.to_thread(
+                self._get_existing_position, market
+            )
+        except Exception as e:
+            logger.warning(f"Could not get position on {market.url=}, exception {e}")
+            return None
+
+        trades = await self.abuild_trades(
+            market=market,
+            answer=processed_market.answer,
+            existing_position=existing_position,
+        )
+        placed_trades = await self.aexecute_trades(market, trades)
+        return self._finish_trading_market(
+            market, processed_market.answer, placed_trades
+        )
+
     def after_process_market(
         self,
         market_type: MarketType,
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Sequence
 
 import numpy as np
+from numpy.typing import NDArray
 from scipy.optimize import minimize_scalar
 
 from prediction_market_agent_tooling.benchmark.utils import get_most_probable_outcome
@@ -32,10 +33,10 @@ from prediction_market_agent_tooling.markets.omen.omen import (
 )
 from prediction_market_agent_tooling.tools.betting_strategies.kelly_criterion import (
     KellyType,
-    get_kelly_bet_full,
-    get_kelly_bet_simplified,
     get_kelly_bets_categorical_full,
     get_kelly_bets_categorical_simplified,
+    get_kelly_bets_full_many,
+    get_kelly_bets_simplified_many,
 )
 from prediction_market_agent_tooling.tools.betting_strategies.utils import (
     BinaryKellyBet,
@@ -48,6 +49,27 @@ class GuaranteedLossError(RuntimeError):
     pass
 
 
+def check_batch_sizes(
+    existing_positions: Sequence[ExistingPosition | None],
+    answers: Sequence[CategoricalProbabilisticAnswer],
+    markets: Sequence[AgentMarket],
+) -> None:
+    if not len(existing_positions) == len(answers) == len(markets):
+        raise ValueError(
+            f"Got {len(existing_positions)} existing positions and {len(answers)} answers for {len(markets)} markets."
+        )
+
+
+def get_existing_amount(
+    existing_position: ExistingPosition | None, outcome: OutcomeStr
+) -> USD:
+    return (
+        existing_position.amounts_current.get(outcome, USD(0))
+        if existing_position
+        else USD(0)
+    )
+
+
 class BettingStrategy(ABC):
     supported_question_types: set[QuestionType]
     supported_market_types: set[MarketType]
@@ -73,11 +95,102 @@ class BettingStrategy(ABC):
     ) -> list[Trade]:
         raise NotImplementedError("Subclass should implement this.")
 
+    def calculate_trades_many(
+        self,
+        existing_positions: Sequence[ExistingPosition | None],
+        answers: Sequence[CategoricalProbabilisticAnswer],
+        markets: Sequence[AgentMarket],
+        total_budget: USD | None = None,
+    ) -> list[list[Trade]]:
+        """
+        Calculates trades for many markets at once, returned in the same order as the markets.
+        If `total_budget` is given, buy trades across all the markets together are fitted into it.
+
+        By default, markets are processed one by one and their buy trades are scaled down proportionally,
+        strategies with a batch implementation override this.
+        """
+        check_batch_sizes(existing_positions, answers, markets)
+        trades = [
+            self.calculate_trades(existing_position, answer, market)
+            for existing_position, answer, market in zip(
+                existing_positions, answers, markets
+            )
+        ]
+        if total_budget is None:
+            return trades
+
+        total_bought = sum(
+            trade.amount.value
+            for market_trades in trades
+            for trade in market_trades
+            if trade.trade_type == TradeType.BUY
+        )
+        if total_bought <= total_budget.value:
+            return trades
+        scale = total_budget.value / total_bought
+        return [
+            [
+                (
+                    trade.model_copy(update={"amount": trade.amount * scale})
+                    if trade.trade_type == TradeType.BUY
+                    else trade
+                )
+                for trade in market_trades
+            ]
+            for market_trades in trades
+        ]
+
     @property
     @abstractmethod
     def maximum_possible_bet_amount(self) -> USD:
         raise NotImplementedError("Subclass should implement this.")
 
+    @staticmethod
+    def fit_positions_to_budget(
+        target_positions: NDArray[np.float64],
+        existing_positions: NDArray[np.float64],
+        total_budget: USD,
+    ) -> NDArray[np.float64]:
+        """
+        Scales down targets that require buying by a common factor `k`, such that the total bought across the markets fits into `total_budget`.
+        Targets that require selling are kept as they are and no target is lowered below its existing position.
+
+        Amount bought in the i-th market, `max(k * target_i - existing_i, 0)`, is piecewise linear and increasing in `k`,
+        so `k` is solved exactly at once from the breakpoints where the markets start buying.
+        """
+        if total_budget < 0:
+            raise ValueError(f"Total budget can not be negative, got {total_budget}.")
+
+        buying = target_positions > existing_positions
+        targets = target_positions[buying]
+        existing = existing_positions[buying]
+        if (targets - existing).sum() <= total_budget.value:
+            return target_positions
+
+        breakpoints = existing / targets
+        order = np.argsort(breakpoints)
+        breakpoints, targets, existing = (
+            breakpoints[order],
+            targets[order],
+            existing[order],
+        )
+        cumulative_targets = np.cumsum(targets)
+        cumulative_existing = np.cumsum(existing)
+        # Total bought with `k` at each breakpoint, when only the markets with lower breakpoints are buying.
+        bought_at_breakpoints = breakpoints * cumulative_targets - cumulative_existing
+        segment = (
+            np.searchsorted(bought_at_breakpoints, total_budget.value, side="right") - 1
+        )
+        k = (total_budget.value + cumulative_existing[segment]) / cumulative_targets[
+            segment
+        ]
+
+        fitted: NDArray[np.float64] = target_positions.copy()
+        fitted[buying] = np.maximum(
+            k * target_positions[buying], existing_positions[buying]
+        )
+        return fitted
+
     @staticmethod
     def build_zero_usd_amount() -> USD:
         return USD(0)
@@ -311,29 +424,63 @@ class CategoricalMaxAccuracyBettingStrategy(BettingStrategy):
         market: AgentMarket,
     ) -> list[Trade]:
         """We place bet on only one outcome."""
-        outcome_to_bet_on = self.calculate_direction(market, answer)
+        return self.calculate_trades_many([existing_position], [answer], [market])[0]
 
-        # Will be lowered if the amount that we would need to buy would be unprofitable.
-        actual_wanted_position = BettingStrategy.cap_to_profitable_position(
+    def calculate_trades_many(
+        self,
+        existing_positions: Sequence[ExistingPosition | None],
+        answers: Sequence[CategoricalProbabilisticAnswer],
+        markets: Sequence[AgentMarket],
+        total_budget: USD | None = None,
+    ) -> list[list[Trade]]:
+        check_batch_sizes(existing_positions, answers, markets)
+        outcomes_to_bet_on = [
+            self.calculate_direction(market, answer)
+            for market, answer in zip(markets, answers)
+        ]
+        existing_amounts = [
+            get_existing_amount(existing_position, outcome_to_bet_on)
+            for existing_position, outcome_to_bet_on in zip(
+                existing_positions, outcomes_to_bet_on
+            )
+        ]
+        wanted_positions = np.full(len(markets), self.max_position_amount.value)
+        if total_budget is not None:
+            wanted_positions = BettingStrategy.fit_positions_to_budget(
+                wanted_positions,
+                np.array([amount.value for amount in existing_amounts]),
+                total_budget,
+            )
+
+        trades = []
+        for (
             market,
-            (
-                existing_position.amounts_current.get(outcome_to_bet_on, USD(0))
-                if existing_position
-                else USD(0)
-            ),
-            self.max_position_amount,
+            existing_position,
             outcome_to_bet_on,
-        )
-
-        target_position = Position(
-            market_id=market.id,
-            amounts_current={outcome_to_bet_on: actual_wanted_position},
-        )
-        trades = self._build_rebalance_trades_from_positions(
-            existing_position=existing_position,
-            target_position=target_position,
-            market=market,
-        )
+            existing_amount,
+            wanted,
+        ) in zip(
+            markets,
+            existing_positions,
+            outcomes_to_bet_on,
+            existing_amounts,
+            wanted_positions,
+        ):
+            # Will be lowered if the amount that we would need to buy would be unprofitable.
+            actual_wanted_position = BettingStrategy.cap_to_profitable_position(
+                market, existing_amount, USD(wanted), outcome_to_bet_on
+            )
+            target_position = Position(
+                market_id=market.id,
+                amounts_current={outcome_to_bet_on: actual_wanted_position},
+            )
+            trades.append(
+                self._build_rebalance_trades_from_positions(
+                    existing_position=existing_position,
+                    target_position=target_position,
+                    market=market,
+                )
+            )
         return trades
 
     def __repr__(self) -> str:
@@ -412,38 +559,58 @@ class _BinaryKellyBettingStrategy(BettingStrategy):
         answer: CategoricalProbabilisticAnswer,
         override_p_yes: float | None = None,
     ) -> BinaryKellyBet:
-        if not market.is_binary:
-            raise ValueError("This strategy is usable only with binary markets.")
-
         estimated_p_yes = (
             answer.probability_for_market_outcome(direction)
             if not override_p_yes
             else override_p_yes
         )
+        return self.get_kelly_bets_many(
+            markets=[market],
+            directions=[direction],
+            other_directions=[other_direction],
+            estimated_p_yes=[estimated_p_yes],
+            confidences=[answer.confidence],
+        )[0]
 
+    def get_kelly_bets_many(
+        self,
+        markets: Sequence[AgentMarket],
+        directions: Sequence[OutcomeStr],
+        other_directions: Sequence[OutcomeStr],
+        estimated_p_yes: Sequence[float],
+        confidences: Sequence[float],
+    ) -> list[BinaryKellyBet]:
+        for market in markets:
+            if not market.is_binary:
+                raise ValueError("This strategy is usable only with binary markets.")
+
+        max_bets = [
+            market.get_usd_in_token(self.max_position_amount) for market in markets
+        ]
         if self.kelly_type == KellyType.SIMPLE:
-            kelly_bet = get_kelly_bet_simplified(
-                max_bet=market.get_usd_in_token(self.max_position_amount),
-                market_p_yes=market.probability_for_market_outcome(direction),
-                estimated_p_yes=estimated_p_yes,
-                confidence=answer.confidence,
-            )
-        else:
-            direction_to_bet_pool_size = market.get_outcome_token_pool_by_outcome(
-                direction
-            )
-            other_direction_pool_size = market.get_outcome_token_pool_by_outcome(
-                other_direction
-            )
-            kelly_bet = get_kelly_bet_full(
-                yes_outcome_pool_size=direction_to_bet_pool_size,
-                no_outcome_pool_size=other_direction_pool_size,
+            return get_kelly_bets_simplified_many(
+                max_bets=max_bets,
+                market_p_yes=[
+                    market.probability_for_market_outcome(direction)
+                    for market, direction in zip(markets, directions)
+                ],
                 estimated_p_yes=estimated_p_yes,
-                max_bet=market.get_usd_in_token(self.max_position_amount),
-                confidence=answer.confidence,
-                fees=market.fees,
+                confidences=confidences,
             )
-        return kelly_bet
+        return get_kelly_bets_full_many(
+            yes_outcome_pool_sizes=[
+                market.get_outcome_token_pool_by_outcome(direction)
+                for market, direction in zip(markets, directions)
+            ],
+            no_outcome_pool_sizes=[
+                market.get_outcome_token_pool_by_outcome(other_direction)
+                for market, other_direction in zip(markets, other_directions)
+            ],
+            estimated_p_yes=estimated_p_yes,
+            confidences=confidences,
+            max_bets=max_bets,
+            fees=[market.fees for market in markets],
+        )
 
     def calculate_trades(
         self,
@@ -451,49 +618,102 @@ class _BinaryKellyBettingStrategy(BettingStrategy):
         answer: CategoricalProbabilisticAnswer,
         market: AgentMarket,
     ) -> list[Trade]:
-        # We consider the p_yes as the direction with highest probability.
-        direction = CategoricalMaxAccuracyBettingStrategy.calculate_direction(
-            market, answer
-        )
-        # We get the first direction which is != direction.
-        other_direction = [i for i in market.outcomes if i != direction][0]
-        if is_invalid_outcome(other_direction):
-            raise ValueError("Invalid outcome found as opposite direction. Exitting.")
+        return self.calculate_trades_many([existing_position], [answer], [market])[0]
 
-        kelly_bet = self.get_kelly_bet(
-            market=market,
-            direction=direction,
-            other_direction=other_direction,
-            answer=answer,
+    def calculate_trades_many(
+        self,
+        existing_positions: Sequence[ExistingPosition | None],
+        answers: Sequence[CategoricalProbabilisticAnswer],
+        markets: Sequence[AgentMarket],
+        total_budget: USD | None = None,
+    ) -> list[list[Trade]]:
+        check_batch_sizes(existing_positions, answers, markets)
+        # We consider the p_yes as the direction with highest probability.
+        directions = [
+            CategoricalMaxAccuracyBettingStrategy.calculate_direction(market, answer)
+            for market, answer in zip(markets, answers)
+        ]
+        other_directions = []
+        for market, direction in zip(markets, directions):
+            # We get the first direction which is != direction.
+            other_direction = [i for i in market.outcomes if i != direction][0]
+            if is_invalid_outcome(other_direction):
+                raise ValueError(
+                    "Invalid outcome found as opposite direction. Exitting."
+                )
+            other_directions.append(other_direction)
+
+        kelly_bets = self.get_kelly_bets_many(
+            markets=markets,
+            directions=directions,
+            other_directions=other_directions,
+            estimated_p_yes=[
+                answer.probability_for_market_outcome(direction)
+                for answer, direction in zip(answers, directions)
+            ],
+            confidences=[answer.confidence for answer in answers],
         )
 
-        kelly_bet_size = kelly_bet.size
+        kelly_bet_sizes = np.array([bet.size.value for bet in kelly_bets])
         if self.max_price_impact:
-            # Adjust amount
-            max_price_impact_bet_amount = self.calculate_bet_amount_for_price_impact(
-                market,
-                direction=direction,
-                max_price_impact=self.max_price_impact,
+            max_price_impact_bet_amounts = np.array(
+                [
+                    self.calculate_bet_amount_for_price_impact(
+                        market,
+                        direction=direction,
+                        max_price_impact=self.max_price_impact,
+                    ).value
+                    for market, direction in zip(markets, directions)
+                ]
             )
-
             # We just don't want Kelly size to extrapolate price_impact - hence we take the min.
-            kelly_bet_size = min(kelly_bet.size, max_price_impact_bet_amount)
+            kelly_bet_sizes = np.minimum(kelly_bet_sizes, max_price_impact_bet_amounts)
 
-        bet_outcome = direction if kelly_bet.direction else other_direction
+        bet_outcomes = [
+            direction if bet.direction else other_direction
+            for bet, direction, other_direction in zip(
+                kelly_bets, directions, other_directions
+            )
+        ]
+        wanted_positions = np.array(
+            [
+                market.get_token_in_usd(CollateralToken(size)).value
+                for market, size in zip(markets, kelly_bet_sizes)
+            ]
+        )
+        if total_budget is not None:
+            wanted_positions = BettingStrategy.fit_positions_to_budget(
+                wanted_positions,
+                np.array(
+                    [
+                        get_existing_amount(existing_position, bet_outcome).value
+                        for existing_position, bet_outcome in zip(
+                            existing_positions, bet_outcomes
+                        )
+                    ]
+                ),
+                total_budget,
+            )
 
-        amounts = {
-            bet_outcome: (
-                BettingStrategy.cap_to_profitable_bet_amount(
-                    market, market.get_token_in_usd(kelly_bet_size), bet_outcome
+        trades = []
+        for market, existing_position, bet_outcome, wanted in zip(
+            markets, existing_positions, bet_outcomes, wanted_positions
+        ):
+            amounts = {
+                bet_outcome: (
+                    BettingStrategy.cap_to_profitable_bet_amount(
+                        market, USD(wanted), bet_outcome
+                    )
+                    if wanted > 0
+                    else USD(0)
+                ),
+            }
+            target_position = Position(market_id=market.id, amounts_current=amounts)
+            trades.append(
+                self._build_rebalance_trades_from_positions(
+                    existing_position, target_position, market=market
                 )
-                if kelly_bet_size > 0
-                else USD(0)
-            ),
-        }
-        target_position = Position(market_id=market.id, amounts_current=amounts)
-        trades = self._build_rebalance_trades_from_positions(
-            existing_position, target_position, market=market
-        )
+            )
         return trades
 
     @staticmethod
@@ -520,30 +740,101 @@ class _BinaryKellyBettingStrategy(BettingStrategy):
         market: AgentMarket,
         direction: OutcomeStr,
         max_price_impact: float,
+    ) -> CollateralToken:
+        if not market.outcome_token_pool:
+            raise ValueError(
+                "Market outcome_token_pool is None, cannot calculate bet amount"
+            )
+
+        outcome_idx = market.get_outcome_index(direction)
+        pool_balances = [i.as_outcome_wei for i in market.outcome_token_pool.values()]
+
+        if (
+            len(pool_balances) == 2
+            and all(balance > 0 for balance in pool_balances)
+            and not market.fees.trading_fee_rate
+        ):
+            return _BinaryKellyBettingStrategy.calculate_binary_bet_amount_for_price_impact(
+                outcome_idx=outcome_idx,
+                pool_balances=pool_balances,
+                fees=market.fees,
+                max_price_impact=max_price_impact,
+            )
+
+        return _BinaryKellyBettingStrategy.calculate_bet_amount_for_price_impact_numerically(
+            outcome_idx=outcome_idx,
+            pool_balances=pool_balances,
+            fees=market.fees,
+            max_price_impact=max_price_impact,
+        )
+
+    @staticmethod
+    def calculate_binary_bet_amount_for_price_impact(
+        outcome_idx: int,
+        pool_balances: list[OutcomeWei],
+        fees: MarketFees,
+        max_price_impact: float,
+    ) -> CollateralToken:
+        """
+        Solves the price impact of a binary FPMM buy for the bet amount in closed form.
+
+        With `x` and `y` the pool balances of the bought and the other outcome, bet `a` puts `m = (1 - f) * a - c` into the pool
+        (after the proportional fee `f` and absolute fee `c`) and returns `m * (x + y + m) / (y + m)` outcome tokens.
+        Requiring the paid price `a / tokens` to be `P = expected_price * (1 + max_price_impact)` gives a quadratic in `m`:
+
+            (1 - (1 - f) * P) * m^2 + (c + y - (1 - f) * P * (x + y)) * m + c * y = 0
+
+        The larger root is the largest bet that keeps the price impact within the target.
+        """
+        x = pool_balances[outcome_idx].as_outcome_token.value
+        y = pool_balances[1 - outcome_idx].as_outcome_token.value
+        g = 1 - fees.bet_proportion
+        c = fees.absolute
+        target_price = y / (x + y) * (1 + max_price_impact)
+
+        a = 1 - g * target_price
+        if a <= 0:
+            # Price paid never reaches the target (it approaches `1 / (1 - f)` for huge bets),
+            # so the bet is bounded the same way as in the numerical search.
+            return CollateralToken(1000 * (x + y))
+        b = c + y - g * target_price * (x + y)
+        discriminant = b**2 - 4 * a * c * y
+        if discriminant < 0:
+            # Even the cheapest bet has a higher price impact, because of the fees.
+            return CollateralToken(0)
+        # Numerically stable form of the larger root `(-b + sqrt(discriminant)) / (2 * a)`.
+        invested = (
+            (-b + np.sqrt(discriminant)) / (2 * a)
+            if b <= 0
+            else 2 * c * y / (-b - np.sqrt(discriminant))
+        )
+        if invested <= 0:
+            return CollateralToken(0)
+        return CollateralToken(float((invested + c) / g))
+
+    @staticmethod
+    def calculate_bet_amount_for_price_impact_numerically(
+        outcome_idx: int,
+        pool_balances: list[OutcomeWei],
+        fees: MarketFees,
+        max_price_impact: float,
     ) -> CollateralToken:
         def calculate_price_impact_deviation_from_target_price_impact(
             bet_amount_collateral: float,  # Needs to be float because it's used in minimize_scalar internally.
         ) -> float:
-            outcome_idx = market.get_outcome_index(direction)
             price_impact = (
                 _BinaryKellyBettingStrategy.calculate_price_impact_for_bet_amount(
                     outcome_idx=outcome_idx,
                     bet_amount=CollateralToken(bet_amount_collateral),
                     pool_balances=pool_balances,
-                    fees=market.fees,
+                    fees=fees,
                 )
             )
             # We return abs for the algorithm to converge to 0 instead of the min (and possibly negative) value.
             return abs(price_impact - max_price_impact)
 
-        if not market.outcome_token_pool:
-            raise ValueError(
-                "Market outcome_token_pool is None, cannot calculate bet amount"
-            )
-
-        pool_balances = [i.as_outcome_wei for i in market.outcome_token_pool.values()]
         # stay float for compatibility with `minimize_scalar`
-        total_pool_balance = sum([i.value for i in market.outcome_token_pool.values()])
+        total_pool_balance = sum([i.as_outcome_token.value for i in pool_balances])
 
         # The bounds below have been found to work heuristically.
         optimized_bet_amount = minimize_scalar(
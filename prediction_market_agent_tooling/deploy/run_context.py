@@ -0,0 +1,75 @@
+import threading
+import typing as t
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from prediction_market_agent_tooling.gtypes import USD, CollateralToken
+from prediction_market_agent_tooling.markets.agent_market import AgentMarket
+from prediction_market_agent_tooling.markets.data_models import ExistingPosition
+
+
+class AgentRunContext(BaseModel):
+    """
+    Data bulk-loaded once per agent's run for all the fetched markets, so that per-market checks can be answered from memory.
+
+    Everything here is optional: if some data couldn't be prefetched for the given market platform,
+    lookups return None and callers fall back to the per-market queries.
+    """
+
+    # Market id -> whether the agent has bet on the market within its same-market trade interval.
+    recently_bet_on: dict[str, bool] = Field(default_factory=dict)
+    # Market id -> agent's position, None if the agent doesn't hold any.
+    positions: dict[str, ExistingPosition | None] = Field(default_factory=dict)
+    # Market id -> USD value of 1 unit of the market's collateral token.
+    token_usd_rates: dict[str, USD] = Field(default_factory=dict)
+    trade_balance: USD | None = None
+    # Market id -> part of `trade_balance` reserved for the market's trades, until they are recorded or the market is processed.
+    reserved_trade_balances: dict[str, USD] = Field(default_factory=dict)
+
+    # Markets can be processed concurrently, in worker threads.
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def have_bet_on_market(self, market: AgentMarket) -> bool | None:
+        return self.recently_bet_on.get(market.id)
+
+    def has_position(self, market: AgentMarket) -> bool:
+        return market.id in self.positions
+
+    def get_position(self, market: AgentMarket) -> ExistingPosition | None:
+        return self.positions[market.id]
+
+    def get_token_in_usd(self, market: AgentMarket, x: CollateralToken) -> USD | None:
+        rate = self.token_usd_rates.get(market.id)
+        return USD(x.value * rate.value) if rate is not None else None
+
+    def reserve_trade_balance(
+        self, market: AgentMarket, amount: USD, get_trade_balance: t.Callable[[], USD]
+    ) -> USD:
+        """
+        Reserves `amount` of the trade balance for the market, so that concurrently processed markets can't together spend more than the agent has.
+        Returns the balance that was available for the market, nothing is reserved if it's lower than `amount`.
+        """
+        with self._lock:
+            if self.trade_balance is None:
+                self.trade_balance = get_trade_balance()
+            available = self.trade_balance - sum(
+                self.reserved_trade_balances.values(), USD(0)
+            )
+            if available >= amount:
+                self.reserved_trade_balances[market.id] = amount
+            return available
+
+    def release_trade_balance(self, market: AgentMarket) -> None:
+        with self._lock:
+            self.reserved_trade_balances.pop(market.id, None)
+
+    def record_trades(self, market: AgentMarket) -> None:
+        """
+        Trades change the agent's bets, position and balance, so update and invalidate what is affected.
+        The market's reservation is released, because its trades are now reflected in the re-fetched balance.
+        """
+        with self._lock:
+            self.recently_bet_on[market.id] = True
+            self.positions.pop(market.id, None)
+            self.trade_balance = None
+            self.reserved_trade_balances.pop(market.id, None)
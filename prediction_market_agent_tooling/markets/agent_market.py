@@ -141,6 +141,17 @@ class AgentMarket(BaseModel):
     def have_bet_on_market_since(self, keys: APIKeys, since: timedelta) -> bool:
         raise NotImplementedError("Subclasses must implement this method")
 
+    @classmethod
+    def markets_bet_on_since(
+        cls, keys: APIKeys, market_ids: t.Sequence[str], since: timedelta
+    ) -> dict[str, DatetimeUTC]:
+        """
+        Batched variant of `have_bet_on_market_since`, returns the time of the user's last bet for each of `market_ids` the user has bet on since the given time.
+
+        Implement it if the platform allows to fetch user's bets across all markets in a few queries.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
     def get_outcome_token_pool_by_outcome(self, outcome: OutcomeStr) -> OutcomeToken:
         if self.outcome_token_pool is None or not self.outcome_token_pool:
             return OutcomeToken(0)
@@ -428,6 +439,13 @@ class AgentMarket(BaseModel):
     def get_binary_market(id: str) -> "AgentMarket":
         raise NotImplementedError("Subclasses must implement this method")
 
+    @staticmethod
+    def prepare_trading(api_keys: APIKeys) -> None:
+        """
+        Executed once before the agent starts trading, implement it to do one-time setup upfront (e.g. token approvals),
+        instead of before the first trade.
+        """
+
     @staticmethod
     def redeem_winnings(api_keys: APIKeys) -> None:
         """
@@ -560,6 +578,31 @@ class AgentMarket(BaseModel):
         """
         raise NotImplementedError("Subclasses must implement this method")
 
+    @classmethod
+    def get_positions_for_markets(
+        cls,
+        user_id: str,
+        markets: t.Sequence["AgentMarket"],
+    ) -> dict[str, ExistingPosition | None]:
+        """
+        Bulk variant of `get_position`, returns positions keyed by the market id (None if the user doesn't hold any in the market).
+
+        Implement it if the platform allows to fetch positions of many markets in a few queries.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    @classmethod
+    def get_token_in_usd_rates(
+        cls,
+        markets: t.Sequence["AgentMarket"],
+    ) -> dict[str, USD]:
+        """
+        Bulk variant of `get_token_in_usd`, returns USD value of 1 collateral token keyed by the market id.
+
+        Implement it if the rate can be resolved once for many markets (e.g. per collateral token, instead of per market).
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
     def can_be_traded(self) -> bool:
         if self.is_closed() or not self.has_liquidity():
             return False
@@ -1,25 +1,137 @@
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import cache
 
 import tenacity
-from pydantic import BaseModel
-from subgrounds import FieldPath, Subgrounds
+from pydantic import BaseModel, TypeAdapter
+from subgrounds import FieldPath
+from subgrounds.query import DataRequest, InputValue, Selection
 
 from prediction_market_agent_tooling.config import APIKeys
 from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.markets.subgraph_transport import (
+    PooledSubgraphTransport,
+    SubgraphTransport,
+    TransportSubgrounds,
+)
+from prediction_market_agent_tooling.tools.caches.subgraph_query_cache import (
+    SubgraphQueryCache,
+    subgraph_query_hash,
+)
+from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
 from prediction_market_agent_tooling.tools.singleton import SingletonMeta
 
 T = t.TypeVar("T", bound=BaseModel)
 
+MAX_CONCURRENT_TIME_SLICES = 8
+
+
+class LazyModel(t.Generic[T]):
+    """
+    Raw item of a subgraph response, validated into the model only on the first `validate()`,
+    so that items filtered out based on their raw data don't pay for the validation.
+    """
+
+    def __init__(self, raw: dict[str, t.Any], model: t.Type[T]) -> None:
+        self.raw = raw
+        self.model = model
+        self._validated: T | None = None
+
+    def validate(self) -> T:
+        if self._validated is None:
+            self._validated = self.model.model_validate(self.raw)
+        return self._validated
+
+
+@cache
+def _list_adapter(model: t.Type[T]) -> TypeAdapter[list[T]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def fields_for_model(
+    field_path: FieldPath, model: t.Type[BaseModel]
+) -> list[FieldPath]:
+    """
+    Builds the selection of `field_path` with exactly the fields of the given model, recursing into nested models.
+    Field names (or their aliases) of the model need to match the subgraph's schema.
+    """
+    fields: list[FieldPath] = []
+    for name, info in model.model_fields.items():
+        sub_field_path = getattr(field_path, info.alias or name)
+        nested_model = _nested_model(info.annotation)
+        if nested_model is not None:
+            fields.extend(fields_for_model(sub_field_path, nested_model))
+        else:
+            fields.append(sub_field_path)
+    return fields
+
+
+def _nested_model(annotation: t.Any) -> t.Type[BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    # Unwrap optionals and lists of models.
+    for arg in t.get_args(annotation):
+        nested_model = _nested_model(arg)
+        if nested_model is not None:
+            return nested_model
+    return None
+
+
+def split_time_window(
+    start_time: DatetimeUTC, end_time: DatetimeUTC, slice_duration: timedelta
+) -> list[tuple[DatetimeUTC, DatetimeUTC]]:
+    """
+    Splits the window into consecutive slices of `slice_duration` (the last one can be shorter), sharing their boundaries.
+    """
+    if slice_duration <= timedelta(0):
+        raise ValueError(f"Slice duration must be positive, got {slice_duration}.")
+    slices: list[tuple[DatetimeUTC, DatetimeUTC]] = []
+    slice_start = start_time
+    while slice_start < end_time:
+        slice_end = min(
+            DatetimeUTC.from_datetime(slice_start + slice_duration), end_time
+        )
+        slices.append((slice_start, slice_end))
+        slice_start = slice_end
+    return slices or [(start_time, end_time)]
+
+
+def _is_pinned_to_block(selection: Selection) -> bool:
+    """
+    Query at a specific block number or hash always returns the same data, unlike e.g. `block: {number_gte: ...}`.
+    """
+    return any(
+        argument.name == "block"
+        and isinstance(argument.value, InputValue.Object)
+        and bool({"number", "hash"} & argument.value.value.keys())
+        for argument in selection.arguments
+    )
+
 
 class BaseSubgraphHandler(metaclass=SingletonMeta):
-    def __init__(self, timeout: int = 30) -> None:
-        self.sg = Subgrounds(timeout=timeout)
+    # Top-level query field name -> for how long its results can be served from the cache.
+    # Queries not listed here are cached only if they are pinned to a block, and then indefinitely.
+    QUERY_CACHE_TTLS: dict[str, timedelta] = {}
+
+    def __init__(
+        self, timeout: int = 30, transport: SubgraphTransport | None = None
+    ) -> None:
+        # All handlers share the pooled transport by default, so they re-use each other's connections.
+        self.sg = TransportSubgrounds(
+            transport=transport or PooledSubgraphTransport(), timeout=timeout
+        )
         # Patch methods to retry on failure.
-        self.sg.query_json = tenacity.retry(
-            stop=tenacity.stop_after_attempt(5),
-            wait=tenacity.wait_exponential(multiplier=1, max=10),
-            after=lambda x: logger.debug(f"query_json failed, {x.attempt_number=}."),
-        )(self.sg.query_json)
+        self._query_json_uncached: t.Callable[..., list[dict[str, t.Any]]] = (
+            tenacity.retry(
+                stop=tenacity.stop_after_attempt(5),
+                wait=tenacity.wait_exponential(multiplier=1, max=10),
+                after=lambda x: logger.debug(
+                    f"query_json failed, {x.attempt_number=}."
+                ),
+            )(self.sg.query_json)
+        )
+        self.sg.query_json = self._query_json_cached
         self.sg.load_subgraph = tenacity.retry(
             stop=tenacity.stop_after_attempt(5),
             wait=tenacity.wait_exponential(multiplier=1, max=10),
@@ -27,6 +139,54 @@ class BaseSubgraphHandler(metaclass=SingletonMeta):
         )(self.sg.load_subgraph)
 
         self.keys = APIKeys()
+        self.query_cache = SubgraphQueryCache(
+            # Persist the results only if caching is enabled in general, same as `db_cache`.
+            sqlalchemy_db_url=(
+                self.keys.SQLALCHEMY_DB_URL if self.keys.ENABLE_CACHE else None
+            ),
+        )
+
+    def _query_cache_ttl(self, request: DataRequest) -> tuple[bool, timedelta | None]:
+        """
+        Returns whether the request can be cached and for how long (None for indefinitely).
+        Request with multiple top-level queries is cached for the shortest TTL of them.
+        """
+        ttls: list[timedelta] = []
+        for document in request.documents:
+            for selection in document.query.selection:
+                if _is_pinned_to_block(selection):
+                    continue
+                ttl = self.QUERY_CACHE_TTLS.get(selection.fmeta.name)
+                if ttl is None:
+                    return False, None
+                ttls.append(ttl)
+        return True, min(ttls) if ttls else None
+
+    def _query_json_cached(
+        self, fpaths: FieldPath | list[FieldPath], *args: t.Any, **kwargs: t.Any
+    ) -> list[dict[str, t.Any]]:
+        # Non-default pagination strategies aren't part of the rendered query, so don't cache them.
+        if args or kwargs:
+            return self._query_json_uncached(fpaths, *args, **kwargs)
+
+        # Same normalisation as in `Subgrounds.query_json`, so the rendered query is the one that would be sent.
+        auto_selected: list[FieldPath] = []
+        for fpath in fpaths if isinstance(fpaths, list) else [fpaths]:
+            selected = FieldPath._auto_select(fpath)
+            auto_selected.extend(selected if isinstance(selected, list) else [selected])
+        request = self.sg.mk_request(auto_selected)
+        cacheable, ttl = self._query_cache_ttl(request)
+        if not cacheable:
+            return self._query_json_uncached(fpaths)
+
+        query_hash = subgraph_query_hash(
+            [(doc.url, doc.graphql, doc.variables) for doc in request.documents]
+        )
+        result = self.query_cache.get(query_hash)
+        if result is None:
+            result = self._query_json_uncached(fpaths)
+            self.query_cache.set(query_hash, result, ttl)
+        return result
 
     def _parse_items_from_json(
         self, result: list[dict[str, t.Any]]
@@ -44,8 +204,53 @@ class BaseSubgraphHandler(metaclass=SingletonMeta):
                     items.extend(v)
         return items
 
-    def do_query(self, fields: list[FieldPath], pydantic_model: t.Type[T]) -> list[T]:
+    def do_query_raw(self, fields: list[FieldPath]) -> list[dict[str, t.Any]]:
         result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        models = [pydantic_model.model_validate(i) for i in items]
-        return models
+        return self._parse_items_from_json(result)
+
+    def do_query(self, fields: list[FieldPath], pydantic_model: t.Type[T]) -> list[T]:
+        items = self.do_query_raw(fields)
+        # Validating the whole list at once with a cached adapter is faster than validating the items one by one.
+        return _list_adapter(pydantic_model).validate_python(items)
+
+    def do_query_lazy(
+        self, fields: list[FieldPath], pydantic_model: t.Type[T]
+    ) -> list[LazyModel[T]]:
+        """
+        Same as `do_query`, but the items are validated only when accessed, see `LazyModel`.
+        """
+        items = self.do_query_raw(fields)
+        return [LazyModel(item, pydantic_model) for item in items]
+
+    def query_time_sliced(
+        self,
+        fetch: t.Callable[[DatetimeUTC, DatetimeUTC], list[T]],
+        start_time: DatetimeUTC,
+        end_time: DatetimeUTC,
+        slice_duration: timedelta,
+        key: t.Callable[[T], t.Hashable],
+        max_workers: int = MAX_CONCURRENT_TIME_SLICES,
+    ) -> list[T]:
+        """
+        Fetches a long time window as smaller slices concurrently, because a single query over the whole window is paginated serially.
+
+        `fetch(slice_start, slice_end)` has to return the items of the given slice.
+        Results are merged in the chronological order of the slices, and de-duplicated by `key`,
+        as items exactly at the slice boundaries are returned by both neighbouring slices if `fetch` uses inclusive bounds.
+        """
+        slices = split_time_window(start_time, end_time, slice_duration)
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(slices)))
+        ) as executor:
+            slice_results = list(executor.map(lambda s: fetch(*s), slices))
+
+        seen: set[t.Hashable] = set()
+        merged: list[T] = []
+        for items in slice_results:
+            for item in items:
+                item_key = key(item)
+                if item_key in seen:
+                    continue
+                seen.add(item_key)
+                merged.append(item)
+        return merged
@@ -528,6 +528,18 @@ def calculate_marginal_prices(
     return [CollateralToken(mp) for mp in marginal_prices]
 
 
+class OmenMarketId(BaseModel):
+    """
+    Projection of `OmenMarket` with only its id, see `OmenSubgraphHandler.get_omen_markets_projected`.
+    """
+
+    id: HexAddress
+
+    @property
+    def market_maker_contract_address_checksummed(self) -> ChecksumAddress:
+        return Web3.to_checksum_address(self.id)
+
+
 class OmenBetCreator(BaseModel):
     id: HexAddress
 
@@ -1,10 +1,10 @@
 import typing as t
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 import tenacity
 from pydantic import BaseModel
-from tqdm import tqdm
 from web3 import Web3
 from web3.constants import HASH_ZERO
 
@@ -79,6 +79,7 @@ from prediction_market_agent_tooling.tools.tokens.auto_withdraw import (
 )
 from prediction_market_agent_tooling.tools.tokens.main_token import KEEPING_ERC20_TOKEN
 from prediction_market_agent_tooling.tools.tokens.usd import (
+    TokenUSDRateOracle,
     get_token_in_usd,
     get_usd_in_token,
     get_xdai_in_usd,
@@ -93,6 +94,8 @@ from prediction_market_agent_tooling.tools.web3_utils import get_receipt_block_t
 
 # Too low value would work with the Omen contract, but causes CoW orders (when buying the specific market's tokens) to fail.
 OMEN_TINY_BET_AMOUNT = USD(0.01)
+# Long history of bets is fetched concurrently in slices of this duration.
+OMEN_BETS_TIME_SLICE = timedelta(days=30)
 
 
 class OmenAgentMarket(AgentMarket):
@@ -162,12 +165,25 @@ class OmenAgentMarket(AgentMarket):
         return get_usd_in_token(x, self.collateral_token_contract_address_checksummed)
 
     def have_bet_on_market_since(self, keys: APIKeys, since: timedelta) -> bool:
+        return self.id in self.markets_bet_on_since(keys, [self.id], since)
+
+    @classmethod
+    def markets_bet_on_since(
+        cls, keys: APIKeys, market_ids: t.Sequence[str], since: timedelta
+    ) -> dict[str, DatetimeUTC]:
         start_time = utcnow() - since
-        prev_bets = self.get_bets_made_since(
+        prev_bets = cls.get_bets_made_since(
             better_address=keys.bet_from_address, start_time=start_time
         )
-
-        return self.id in [b.market_id for b in prev_bets]
+        market_ids_set = set(market_ids)
+        last_bet_times: dict[str, DatetimeUTC] = {}
+        for bet in prev_bets:
+            if bet.market_id in market_ids_set and (
+                bet.market_id not in last_bet_times
+                or bet.created_time > last_bet_times[bet.market_id]
+            ):
+                last_bet_times[bet.market_id] = bet.created_time
+        return last_bet_times
 
     def liquidate_existing_positions(
         self,
@@ -258,6 +274,24 @@ class OmenAgentMarket(AgentMarket):
 
         return collateral
 
+    def get_sell_values_of_outcome_tokens(
+        self, amounts: dict[OutcomeStr, OutcomeToken]
+    ) -> dict[OutcomeStr, CollateralToken]:
+        """
+        Same as `get_sell_value_of_outcome_token` for many outcomes at once,
+        but computed from the market's already fetched pool balances, without any RPC calls.
+        """
+        pool_balances = [self.outcome_token_pool[o] for o in self.outcomes]
+        return {
+            outcome: calculate_sell_amount_in_collateral(
+                shares_to_sell=amount,
+                outcome_index=self.get_outcome_index(outcome),
+                pool_balances=pool_balances,
+                fees=self.fees,
+            )
+            for outcome, amount in amounts.items()
+        }
+
     def sell_tokens(
         self,
         outcome: OutcomeStr,
@@ -497,6 +531,7 @@ class OmenAgentMarket(AgentMarket):
             market_id=None,
             market_resolved_before=market_resolved_before,
             market_resolved_after=market_resolved_after,
+            time_slice=OMEN_BETS_TIME_SLICE,
         )
         generic_bets = [b.to_generic_resolved_bet() for b in bets]
         return generic_bets
@@ -567,6 +602,8 @@ class OmenAgentMarket(AgentMarket):
                 omen_position
             )
 
+        # Full markets instead of a projection, because positions are built from complete agent markets
+        # (tradeability, pool balances and fees for the sell values, collateral token for the USD rates).
         omen_markets: dict[HexBytes, OmenMarket] = {
             m.condition.id: m
             for m in sgh.get_omen_markets(
@@ -590,11 +627,27 @@ class OmenAgentMarket(AgentMarket):
                 f"Missing condition ids: {missing_conditions_ids}"
             )
 
-        positions = []
-        for condition_id, omen_positions in tqdm(
-            omen_positions_dict.items(), mininterval=3
-        ):
-            market = cls.from_data_model(omen_markets[condition_id])
+        return cls._build_positions(
+            omen_positions_dict,
+            {
+                condition_id: cls.from_data_model(m)
+                for condition_id, m in omen_markets.items()
+            },
+            liquid_only=liquid_only,
+        )
+
+    @classmethod
+    def _build_positions(
+        cls,
+        omen_positions_dict: dict[HexBytes, list[OmenUserPosition]],
+        markets_by_condition_id: dict[HexBytes, "OmenAgentMarket"],
+        liquid_only: bool,
+    ) -> list[ExistingPosition]:
+        markets_amounts_ot: list[
+            tuple[OmenAgentMarket, dict[OutcomeStr, OutcomeToken]]
+        ] = []
+        for condition_id, omen_positions in omen_positions_dict.items():
+            market = markets_by_condition_id[condition_id]
 
             # Skip markets that cannot be traded if `liquid_only`` is True.
             if liquid_only and not market.can_be_traded():
@@ -615,29 +668,158 @@ class OmenAgentMarket(AgentMarket):
 
                 amounts_ot[outecome_str] = omen_position.totalBalance.as_outcome_token
 
-            amounts_current = {
-                k: market.get_token_in_usd(
-                    # If the market is not open for trading anymore, then current value is equal to potential value.
-                    market.get_sell_value_of_outcome_token(k, v)
-                    if market.can_be_traded()
-                    else v.as_token
-                )
-                for k, v in amounts_ot.items()
-            }
-            amounts_potential = {
-                k: market.get_token_in_usd(v.as_token) for k, v in amounts_ot.items()
-            }
+            markets_amounts_ot.append((market, amounts_ot))
+
+        sell_values = cls._get_sell_values_of_positions(markets_amounts_ot)
+        # One rate lookup for all the collateral tokens.
+        token_in_usd_rates = cls.get_token_in_usd_rates(
+            [market for market, _ in markets_amounts_ot]
+        )
+
+        positions = []
+        for (market, amounts_ot), amounts_sell in zip(markets_amounts_ot, sell_values):
+            rate = token_in_usd_rates[market.id]
             positions.append(
                 ExistingPosition(
                     market_id=market.id,
-                    amounts_current=amounts_current,
-                    amounts_potential=amounts_potential,
+                    amounts_current={
+                        k: USD(v.value * rate.value) for k, v in amounts_sell.items()
+                    },
+                    amounts_potential={
+                        k: USD(v.value * rate.value) for k, v in amounts_ot.items()
+                    },
                     amounts_ot=amounts_ot,
                 )
             )
 
         return positions
 
+    @staticmethod
+    def _get_sell_values_of_positions(
+        markets_amounts_ot: list[
+            tuple["OmenAgentMarket", dict[OutcomeStr, OutcomeToken]]
+        ],
+    ) -> list[dict[OutcomeStr, CollateralToken]]:
+        """
+        Current value of the positions, from the pool balances already fetched with the markets.
+        Only markets where that isn't possible (e.g. pool with an empty outcome) fall back to reading the pool on-chain, concurrently.
+        """
+        sell_values: list[dict[OutcomeStr, CollateralToken] | None] = []
+        for market, amounts_ot in markets_amounts_ot:
+            if not market.can_be_traded():
+                # If the market is not open for trading anymore, then current value is equal to potential value.
+                sell_values.append({k: v.as_token for k, v in amounts_ot.items()})
+                continue
+            try:
+                sell_values.append(market.get_sell_values_of_outcome_tokens(amounts_ot))
+            except (ValueError, RuntimeError) as e:
+                logger.warning(
+                    f"Could not compute sell values of {market.url} from its pool balances, reading them on-chain: {e}"
+                )
+                sell_values.append(None)
+
+        def read_on_chain(i: int) -> dict[OutcomeStr, CollateralToken]:
+            market, amounts_ot = markets_amounts_ot[i]
+            return {
+                k: market.get_sell_value_of_outcome_token(k, v)
+                for k, v in amounts_ot.items()
+            }
+
+        fallback = [i for i, values in enumerate(sell_values) if values is None]
+        if fallback:
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                for i, values in zip(fallback, executor.map(read_on_chain, fallback)):
+                    sell_values[i] = values
+
+        return [check_not_none(values) for values in sell_values]
+
+    @classmethod
+    def get_positions_for_markets(
+        cls,
+        user_id: str,
+        markets: t.Sequence[AgentMarket],
+    ) -> dict[str, ExistingPosition | None]:
+        omen_markets: list[OmenAgentMarket] = []
+        for market in markets:
+            if not isinstance(market, OmenAgentMarket):
+                raise ValueError(f"Expected OmenAgentMarket, got {type(market)}.")
+            omen_markets.append(market)
+        if not omen_markets:
+            return {}
+
+        # Same filtering as in `get_position`, but only the positions in the given markets are queried, instead of the whole wallet.
+        liquidatable_amounts = {m.id: m.get_liquidatable_amount() for m in omen_markets}
+        sgh = OmenSubgraphHandler()
+        conditions_positions = sgh.get_positions(
+            condition_id_in=[m.condition.id for m in omen_markets]
+        )
+        omen_positions = (
+            sgh.get_user_positions(
+                better_address=Web3.to_checksum_address(user_id),
+                position_id_in=[p.id for p in conditions_positions],
+                total_balance_bigger_than=min(
+                    liquidatable_amounts.values()
+                ).as_outcome_wei,
+            )
+            if conditions_positions
+            else []
+        )
+        omen_positions_dict: dict[HexBytes, list[OmenUserPosition]] = defaultdict(list)
+        for omen_position in omen_positions:
+            omen_positions_dict[omen_position.position.condition_id].append(
+                omen_position
+            )
+        positions_by_market_id = {
+            p.market_id: p
+            for p in cls._build_positions(
+                omen_positions_dict,
+                {m.condition.id: m for m in omen_markets},
+                liquid_only=True,
+            )
+        }
+
+        result: dict[str, ExistingPosition | None] = {}
+        for market_id, larger_than in liquidatable_amounts.items():
+            position = positions_by_market_id.get(market_id)
+            outcomes = (
+                [o for o, ot in position.amounts_ot.items() if ot > larger_than]
+                if position is not None
+                else []
+            )
+            result[market_id] = (
+                ExistingPosition(
+                    market_id=market_id,
+                    amounts_current={o: position.amounts_current[o] for o in outcomes},
+                    amounts_potential={
+                        o: position.amounts_potential[o] for o in outcomes
+                    },
+                    amounts_ot={o: position.amounts_ot[o] for o in outcomes},
+                )
+                if position is not None and outcomes
+                else None
+            )
+        return result
+
+    @classmethod
+    def get_token_in_usd_rates(
+        cls,
+        markets: t.Sequence[AgentMarket],
+    ) -> dict[str, USD]:
+        omen_markets: list[OmenAgentMarket] = []
+        for market in markets:
+            if not isinstance(market, OmenAgentMarket):
+                raise ValueError(f"Expected OmenAgentMarket, got {type(market)}.")
+            omen_markets.append(market)
+        # Only a handful of collateral tokens is used on Omen, so their rates are resolved together in one batch.
+        token_rates = TokenUSDRateOracle().get_token_to_usd_rates(
+            market.collateral_token_contract_address_checksummed
+            for market in omen_markets
+        )
+        return {
+            market.id: token_rates[market.collateral_token_contract_address_checksummed]
+            for market in omen_markets
+        }
+
     @classmethod
     def get_user_url(cls, keys: APIKeys) -> str:
         return get_omen_user_url(keys.bet_from_address)
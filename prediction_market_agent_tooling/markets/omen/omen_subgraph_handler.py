@@ -1,10 +1,12 @@
 import sys
 import typing as t
+from datetime import timedelta
 
 import requests
 from PIL import Image
 from PIL.Image import Image as ImageType
 from subgrounds import FieldPath
+from typing_extensions import Unpack
 
 from prediction_market_agent_tooling.gtypes import (
     ChecksumAddress,
@@ -15,6 +17,8 @@ from prediction_market_agent_tooling.gtypes import (
 from prediction_market_agent_tooling.markets.agent_market import FilterBy, SortBy
 from prediction_market_agent_tooling.markets.base_subgraph_handler import (
     BaseSubgraphHandler,
+    T,
+    fields_for_model,
 )
 from prediction_market_agent_tooling.markets.omen.data_models import (
     OMEN_BINARY_MARKET_OUTCOMES,
@@ -62,11 +66,45 @@ SAFE_COLLATERAL_TOKENS_ADDRESSES = [
 ]
 
 
+class OmenMarketsFilters(t.TypedDict, total=False):
+    """
+    Filters of the Omen markets queries, see `OmenSubgraphHandler.get_omen_markets`.
+    Omitted `collateral_token_address_in` defaults to `SAFE_COLLATERAL_TOKENS_ADDRESSES`, `include_categorical_markets` to True and `include_scalar_markets` to False.
+    """
+
+    creator: HexAddress | None
+    creator_in: t.Sequence[HexAddress] | None
+    created_after: DatetimeUTC | None
+    question_opened_before: DatetimeUTC | None
+    question_opened_after: DatetimeUTC | None
+    question_finalized_before: DatetimeUTC | None
+    question_finalized_after: DatetimeUTC | None
+    question_with_answers: bool | None
+    question_pending_arbitration: bool | None
+    question_id: HexBytes | None
+    question_id_in: list[HexBytes] | None
+    question_current_answer_before: DatetimeUTC | None
+    question_excluded_titles: set[str] | None
+    resolved: bool | None
+    liquidity_bigger_than: Wei | None
+    condition_id_in: list[HexBytes] | None
+    id_in: list[str] | None
+    collateral_token_address_in: t.Sequence[ChecksumAddress] | None
+    category: str | None
+    include_categorical_markets: bool
+    include_scalar_markets: bool
+
+
 class OmenSubgraphHandler(BaseSubgraphHandler):
     """
     Class responsible for handling interactions with Omen subgraphs (trades, conditionalTokens).
     """
 
+    # Subgraph itself lags behind the chain by a few blocks, so serving markets by id a bit stale doesn't change much.
+    QUERY_CACHE_TTLS = {
+        "fixedProductMarketMaker": timedelta(seconds=30),
+    }
+
     OMEN_TRADES_SUBGRAPH = "https://gateway-arbitrum.network.thegraph.com/api/{graph_api_key}/subgraphs/id/9fUVQpFwzpdWS9bq5WkAnmKbNNcoBwatMR4yZq81pbbz"
 
     CONDITIONAL_TOKENS_SUBGRAPH = "https://gateway-arbitrum.network.thegraph.com/api/{graph_api_key}/subgraphs/id/7s9rGBffUTL8kDZuxvvpuc46v44iuDarbrADBFw5uVp2"
@@ -214,52 +252,43 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
         ] + self._get_fields_for_market_questions(markets_field.question)
 
     def _build_where_statements(
-        self,
-        creator: HexAddress | None,
-        creator_in: t.Sequence[HexAddress] | None,
-        created_after: DatetimeUTC | None,
-        question_opened_before: DatetimeUTC | None,
-        question_opened_after: DatetimeUTC | None,
-        question_finalized_before: DatetimeUTC | None,
-        question_finalized_after: DatetimeUTC | None,
-        question_with_answers: bool | None,
-        question_pending_arbitration: bool | None,
-        question_id: HexBytes | None,
-        question_id_in: list[HexBytes] | None,
-        question_current_answer_before: DatetimeUTC | None,
-        question_excluded_titles: set[str] | None,
-        resolved: bool | None,
-        liquidity_bigger_than: Wei | None,
-        condition_id_in: list[HexBytes] | None,
-        id_in: list[str] | None,
-        collateral_token_address_in: t.Sequence[ChecksumAddress] | None,
-        category: str | None,
-        include_categorical_markets: bool = False,
-        include_scalar_markets: bool = False,
+        self, **filters: Unpack[OmenMarketsFilters]
     ) -> dict[str, t.Any]:
+        creator = filters.get("creator")
+        creator_in = filters.get("creator_in")
+        created_after = filters.get("created_after")
+        liquidity_bigger_than = filters.get("liquidity_bigger_than")
+        condition_id_in = filters.get("condition_id_in")
+        id_in = filters.get("id_in")
+        resolved = filters.get("resolved")
+        category = filters.get("category")
+        collateral_token_address_in = filters.get(
+            "collateral_token_address_in", SAFE_COLLATERAL_TOKENS_ADDRESSES
+        )
+
         where_stms: dict[str, t.Any] = {
             "title_not": None,
             "condition_": {},
         }
-        if not include_categorical_markets:
+        if not filters.get("include_categorical_markets", True):
             where_stms["outcomeSlotCount"] = 2
             where_stms["outcomes"] = OMEN_BINARY_MARKET_OUTCOMES
 
-        if not include_scalar_markets:
+        if not filters.get("include_scalar_markets", False):
             # scalar markets can be identified
             where_stms["outcomes_not"] = None
 
         where_stms["question_"] = self.get_omen_question_filters(
-            question_id=question_id,
-            opened_before=question_opened_before,
-            opened_after=question_opened_after,
-            finalized_before=question_finalized_before,
-            finalized_after=question_finalized_after,
-            with_answers=question_with_answers,
-            pending_arbitration=question_pending_arbitration,
-            current_answer_before=question_current_answer_before,
-            question_id_in=question_id_in,
-            excluded_titles=question_excluded_titles,
+            question_id=filters.get("question_id"),
+            opened_before=filters.get("question_opened_before"),
+            opened_after=filters.get("question_opened_after"),
+            finalized_before=filters.get("question_finalized_before"),
+            finalized_after=filters.get("question_finalized_after"),
+            with_answers=filters.get("question_with_answers"),
+            pending_arbitration=filters.get("question_pending_arbitration"),
+            current_answer_before=filters.get("question_current_answer_before"),
+            question_id_in=filters.get("question_id_in"),
+            excluded_titles=filters.get("question_excluded_titles"),
         )
 
         if collateral_token_address_in:
@@ -391,58 +420,58 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
     def get_omen_markets(
         self,
         limit: t.Optional[int],
-        creator: HexAddress | None = None,
-        creator_in: t.Sequence[HexAddress] | None = None,
-        created_after: DatetimeUTC | None = None,
-        question_opened_before: DatetimeUTC | None = None,
-        question_opened_after: DatetimeUTC | None = None,
-        question_finalized_before: DatetimeUTC | None = None,
-        question_finalized_after: DatetimeUTC | None = None,
-        question_with_answers: bool | None = None,
-        question_pending_arbitration: bool | None = None,
-        question_id: HexBytes | None = None,
-        question_id_in: list[HexBytes] | None = None,
-        question_current_answer_before: DatetimeUTC | None = None,
-        question_excluded_titles: set[str] | None = None,
-        resolved: bool | None = None,
-        liquidity_bigger_than: Wei | None = None,
-        condition_id_in: list[HexBytes] | None = None,
-        id_in: list[str] | None = None,
         sort_by_field: FieldPath | None = None,
         sort_direction: str | None = None,
-        collateral_token_address_in: (
-            t.Sequence[ChecksumAddress] | None
-        ) = SAFE_COLLATERAL_TOKENS_ADDRESSES,
-        category: str | None = None,
-        include_categorical_markets: bool = True,
-        include_scalar_markets: bool = False,
+        **filters: Unpack[OmenMarketsFilters],
     ) -> t.List[OmenMarket]:
         """
         Complete method to fetch Omen  markets with various filters, use `get_omen_markets_simple` for simplified version that uses FilterBy and SortBy enums.
         """
-        where_stms = self._build_where_statements(
-            creator=creator,
-            creator_in=creator_in,
-            created_after=created_after,
-            question_opened_before=question_opened_before,
-            question_opened_after=question_opened_after,
-            question_finalized_before=question_finalized_before,
-            question_finalized_after=question_finalized_after,
-            question_with_answers=question_with_answers,
-            question_pending_arbitration=question_pending_arbitration,
-            question_id=question_id,
-            question_id_in=question_id_in,
-            question_current_answer_before=question_current_answer_before,
-            question_excluded_titles=question_excluded_titles,
-            resolved=resolved,
-            condition_id_in=condition_id_in,
-            id_in=id_in,
-            liquidity_bigger_than=liquidity_bigger_than,
-            collateral_token_address_in=collateral_token_address_in,
-            category=category,
-            include_categorical_markets=include_categorical_markets,
-            include_scalar_markets=include_scalar_markets,
+        markets = self._get_omen_markets_field(
+            limit=limit,
+            sort_by_field=sort_by_field,
+            sort_direction=sort_direction,
+            **filters,
         )
+        fields = self._get_fields_for_markets(markets)
+
+        omen_markets = self.do_query(fields=fields, pydantic_model=OmenMarket)
+        return omen_markets
+
+    def get_omen_markets_projected(
+        self,
+        projection: t.Type[T],
+        limit: t.Optional[int],
+        sort_by_field: FieldPath | None = None,
+        sort_direction: str | None = None,
+        **filters: Unpack[OmenMarketsFilters],
+    ) -> list[T]:
+        """
+        Same as `get_omen_markets`, but only the fields of `projection` are queried and validated.
+        Use a model with a subset of `OmenMarket`'s fields, e.g. `OmenMarketId`, for bulk scans that don't need the full markets.
+        """
+        unknown_fields = set(projection.model_fields) - set(OmenMarket.model_fields)
+        if unknown_fields:
+            raise ValueError(
+                f"{projection.__name__} has fields not available on OmenMarket: {unknown_fields}"
+            )
+        markets = self._get_omen_markets_field(
+            limit=limit,
+            sort_by_field=sort_by_field,
+            sort_direction=sort_direction,
+            **filters,
+        )
+        fields = fields_for_model(markets, projection)
+        return self.do_query(fields=fields, pydantic_model=projection)
+
+    def _get_omen_markets_field(
+        self,
+        limit: t.Optional[int],
+        sort_by_field: FieldPath | None = None,
+        sort_direction: str | None = None,
+        **filters: Unpack[OmenMarketsFilters],
+    ) -> FieldPath:
+        where_stms = self._build_where_statements(**filters)
 
         # These values can not be set to `None`, but they can be omitted.
         optional_params = {}
@@ -458,11 +487,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             where=unwrap_generic_value(where_stms),
             **optional_params,
         )
-
-        fields = self._get_fields_for_markets(markets)
-
-        omen_markets = self.do_query(fields=fields, pydantic_model=OmenMarket)
-        return omen_markets
+        return markets
 
     def get_omen_market_by_market_id(
         self, market_id: HexAddress, block_number: int | None = None
@@ -504,19 +529,24 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
     def get_positions(
         self,
         condition_id: HexBytes | None = None,
+        condition_id_in: list[HexBytes] | None = None,
     ) -> list[OmenPosition]:
         where_stms: dict[str, t.Any] = {}
 
         if condition_id is not None:
             where_stms["conditionIds_contains"] = [condition_id.to_0x_hex()]
 
+        if condition_id_in is not None:
+            # Condition ids are a list field, so match positions containing any of them.
+            where_stms["or"] = [
+                {"conditionIds_contains": [x.to_0x_hex()]} for x in condition_id_in
+            ]
+
         positions = self.conditional_tokens_subgraph.Query.positions(
             first=sys.maxsize, where=unwrap_generic_value(where_stms)
         )
         fields = self._get_fields_for_positions(positions)
-        result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        return [OmenPosition.model_validate(i) for i in items]
+        return self.do_query(fields=fields, pydantic_model=OmenPosition)
 
     def get_user_positions(
         self,
@@ -547,9 +577,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             first=sys.maxsize, where=unwrap_generic_value(where_stms)
         )
         fields = self._get_fields_for_user_positions(positions)
-        result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        return [OmenUserPosition.model_validate(i) for i in items]
+        return self.do_query(fields=fields, pydantic_model=OmenUserPosition)
 
     def get_trades(
         self,
@@ -566,10 +594,40 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
         collateral_amount_more_than: Wei | None = None,
         sort_by_field: FieldPath | None = None,
         sort_direction: str | None = None,
+        time_slice: timedelta | None = None,
     ) -> list[OmenBet]:
+        """
+        If `time_slice` is set, the `start_time`–`end_time` window is fetched as concurrent slices of that duration.
+        Slicing is used only without `limit` and custom sorting, because these can not be applied per slice.
+        """
         if not end_time:
             end_time = utcnow()
 
+        if (
+            time_slice is not None
+            and start_time is not None
+            and limit is None
+            and sort_by_field is None
+        ):
+            return self.query_time_sliced(
+                fetch=lambda slice_start, slice_end: self.get_trades(
+                    better_address=better_address,
+                    start_time=slice_start,
+                    end_time=slice_end,
+                    market_id=market_id,
+                    filter_by_answer_finalized_not_null=filter_by_answer_finalized_not_null,
+                    type_=type_,
+                    market_opening_after=market_opening_after,
+                    market_resolved_before=market_resolved_before,
+                    market_resolved_after=market_resolved_after,
+                    collateral_amount_more_than=collateral_amount_more_than,
+                ),
+                start_time=start_time,
+                end_time=end_time,
+                slice_duration=time_slice,
+                key=lambda bet: bet.id,
+            )
+
         trade = self.trades_subgraph.FpmmTrade
         where_stms = []
         if start_time:
@@ -615,9 +673,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             **optional_params,
         )
         fields = self._get_fields_for_bets(trades)
-        result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        return [OmenBet.model_validate(i) for i in items]
+        return self.do_query(fields=fields, pydantic_model=OmenBet)
 
     def get_bets(
         self,
@@ -630,6 +686,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
         market_resolved_before: DatetimeUTC | None = None,
         market_resolved_after: DatetimeUTC | None = None,
         collateral_amount_more_than: Wei | None = None,
+        time_slice: timedelta | None = None,
     ) -> list[OmenBet]:
         return self.get_trades(
             better_address=better_address,
@@ -642,6 +699,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             market_resolved_before=market_resolved_before,
             market_resolved_after=market_resolved_after,
             collateral_amount_more_than=collateral_amount_more_than,
+            time_slice=time_slice,
         )
 
     def get_resolved_bets(
@@ -652,6 +710,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
         market_id: t.Optional[ChecksumAddress] = None,
         market_resolved_before: DatetimeUTC | None = None,
         market_resolved_after: DatetimeUTC | None = None,
+        time_slice: timedelta | None = None,
     ) -> list[OmenBet]:
         omen_bets = self.get_bets(
             better_address=better_address,
@@ -661,6 +720,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             filter_by_answer_finalized_not_null=True,
             market_resolved_before=market_resolved_before,
             market_resolved_after=market_resolved_after,
+            time_slice=time_slice,
         )
         return [b for b in omen_bets if b.fpmm.is_resolved]
 
@@ -672,6 +732,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
         market_resolved_before: DatetimeUTC | None = None,
         market_resolved_after: DatetimeUTC | None = None,
         market_id: t.Optional[ChecksumAddress] = None,
+        time_slice: timedelta | None = None,
     ) -> list[OmenBet]:
         bets = self.get_resolved_bets(
             better_address=better_address,
@@ -680,6 +741,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             market_id=market_id,
             market_resolved_before=market_resolved_before,
             market_resolved_after=market_resolved_after,
+            time_slice=time_slice,
         )
         return [b for b in bets if b.fpmm.is_resolved_with_valid_answer]
 
@@ -853,9 +915,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             where=unwrap_generic_value(where_stms),
         )
         fields = self._get_fields_for_reality_questions(questions)
-        result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        return [RealityQuestion.model_validate(i) for i in items]
+        return self.do_query(fields=fields, pydantic_model=RealityQuestion)
 
     def get_answers(self, question_id: HexBytes) -> list[RealityAnswer]:
         answer = self.realityeth_subgraph.Answer
@@ -868,9 +928,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             where=unwrap_generic_value(where_stms)
         )
         fields = self._get_fields_for_answers(answers)
-        result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        return [RealityAnswer.model_validate(i) for i in items]
+        return self.do_query(fields=fields, pydantic_model=RealityAnswer)
 
     def get_responses(
         self,
@@ -916,9 +974,7 @@ class OmenSubgraphHandler(BaseSubgraphHandler):
             where=unwrap_generic_value(where_stms),
         )
         fields = self._get_fields_for_responses(responses)
-        result = self.sg.query_json(fields)
-        items = self._parse_items_from_json(result)
-        return [RealityResponse.model_validate(i) for i in items]
+        return self.do_query(fields=fields, pydantic_model=RealityResponse)
 
     def get_markets_from_all_user_positions(
         self, user_positions: list[OmenUserPosition]
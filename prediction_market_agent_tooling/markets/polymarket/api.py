@@ -1,10 +1,13 @@
+import threading
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from enum import Enum
 from urllib.parse import urljoin
 
 import httpx
 import tenacity
+from cachetools import TTLCache
 from httpx import Client
 
 from prediction_market_agent_tooling.gtypes import ChecksumAddress, HexBytes
@@ -28,6 +31,50 @@ from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
 from prediction_market_agent_tooling.tools.httpx_cached_client import HttpxCachedClient
 from prediction_market_agent_tooling.tools.utils import response_to_model
 
+MAX_CONCURRENT_EVENT_FETCHES = 10
+
+
+class GammaEventCache:
+    """
+    Short-lived cache of parsed Gamma events, indexed by the event's id, slug and condition ids of its markets,
+    so that the event fetched by any of the getters is re-used by the others.
+    """
+
+    def __init__(self, maxsize: int = 5_000, ttl: float = 60) -> None:
+        self._lock = threading.Lock()
+        self._cache: TTLCache[str, PolymarketGammaResponseDataItem] = TTLCache(
+            maxsize=maxsize, ttl=ttl
+        )
+
+    def get_by_id(self, event_id: str) -> PolymarketGammaResponseDataItem | None:
+        return self._get(f"id:{event_id}")
+
+    def get_by_slug(self, slug: str) -> PolymarketGammaResponseDataItem | None:
+        return self._get(f"slug:{slug}")
+
+    def get_by_condition_id(
+        self, condition_id: HexBytes
+    ) -> PolymarketGammaResponseDataItem | None:
+        return self._get(f"condition:{condition_id.to_0x_hex()}")
+
+    def put(self, event: PolymarketGammaResponseDataItem) -> None:
+        with self._lock:
+            self._cache[f"id:{event.id}"] = event
+            self._cache[f"slug:{event.slug}"] = event
+            for market in event.markets or []:
+                self._cache[f"condition:{market.conditionId.to_0x_hex()}"] = event
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _get(self, key: str) -> PolymarketGammaResponseDataItem | None:
+        with self._lock:
+            return self._cache.get(key)
+
+
+GAMMA_EVENT_CACHE = GammaEventCache()
+
 
 class PolymarketOrderByEnum(str, Enum):
     LIQUIDITY = "liquidity"
@@ -40,11 +87,22 @@ class PolymarketOrderByEnum(str, Enum):
     stop=tenacity.stop_after_attempt(5),
     wait=tenacity.wait_exponential(multiplier=2, min=2, max=30),
     after=lambda x: logger.debug(
-        f"get_polymarkets_with_pagination failed, {x.attempt_number=}."
+        f"_fetch_gamma_events_page failed, {x.attempt_number=}."
     ),
 )
-def get_polymarkets_with_pagination(
-    limit: int,
+def _fetch_gamma_events_page(
+    client: Client, params: dict[str, t.Any]
+) -> PolymarketGammaResponse:
+    url = urljoin(
+        POLYMARKET_GAMMA_API_BASE_URL,
+        "events/pagination",
+    )
+    r = client.get(url, params=params, timeout=60.0)
+    r.raise_for_status()
+    return response_to_model(r, PolymarketGammaResponse)
+
+
+def iter_polymarkets_pages(
     created_after: t.Optional[DatetimeUTC] = None,
     active: bool | None = None,
     closed: bool | None = None,
@@ -53,18 +111,19 @@ def get_polymarkets_with_pagination(
     archived: bool = False,
     ascending: bool = False,
     order_by: PolymarketOrderByEnum = PolymarketOrderByEnum.VOLUME_24HR,
-) -> list[PolymarketGammaResponseDataItem]:
+    start_offset: int = 0,
+) -> t.Iterator[tuple[int, list[PolymarketGammaResponseDataItem]]]:
     """
+    Yields the filtered markets of each fetched page, together with the offset at which the next page starts,
+    so that the consumer can resume the pagination from there.
+
     Binary markets have len(model.markets) == 1.
     Categorical markets have len(model.markets) > 1
     """
     client = Client()
-    all_markets: list[PolymarketGammaResponseDataItem] = []
-    offset = 0
-    remaining = limit
+    offset = start_offset
 
-    while remaining > 0:
-        # Calculate how many items to request in this batch (up to MARKETS_LIMIT or remaining)
+    while True:
         # By default we fetch many markets because not possible to filter by binary/categorical
         batch_size = MARKETS_LIMIT
 
@@ -79,15 +138,8 @@ def get_polymarkets_with_pagination(
             "offset": offset,
         }
         params_not_none = {k: v for k, v in params.items() if v is not None}
-        url = urljoin(
-            POLYMARKET_GAMMA_API_BASE_URL,
-            "events/pagination",
-        )
 
-        r = client.get(url, params=params_not_none, timeout=60.0)
-        r.raise_for_status()
-
-        market_response = response_to_model(r, PolymarketGammaResponse)
+        market_response = _fetch_gamma_events_page(client, params_not_none)
 
         markets_to_add = []
         for m in market_response.data:
@@ -111,26 +163,46 @@ def get_polymarkets_with_pagination(
 
             markets_to_add.append(m)
 
-        if only_binary:
-            markets_to_add = [
-                market
-                for market in markets_to_add
-                if market.markets and len(market.markets) == 1
-            ]
+        offset += len(market_response.data)
+        yield offset, markets_to_add
 
-        # Add the markets from this batch to our results
-        all_markets.extend(markets_to_add)
+        # Stop if there are no more results
+        if not market_response.pagination.hasMore or len(market_response.data) == 0:
+            break
 
-        # Update counters
-        offset += len(market_response.data)
-        remaining -= len(markets_to_add)
-
-        # Stop if we've reached our limit or there are no more results
-        if (
-            remaining <= 0
-            or not market_response.pagination.hasMore
-            or len(market_response.data) == 0
-        ):
+
+def get_polymarkets_with_pagination(
+    limit: int,
+    created_after: t.Optional[DatetimeUTC] = None,
+    active: bool | None = None,
+    closed: bool | None = None,
+    excluded_questions: set[str] | None = None,
+    only_binary: bool = True,
+    archived: bool = False,
+    ascending: bool = False,
+    order_by: PolymarketOrderByEnum = PolymarketOrderByEnum.VOLUME_24HR,
+) -> list[PolymarketGammaResponseDataItem]:
+    """
+    Binary markets have len(model.markets) == 1.
+    Categorical markets have len(model.markets) > 1
+    """
+    all_markets: list[PolymarketGammaResponseDataItem] = []
+    if limit <= 0:
+        return all_markets
+
+    for _, markets in iter_polymarkets_pages(
+        created_after=created_after,
+        active=active,
+        closed=closed,
+        excluded_questions=excluded_questions,
+        only_binary=only_binary,
+        archived=archived,
+        ascending=ascending,
+        order_by=order_by,
+    ):
+        all_markets.extend(markets)
+        # Stop if we've reached our limit
+        if len(all_markets) >= limit:
             break
 
     # Return exactly the number of items requested (in case we got more due to batch size)
@@ -254,11 +326,15 @@ def get_trades_for_market(
 )
 def get_gamma_event_by_id(event_id: str) -> PolymarketGammaResponseDataItem:
     """Fetch a single Polymarket event by its Gamma API event ID."""
+    if (cached := GAMMA_EVENT_CACHE.get_by_id(event_id)) is not None:
+        return cached
     client: httpx.Client = HttpxCachedClient(ttl=timedelta(seconds=60)).get_client()
     url = urljoin(POLYMARKET_GAMMA_API_BASE_URL, f"events/{event_id}")
     r = client.get(url)
     r.raise_for_status()
-    return response_to_model(r, PolymarketGammaResponseDataItem)
+    event = response_to_model(r, PolymarketGammaResponseDataItem)
+    GAMMA_EVENT_CACHE.put(event)
+    return event
 
 
 @tenacity.retry(
@@ -270,6 +346,8 @@ def get_gamma_event_by_id(event_id: str) -> PolymarketGammaResponseDataItem:
 )
 def get_gamma_event_by_slug(slug: str) -> PolymarketGammaResponseDataItem:
     """Fetch a single Polymarket event by its slug."""
+    if (cached := GAMMA_EVENT_CACHE.get_by_slug(slug)) is not None:
+        return cached
     client: httpx.Client = HttpxCachedClient(ttl=timedelta(seconds=60)).get_client()
     url = urljoin(POLYMARKET_GAMMA_API_BASE_URL, "events")
     r = client.get(url, params={"slug": slug})
@@ -277,7 +355,28 @@ def get_gamma_event_by_slug(slug: str) -> PolymarketGammaResponseDataItem:
     data = r.json()
     if not data:
         raise ValueError(f"No event found for slug '{slug}'")
-    return PolymarketGammaResponseDataItem.model_validate(data[0])
+    event = PolymarketGammaResponseDataItem.model_validate(data[0])
+    GAMMA_EVENT_CACHE.put(event)
+    return event
+
+
+def get_gamma_events_by_slugs(
+    slugs: t.Sequence[str],
+    max_workers: int = MAX_CONCURRENT_EVENT_FETCHES,
+) -> dict[str, PolymarketGammaResponseDataItem]:
+    """
+    Fetch many Polymarket events by their slugs, keyed by the slug.
+    Gamma API returns only one event per slug query, so events not cached yet are fetched concurrently.
+    """
+    unique_slugs = list(dict.fromkeys(slugs))
+    to_fetch = [s for s in unique_slugs if GAMMA_EVENT_CACHE.get_by_slug(s) is None]
+    if to_fetch:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(to_fetch)))
+        ) as executor:
+            # Results are put into the cache by `get_gamma_event_by_slug`.
+            list(executor.map(get_gamma_event_by_slug, to_fetch))
+    return {s: get_gamma_event_by_slug(s) for s in unique_slugs}
 
 
 @tenacity.retry(
@@ -296,6 +395,8 @@ def get_gamma_event_by_condition_id(
     to resolve slug → event, because the Gamma /markets endpoint does not
     support filtering by condition_id.
     """
+    if (cached := GAMMA_EVENT_CACHE.get_by_condition_id(condition_id)) is not None:
+        return cached
     client: httpx.Client = HttpxCachedClient(ttl=timedelta(seconds=60)).get_client()
 
     # CLOB API supports direct lookup by condition_id.
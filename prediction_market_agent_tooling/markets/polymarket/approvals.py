@@ -0,0 +1,172 @@
+import threading
+from datetime import timedelta
+
+from pydantic import SecretStr
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Field, SQLModel, col, select
+
+from prediction_market_agent_tooling.gtypes import ChecksumAddress, Wei
+from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
+from prediction_market_agent_tooling.tools.db.db_manager import (
+    DBManager,
+    EnsureTableManager,
+)
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
+from prediction_market_agent_tooling.tools.utils import check_not_none, utcnow
+
+# Known state older than this is re-checked on-chain, as the allowance could have been spent by another process in the meantime.
+APPROVAL_STATE_TTL = timedelta(hours=6)
+
+
+class PolymarketApprovalState(SQLModel, table=True):
+    __tablename__ = "polymarket_approval_state"
+    __table_args__ = {"extend_existing": True}
+    id: str = Field(primary_key=True)
+    # Stored as a string, because allowance can be up to uint256.
+    usdc_allowance_wei: str
+    ctf_approved: bool
+    updated_at: DatetimeUTC = Field(default_factory=utcnow)
+
+
+_table_manager = EnsureTableManager([PolymarketApprovalState])
+
+
+class ApprovalStateCache(metaclass=SingletonMeta):
+    """
+    Known USDC allowances and CTF approvals of an owner for the Polymarket exchanges, so that the order path doesn't need to
+    query them on-chain before every order.
+
+    Allowances are decreased by the amount of every buy order, and once they drop below the required threshold,
+    the caller has to re-check them on-chain. If a database is given, the state is kept only there instead of in memory,
+    so that it survives restarts of the agent and processes trading from the same wallet see each other's spending.
+    """
+
+    def __init__(self, sqlalchemy_db_url: SecretStr | None = None) -> None:
+        self.sqlalchemy_db_url = sqlalchemy_db_url
+        # Re-entrant, because updates read and write the state under the same lock.
+        self._lock = threading.RLock()
+        self._states: dict[str, PolymarketApprovalState] = {}
+
+    @staticmethod
+    def _key(owner: ChecksumAddress, spender: ChecksumAddress) -> str:
+        return f"{owner}-{spender}"
+
+    def is_approved(
+        self,
+        owner: ChecksumAddress,
+        spender: ChecksumAddress,
+        min_allowance_wei: Wei,
+    ) -> bool:
+        state = self._get(self._key(owner, spender))
+        return (
+            state is not None
+            and state.ctf_approved
+            and int(state.usdc_allowance_wei) >= min_allowance_wei.value
+        )
+
+    def set_approved(
+        self,
+        owner: ChecksumAddress,
+        spender: ChecksumAddress,
+        usdc_allowance_wei: Wei,
+    ) -> None:
+        state = PolymarketApprovalState(
+            id=self._key(owner, spender),
+            usdc_allowance_wei=str(usdc_allowance_wei.value),
+            ctf_approved=True,
+        )
+        self._set(state)
+
+    def record_spent(
+        self,
+        owner: ChecksumAddress,
+        spenders: list[ChecksumAddress],
+        amount_wei: Wei,
+    ) -> None:
+        """
+        Order can be settled by any of the exchanges, so conservatively decrease the allowance of all of them.
+        """
+        for spender in spenders:
+            with self._lock:
+                state = self._get(self._key(owner, spender))
+                if state is None:
+                    continue
+                self._set(
+                    state.model_copy(
+                        update={
+                            "usdc_allowance_wei": str(
+                                max(0, int(state.usdc_allowance_wei) - amount_wei.value)
+                            ),
+                            "updated_at": utcnow(),
+                        }
+                    )
+                )
+
+    def invalidate(self, owner: ChecksumAddress) -> None:
+        if self.sqlalchemy_db_url is None:
+            with self._lock:
+                for key in [k for k in self._states if k.startswith(f"{owner}-")]:
+                    del self._states[key]
+        else:
+            self._delete_owner(owner)
+
+    def _get(self, key: str) -> PolymarketApprovalState | None:
+        if self.sqlalchemy_db_url is None:
+            with self._lock:
+                state = self._states.get(key)
+        else:
+            # Other processes of the same wallet could have spent the allowance, so the shared database is the source of truth.
+            state = self._load(key)
+        if state is None or utcnow() - state.updated_at > APPROVAL_STATE_TTL:
+            return None
+        return state
+
+    def _set(self, state: PolymarketApprovalState) -> None:
+        if self.sqlalchemy_db_url is None:
+            with self._lock:
+                self._states[state.id] = state
+        else:
+            self._persist(state)
+
+    def _db_manager(self) -> DBManager:
+        sqlalchemy_db_url = check_not_none(self.sqlalchemy_db_url)
+        _table_manager.ensure_tables_sync(sqlalchemy_db_url)
+        return DBManager(sqlalchemy_db_url.get_secret_value())
+
+    # Persistent backing is only an optimisation, so database errors don't fail the trading, worst case the approvals are re-checked on-chain.
+
+    def _load(self, key: str) -> PolymarketApprovalState | None:
+        try:
+            with self._db_manager().get_session() as session:
+                state = session.get(PolymarketApprovalState, key)
+                if state is None:
+                    return None
+                state = PolymarketApprovalState.model_validate(state.model_dump())
+                # SQLite doesn't keep the timezone.
+                state.updated_at = DatetimeUTC.from_datetime(state.updated_at)
+                return state
+        except SQLAlchemyError as e:
+            logger.warning(f"Failed to load approval state {key}: {e}")
+            return None
+
+    def _persist(self, state: PolymarketApprovalState) -> None:
+        try:
+            with self._db_manager().get_session() as session:
+                session.merge(state)
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Failed to persist approval state {state.id}: {e}")
+
+    def _delete_owner(self, owner: ChecksumAddress) -> None:
+        try:
+            with self._db_manager().get_session() as session:
+                for state in session.exec(
+                    select(PolymarketApprovalState).where(
+                        col(PolymarketApprovalState.id).startswith(f"{owner}-")
+                    )
+                ):
+                    session.delete(state)
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Failed to delete approval states of {owner}: {e}")
@@ -1,6 +1,10 @@
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 import tenacity
+from cachetools import TTLCache
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import MarketOrderArgs, OrderType
 from py_clob_client.exceptions import PolyApiException
@@ -11,6 +15,9 @@ from prediction_market_agent_tooling.chains import POLYGON_CHAIN_ID
 from prediction_market_agent_tooling.config import APIKeys, RPCConfig
 from prediction_market_agent_tooling.gtypes import USD, HexBytes, OutcomeToken, Wei
 from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.markets.polymarket.approvals import (
+    ApprovalStateCache,
+)
 from prediction_market_agent_tooling.markets.polymarket.constants import (
     CTF_EXCHANGE_POLYMARKET,
     NEG_RISK_ADAPTER,
@@ -19,6 +26,7 @@ from prediction_market_agent_tooling.markets.polymarket.constants import (
     POLYMARKET_TINY_BET_AMOUNT,
 )
 from prediction_market_agent_tooling.markets.polymarket.data_models import (
+    PolymarketGammaResponseDataItem,
     PolymarketSideEnum,
 )
 from prediction_market_agent_tooling.markets.polymarket.polymarket_contracts import (
@@ -26,6 +34,13 @@ from prediction_market_agent_tooling.markets.polymarket.polymarket_contracts imp
     USDCeContract,
 )
 from prediction_market_agent_tooling.tools.cow.cow_order import handle_allowance
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
+
+# Derived API credentials are re-derived after this time.
+CLOB_SESSION_TTL = 60 * 60
+FEE_RATE_TTL = 60 * 60
+MAX_CONCURRENT_FEE_LOOKUPS = 10
+POLYMARKET_EXCHANGES = [CTF_EXCHANGE_POLYMARKET, NEG_RISK_EXCHANGE, NEG_RISK_ADAPTER]
 
 
 class OrderNotFoundError(Exception):
@@ -55,32 +70,139 @@ class PriceResponse(BaseModel):
         return USD(self.price)
 
 
-class ClobManager:
-    def __init__(self, api_keys: APIKeys | None = None) -> None:
-        self.api_keys = api_keys or APIKeys()
-        self.clob_client = ClobClient(
-            POLYMARKET_CLOB_API_URL,
-            key=self.api_keys.bet_from_private_key.get_secret_value(),
-            chain_id=POLYGON_CHAIN_ID,
+def fee_bps_to_rate(in_bps: int) -> float:
+    return (
+        in_bps / 100 / 100
+    )  # convert from bps to percentage and percentage to decimal
+
+
+class ClobSession(metaclass=SingletonMeta):
+    """
+    Process-wide CLOB clients, so that API credentials are derived once per account (and again after `CLOB_SESSION_TTL`),
+    instead of for every `ClobManager` instance.
+
+    Public endpoints (fee rates) are queried by an unauthenticated client with cached results.
+    """
+
+    def __init__(self, host: str = POLYMARKET_CLOB_API_URL) -> None:
+        self.host = host
+        self.public_client = ClobClient(host)
+        self._lock = threading.Lock()
+        self._clients: TTLCache[str, ClobClient] = TTLCache(
+            maxsize=10, ttl=CLOB_SESSION_TTL
         )
-        self.clob_client.set_api_creds(self.clob_client.create_or_derive_api_creds())
-        self.polygon_web3 = RPCConfig().get_polygon_web3()
+        self._token_fee_bps: TTLCache[int, int] = TTLCache(
+            maxsize=10_000, ttl=FEE_RATE_TTL
+        )
+        self._category_fee_bps: TTLCache[tuple[str, ...], int] = TTLCache(
+            maxsize=1_000, ttl=FEE_RATE_TTL
+        )
+
+    def get_client(self, api_keys: APIKeys) -> ClobClient:
+        private_key = api_keys.bet_from_private_key.get_secret_value()
+        # Hold the lock while deriving, so that concurrent callers don't derive the same credentials multiple times.
+        with self._lock:
+            client = self._clients.get(private_key)
+            if client is None:
+                client = ClobClient(
+                    self.host,
+                    key=private_key,
+                    chain_id=POLYGON_CHAIN_ID,
+                )
+                client.set_api_creds(client.create_or_derive_api_creds())
+                self._clients[private_key] = client
+            return client
+
+    def invalidate_client(self, api_keys: APIKeys) -> None:
+        with self._lock:
+            self._clients.pop(api_keys.bet_from_private_key.get_secret_value(), None)
 
     def get_token_fee_bps(self, token_id: int) -> int:
+        with self._lock:
+            if token_id in self._token_fee_bps:
+                return self._token_fee_bps[token_id]
+
         try:
-            in_bps: int = self.clob_client.get_fee_rate_bps(token_id=token_id)
+            in_bps = int(self.public_client.get_fee_rate_bps(token_id=str(token_id)))
         except PolyApiException as e:
-            if "fee rate not found" in str(e.error_msg):
-                return 0
-            raise
+            if "fee rate not found" not in str(e.error_msg):
+                raise
+            in_bps = 0
 
+        with self._lock:
+            self._token_fee_bps[token_id] = in_bps
         return in_bps
 
+    def get_fee_rates_for_gamma_items(
+        self, items: t.Sequence[PolymarketGammaResponseDataItem]
+    ) -> dict[str, float]:
+        """
+        Returns fee rate for each of the gamma items (events), keyed by its id.
+
+        Fee is dependent only on market category, so it's queried just for one token per category (identified by the event's tags),
+        concurrently for the categories that aren't cached yet.
+        """
+        fees_bps: dict[str, int] = {}
+        # Token to query -> gamma ids, category (None if the event doesn't have any tags) to which the result applies.
+        to_fetch: dict[int, tuple[list[str], tuple[str, ...] | None]] = {}
+        category_to_token: dict[tuple[str, ...], int] = {}
+
+        for item in items:
+            if not item.markets:
+                fees_bps[item.id] = 0
+                continue
+            category = tuple(sorted(tag.slug for tag in item.tags)) or None
+            with self._lock:
+                cached_bps = (
+                    self._category_fee_bps.get(category)
+                    if category is not None
+                    else None
+                )
+            if cached_bps is not None:
+                fees_bps[item.id] = cached_bps
+                continue
+
+            token_id = (
+                category_to_token.setdefault(category, item.markets[0].token_ids[0])
+                if category is not None
+                else item.markets[0].token_ids[0]
+            )
+            to_fetch.setdefault(token_id, ([], category))[0].append(item.id)
+
+        if to_fetch:
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_CONCURRENT_FEE_LOOKUPS, len(to_fetch))
+            ) as executor:
+                fetched = dict(
+                    zip(to_fetch, executor.map(self.get_token_fee_bps, list(to_fetch)))
+                )
+            for token_id, (gamma_ids, category) in to_fetch.items():
+                if category is not None:
+                    with self._lock:
+                        self._category_fee_bps[category] = fetched[token_id]
+                for gamma_id in gamma_ids:
+                    fees_bps[gamma_id] = fetched[token_id]
+
+        return {item.id: fee_bps_to_rate(fees_bps[item.id]) for item in items}
+
+
+class ClobManager:
+    def __init__(self, api_keys: APIKeys | None = None) -> None:
+        self.api_keys = api_keys or APIKeys()
+        self.clob_client = ClobSession().get_client(self.api_keys)
+        self.polygon_web3 = RPCConfig().get_polygon_web3()
+        self.approvals = ApprovalStateCache(
+            # Shared with other processes of the same wallet only if caching is enabled in general, same as `db_cache`.
+            sqlalchemy_db_url=(
+                self.api_keys.SQLALCHEMY_DB_URL if self.api_keys.ENABLE_CACHE else None
+            ),
+        )
+
+    def get_token_fee_bps(self, token_id: int) -> int:
+        return ClobSession().get_token_fee_bps(token_id=token_id)
+
     def get_token_fee_rate(self, token_id: int) -> float:
-        in_bps: int = self.get_token_fee_bps(token_id=token_id)
-        return (
-            in_bps / 100 / 100
-        )  # convert from bps to percentage and percentage to decimal
+        return fee_bps_to_rate(self.get_token_fee_bps(token_id=token_id))
 
     def get_token_price(self, token_id: int, side: PolymarketSideEnum) -> USD:
         price_data = self.clob_client.get_price(token_id=token_id, side=side.value)
@@ -109,9 +231,28 @@ class ClobManager:
 
         logger.info(f"Placing market order: {order_args}")
         signed_order = self.clob_client.create_market_order(order_args)
-        resp = self.clob_client.post_order(signed_order, orderType=OrderType.FOK)
+        try:
+            resp = self.clob_client.post_order(signed_order, orderType=OrderType.FOK)
+        except PolyApiException as e:
+            if e.status_code != 401:
+                raise
+            # Credentials could have been revoked or expired on the server side, re-derive them and try once more.
+            logger.warning(f"CLOB rejected credentials, re-deriving them: {e}")
+            ClobSession().invalidate_client(self.api_keys)
+            self.clob_client = ClobSession().get_client(self.api_keys)
+            resp = self.clob_client.post_order(signed_order, orderType=OrderType.FOK)
         result = CreateOrderResult.model_validate(resp)
 
+        if not result.success:
+            # Failure can be caused by insufficient approvals, don't trust the cached state for the next order.
+            self.approvals.invalidate(self.api_keys.bet_from_address)
+        elif side == PolymarketSideEnum.BUY:
+            self.approvals.record_spent(
+                self.api_keys.bet_from_address,
+                POLYMARKET_EXCHANGES,
+                Wei(int(amount_float * 1e6)),
+            )
+
         if result.success and result.transactionsHashes:
             self._verify_order_on_chain(result)
 
@@ -156,12 +297,19 @@ class ClobManager:
     ) -> CreateOrderResult:
         return self._place_market_order(token_id, token_shares, PolymarketSideEnum.SELL)
 
+    def prewarm_approvals(self) -> None:
+        """
+        Checks (and sets, if needed) the approvals upfront, e.g. at the agent's start, so that the first order doesn't have to.
+        """
+        self.__init_approvals()
+
     def __init_approvals(
         self,
         polygon_web3: Web3 | None = None,
     ) -> None:
         # from https://github.com/Polymarket/agents/blob/main/agents/polymarket/polymarket.py#L341
         polygon_web3 = polygon_web3 or self.polygon_web3
+        owner = self.api_keys.bet_from_address
 
         usdc = USDCeContract()
 
@@ -171,13 +319,12 @@ class ClobManager:
         amount_to_check_wei = Wei(int(POLYMARKET_TINY_BET_AMOUNT.value * 1e6))
         ctf = PolymarketConditionalTokenContract()
 
-        for target_address in [
-            CTF_EXCHANGE_POLYMARKET,
-            NEG_RISK_EXCHANGE,
-            NEG_RISK_ADAPTER,
-        ]:
+        for target_address in POLYMARKET_EXCHANGES:
+            if self.approvals.is_approved(owner, target_address, amount_to_check_wei):
+                continue
+
             logger.info(f"Checking allowances for {target_address}")
-            handle_allowance(
+            allowance_wei = handle_allowance(
                 api_keys=self.api_keys,
                 sell_token=usdc.address,
                 for_address=target_address,
@@ -191,3 +338,4 @@ class ClobManager:
                 for_address=target_address,
                 web3=polygon_web3,
             )
+            self.approvals.set_approved(owner, target_address, allowance_wei)
@@ -23,5 +23,6 @@ POLYMARKET_CONDITIONS_SUBGRAPH_URL = "https://gateway.thegraph.com/api/{graph_ap
 # Trading constants
 MARKETS_LIMIT = 100
 TRADES_LIMIT = 100
+POSITIONS_CONDITION_IDS_CHUNK = 50
 POLYMARKET_TINY_BET_AMOUNT = USD(1.0)
 POLYMARKET_MIN_LIQUIDITY_USD = USD(5)
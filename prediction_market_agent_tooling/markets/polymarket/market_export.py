@@ -1,16 +1,32 @@
 import json
+import os
 import typing as t
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 
 from pydantic import BaseModel
 
+from prediction_market_agent_tooling.loggers import logger
 from prediction_market_agent_tooling.markets.agent_market import FilterBy, SortBy
+from prediction_market_agent_tooling.markets.polymarket.api import (
+    iter_polymarkets_pages,
+)
+from prediction_market_agent_tooling.markets.polymarket.data_models import (
+    PolymarketGammaResponseDataItem,
+)
 from prediction_market_agent_tooling.markets.polymarket.polymarket import (
     PolymarketAgentMarket,
 )
+from prediction_market_agent_tooling.markets.polymarket.polymarket_subgraph_handler import (
+    ConditionSubgraphModel,
+)
 from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
+from prediction_market_agent_tooling.tools.hexbytes_custom import HexBytes
 from prediction_market_agent_tooling.tools.utils import utcnow
 
+PARQUET_ROWS_PER_PART = 10_000
+
 
 class MarketExportData(BaseModel):
     source: str = "polymarket"
@@ -103,6 +119,14 @@ def fetch_and_export_markets(
         )
     )
 
+    return _export_gamma_items(gamma_items, condition_dict, trading_fees)
+
+
+def _export_gamma_items(
+    gamma_items: Sequence[PolymarketGammaResponseDataItem],
+    condition_dict: dict[HexBytes, ConditionSubgraphModel],
+    trading_fees: dict[str, float],
+) -> list[MarketExportData]:
     results: list[MarketExportData] = []
     for item in gamma_items:
         agent_markets = PolymarketAgentMarket.from_data_model_all(
@@ -115,3 +139,259 @@ def fetch_and_export_markets(
             results.append(export_market(market, tags=tags))
 
     return results
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class ExportCheckpoint(BaseModel):
+    """
+    Progress of a streaming export, stored next to the output, so that an interrupted export can continue where it stopped.
+    """
+
+    # Gamma API offset from which the export continues.
+    offset: int = 0
+    exported_events: int = 0
+    exported_markets: int = 0
+    finished: bool = False
+    # Size of the NDJSON output at the time of the checkpoint, anything written after it is dropped on resume.
+    ndjson_size: int = 0
+    # Number of complete Parquet part files at the time of the checkpoint.
+    parquet_parts: int = 0
+
+    @staticmethod
+    def path(output_path: str) -> str:
+        return f"{output_path}.checkpoint.json"
+
+    @staticmethod
+    def load(output_path: str) -> "ExportCheckpoint | None":
+        path = ExportCheckpoint.path(output_path)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return ExportCheckpoint.model_validate_json(f.read())
+
+    def save(self, output_path: str) -> None:
+        path = ExportCheckpoint.path(output_path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.model_dump_json())
+        os.replace(tmp_path, path)
+
+
+class _NdjsonWriter:
+    def __init__(self, output_path: str, checkpoint: ExportCheckpoint) -> None:
+        self.file: t.BinaryIO
+        if checkpoint.ndjson_size > 0 and os.path.exists(output_path):
+            self.file = open(output_path, "r+b")
+            # Drop lines written after the last checkpoint, they will be exported again.
+            self.file.truncate(checkpoint.ndjson_size)
+            self.file.seek(checkpoint.ndjson_size)
+        else:
+            self.file = open(output_path, "wb")
+
+    def write(self, rows: list[MarketExportData]) -> None:
+        self.file.write(
+            b"".join(row.model_dump_json().encode() + b"\n" for row in rows)
+        )
+
+    def commit(self, checkpoint: ExportCheckpoint) -> bool:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        checkpoint.ndjson_size = self.file.tell()
+        return True
+
+    def close(self, checkpoint: ExportCheckpoint) -> None:
+        self.commit(checkpoint)
+        self.file.close()
+
+
+class _ParquetWriter:
+    """
+    Writes the output as a directory of Parquet part files, every written batch becomes a row group of the current part.
+    Parquet file is readable only once it's closed, so the progress is committed whenever a part is complete.
+    """
+
+    def __init__(
+        self, output_path: str, checkpoint: ExportCheckpoint, rows_per_part: int
+    ) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow not installed, please install extras `parquet` to export into Parquet."
+            )
+
+        self.pa = pa
+        self.pq = pq
+        self.schema = pa.schema(
+            [
+                ("source", pa.string()),
+                ("market_id", pa.string()),
+                ("condition_id", pa.string()),
+                ("question", pa.string()),
+                ("description", pa.string()),
+                ("outcomes", pa.list_(pa.string())),
+                ("probabilities", pa.map_(pa.string(), pa.float64())),
+                ("volume_usd", pa.float64()),
+                ("liquidity_usd", pa.float64()),
+                ("created_time", pa.timestamp("us", tz="UTC")),
+                ("close_time", pa.timestamp("us", tz="UTC")),
+                ("url", pa.string()),
+                ("resolution", pa.string()),
+                ("is_active", pa.bool_()),
+                ("tags", pa.list_(pa.string())),
+                ("exported_at", pa.timestamp("us", tz="UTC")),
+            ]
+        )
+        self.output_path = output_path
+        self.rows_per_part = rows_per_part
+        self.part_index = checkpoint.parquet_parts
+        self.part_writer: t.Any = None
+        self.part_rows = 0
+        os.makedirs(output_path, exist_ok=True)
+        # Remove incomplete parts of the interrupted export.
+        for name in os.listdir(output_path):
+            if name.startswith("part-") and int(name[5:10]) >= self.part_index:
+                os.remove(os.path.join(output_path, name))
+
+    def write(self, rows: list[MarketExportData]) -> None:
+        if not rows:
+            return
+        if self.part_writer is None:
+            self.part_writer = self.pq.ParquetWriter(
+                os.path.join(self.output_path, f"part-{self.part_index:05d}.parquet"),
+                self.schema,
+            )
+        records = []
+        for row in rows:
+            record = row.model_dump()
+            record["probabilities"] = list(record["probabilities"].items())
+            records.append(record)
+        self.part_writer.write_table(
+            self.pa.Table.from_pylist(records, schema=self.schema)
+        )
+        self.part_rows += len(rows)
+
+    def commit(self, checkpoint: ExportCheckpoint) -> bool:
+        if self.part_writer is None or self.part_rows < self.rows_per_part:
+            return False
+        self._close_part()
+        checkpoint.parquet_parts = self.part_index
+        return True
+
+    def close(self, checkpoint: ExportCheckpoint) -> None:
+        if self.part_writer is not None:
+            self._close_part()
+        checkpoint.parquet_parts = self.part_index
+
+    def _close_part(self) -> None:
+        self.part_writer.close()
+        self.part_writer = None
+        self.part_rows = 0
+        self.part_index += 1
+
+
+def stream_export_markets(
+    output_path: str,
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    limit: int | None = None,
+    filter_by: FilterBy = FilterBy.OPEN,
+    sort_by: SortBy = SortBy.NONE,
+    created_after: t.Optional[DatetimeUTC] = None,
+    resume: bool = True,
+    parquet_rows_per_part: int = PARQUET_ROWS_PER_PART,
+) -> ExportCheckpoint:
+    """
+    Exports markets page by page as Gamma API pagination yields them, so that only a single page is held in memory.
+
+    With `resume`, the export continues from the checkpoint of the previous interrupted run with the same `output_path`.
+    Checkpoints are by the pagination offset, so markets added or re-ordered on Polymarket in between the runs can be missed or duplicated.
+    `limit` is the maximum number of exported events, not markets (same as in `fetch_and_export_markets`).
+    """
+    checkpoint = (
+        ExportCheckpoint.load(output_path) if resume else None
+    ) or ExportCheckpoint()
+    if checkpoint.finished:
+        logger.info(f"Export into {output_path} is already finished.")
+        return checkpoint
+
+    writer: _NdjsonWriter | _ParquetWriter = (
+        _NdjsonWriter(output_path, checkpoint)
+        if export_format == ExportFormat.NDJSON
+        else _ParquetWriter(output_path, checkpoint, parquet_rows_per_part)
+    )
+    closed, order_by, ascending = PolymarketAgentMarket._gamma_query_params(
+        sort_by, filter_by
+    )
+    # Progress of the pages written, but not yet committed into the checkpoint.
+    progress = checkpoint.model_copy()
+
+    for next_offset, gamma_items in iter_polymarkets_pages(
+        closed=closed,
+        order_by=order_by,
+        ascending=ascending,
+        created_after=created_after,
+        start_offset=checkpoint.offset,
+    ):
+        if limit is not None:
+            gamma_items = gamma_items[: limit - progress.exported_events]
+        condition_dict, trading_fees = (
+            PolymarketAgentMarket._fetch_conditions_and_fees(gamma_items)
+            if gamma_items
+            else ({}, {})
+        )
+        rows = _export_gamma_items(gamma_items, condition_dict, trading_fees)
+        writer.write(rows)
+
+        progress.offset = next_offset
+        progress.exported_events += len(gamma_items)
+        progress.exported_markets += len(rows)
+        if writer.commit(progress):
+            progress.save(output_path)
+
+        if limit is not None and progress.exported_events >= limit:
+            break
+
+    writer.close(progress)
+    checkpoint = progress.model_copy(update={"finished": True})
+    checkpoint.save(output_path)
+
+    logger.info(f"Exported {checkpoint.exported_markets} markets into {output_path}.")
+    return checkpoint
+
+
+def stream_export_markets_by_sort_orders(
+    output_dir: str,
+    sort_bys: Sequence[SortBy],
+    export_format: ExportFormat = ExportFormat.NDJSON,
+    limit: int | None = None,
+    filter_by: FilterBy = FilterBy.OPEN,
+    created_after: t.Optional[DatetimeUTC] = None,
+    resume: bool = True,
+    max_workers: int | None = None,
+) -> dict[SortBy, ExportCheckpoint]:
+    """
+    Runs `stream_export_markets` for every sort order in parallel, each into its own `{sort_by}.{export_format}` output in `output_dir`.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers or len(sort_bys)) as executor:
+        futures = {
+            sort_by: executor.submit(
+                stream_export_markets,
+                output_path=os.path.join(
+                    output_dir, f"{sort_by.value}.{export_format.value}"
+                ),
+                export_format=export_format,
+                limit=limit,
+                filter_by=filter_by,
+                sort_by=sort_by,
+                created_after=created_after,
+                resume=resume,
+            )
+            for sort_by in sort_bys
+        }
+        return {sort_by: future.result() for sort_by, future in futures.items()}
@@ -38,18 +38,22 @@ from prediction_market_agent_tooling.markets.data_models import (
 from prediction_market_agent_tooling.markets.polymarket.api import (
     PolymarketOrderByEnum,
     get_gamma_event_by_condition_id,
-    get_gamma_event_by_slug,
+    get_gamma_events_by_slugs,
     get_last_trade_price_from_clob,
     get_polymarkets_with_pagination,
     get_trades_for_market,
     get_user_positions,
     get_user_trades,
 )
-from prediction_market_agent_tooling.markets.polymarket.clob_manager import ClobManager
+from prediction_market_agent_tooling.markets.polymarket.clob_manager import (
+    ClobManager,
+    ClobSession,
+)
 from prediction_market_agent_tooling.markets.polymarket.constants import (
     POLYMARKET_BASE_URL,
     POLYMARKET_MIN_LIQUIDITY_USD,
     POLYMARKET_TINY_BET_AMOUNT,
+    POSITIONS_CONDITION_IDS_CHUNK,
 )
 from prediction_market_agent_tooling.markets.polymarket.data_models import (
     POLYMARKET_FALSE_OUTCOME,
@@ -235,6 +239,10 @@ class PolymarketAgentMarket(AgentMarket):
     def get_usd_in_token(self, x: USD) -> CollateralToken:
         return get_usd_in_token(x, self.collateral_token_address())
 
+    @staticmethod
+    def prepare_trading(api_keys: APIKeys) -> None:
+        ClobManager(api_keys).prewarm_approvals()
+
     @staticmethod
     def get_trade_balance(api_keys: APIKeys, web3: Web3 | None = None) -> USD:
         usdc_balance_wei = USDCeContract().balanceOf(
@@ -278,18 +286,12 @@ class PolymarketAgentMarket(AgentMarket):
         return created_order.transactionsHashes[0].to_0x_hex()
 
     @staticmethod
-    def _fetch_gamma_markets_with_conditions_and_fees(
-        limit: int,
-        sort_by: SortBy = SortBy.NONE,
-        filter_by: FilterBy = FilterBy.OPEN,
-        created_after: t.Optional[DatetimeUTC] = None,
-        excluded_questions: set[str] | None = None,
-        only_binary: bool = True,
-    ) -> tuple[
-        list[PolymarketGammaResponseDataItem],
-        dict[HexBytes, ConditionSubgraphModel],
-        dict[str, float],
-    ]:
+    def _gamma_query_params(
+        sort_by: SortBy, filter_by: FilterBy
+    ) -> tuple[bool | None, PolymarketOrderByEnum, bool]:
+        """
+        Returns `closed`, `order_by` and `ascending` parameters of Gamma API for the given filter and sorting.
+        """
         closed: bool | None
 
         if filter_by == FilterBy.OPEN:
@@ -319,6 +321,45 @@ class PolymarketAgentMarket(AgentMarket):
             case _:
                 raise ValueError(f"Unknown sort_by: {sort_by}")
 
+        return closed, order_by, ascending
+
+    @staticmethod
+    def _fetch_conditions_and_fees(
+        gamma_items: list[PolymarketGammaResponseDataItem],
+    ) -> tuple[dict[HexBytes, ConditionSubgraphModel], dict[str, float]]:
+        all_condition_ids: set[HexBytes] = set()
+        for market in gamma_items:
+            for inner in market.markets or []:
+                all_condition_ids.add(inner.conditionId)
+
+        condition_models = PolymarketSubgraphHandler().get_conditions(
+            condition_ids=list(all_condition_ids)
+        )
+        condition_dict = {c.id: c for c in condition_models}
+
+        gamma_id_to_trading_fee = ClobSession().get_fee_rates_for_gamma_items(
+            gamma_items
+        )
+
+        return condition_dict, gamma_id_to_trading_fee
+
+    @staticmethod
+    def _fetch_gamma_markets_with_conditions_and_fees(
+        limit: int,
+        sort_by: SortBy = SortBy.NONE,
+        filter_by: FilterBy = FilterBy.OPEN,
+        created_after: t.Optional[DatetimeUTC] = None,
+        excluded_questions: set[str] | None = None,
+        only_binary: bool = True,
+    ) -> tuple[
+        list[PolymarketGammaResponseDataItem],
+        dict[HexBytes, ConditionSubgraphModel],
+        dict[str, float],
+    ]:
+        closed, order_by, ascending = PolymarketAgentMarket._gamma_query_params(
+            sort_by, filter_by
+        )
+
         # closed markets also have property active=True, hence ignoring active.
         gamma_items = get_polymarkets_with_pagination(
             limit=limit,
@@ -330,25 +371,9 @@ class PolymarketAgentMarket(AgentMarket):
             only_binary=only_binary,
         )
 
-        all_condition_ids: set[HexBytes] = set()
-        for market in gamma_items:
-            for inner in market.markets or []:
-                all_condition_ids.add(inner.conditionId)
-
-        condition_models = PolymarketSubgraphHandler().get_conditions(
-            condition_ids=list(all_condition_ids)
+        condition_dict, gamma_id_to_trading_fee = (
+            PolymarketAgentMarket._fetch_conditions_and_fees(gamma_items)
         )
-        condition_dict = {c.id: c for c in condition_models}
-
-        gamma_id_to_trading_fee = {
-            # Fee is dependent only on market category, so we can get it just for one market/token.
-            item.id: (
-                ClobManager().get_token_fee_rate(item.markets[0].token_ids[0])
-                if item.markets
-                else 0
-            )
-            for item in gamma_items
-        }
 
         return gamma_items, condition_dict, gamma_id_to_trading_fee
 
@@ -501,6 +526,11 @@ class PolymarketAgentMarket(AgentMarket):
         positions = get_user_positions(
             user_id=Web3.to_checksum_address(user_id), condition_ids=[self.condition_id]
         )
+        return self._build_position(positions)
+
+    def _build_position(
+        self, positions: list[PolymarketPositionResponse]
+    ) -> ExistingPosition | None:
         if not positions:
             return None
 
@@ -523,6 +553,48 @@ class PolymarketAgentMarket(AgentMarket):
             amounts_current=amounts_current,
         )
 
+    @classmethod
+    def get_positions_for_markets(
+        cls,
+        user_id: str,
+        markets: t.Sequence[AgentMarket],
+    ) -> dict[str, ExistingPosition | None]:
+        polymarket_markets: list[PolymarketAgentMarket] = []
+        for market in markets:
+            if not isinstance(market, PolymarketAgentMarket):
+                raise ValueError(f"Expected PolymarketAgentMarket, got {type(market)}.")
+            polymarket_markets.append(market)
+
+        positions_by_condition: dict[str, list[PolymarketPositionResponse]] = (
+            defaultdict(list)
+        )
+        # Condition ids are sent in the query string, so query them in chunks to keep the URL reasonably short.
+        for i in range(0, len(polymarket_markets), POSITIONS_CONDITION_IDS_CHUNK):
+            for p in get_user_positions(
+                user_id=Web3.to_checksum_address(user_id),
+                condition_ids=[
+                    m.condition_id
+                    for m in polymarket_markets[i : i + POSITIONS_CONDITION_IDS_CHUNK]
+                ],
+            ):
+                positions_by_condition[p.conditionId].append(p)
+
+        return {
+            m.id: m._build_position(
+                positions_by_condition.get(m.condition_id.to_0x_hex(), [])
+            )
+            for m in polymarket_markets
+        }
+
+    @classmethod
+    def get_token_in_usd_rates(
+        cls,
+        markets: t.Sequence[AgentMarket],
+    ) -> dict[str, USD]:
+        # All markets use the same collateral token.
+        rate = get_token_in_usd(CollateralToken(1), cls.collateral_token_address())
+        return {m.id: rate for m in markets}
+
     @classmethod
     def get_positions(
         cls,
@@ -555,8 +627,9 @@ class PolymarketAgentMarket(AgentMarket):
 
         # Fetch markets from Gamma API by slug, resolve each condition_id
         markets_by_condition: dict[str, "PolymarketAgentMarket"] = {}
+        events_by_slug = get_gamma_events_by_slugs(list(slug_to_conditions))
         for slug, condition_ids_for_slug in slug_to_conditions.items():
-            event = get_gamma_event_by_slug(slug)
+            event = events_by_slug[slug]
             for cid_str in condition_ids_for_slug:
                 cid_bytes = HexBytes(cid_str)
                 market = cls.from_data_model(
@@ -659,14 +732,9 @@ class PolymarketAgentMarket(AgentMarket):
         model = get_gamma_event_by_condition_id(cid)
         conditions = PolymarketSubgraphHandler().get_conditions([cid])
         condition_dict = {c.id: c for c in conditions}
-        trading_fee_rate = (
-            ClobManager().get_token_fee_rate(
-                # Fee is dependent only on market category, so we can get it just for one market/token.
-                model.markets[0].token_ids[0]
-            )
-            if model.markets
-            else 0
-        )
+        trading_fee_rate = ClobSession().get_fee_rates_for_gamma_items([model])[
+            model.id
+        ]
         market = PolymarketAgentMarket.from_data_model(
             model,
             condition_dict,
@@ -868,6 +936,28 @@ class PolymarketAgentMarket(AgentMarket):
         cutoff = utcnow() - since
         return any(t.timestamp >= cutoff for t in trades)
 
+    @classmethod
+    def markets_bet_on_since(
+        cls, keys: APIKeys, market_ids: t.Sequence[str], since: timedelta
+    ) -> dict[str, DatetimeUTC]:
+        # Single paginated query over the user's trade history, instead of one query per market.
+        trades = get_user_trades(
+            user_address=keys.bet_from_address, after=utcnow() - since
+        )
+        last_trade_times: dict[str, DatetimeUTC] = {}
+        for trade in trades:
+            condition_id = trade.conditionId.to_0x_hex()
+            if (
+                condition_id not in last_trade_times
+                or trade.timestamp > last_trade_times[condition_id]
+            ):
+                last_trade_times[condition_id] = trade.timestamp
+        return {
+            i: last_trade_times[i.lower()]
+            for i in market_ids
+            if i.lower() in last_trade_times
+        }
+
     def get_most_recent_trade_datetime(self, user_id: str) -> DatetimeUTC | None:
         trades = get_trades_for_market(
             market=self.condition_id,
@@ -0,0 +1,297 @@
+"""
+Local simulation of swaps in Swapr's concentrated-liquidity (Algebra, Uniswap v3 style) pools.
+
+The math is a port of Uniswap v3's `TickMath`, `SqrtPriceMath` and `SwapMath` libraries in integer arithmetic,
+so that the quotes match the on-chain quoter up to the pool's state.
+"""
+
+from bisect import bisect_right
+
+from cachetools import TTLCache, cached
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import ChecksumAddress, Wei
+from prediction_market_agent_tooling.markets.seer.seer_subgraph_handler import (
+    SeerSubgraphHandler,
+)
+from prediction_market_agent_tooling.markets.seer.subgraph_data_models import (
+    SwaprPool,
+    SwaprTick,
+)
+
+Q96 = 1 << 96
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+# Fees are in hundredths of a bip.
+FEE_DENOMINATOR = 1_000_000
+
+_TICK_RATIO_FACTORS = [
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+]
+
+
+def _div_rounding_up(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    return _div_rounding_up(a * b, denominator)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """
+    Returns sqrt(1.0001^tick) as a Q64.96 number.
+    """
+    if not MIN_TICK <= tick <= MAX_TICK:
+        raise ValueError(f"Tick {tick} is out of bounds.")
+    abs_tick = abs(tick)
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if abs_tick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    for bit, factor in _TICK_RATIO_FACTORS:
+        if abs_tick & bit:
+            ratio = (ratio * factor) >> 128
+    if tick > 0:
+        ratio = ((1 << 256) - 1) // ratio
+    # Round up to Q64.96, so that `get_tick_at_sqrt_ratio` is consistent with this function.
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_amount0_delta(
+    sqrt_ratio_a: int, sqrt_ratio_b: int, liquidity: int, round_up: bool
+) -> int:
+    sqrt_ratio_a, sqrt_ratio_b = sorted((sqrt_ratio_a, sqrt_ratio_b))
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b - sqrt_ratio_a
+    if round_up:
+        return _div_rounding_up(
+            _mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b), sqrt_ratio_a
+        )
+    return numerator1 * numerator2 // sqrt_ratio_b // sqrt_ratio_a
+
+
+def get_amount1_delta(
+    sqrt_ratio_a: int, sqrt_ratio_b: int, liquidity: int, round_up: bool
+) -> int:
+    sqrt_ratio_a, sqrt_ratio_b = sorted((sqrt_ratio_a, sqrt_ratio_b))
+    if round_up:
+        return _mul_div_rounding_up(liquidity, sqrt_ratio_b - sqrt_ratio_a, Q96)
+    return liquidity * (sqrt_ratio_b - sqrt_ratio_a) // Q96
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price: int, liquidity: int, amount_in: int, zero_for_one: bool
+) -> int:
+    if zero_for_one:
+        # Price goes down, rounded up so that it doesn't pass the target price.
+        numerator1 = liquidity << 96
+        return _mul_div_rounding_up(
+            numerator1, sqrt_price, numerator1 + amount_in * sqrt_price
+        )
+    # Price goes up, rounded down.
+    return sqrt_price + (amount_in << 96) // liquidity
+
+
+def compute_swap_step(
+    sqrt_price_current: int,
+    sqrt_price_target: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee: int,
+) -> tuple[int, int, int, int]:
+    """
+    Swaps as much of the exact input amount as possible within one price range.
+    Returns the next sqrt price, amount in (without fee), amount out and the fee amount.
+    """
+    zero_for_one = sqrt_price_current >= sqrt_price_target
+    amount_remaining_less_fee = (
+        amount_remaining * (FEE_DENOMINATOR - fee) // FEE_DENOMINATOR
+    )
+    amount_in = (
+        get_amount0_delta(sqrt_price_target, sqrt_price_current, liquidity, True)
+        if zero_for_one
+        else get_amount1_delta(sqrt_price_current, sqrt_price_target, liquidity, True)
+    )
+    if amount_remaining_less_fee >= amount_in:
+        sqrt_price_next = sqrt_price_target
+    else:
+        sqrt_price_next = get_next_sqrt_price_from_input(
+            sqrt_price_current, liquidity, amount_remaining_less_fee, zero_for_one
+        )
+
+    reached_target = sqrt_price_next == sqrt_price_target
+    if zero_for_one:
+        if not reached_target:
+            amount_in = get_amount0_delta(
+                sqrt_price_next, sqrt_price_current, liquidity, True
+            )
+        amount_out = get_amount1_delta(
+            sqrt_price_next, sqrt_price_current, liquidity, False
+        )
+    else:
+        if not reached_target:
+            amount_in = get_amount1_delta(
+                sqrt_price_current, sqrt_price_next, liquidity, True
+            )
+        amount_out = get_amount0_delta(
+            sqrt_price_current, sqrt_price_next, liquidity, False
+        )
+
+    fee_amount = (
+        _mul_div_rounding_up(amount_in, fee, FEE_DENOMINATOR - fee)
+        if reached_target
+        else amount_remaining - amount_in
+    )
+    return sqrt_price_next, amount_in, amount_out, fee_amount
+
+
+class ConcentratedLiquidityPool:
+    """
+    Snapshot of a pool's state (price, active liquidity, fee and initialized ticks), answering quotes locally.
+    """
+
+    def __init__(
+        self,
+        token0: ChecksumAddress,
+        token1: ChecksumAddress,
+        sqrt_price_x96: int,
+        liquidity: int,
+        tick: int,
+        fee: int,
+        ticks: list[SwaprTick],
+    ) -> None:
+        self.token0 = token0
+        self.token1 = token1
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.liquidity = liquidity
+        self.tick = tick
+        self.fee = fee
+        sorted_ticks = sorted(ticks, key=lambda t: t.tickIdx)
+        self._tick_indexes = [t.tickIdx for t in sorted_ticks]
+        self._liquidity_nets = [t.liquidityNet for t in sorted_ticks]
+
+    @staticmethod
+    def from_subgraph(
+        pool: SwaprPool, ticks: list[SwaprTick]
+    ) -> "ConcentratedLiquidityPool":
+        if pool.tick is None or pool.fee is None:
+            raise ValueError(f"Pool {pool.id.to_0x_hex()} is missing tick or fee.")
+        return ConcentratedLiquidityPool(
+            token0=pool.token0.address,
+            token1=pool.token1.address,
+            sqrt_price_x96=pool.sqrtPrice,
+            liquidity=pool.liquidity,
+            tick=pool.tick,
+            fee=pool.fee,
+            ticks=ticks,
+        )
+
+    def _is_zero_for_one(self, token_in: ChecksumAddress) -> bool:
+        if token_in == self.token0:
+            return True
+        elif token_in == self.token1:
+            return False
+        raise ValueError(f"Token {token_in} is not traded in this pool.")
+
+    def spot_price(self, token_in: ChecksumAddress) -> float:
+        """
+        Marginal amount of the other token received per unit of `token_in`, before the fee.
+        """
+        price_of_token0 = (self.sqrt_price_x96 / Q96) ** 2
+        return (
+            price_of_token0 if self._is_zero_for_one(token_in) else 1 / price_of_token0
+        )
+
+    def quote_exact_input(self, token_in: ChecksumAddress, amount_in: Wei) -> Wei:
+        """
+        Amount of the other token received for `amount_in` of `token_in`, same as `quoteExactInputSingle` of the quoter.
+        Input that the pool's liquidity can't absorb is left unswapped.
+        """
+        zero_for_one = self._is_zero_for_one(token_in)
+        sqrt_price = self.sqrt_price_x96
+        liquidity = self.liquidity
+        tick = self.tick
+        amount_remaining: int = amount_in.value
+        amount_out = 0
+
+        while amount_remaining > 0:
+            next_tick_position = (
+                # Highest initialized tick at or below the current one.
+                bisect_right(self._tick_indexes, tick) - 1
+                if zero_for_one
+                # Lowest initialized tick above the current one.
+                else bisect_right(self._tick_indexes, tick)
+            )
+            has_next_tick = 0 <= next_tick_position < len(self._tick_indexes)
+            if has_next_tick:
+                next_tick = self._tick_indexes[next_tick_position]
+                sqrt_price_target = get_sqrt_ratio_at_tick(next_tick)
+            else:
+                sqrt_price_target = (
+                    MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+                )
+            sqrt_price, step_in, step_out, step_fee = compute_swap_step(
+                sqrt_price, sqrt_price_target, liquidity, amount_remaining, self.fee
+            )
+            amount_remaining -= step_in + step_fee
+            amount_out += step_out
+
+            if sqrt_price != sqrt_price_target:
+                # Whole input was swapped within the current range.
+                break
+            if not has_next_tick:
+                # Reached the price limit, there is no more liquidity.
+                break
+            liquidity_net = self._liquidity_nets[next_tick_position]
+            liquidity += -liquidity_net if zero_for_one else liquidity_net
+            tick = next_tick - 1 if zero_for_one else next_tick
+
+        return Wei(amount_out)
+
+    def price_impact(self, token_in: ChecksumAddress, amount_in: Wei) -> float:
+        """
+        Relative difference between the spot price and the effective price of swapping `amount_in`, fee included.
+        """
+        if amount_in.value <= 0:
+            return 0.0
+        amount_out = self.quote_exact_input(token_in, amount_in)
+        effective_price = amount_out.value / amount_in.value
+        return 1 - effective_price / self.spot_price(token_in)
+
+
+@cached(TTLCache(maxsize=500, ttl=30))
+def get_pool_simulator(
+    token_a: ChecksumAddress, token_b: ChecksumAddress
+) -> ConcentratedLiquidityPool | None:
+    """
+    Loads the pool trading the two tokens once, so that repeated quotes don't need to query the chain.
+    """
+    subgraph = SeerSubgraphHandler()
+    pool = subgraph.get_pool_by_token(token_address=token_a, collateral_address=token_b)
+    if pool is None:
+        return None
+    return ConcentratedLiquidityPool.from_subgraph(
+        pool, subgraph.get_ticks_for_pool(Web3.to_checksum_address(pool.id.to_0x_hex()))
+    )
@@ -17,6 +17,9 @@ from prediction_market_agent_tooling.markets.seer.data_models import SeerMarket
 from prediction_market_agent_tooling.markets.seer.exceptions import (
     PriceCalculationError,
 )
+from prediction_market_agent_tooling.markets.seer.pool_simulator import (
+    get_pool_simulator,
+)
 from prediction_market_agent_tooling.markets.seer.seer_contracts import (
     QuoteExactInputSingleParams,
     SwaprQuoterContract,
@@ -265,6 +268,18 @@ class PriceManager:
         input_amount: Wei,
         web3: Web3 | None = None,
     ) -> Wei:  # Not marked as OutcomeWei, but this works for both buying and selling.
+        # Simulate the swap locally on the pool's state from the subgraph, so repeated quotes don't need RPC calls.
+        # Explicitly given web3 (e.g. a local chain) might not match the subgraph, so the quoter is used then.
+        if web3 is None:
+            try:
+                pool = get_pool_simulator(input_token, output_token)
+                if pool is not None:
+                    return pool.quote_exact_input(input_token, input_amount)
+            except Exception as e:
+                logger.warning(
+                    f"Could not simulate swap of {input_token} to {output_token}, using the quoter contract: {e}"
+                )
+
         quoter = SwaprQuoterContract()
         amount_out, _ = quoter.quote_exact_input_single(
             QuoteExactInputSingleParams(
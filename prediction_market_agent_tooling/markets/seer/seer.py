@@ -1,6 +1,6 @@
-import asyncio
 import typing as t
 from datetime import timedelta
+from functools import partial
 
 import cachetools
 from cowdao_cowpy.common.api.errors import UnexpectedResponseError
@@ -74,6 +74,10 @@ from prediction_market_agent_tooling.markets.seer.subgraph_data_models import (
 from prediction_market_agent_tooling.markets.seer.swap_pool_handler import (
     SwapPoolHandler,
 )
+from prediction_market_agent_tooling.markets.seer.swap_router import (
+    SeerSwapRouter,
+    SwapVenue,
+)
 from prediction_market_agent_tooling.tools.contract import (
     ContractERC20OnGnosisChain,
     init_collateral_token_contract,
@@ -89,6 +93,7 @@ from prediction_market_agent_tooling.tools.cow.cow_order import (
     wait_for_order_completion,
 )
 from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
+from prediction_market_agent_tooling.tools.parallelism import BackgroundEventLoop
 from prediction_market_agent_tooling.tools.tokens.auto_deposit import (
     auto_deposit_collateral_token,
 )
@@ -99,7 +104,11 @@ from prediction_market_agent_tooling.tools.tokens.usd import (
     get_token_in_usd,
     get_usd_in_token,
 )
-from prediction_market_agent_tooling.tools.utils import check_not_none, utcnow
+from prediction_market_agent_tooling.tools.utils import (
+    check_not_none,
+    should_not_happen,
+    utcnow,
+)
 
 # We place a larger bet amount by default than Omen so that cow presents valid quotes.
 SEER_TINY_BET_AMOUNT = USD(0.1)
@@ -371,17 +380,56 @@ class SeerAgentMarket(AgentMarket):
 
     def have_bet_on_market_since(self, keys: APIKeys, since: timedelta) -> bool:
         """Check if the user has placed a bet on this market since a specific time using Cow API."""
-        # Cow endpoint doesn't allow us to filter by time.
-        start_time = utcnow() - since
-        prev_orders = get_orders_by_owner(owner=keys.bet_from_address)
-        for order in prev_orders:
-            if order.creationDate >= start_time and {
+        return bool(
+            self._last_token_trade_times_since(keys, since).keys()
+            & set(self.wrapped_tokens)
+        )
+
+    @classmethod
+    def markets_bet_on_since(
+        cls, keys: APIKeys, market_ids: t.Sequence[str], since: timedelta
+    ) -> dict[str, DatetimeUTC]:
+        last_token_trade_times = cls._last_token_trade_times_since(keys, since)
+        if not last_token_trade_times or not market_ids:
+            return {}
+
+        markets = SeerSubgraphHandler().get_markets_by_ids(
+            [HexBytes(i) for i in market_ids]
+        )
+        last_bet_times: dict[str, DatetimeUTC] = {}
+        for m in markets:
+            trade_times = [
+                last_token_trade_times[token]
+                for token in (Web3.to_checksum_address(i) for i in m.wrapped_tokens)
+                if token in last_token_trade_times
+            ]
+            if trade_times:
+                last_bet_times[m.id.to_0x_hex()] = max(trade_times)
+        return {
+            i: last_bet_times[i.lower()]
+            for i in market_ids
+            if i.lower() in last_bet_times
+        }
+
+    @staticmethod
+    def _last_token_trade_times_since(
+        keys: APIKeys, since: timedelta
+    ) -> dict[ChecksumAddress, DatetimeUTC]:
+        # Cow endpoint doesn't allow us to filter by time, but orders are sorted from the newest, so the pagination stops at older ones.
+        last_trade_times: dict[ChecksumAddress, DatetimeUTC] = {}
+        for order in get_orders_by_owner(
+            owner=keys.bet_from_address, created_after=utcnow() - since
+        ):
+            for token in (
                 Web3.to_checksum_address(order.sellToken),
                 Web3.to_checksum_address(order.buyToken),
-            }.intersection(set(self.wrapped_tokens)):
-                return True
-
-        return False
+            ):
+                if (
+                    token not in last_trade_times
+                    or order.creationDate > last_trade_times[token]
+                ):
+                    last_trade_times[token] = order.creationDate
+        return last_trade_times
 
     def ensure_min_native_balance(
         self,
@@ -534,13 +582,18 @@ class SeerAgentMarket(AgentMarket):
     ) -> t.Sequence["SeerAgentMarket"]:
         seer_subgraph = SeerSubgraphHandler()
 
-        markets = seer_subgraph.get_markets(
+        lazy_markets = seer_subgraph.get_markets_lazy(
             limit=limit,
             sort_by=sort_by,
             filter_by=filter_by,
             question_type=question_type,
             conditional_filter_type=conditional_filter_type,
         )
+        if filter_by == FilterBy.OPEN:
+            # Markets without any outcome tokens can not have liquidity, so drop them based on the raw data,
+            # before they are validated and priced (the subgraph's own filter is sometimes unreliable).
+            lazy_markets = [m for m in lazy_markets if int(m.raw["outcomesSupply"]) > 0]
+        markets = [m.validate() for m in lazy_markets]
 
         # We exclude the None values below because `from_data_model_with_subgraph` can return None, which
         # represents an invalid market.
@@ -640,7 +693,8 @@ class SeerAgentMarket(AgentMarket):
         web3: Web3 | None,
     ) -> str:
         """
-        Helper method to swap tokens with a fallback to direct pool swapping if the order times out.
+        Helper method to swap tokens at the venue with the best expected output (see `SeerSwapRouter`),
+        with a fallback to the other venue if the swap fails.
 
         Args:
             sell_token: Address of the token to sell
@@ -652,63 +706,127 @@ class SeerAgentMarket(AgentMarket):
         Returns:
             Transaction hash of the successful swap
         """
-        slippage_tolerance = get_slippage_tolerance_per_token(sell_token, buy_token)
-        try:
-            _, order = swap_tokens_waiting(
-                amount_wei=amount_wei,
+        router = SeerSwapRouter()
+        best_quote = router.choose(
+            router.get_quotes(
                 sell_token=sell_token,
                 buy_token=buy_token,
-                api_keys=api_keys,
+                amount_wei=amount_wei,
                 web3=web3,
-                wait_order_complete=False,
-                timeout=timedelta(minutes=2),
-                slippage_tolerance=slippage_tolerance,
-            )
-            order_metadata = asyncio.run(wait_for_order_completion(order=order))
-            logger.info(
-                f"Swapped {sell_token} for {buy_token}. Order details {order_metadata}"
             )
-            trades = get_trades_by_order_uid(HexBytes(order_metadata.uid.root))
-            if len(trades) != 1:
-                raise ValueError(
-                    f"Expected exactly 1 trade from {order_metadata=}, but got {len(trades)=}."
+        )
+        first_venue = best_quote.venue if best_quote is not None else SwapVenue.COW
+        venues = [first_venue] + [v for v in SwapVenue if v != first_venue]
+        swap_at_venue = {
+            SwapVenue.COW: self._swap_tokens_via_cow,
+            SwapVenue.SWAPR: self._swap_tokens_via_pool,
+        }
+
+        for venue, fallback_venue in zip(venues, venues[1:] + [None]):
+            try:
+                return router.execute(
+                    venue,
+                    partial(
+                        swap_at_venue[venue],
+                        sell_token=sell_token,
+                        buy_token=buy_token,
+                        amount_wei=amount_wei,
+                        api_keys=api_keys,
+                        web3=web3,
+                    ),
+                )
+            except Exception as e:
+                if fallback_venue is None or not self._can_fall_back_to(
+                    fallback_venue, failed_venue=venue, error=e
+                ):
+                    raise
+                logger.info(
+                    f"Exception occured when swapping tokens via {venue.value}, doing swap via {fallback_venue.value}. {e}"
                 )
-            cow_tx_hash = trades[0].txHash
-            logger.info(f"TxHash is {cow_tx_hash=} for {order_metadata.uid.root=}.")
-            return cow_tx_hash.to_0x_hex()
-
-        except (
-            UnexpectedResponseError,
-            TimeoutError,
-            NoLiquidityAvailableOnCowException,
-            OrderStatusError,
-        ) as e:
+
+        should_not_happen("Every venue either returns or raises.")
+
+    def _can_fall_back_to(
+        self, fallback_venue: SwapVenue, failed_venue: SwapVenue, error: Exception
+    ) -> bool:
+        if failed_venue == SwapVenue.COW:
+            if not isinstance(
+                error,
+                (
+                    UnexpectedResponseError,
+                    TimeoutError,
+                    NoLiquidityAvailableOnCowException,
+                    OrderStatusError,
+                ),
+            ):
+                return False
             # We don't retry if not enough balance.
-            if "InsufficientBalance" in str(e):
-                raise e
             # Note that we don't need to cancel the order because we are setting
             # timeout and valid_to in the order, thus the order simply expires.
-            logger.info(
-                f"Exception occured when swapping tokens via Cowswap, doing swap via pools. {e}"
-            )
+            if "InsufficientBalance" in str(error):
+                return False
 
-            if not self.has_liquidity():
-                logger.error(f"Market {self.id} has no liquidity. Cannot place bet.")
-                raise e
-
-            tx_receipt = SwapPoolHandler(
-                api_keys=api_keys,
-                market_id=self.id,
-                collateral_token_address=self.collateral_token_contract_address_checksummed,
-            ).buy_or_sell_outcome_token(
-                token_in=sell_token,
-                token_out=buy_token,
-                amount_in=amount_wei,
-                web3=web3,
+        if fallback_venue == SwapVenue.SWAPR and not self.has_liquidity():
+            logger.error(f"Market {self.id} has no liquidity. Cannot place bet.")
+            return False
+
+        return True
+
+    def _swap_tokens_via_cow(
+        self,
+        sell_token: ChecksumAddress,
+        buy_token: ChecksumAddress,
+        amount_wei: Wei,
+        api_keys: APIKeys,
+        web3: Web3 | None,
+    ) -> str:
+        slippage_tolerance = get_slippage_tolerance_per_token(sell_token, buy_token)
+        _, order = swap_tokens_waiting(
+            amount_wei=amount_wei,
+            sell_token=sell_token,
+            buy_token=buy_token,
+            api_keys=api_keys,
+            web3=web3,
+            wait_order_complete=False,
+            timeout=timedelta(minutes=2),
+            slippage_tolerance=slippage_tolerance,
+        )
+        order_metadata = BackgroundEventLoop().run(
+            wait_for_order_completion(order=order)
+        )
+        logger.info(
+            f"Swapped {sell_token} for {buy_token}. Order details {order_metadata}"
+        )
+        trades = get_trades_by_order_uid(HexBytes(order_metadata.uid.root))
+        if len(trades) != 1:
+            raise ValueError(
+                f"Expected exactly 1 trade from {order_metadata=}, but got {len(trades)=}."
             )
-            swap_pool_tx_hash = tx_receipt["transactionHash"]
-            logger.info(f"TxHash is {swap_pool_tx_hash=}.")
-            return swap_pool_tx_hash.to_0x_hex()
+        cow_tx_hash = trades[0].txHash
+        logger.info(f"TxHash is {cow_tx_hash=} for {order_metadata.uid.root=}.")
+        return cow_tx_hash.to_0x_hex()
+
+    def _swap_tokens_via_pool(
+        self,
+        sell_token: ChecksumAddress,
+        buy_token: ChecksumAddress,
+        amount_wei: Wei,
+        api_keys: APIKeys,
+        web3: Web3 | None,
+    ) -> str:
+        tx_receipt = SwapPoolHandler(
+            api_keys=api_keys,
+            market_id=self.id,
+            collateral_token_address=self.collateral_token_contract_address_checksummed,
+        ).buy_or_sell_outcome_token(
+            token_in=sell_token,
+            token_out=buy_token,
+            amount_in=amount_wei,
+            web3=web3,
+        )
+        swap_pool_tx_hash = tx_receipt["transactionHash"]
+        logger.info(f"TxHash is {swap_pool_tx_hash=}.")
+        return swap_pool_tx_hash.to_0x_hex()
 
     def place_bet(
         self,
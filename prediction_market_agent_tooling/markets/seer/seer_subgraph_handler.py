@@ -1,6 +1,7 @@
 import sys
 import typing as t
 from collections import defaultdict
+from datetime import timedelta
 from enum import Enum
 from typing import Any
 
@@ -23,6 +24,7 @@ from prediction_market_agent_tooling.markets.agent_market import (
 )
 from prediction_market_agent_tooling.markets.base_subgraph_handler import (
     BaseSubgraphHandler,
+    LazyModel,
 )
 from prediction_market_agent_tooling.markets.seer.data_models import (
     SeerMarket,
@@ -32,6 +34,7 @@ from prediction_market_agent_tooling.markets.seer.data_models import (
 from prediction_market_agent_tooling.markets.seer.subgraph_data_models import (
     SwaprPool,
     SwaprSwap,
+    SwaprTick,
 )
 from prediction_market_agent_tooling.tools.hexbytes_custom import HexBytes
 from prediction_market_agent_tooling.tools.singleton import SingletonMeta
@@ -62,6 +65,13 @@ class SeerSubgraphHandler(BaseSubgraphHandler):
 
     INVALID_ANSWER = "ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff"
 
+    # Subgraphs themselves lag behind the chain by a few blocks, so serving these a bit stale doesn't change much.
+    QUERY_CACHE_TTLS = {
+        "market": timedelta(minutes=1),
+        "marketQuestions": timedelta(minutes=1),
+        "pools": timedelta(seconds=30),
+    }
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -259,6 +269,32 @@ class SeerSubgraphHandler(BaseSubgraphHandler):
         conditional_filter_type: ConditionalFilterType = ConditionalFilterType.ONLY_NOT_CONDITIONAL,
         parent_market_id: HexBytes | None = None,
     ) -> list[SeerMarketWithQuestions]:
+        return [
+            m.validate()
+            for m in self.get_markets_lazy(
+                filter_by=filter_by,
+                sort_by=sort_by,
+                limit=limit,
+                outcome_supply_gt_if_open=outcome_supply_gt_if_open,
+                question_type=question_type,
+                conditional_filter_type=conditional_filter_type,
+                parent_market_id=parent_market_id,
+            )
+        ]
+
+    def get_markets_lazy(
+        self,
+        filter_by: FilterBy,
+        sort_by: SortBy = SortBy.NONE,
+        limit: int | None = None,
+        outcome_supply_gt_if_open: Wei = Wei(0),
+        question_type: QuestionType = QuestionType.ALL,
+        conditional_filter_type: ConditionalFilterType = ConditionalFilterType.ONLY_NOT_CONDITIONAL,
+        parent_market_id: HexBytes | None = None,
+    ) -> list[LazyModel[SeerMarketWithQuestions]]:
+        """
+        Same as `get_markets`, but the markets are validated only when accessed, see `LazyModel`.
+        """
         sort_direction, sort_by_field = self._build_sort_params(sort_by)
 
         where_stms = self._build_where_statements(
@@ -284,22 +320,21 @@ class SeerSubgraphHandler(BaseSubgraphHandler):
             **optional_params,
         )
         fields = self._get_fields_for_markets(markets_field)
-        markets = self.do_query(fields=fields, pydantic_model=SeerMarket)
-        market_ids = [m.id for m in markets]
+        # Markets are validated only once, together with their questions, so ids are taken from the raw items.
+        markets = self.do_query_lazy(fields, SeerMarketWithQuestions)
+        market_ids = [HexBytes(m.raw["id"]) for m in markets]
         # We fetch questions from all markets and all parents in one go
         parent_market_ids = [
-            m.parent_market.id for m in markets if m.parent_market is not None
+            HexBytes(m.raw["parentMarket"]["id"])
+            for m in markets
+            if m.raw.get("parentMarket") is not None
         ]
         q = SeerQuestionsCache(seer_subgraph_handler=self)
         q.fetch_questions(list(set(market_ids + parent_market_ids)))
 
-        # Create SeerMarketWithQuestions for each market
-        return [
-            SeerMarketWithQuestions(
-                **m.model_dump(), questions=q.market_id_to_questions[m.id]
-            )
-            for m in markets
-        ]
+        for m, market_id in zip(markets, market_ids):
+            m.raw["questions"] = q.market_id_to_questions[market_id]
+        return markets
 
     def get_questions_for_markets(
         self, market_ids: list[HexBytes]
@@ -330,6 +365,14 @@ class SeerSubgraphHandler(BaseSubgraphHandler):
         )
         return s
 
+    def get_markets_by_ids(self, market_ids: list[HexBytes]) -> list[SeerMarket]:
+        where_stms = {"id_in": [i.to_0x_hex().lower() for i in market_ids]}
+        markets_field = self.seer_subgraph.Query.markets(
+            first=len(market_ids), where=unwrap_generic_value(where_stms)
+        )
+        fields = self._get_fields_for_markets(markets_field)
+        return self.do_query(fields=fields, pydantic_model=SeerMarket)
+
     def _get_fields_for_questions(self, questions_field: FieldPath) -> list[FieldPath]:
         fields = [
             questions_field.question.id,
@@ -369,6 +412,8 @@ class SeerSubgraphHandler(BaseSubgraphHandler):
                 pools_field.token1Price,
                 pools_field.totalValueLockedToken0,
                 pools_field.totalValueLockedToken1,
+                pools_field.tick,
+                pools_field.fee,
             ]
             + self._get_fields_for_seer_token(pools_field.token0)
             + self._get_fields_for_seer_token(pools_field.token1)
@@ -412,6 +457,16 @@ class SeerSubgraphHandler(BaseSubgraphHandler):
             return pools[0]
         return None
 
+    def get_ticks_for_pool(self, pool_id: ChecksumAddress) -> list[SwaprTick]:
+        """
+        Initialized ticks of the pool, i.e. the boundaries where the active liquidity changes.
+        """
+        ticks_field = self.swapr_algebra_subgraph.Query.ticks(
+            where=unwrap_generic_value({"pool": pool_id.lower(), "liquidityNet_not": 0})
+        )
+        fields = [ticks_field.tickIdx, ticks_field.liquidityNet]
+        return self.do_query(fields=fields, pydantic_model=SwaprTick)
+
     def _get_fields_for_swaps(self, swaps_field: FieldPath) -> list[FieldPath]:
         fields = (
             [
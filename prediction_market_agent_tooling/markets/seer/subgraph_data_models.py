@@ -35,6 +35,14 @@ class SwaprPool(BaseModel):
     sqrtPrice: int
     totalValueLockedToken0: float
     totalValueLockedToken1: float
+    # Current tick and fee (in hundredths of a bip), needed to simulate swaps locally.
+    tick: int | None = None
+    fee: int | None = None
+
+
+class SwaprTick(BaseModel):
+    tickIdx: int
+    liquidityNet: int
 
 
 class SwaprSwap(BaseModel):
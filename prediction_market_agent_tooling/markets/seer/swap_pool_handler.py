@@ -1,18 +1,13 @@
 from web3 import Web3
 
 from prediction_market_agent_tooling.config import APIKeys
-from prediction_market_agent_tooling.gtypes import (
-    ChecksumAddress,
-    HexBytes,
-    HexStr,
-    TxReceipt,
-    Wei,
-)
+from prediction_market_agent_tooling.gtypes import ChecksumAddress, TxReceipt, Wei
 from prediction_market_agent_tooling.markets.seer.data_models import (
     ExactInputSingleParams,
+    QuoteExactInputSingleParams,
 )
-from prediction_market_agent_tooling.markets.seer.price_manager import PriceManager
 from prediction_market_agent_tooling.markets.seer.seer_contracts import (
+    SwaprQuoterContract,
     SwaprRouterContract,
 )
 from prediction_market_agent_tooling.markets.seer.seer_subgraph_handler import (
@@ -39,10 +34,16 @@ class SwapPoolHandler:
         token_in: ChecksumAddress,
         token_out: ChecksumAddress,
         buffer_pct: float = 0.05,
+        web3: Web3 | None = None,
     ) -> Wei:
-        price_manager = PriceManager.build(HexBytes(HexStr(self.market_id)))
-        value = price_manager.get_swapr_input_quote(
-            input_amount=amount_in, input_token=token_in, output_token=token_out
+        # Slippage protection has to be based on the exact on-chain state, not on the locally simulated quote.
+        value, _ = SwaprQuoterContract().quote_exact_input_single(
+            QuoteExactInputSingleParams(
+                token_in=token_in,
+                token_out=token_out,
+                amount_in=amount_in,
+            ),
+            web3=web3,
         )
         return value * (1 - buffer_pct)
 
@@ -63,6 +64,7 @@ class SwapPoolHandler:
             amount_in=amount_in,
             token_in=token_in,
             token_out=token_out,
+            web3=web3,
         )
 
         p = ExactInputSingleParams(
@@ -0,0 +1,221 @@
+import threading
+import time
+import typing as t
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from enum import Enum
+
+from pydantic import BaseModel
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import ChecksumAddress, Wei
+from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.markets.seer.data_models import (
+    QuoteExactInputSingleParams,
+)
+from prediction_market_agent_tooling.markets.seer.seer_contracts import (
+    SwaprQuoterContract,
+)
+from prediction_market_agent_tooling.tools.cow.cow_order import get_quote_async_no_retry
+from prediction_market_agent_tooling.tools.parallelism import BackgroundEventLoop
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
+
+T = t.TypeVar("T")
+
+# Give up on the expected output by this fraction for every second of waiting for the swap to settle.
+LATENCY_PENALTY_PER_SECOND = 0.0005
+# How many past swaps the predictions are based on.
+VENUE_HISTORY_SIZE = 50
+# Prior is weighted as this many past swaps, so a few unlucky swaps don't flip the routing right away.
+VENUE_PRIOR_WEIGHT = 5
+
+
+class SwapVenue(str, Enum):
+    COW = "cow"
+    SWAPR = "swapr"
+
+
+class VenuePrior(BaseModel):
+    fill_probability: float
+    latency: timedelta
+
+
+# CoW orders wait for a solver and can expire, while pool swaps are settled by our own transaction.
+VENUE_PRIORS = {
+    SwapVenue.COW: VenuePrior(fill_probability=0.8, latency=timedelta(seconds=60)),
+    SwapVenue.SWAPR: VenuePrior(fill_probability=0.95, latency=timedelta(seconds=10)),
+}
+
+
+class SwapOutcome(BaseModel):
+    filled: bool
+    latency: timedelta
+
+
+class VenueHistory(metaclass=SingletonMeta):
+    """
+    Outcomes of recent swaps per venue, used to predict the fill probability and latency of the next swap.
+    """
+
+    def __init__(self, maxlen: int = VENUE_HISTORY_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._outcomes: dict[SwapVenue, deque[SwapOutcome]] = {
+            venue: deque(maxlen=maxlen) for venue in SwapVenue
+        }
+
+    def record(self, venue: SwapVenue, filled: bool, latency: timedelta) -> None:
+        with self._lock:
+            self._outcomes[venue].append(SwapOutcome(filled=filled, latency=latency))
+
+    def fill_probability(self, venue: SwapVenue) -> float:
+        with self._lock:
+            outcomes = list(self._outcomes[venue])
+        prior = VENUE_PRIORS[venue]
+        return (
+            prior.fill_probability * VENUE_PRIOR_WEIGHT
+            + sum(outcome.filled for outcome in outcomes)
+        ) / (VENUE_PRIOR_WEIGHT + len(outcomes))
+
+    def expected_latency(self, venue: SwapVenue) -> timedelta:
+        """
+        Latency of both filled and failed swaps, as failed swaps delay the trade until the fallback as well.
+        """
+        with self._lock:
+            outcomes = list(self._outcomes[venue])
+        prior = VENUE_PRIORS[venue]
+        return (
+            prior.latency * VENUE_PRIOR_WEIGHT
+            + sum((outcome.latency for outcome in outcomes), timedelta(0))
+        ) / (VENUE_PRIOR_WEIGHT + len(outcomes))
+
+
+class VenueQuote(BaseModel):
+    venue: SwapVenue
+    amount_out: Wei
+    fill_probability: float
+    expected_latency: timedelta
+
+
+def _latency_discount(latency: timedelta) -> float:
+    return max(0.0, 1 - LATENCY_PENALTY_PER_SECOND * latency.total_seconds())
+
+
+def expected_output(quote: VenueQuote, fallback: VenueQuote | None) -> float:
+    """
+    Output of swapping at the quote's venue, weighted by its fill probability and latency.
+    If the swap doesn't fill, the fallback venue is tried, but only after the first venue's latency.
+    """
+    output = (
+        quote.fill_probability
+        * quote.amount_out.value
+        * _latency_discount(quote.expected_latency)
+    )
+    if fallback is not None:
+        output += (
+            (1 - quote.fill_probability)
+            * fallback.fill_probability
+            * fallback.amount_out.value
+            * _latency_discount(quote.expected_latency + fallback.expected_latency)
+        )
+    return output
+
+
+class SeerSwapRouter:
+    """
+    Picks the venue for a Seer swap, by quoting CoW and the Swapr pool concurrently and comparing their expected outputs.
+    """
+
+    def __init__(self, history: VenueHistory | None = None) -> None:
+        self.history = history or VenueHistory()
+
+    def get_quotes(
+        self,
+        sell_token: ChecksumAddress,
+        buy_token: ChecksumAddress,
+        amount_wei: Wei,
+        web3: Web3 | None = None,
+    ) -> list[VenueQuote]:
+        """
+        Venues that failed to quote (e.g. no liquidity) are left out.
+        """
+        quoters: dict[SwapVenue, t.Callable[[], Wei]] = {
+            SwapVenue.COW: lambda: Wei(
+                BackgroundEventLoop()
+                .run(
+                    get_quote_async_no_retry(
+                        amount_wei=amount_wei,
+                        sell_token=sell_token,
+                        buy_token=buy_token,
+                    )
+                )
+                .quote.buyAmount.root
+            ),
+            SwapVenue.SWAPR: lambda: SwaprQuoterContract().quote_exact_input_single(
+                QuoteExactInputSingleParams(
+                    token_in=sell_token,
+                    token_out=buy_token,
+                    amount_in=amount_wei,
+                ),
+                web3=web3,
+            )[0],
+        }
+        with ThreadPoolExecutor(max_workers=len(quoters)) as executor:
+            futures = {
+                venue: executor.submit(quoter) for venue, quoter in quoters.items()
+            }
+
+        quotes: list[VenueQuote] = []
+        for venue, future in futures.items():
+            try:
+                amount_out = future.result()
+            except Exception as e:
+                logger.info(f"Could not get a quote from {venue.value}: {e}")
+                continue
+            quotes.append(
+                VenueQuote(
+                    venue=venue,
+                    amount_out=amount_out,
+                    fill_probability=self.history.fill_probability(venue),
+                    expected_latency=self.history.expected_latency(venue),
+                )
+            )
+        return quotes
+
+    def choose(self, quotes: list[VenueQuote]) -> VenueQuote | None:
+        """
+        Returns the quote with the best expected output, counting in the fallback to the best of the other venues.
+        """
+        best: VenueQuote | None = None
+        best_output = 0.0
+        for quote in quotes:
+            others = [q for q in quotes if q.venue != quote.venue]
+            fallback = (
+                max(others, key=lambda q: expected_output(q, None)) if others else None
+            )
+            output = expected_output(quote, fallback)
+            logger.info(
+                f"Expected output at {quote.venue.value} is {output:.0f} wei (quoted {quote.amount_out.value})."
+            )
+            if output > best_output:
+                best, best_output = quote, output
+        return best
+
+    def execute(self, venue: SwapVenue, swap: t.Callable[[], T]) -> T:
+        """
+        Runs the swap at the venue and records its outcome into the history.
+        """
+        start = time.monotonic()
+        try:
+            result = swap()
+        except Exception:
+            self.history.record(
+                venue,
+                filled=False,
+                latency=timedelta(seconds=time.monotonic() - start),
+            )
+            raise
+        self.history.record(
+            venue, filled=True, latency=timedelta(seconds=time.monotonic() - start)
+        )
+        return result
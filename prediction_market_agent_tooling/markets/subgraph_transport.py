@@ -0,0 +1,156 @@
+import threading
+import time
+import typing as t
+from json import JSONDecodeError
+from urllib.parse import urlparse
+
+import httpx
+from pydantic import BaseModel
+from subgrounds import Subgrounds
+from subgrounds.errors import GraphQLError, ServerError
+from subgrounds.utils import default_header
+
+from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
+
+SUBGRAPH_LOG_PREFIX = "[subgraph-transport]"
+MAX_CONCURRENT_REQUESTS_PER_ENDPOINT = 8
+
+
+class SubgraphTransport(t.Protocol):
+    def post(
+        self,
+        url: str,
+        json: dict[str, t.Any],
+        headers: dict[str, str],
+        timeout: float,
+    ) -> httpx.Response: ...
+
+
+class EndpointLatencyStats(BaseModel):
+    requests: int = 0
+    failures: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Identifies the subgraph without the API key that is part of the gateway's URL.
+    """
+    parsed = urlparse(url)
+    return f"{parsed.netloc}/{parsed.path.rstrip('/').rsplit('/', 1)[-1]}"
+
+
+class PooledSubgraphTransport(metaclass=SingletonMeta):
+    """
+    Process-wide pooled HTTP/2 client shared by all the subgraph handlers,
+    so concurrent queries are multiplexed over already opened connections instead of opening a new TCP/TLS connection per request.
+
+    Number of in-flight requests is limited per endpoint, extra requests wait for a free slot.
+    Compressed responses are decoded by httpx (gzip always, brotli if the `brotli` package is installed).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        max_concurrent_requests_per_endpoint: int = MAX_CONCURRENT_REQUESTS_PER_ENDPOINT,
+    ) -> None:
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+        )
+        self.max_concurrent_requests_per_endpoint = max_concurrent_requests_per_endpoint
+        self._lock = threading.Lock()
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._stats: dict[str, EndpointLatencyStats] = {}
+
+    def post(
+        self,
+        url: str,
+        json: dict[str, t.Any],
+        headers: dict[str, str],
+        timeout: float,
+    ) -> httpx.Response:
+        endpoint = endpoint_name(url)
+        with self._semaphore(endpoint):
+            start = time.monotonic()
+            try:
+                response = self.client.post(
+                    url, json=json, headers=headers, timeout=timeout
+                )
+                response.raise_for_status()
+            except httpx.HTTPError:
+                self._record(endpoint, time.monotonic() - start, failed=True)
+                raise
+        elapsed = time.monotonic() - start
+        self._record(endpoint, elapsed, failed=False)
+        logger.debug(
+            f"{SUBGRAPH_LOG_PREFIX} {endpoint} responded in {elapsed:.3f}s over {response.http_version}."
+        )
+        return response
+
+    def latency_stats(self) -> dict[str, EndpointLatencyStats]:
+        with self._lock:
+            return {
+                endpoint: stats.model_copy() for endpoint, stats in self._stats.items()
+            }
+
+    def _semaphore(self, endpoint: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(endpoint)
+            if semaphore is None:
+                semaphore = self._semaphores[endpoint] = threading.BoundedSemaphore(
+                    self.max_concurrent_requests_per_endpoint
+                )
+            return semaphore
+
+    def _record(self, endpoint: str, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointLatencyStats())
+            stats.requests += 1
+            stats.failures += int(failed)
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+
+
+class TransportSubgrounds(Subgrounds):
+    """
+    Subgrounds sending its requests through the given transport, instead of its own per-instance client.
+    """
+
+    def __init__(self, transport: SubgraphTransport, timeout: int = 30) -> None:
+        super().__init__(timeout=timeout)
+        self.transport = transport
+
+    def _fetch(self, url: str, blob: dict[str, t.Any]) -> dict[str, t.Any]:
+        # Same as `Subgrounds._fetch`, only the request goes through the transport.
+        response = self.transport.post(
+            url,
+            json=blob,
+            headers=default_header(url) | self.headers,
+            timeout=self.timeout,
+        )
+
+        try:
+            raw_data = response.json()
+        except JSONDecodeError:
+            raise ServerError(
+                f"Server ({url}) did not respond with proper JSON"
+                f"\nDid you query a proper GraphQL endpoint?"
+                f"\n\n{response.content!r}"
+            )
+
+        if (data := raw_data.get("data")) is None:
+            raise GraphQLError(raw_data.get("errors", "Unknown Error(s) Found"))
+
+        data_dict: dict[str, t.Any] = data
+        return data_dict
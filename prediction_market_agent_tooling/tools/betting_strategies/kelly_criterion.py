@@ -1,8 +1,9 @@
 from enum import Enum
 from itertools import chain
-from typing import Callable
+from typing import Callable, Sequence
 
 import numpy as np
+from numpy.typing import NDArray
 from scipy.optimize import minimize
 
 from prediction_market_agent_tooling.gtypes import (
@@ -29,14 +30,19 @@ def check_is_valid_probability(probability: float) -> None:
         raise ValueError("Probability must be between 0 and 1")
 
 
-def get_kelly_bet_simplified(
-    max_bet: CollateralToken,
-    market_p_yes: float,
-    estimated_p_yes: float,
-    confidence: float,
-) -> BinaryKellyBet:
+def check_are_valid_probabilities(probabilities: NDArray[np.float64]) -> None:
+    if not np.all((probabilities >= 0) & (probabilities <= 1)):
+        raise ValueError("Probability must be between 0 and 1")
+
+
+def get_kelly_bets_simplified_many(
+    max_bets: Sequence[CollateralToken],
+    market_p_yes: Sequence[float],
+    estimated_p_yes: Sequence[float],
+    confidences: Sequence[float],
+) -> list[BinaryKellyBet]:
     """
-    Calculate the optimal bet amount using the Kelly Criterion for a binary outcome market.
+    Calculate the optimal bet amount using the Kelly Criterion for binary outcome markets, computed for many markets at once.
 
     From https://en.wikipedia.org/wiki/Kelly_criterion:
 
@@ -53,43 +59,40 @@ def get_kelly_bet_simplified(
     compared to the market volume. See discussion here for more detail:
     https://github.com/gnosis/prediction-market-agent-tooling/pull/330#discussion_r1698269328
     """
-    check_is_valid_probability(market_p_yes)
-    check_is_valid_probability(estimated_p_yes)
-    check_is_valid_probability(confidence)
-
-    if estimated_p_yes > market_p_yes:
-        bet_direction = True
-        market_prob = market_p_yes
-        estimated_p = estimated_p_yes
-    else:
-        bet_direction = False
-        market_prob = 1 - market_p_yes
-        estimated_p = 1 - estimated_p_yes
-
-    # Handle the case where market_prob is 0
-    if market_prob == 0:
-        market_prob = 1e-10
-
-    edge = abs(estimated_p - market_prob) * confidence
+    max_bet = np.array([b.value for b in max_bets], dtype=np.float64)
+    market_p = np.asarray(market_p_yes, dtype=np.float64)
+    estimated_p = np.asarray(estimated_p_yes, dtype=np.float64)
+    confidence = np.asarray(confidences, dtype=np.float64)
+    for probabilities in [market_p, estimated_p, confidence]:
+        check_are_valid_probabilities(probabilities)
+
+    bet_direction = estimated_p > market_p
+    market_prob = np.where(bet_direction, market_p, 1 - market_p)
+    estimated = np.where(bet_direction, estimated_p, 1 - estimated_p)
+    market_prob = np.where(market_prob == 0, 1e-10, market_prob)
+
+    edge = np.abs(estimated - market_prob) * confidence
     odds = (1 / market_prob) - 1
-    kelly_fraction = edge / odds
-
-    # Ensure bet size is non-negative does not exceed the wallet balance
-    bet_size = CollateralToken(min(kelly_fraction * max_bet.value, max_bet.value))
+    # Odds are zero only if the market is certain and we agree with it, so there is no edge.
+    kelly_fraction = np.divide(edge, odds, out=np.zeros_like(edge), where=odds != 0)
+    bet_size = np.minimum(kelly_fraction * max_bet, max_bet)
 
-    return BinaryKellyBet(direction=bet_direction, size=bet_size)
+    return [
+        BinaryKellyBet(direction=bool(direction), size=CollateralToken(size))
+        for direction, size in zip(bet_direction, bet_size)
+    ]
 
 
-def get_kelly_bet_full(
-    yes_outcome_pool_size: OutcomeToken,
-    no_outcome_pool_size: OutcomeToken,
-    estimated_p_yes: float,
-    confidence: float,
-    max_bet: CollateralToken,
-    fees: MarketFees,
-) -> BinaryKellyBet:
+def get_kelly_bets_full_many(
+    yes_outcome_pool_sizes: Sequence[OutcomeToken],
+    no_outcome_pool_sizes: Sequence[OutcomeToken],
+    estimated_p_yes: Sequence[float],
+    confidences: Sequence[float],
+    max_bets: Sequence[CollateralToken],
+    fees: Sequence[MarketFees],
+) -> list[BinaryKellyBet]:
     """
-    Calculate the optimal bet amount using the Kelly Criterion for a binary outcome market.
+    Calculate the optimal bet amount using the Kelly Criterion for binary outcome markets, computed for many markets at once.
 
     'Full' as in it accounts for how the bet changes the market odds.
 
@@ -111,66 +114,92 @@ def get_kelly_bet_full(
     limitations under the License.
     ```
     """
-    fee = fees.bet_proportion
-    if fees.absolute or fees.trading_fee_rate:
-        raise RuntimeError(
-            f"Kelly works only with bet-proportional fees, but the fees are {fees=}."
-        )
+    for market_fees in fees:
+        if market_fees.absolute or market_fees.trading_fee_rate:
+            raise RuntimeError(
+                f"Kelly works only with bet-proportional fees, but the fees are {market_fees=}."
+            )
 
-    check_is_valid_probability(estimated_p_yes)
-    check_is_valid_probability(confidence)
+    p = np.asarray(estimated_p_yes, dtype=np.float64)
+    c = np.asarray(confidences, dtype=np.float64)
+    check_are_valid_probabilities(p)
+    check_are_valid_probabilities(c)
 
-    if max_bet == 0:
-        return BinaryKellyBet(size=CollateralToken(0), direction=True)
+    x = np.array([pool.value for pool in yes_outcome_pool_sizes], dtype=np.float64)
+    y = np.array([pool.value for pool in no_outcome_pool_sizes], dtype=np.float64)
+    b = np.array([max_bet.value for max_bet in max_bets], dtype=np.float64)
+    f = 1 - np.array([market_fees.bet_proportion for market_fees in fees])
 
-    x = yes_outcome_pool_size.value
-    y = no_outcome_pool_size.value
-    p = estimated_p_yes
-    c = confidence
-    b = max_bet.value
-    f = 1 - fee
+    # Add a delta to prevent division by zero
+    y = np.where(x == y, y + 1e-10, y)
 
-    if x == y:
-        # Add a delta to prevent division by zero
-        y += 1e-10
-
-    numerator = (
+    linear = (
         -4 * x**2 * y
         + b * y**2 * p * c * f
         + 2 * b * x * y * p * c * f
         + b * x**2 * p * c * f
         - 2 * b * y**2 * f
         - 2 * b * x * y * f
-        + (
-            (
-                4 * x**2 * y
-                - b * y**2 * p * c * f
-                - 2 * b * x * y * p * c * f
-                - b * x**2 * p * c * f
-                + 2 * b * y**2 * f
-                + 2 * b * x * y * f
-            )
-            ** 2
-            - (
-                4
-                * (x**2 * f - y**2 * f)
-                * (
-                    -4 * b * x * y**2 * p * c
-                    - 4 * b * x**2 * y * p * c
-                    + 4 * b * x * y**2
-                )
-            )
-        )
-        ** (1 / 2)
     )
-    denominator = 2 * (x**2 * f - y**2 * f)
-    kelly_bet_amount = numerator / denominator
+    discriminant = linear**2 - (
+        4
+        * (x**2 * f - y**2 * f)
+        * (-4 * b * x * y**2 * p * c - 4 * b * x**2 * y * p * c + 4 * b * x * y**2)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Markets without a budget would divide by zero, they are zeroed below.
+        kelly_bet_amount = (linear + np.sqrt(discriminant)) / (
+            2 * (x**2 * f - y**2 * f)
+        )
 
     # Clip the bet size to max_bet to account for rounding errors.
-    return BinaryKellyBet(
-        direction=kelly_bet_amount > 0,
-        size=CollateralToken(min(max_bet.value, abs(kelly_bet_amount))),
-    )
+    bet_size = np.minimum(b, np.abs(kelly_bet_amount))
+    return [
+        (
+            BinaryKellyBet(direction=bool(amount > 0), size=CollateralToken(size))
+            if max_bet > 0
+            else BinaryKellyBet(direction=True, size=CollateralToken(0))
+        )
+        for amount, size, max_bet in zip(kelly_bet_amount, bet_size, b)
+    ]
+
+
+def get_kelly_bet_simplified(
+    max_bet: CollateralToken,
+    market_p_yes: float,
+    estimated_p_yes: float,
+    confidence: float,
+) -> BinaryKellyBet:
+    """
+    Single-market variant of `get_kelly_bets_simplified_many`.
+    """
+    return get_kelly_bets_simplified_many(
+        max_bets=[max_bet],
+        market_p_yes=[market_p_yes],
+        estimated_p_yes=[estimated_p_yes],
+        confidences=[confidence],
+    )[0]
+
+
+def get_kelly_bet_full(
+    yes_outcome_pool_size: OutcomeToken,
+    no_outcome_pool_size: OutcomeToken,
+    estimated_p_yes: float,
+    confidence: float,
+    max_bet: CollateralToken,
+    fees: MarketFees,
+) -> BinaryKellyBet:
+    """
+    Single-market variant of `get_kelly_bets_full_many`.
+    """
+    return get_kelly_bets_full_many(
+        yes_outcome_pool_sizes=[yes_outcome_pool_size],
+        no_outcome_pool_sizes=[no_outcome_pool_size],
+        estimated_p_yes=[estimated_p_yes],
+        confidences=[confidence],
+        max_bets=[max_bet],
+        fees=[fees],
+    )[0]
 
 
 def get_kelly_bets_categorical_simplified(
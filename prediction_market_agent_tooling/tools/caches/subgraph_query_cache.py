@@ -0,0 +1,157 @@
+import hashlib
+import json
+import math
+import threading
+import time
+import typing as t
+from datetime import timedelta
+
+from cachetools import TLRUCache
+from pydantic import SecretStr
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Field, SQLModel
+
+from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.tools.db.db_manager import (
+    DBManager,
+    EnsureTableManager,
+)
+from prediction_market_agent_tooling.tools.utils import utcnow
+
+SUBGRAPH_QUERY_CACHE_MAXSIZE = 2048
+
+
+class SubgraphQueryResult(SQLModel, table=True):
+    __tablename__ = "subgraph_query_result"
+    __table_args__ = {"extend_existing": True}
+    query_hash: str = Field(primary_key=True)
+    # Raw JSON response of the subgraph.
+    result: str
+    # None means the result never expires (query pinned to a block).
+    valid_until_timestamp: int | None = None
+
+
+_table_manager = EnsureTableManager([SubgraphQueryResult])
+
+
+def subgraph_query_hash(documents: list[tuple[str, str, dict[str, t.Any]]]) -> str:
+    """
+    Hash of the rendered request, given as a list of `(url, graphql, variables)` documents.
+    """
+    return hashlib.sha256(
+        json.dumps(documents, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _decode(encoded: str) -> list[dict[str, t.Any]]:
+    result: list[dict[str, t.Any]] = json.loads(encoded)
+    return result
+
+
+class SubgraphQueryCache:
+    """
+    Responses of subgraph queries, in an in-memory LRU cache and optionally persisted into a database, so they are shared across runs.
+
+    Every entry has its own TTL, `None` meaning it never expires.
+    Results are kept as JSON strings, so callers always get a fresh copy that they can modify.
+    """
+
+    def __init__(
+        self,
+        sqlalchemy_db_url: SecretStr | None = None,
+        maxsize: int = SUBGRAPH_QUERY_CACHE_MAXSIZE,
+    ) -> None:
+        self.sqlalchemy_db_url = sqlalchemy_db_url
+        self._lock = threading.Lock()
+        self._memory: TLRUCache[str, tuple[str, float]] = TLRUCache(
+            maxsize=maxsize,
+            ttu=lambda _key, value, now: now + value[1],
+            timer=time.monotonic,
+        )
+
+    def get(self, query_hash: str) -> list[dict[str, t.Any]] | None:
+        with self._lock:
+            entry = self._memory.get(query_hash)
+        if entry is not None:
+            return _decode(entry[0])
+
+        if self.sqlalchemy_db_url is None:
+            return None
+        stored = self._load(query_hash)
+        if stored is None:
+            return None
+        ttl_seconds = (
+            math.inf
+            if stored.valid_until_timestamp is None
+            else stored.valid_until_timestamp - utcnow().timestamp()
+        )
+        if ttl_seconds <= 0:
+            return None
+        with self._lock:
+            self._memory[query_hash] = (stored.result, ttl_seconds)
+        return _decode(stored.result)
+
+    def set(
+        self,
+        query_hash: str,
+        result: list[dict[str, t.Any]],
+        ttl: timedelta | None,
+    ) -> None:
+        encoded = json.dumps(result)
+        with self._lock:
+            self._memory[query_hash] = (
+                encoded,
+                math.inf if ttl is None else ttl.total_seconds(),
+            )
+
+        if self.sqlalchemy_db_url is None:
+            return
+        self._persist(
+            SubgraphQueryResult(
+                query_hash=query_hash,
+                result=encoded,
+                valid_until_timestamp=(
+                    None if ttl is None else int((utcnow() + ttl).timestamp())
+                ),
+            )
+        )
+
+    def clear(self) -> None:
+        """
+        Clears only the in-memory tier, persisted results are valid until their TTL.
+        """
+        with self._lock:
+            self._memory.clear()
+
+    def _db_manager(self, sqlalchemy_db_url: SecretStr) -> DBManager:
+        _table_manager.ensure_tables_sync(sqlalchemy_db_url)
+        return DBManager(sqlalchemy_db_url.get_secret_value())
+
+    # Persistent tier is only an optimisation, so database errors don't fail the queries, worst case the subgraph is queried again.
+
+    def _load(self, query_hash: str) -> SubgraphQueryResult | None:
+        if self.sqlalchemy_db_url is None:
+            return None
+        try:
+            with self._db_manager(self.sqlalchemy_db_url).get_session() as session:
+                stored = session.get(SubgraphQueryResult, query_hash)
+                return (
+                    SubgraphQueryResult.model_validate(stored.model_dump())
+                    if stored is not None
+                    else None
+                )
+        except SQLAlchemyError as e:
+            logger.warning(f"Failed to load subgraph query result {query_hash}: {e}")
+            return None
+
+    def _persist(self, stored: SubgraphQueryResult) -> None:
+        if self.sqlalchemy_db_url is None:
+            return
+        try:
+            with self._db_manager(self.sqlalchemy_db_url).get_session() as session:
+                session.merge(stored)
+                session.commit()
+        except SQLAlchemyError as e:
+            logger.warning(
+                f"Failed to persist subgraph query result {stored.query_hash}: {e}"
+            )
@@ -1,6 +1,12 @@
 import asyncio
+import concurrent.futures
+import threading
+import time
 import typing as t
+import weakref
+from collections import defaultdict, deque
 from datetime import timedelta
+from functools import cache
 
 import httpx
 import tenacity
@@ -51,8 +57,15 @@ from prediction_market_agent_tooling.markets.omen.cow_contracts import (
 )
 from prediction_market_agent_tooling.tools.contract import ContractERC20BaseClass
 from prediction_market_agent_tooling.tools.cow.cow_client import ClientCoW
-from prediction_market_agent_tooling.tools.cow.models import MinimalisticTrade, Order
+from prediction_market_agent_tooling.tools.cow.models import (
+    CowQuoteRequest,
+    MinimalisticTrade,
+    Order,
+)
 from prediction_market_agent_tooling.tools.cow.semaphore import postgres_rate_limited
+from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
+from prediction_market_agent_tooling.tools.parallelism import BackgroundEventLoop
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
 from prediction_market_agent_tooling.tools.utils import utcnow
 
 
@@ -64,37 +77,90 @@ class NoLiquidityAvailableOnCowException(Exception):
     """Custom exception for handling case where no liquidity available."""
 
 
+class CowHttpClient(metaclass=SingletonMeta):
+    """
+    Pooled async HTTP clients for the CoW API, so consecutive requests re-use already opened TCP/TLS connections,
+    instead of cowpy's default of opening a new client for every request.
+
+    `httpx.AsyncClient` is bound to the event loop it was first used in, so the clients are kept per loop.
+    """
+
+    def __init__(self, max_connections: int = 20) -> None:
+        self.limits = httpx.Limits(max_connections=max_connections)
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits)
+            self._async_clients[loop] = client
+        return client
+
+
+class PooledRequestStrategy(RequestStrategy):
+    """
+    Sends the requests of cowpy's APIs through `CowHttpClient`, optionally authenticated with the partners API key.
+    """
+
+    def __init__(self, api_key: str | None = None) -> None:
+        self.api_key = api_key
+
+    async def make_request(
+        self, client: t.Any, url: str, method: str, **request_kwargs: t.Any
+    ) -> t.Any:
+        headers = {
+            "accept": "application/json",
+            "content-type": "application/json",
+        }
+        if self.api_key is not None:
+            headers["X-API-Key"] = self.api_key
+        # `client` is the one-off client created by cowpy for this request, use the pooled one instead.
+        return (
+            await CowHttpClient()
+            .get_async_client()
+            .request(url=url, headers=headers, method=method, **request_kwargs)
+        )
+
+
 def get_order_book_api(env: Envs, chain: Chain) -> OrderBookApi:
+    cow_api_key = APIKeys().COW_API_KEY
+    return _get_order_book_api(
+        env,
+        chain,
+        cow_api_key.get_secret_value() if cow_api_key is not None else None,
+    )
+
+
+@cache
+def _get_order_book_api(env: Envs, chain: Chain, api_key: str | None) -> OrderBookApi:
     chain_id = SupportedChainId(chain.value[0])
     config = OrderBookAPIConfigFactory.get_config(env, chain_id)
 
-    cow_api_key = APIKeys().COW_API_KEY
-    if cow_api_key is not None:
-        api_key_value = cow_api_key.get_secret_value()
+    if api_key is not None:
         # Use the partners API with the API key for higher rate limits.
         config.config_map = {
             k: v.replace("api.cow.fi", "partners.cow.fi")
             for k, v in config.config_map.items()
         }
 
-        class AuthenticatedRequestStrategy(RequestStrategy):
-            async def make_request(
-                self, client: t.Any, url: str, method: str, **request_kwargs: t.Any
-            ) -> t.Any:
-                headers = {
-                    "accept": "application/json",
-                    "content-type": "application/json",
-                    "X-API-Key": api_key_value,
-                }
-                return await client.request(
-                    url=url, headers=headers, method=method, **request_kwargs
-                )
+    api = OrderBookApi(config)
+    api.request_builder.strategy = PooledRequestStrategy(api_key)
+    return api
 
-        api = OrderBookApi(config)
-        api.request_builder.strategy = AuthenticatedRequestStrategy()
-        return api
 
-    return OrderBookApi(config)
+def _quote_request(
+    sell_token: ChecksumAddress, buy_token: ChecksumAddress
+) -> OrderQuoteRequest:
+    return OrderQuoteRequest(
+        sellToken=Address(sell_token),
+        buyToken=Address(buy_token),
+        from_=Address(
+            "0x1234567890abcdef1234567890abcdef12345678"
+        ),  # Just random address, doesn't matter.
+    )
 
 
 @tenacity.retry(
@@ -113,19 +179,12 @@ def get_sell_token_amount(
     Calculate how much of the sell_token is needed to obtain a specified amount of buy_token.
     """
     order_book_api = get_order_book_api(env, chain)
-    order_quote_request = OrderQuoteRequest(
-        sellToken=Address(sell_token),
-        buyToken=Address(buy_token),
-        from_=Address(
-            "0x1234567890abcdef1234567890abcdef12345678"
-        ),  # Just random address, doesn't matter.
-    )
     order_side = OrderQuoteSide3(
         kind=OrderQuoteSideKindBuy.buy,
         buyAmountAfterFee=TokenAmount(str(buy_amount)),
     )
-    order_quote = asyncio.run(
-        order_book_api.post_quote(order_quote_request, order_side)
+    order_quote = BackgroundEventLoop().run(
+        order_book_api.post_quote(_quote_request(sell_token, buy_token), order_side)
     )
     return Wei(order_quote.quote.sellAmount.root)
 
@@ -133,38 +192,45 @@ def get_sell_token_amount(
 @tenacity.retry(
     stop=stop_after_attempt(4),
     wait=wait_exponential(min=4, max=10),
+    # Missing liquidity won't appear within the retries.
+    retry=tenacity.retry_if_not_exception_type(NoLiquidityAvailableOnCowException),
 )
-def get_quote(
+async def get_quote_async(
     amount_wei: Wei,
     sell_token: ChecksumAddress,
     buy_token: ChecksumAddress,
     chain: Chain = Chain.GNOSIS,
     env: Envs = "prod",
 ) -> OrderQuoteResponse:
-    order_book_api = get_order_book_api(env, chain)
-    order_quote_request = OrderQuoteRequest(
-        sellToken=Address(sell_token),
-        buyToken=Address(buy_token),
-        from_=Address(
-            "0x1234567890abcdef1234567890abcdef12345678"
-        ),  # Just random address, doesn't matter.
+    return await get_quote_async_no_retry(
+        amount_wei=amount_wei,
+        sell_token=sell_token,
+        buy_token=buy_token,
+        chain=chain,
+        env=env,
     )
+
+
+async def get_quote_async_no_retry(
+    amount_wei: Wei,
+    sell_token: ChecksumAddress,
+    buy_token: ChecksumAddress,
+    chain: Chain = Chain.GNOSIS,
+    env: Envs = "prod",
+) -> OrderQuoteResponse:
+    order_book_api = get_order_book_api(env, chain)
     order_side = OrderQuoteSide1(
         kind=OrderQuoteSideKindSell.sell,
         sellAmountBeforeFee=TokenAmount(str(amount_wei)),
     )
 
     try:
-        order_quote = asyncio.run(
-            get_order_quote(
-                order_quote_request=order_quote_request,
-                order_side=order_side,
-                order_book_api=order_book_api,
-            )
+        return await get_order_quote(
+            order_quote_request=_quote_request(sell_token, buy_token),
+            order_side=order_side,
+            order_book_api=order_book_api,
         )
 
-        return order_quote
-
     except UnexpectedResponseError as e1:
         if "NoLiquidity" in e1.message:
             raise NoLiquidityAvailableOnCowException(e1.message)
@@ -175,6 +241,60 @@ def get_quote(
         raise
 
 
+def get_quote(
+    amount_wei: Wei,
+    sell_token: ChecksumAddress,
+    buy_token: ChecksumAddress,
+    chain: Chain = Chain.GNOSIS,
+    env: Envs = "prod",
+) -> OrderQuoteResponse:
+    return BackgroundEventLoop().run(
+        get_quote_async(
+            amount_wei=amount_wei,
+            sell_token=sell_token,
+            buy_token=buy_token,
+            chain=chain,
+            env=env,
+        )
+    )
+
+
+def get_quotes(
+    quote_requests: t.Sequence[CowQuoteRequest],
+    chain: Chain = Chain.GNOSIS,
+    env: Envs = "prod",
+) -> list[OrderQuoteResponse | None]:
+    """
+    Requests the quotes concurrently, in the order of `quote_requests`.
+    Pairs without liquidity on CoW get None, any other error is raised.
+    """
+
+    async def gather() -> list[OrderQuoteResponse | BaseException]:
+        return await asyncio.gather(
+            *(
+                get_quote_async(
+                    amount_wei=r.sell_amount,
+                    sell_token=r.sell_token,
+                    buy_token=r.buy_token,
+                    chain=chain,
+                    env=env,
+                )
+                for r in quote_requests
+            ),
+            return_exceptions=True,
+        )
+
+    quotes: list[OrderQuoteResponse | None] = []
+    for quote in BackgroundEventLoop().run(gather()):
+        if isinstance(quote, NoLiquidityAvailableOnCowException):
+            quotes.append(None)
+        elif isinstance(quote, BaseException):
+            raise quote
+        else:
+            quotes.append(quote)
+    return quotes
+
+
 @cached(TTLCache(maxsize=100, ttl=5 * 60))
 def get_buy_token_amount_else_raise(
     sell_amount: Wei,
@@ -200,7 +320,10 @@ def handle_allowance(
     amount_to_set_wei: Wei | None = None,
     for_address: ChecksumAddress | None = None,
     web3: Web3 | None = None,
-) -> None:
+) -> Wei:
+    """
+    Returns the allowance after the check (and approval, if it was needed).
+    """
     # Approve the CoW Swap Vault Relayer to get the sell token only if allowance not sufficient.
     for_address = for_address or Web3.to_checksum_address(
         CowContractAddress.VAULT_RELAYER.value
@@ -218,6 +341,8 @@ def handle_allowance(
             amount_wei=amount_to_set_wei,
             web3=web3,
         )
+        return amount_to_set_wei
+    return current_allowance
 
 
 @postgres_rate_limited(
@@ -292,36 +417,213 @@ async def place_swap_order(
     return order
 
 
-async def wait_for_order_completion(
-    order: CompletedOrder, timeout: timedelta = timedelta(seconds=120)
-) -> OrderMetaData:
-    start_time = utcnow()
+ORDER_POLL_MIN_INTERVAL = timedelta(seconds=1)
+ORDER_POLL_MAX_INTERVAL = timedelta(seconds=10)
+ORDER_POLL_BACKOFF = 1.5
+# How many pages of paginated endpoints are fetched ahead.
+PAGINATION_PREFETCH = 3
+# Orders being waited for are the most recent ones of the account, so it's enough to look at its latest orders.
+ACCOUNT_ORDERS_LOOKUP_LIMIT = 100
+
+
+class _PolledOrder:
+    def __init__(
+        self, order: CompletedOrder, deadline: float, interval: timedelta
+    ) -> None:
+        self.order = order
+        self.deadline = deadline
+        self.interval = interval
+        self.next_poll = time.monotonic()
+        self.status: OrderStatus | None = None
+        self.future: concurrent.futures.Future[OrderMetaData] = (
+            concurrent.futures.Future()
+        )
 
-    while True:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(order.url)
-            order_metadata = OrderMetaData.model_validate(response.json())
+    @property
+    def uid(self) -> str:
+        return self.order.uid.root
 
-        if order_metadata.status == OrderStatus.fulfilled:
-            logger.info(f"Order {order.uid} ({order.url}) completed.")
-            return order_metadata
+    @property
+    def account_orders_url(self) -> str:
+        # Bytes 32..52 of the order's UID are the owner's address.
+        owner = "0x" + self.uid[2 + 2 * 32 : 2 + 2 * 52]
+        return f"{self.order.url.rsplit('/orders/', 1)[0]}/account/{owner}/orders"
 
-        elif order_metadata.status in (
+
+class CowOrderPoller(metaclass=SingletonMeta):
+    """
+    Waits for any number of CoW orders with a single polling task in the `BackgroundEventLoop`,
+    instead of a polling loop (and new HTTP client on every poll) per waiting swap.
+
+    Statuses are fetched over the pooled `CowHttpClient`, orders of the same owner with a single request for the account's latest orders.
+    Polling of an order backs off while its status doesn't change. Every order's future is resolved once the order is settled or times out.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta = ORDER_POLL_MIN_INTERVAL,
+        max_interval: timedelta = ORDER_POLL_MAX_INTERVAL,
+        backoff: float = ORDER_POLL_BACKOFF,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._orders: dict[str, _PolledOrder] = {}
+        # Both are only touched from inside of the background event loop.
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def track(
+        self, order: CompletedOrder, timeout: timedelta
+    ) -> concurrent.futures.Future[OrderMetaData]:
+        """
+        Starts polling the order, returns a future that resolves to the fulfilled order,
+        or raises `OrderStatusError` if it's cancelled or expired, and `TimeoutError` if it isn't settled in time.
+        """
+        deadline = time.monotonic() + timeout.total_seconds()
+        with self._lock:
+            polled = self._orders.get(order.uid.root)
+            if polled is None:
+                polled = self._orders[order.uid.root] = _PolledOrder(
+                    order, deadline, self.min_interval
+                )
+            else:
+                polled.deadline = max(polled.deadline, deadline)
+        BackgroundEventLoop().loop.call_soon_threadsafe(self._wake_up)
+        return polled.future
+
+    def _wake_up(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            with self._lock:
+                for uid, polled in list(self._orders.items()):
+                    # Caller isn't waiting anymore.
+                    if polled.future.cancelled():
+                        del self._orders[uid]
+                now = time.monotonic()
+                due = [o for o in self._orders.values() if o.next_poll <= now]
+
+            if due:
+                await self._poll(due)
+
+            with self._lock:
+                if not self._orders:
+                    return
+                sleep = min(o.next_poll for o in self._orders.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=max(0, sleep - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, due: list[_PolledOrder]) -> None:
+        by_account: dict[str, list[_PolledOrder]] = defaultdict(list)
+        for polled in due:
+            by_account[polled.account_orders_url].append(polled)
+        results = await asyncio.gather(
+            *(self._fetch_statuses(orders) for orders in by_account.values()),
+            return_exceptions=True,
+        )
+        for orders, result in zip(by_account.values(), results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch statuses of CoW orders: {result}")
+                result = {}
+            for polled in orders:
+                self._update(polled, result.get(polled.uid))
+
+    async def _fetch_statuses(
+        self, orders: list[_PolledOrder]
+    ) -> dict[str, OrderMetaData]:
+        client = CowHttpClient().get_async_client()
+        statuses: dict[str, OrderMetaData] = {}
+
+        if len(orders) > 1:
+            uids = {polled.uid for polled in orders}
+            response = await client.get(
+                orders[0].account_orders_url,
+                params={"limit": ACCOUNT_ORDERS_LOOKUP_LIMIT},
+            )
+            response.raise_for_status()
+            for item in response.json():
+                if item["uid"] in uids:
+                    statuses[item["uid"]] = OrderMetaData.model_validate(item)
+
+        # Orders that weren't among the account's latest ones (or are alone) are looked up directly.
+        missing = [polled for polled in orders if polled.uid not in statuses]
+        responses = await asyncio.gather(
+            *(client.get(polled.order.url) for polled in missing)
+        )
+        for polled, response in zip(missing, responses):
+            response.raise_for_status()
+            statuses[polled.uid] = OrderMetaData.model_validate(response.json())
+
+        return statuses
+
+    def _update(
+        self, polled: _PolledOrder, order_metadata: OrderMetaData | None
+    ) -> None:
+        if (
+            order_metadata is not None
+            and order_metadata.status == OrderStatus.fulfilled
+        ):
+            logger.info(f"Order {polled.uid} ({polled.order.url}) completed.")
+            self._resolve(polled, order_metadata)
+
+        elif order_metadata is not None and order_metadata.status in (
             OrderStatus.cancelled,
             OrderStatus.expired,
         ):
-            raise OrderStatusError(f"Order {order.uid} failed. {order.url}")
+            self._resolve(
+                polled,
+                OrderStatusError(f"Order {polled.uid} failed. {polled.order.url}"),
+            )
 
-        if utcnow() - start_time > timeout:
-            raise TimeoutError(
-                f"Timeout waiting for order {order.uid} to be completed. {order.url}"
+        elif time.monotonic() > polled.deadline:
+            self._resolve(
+                polled,
+                TimeoutError(
+                    f"Timeout waiting for order {polled.uid} to be completed. {polled.order.url}"
+                ),
             )
 
-        logger.info(
-            f"Order status of {order.uid} ({order.url}): {order_metadata.status}, waiting..."
-        )
+        else:
+            status = order_metadata.status if order_metadata is not None else None
+            polled.interval = (
+                self.min_interval
+                if status != polled.status
+                else min(polled.interval * self.backoff, self.max_interval)
+            )
+            polled.status = status
+            polled.next_poll = time.monotonic() + polled.interval.total_seconds()
+            logger.info(
+                f"Order status of {polled.uid} ({polled.order.url}): {status}, waiting..."
+            )
+
+    def _resolve(self, polled: _PolledOrder, result: OrderMetaData | Exception) -> None:
+        with self._lock:
+            self._orders.pop(polled.uid, None)
+        if not polled.future.set_running_or_notify_cancel():
+            return
+        if isinstance(result, Exception):
+            polled.future.set_exception(result)
+        else:
+            polled.future.set_result(result)
 
-        await asyncio.sleep(3.14)
+
+async def wait_for_order_completion(
+    order: CompletedOrder, timeout: timedelta = timedelta(seconds=120)
+) -> OrderMetaData:
+    return await asyncio.wrap_future(CowOrderPoller().track(order, timeout))
 
 
 async def swap_tokens_waiting_async(
@@ -380,20 +682,56 @@ async def sign_safe_cow_swap(
     )
 
 
-@tenacity.retry(
-    stop=stop_after_attempt(3),
-    wait=wait_fixed(1),
-    after=lambda x: logger.debug(f"get_trades_by_owner failed, {x.attempt_number=}."),
-)
+class SeenTradesCache(metaclass=SingletonMeta):
+    """
+    Trades of every owner seen so far. Settled trades don't change, so only the trades newer than the already seen ones need to be fetched.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._trades: dict[ChecksumAddress, list[MinimalisticTrade]] = {}
+
+    def get(self, owner: ChecksumAddress) -> list[MinimalisticTrade]:
+        with self._lock:
+            return list(self._trades.get(owner, []))
+
+    def add_newer(
+        self, owner: ChecksumAddress, trades: list[MinimalisticTrade]
+    ) -> list[MinimalisticTrade]:
+        """
+        Prepends the trades (newest first) to the seen ones, returns all the trades of the owner.
+        """
+        with self._lock:
+            seen = self._trades.get(owner, [])
+            seen_keys = {_trade_key(trade) for trade in seen}
+            all_trades = [
+                trade for trade in trades if _trade_key(trade) not in seen_keys
+            ] + seen
+            self._trades[owner] = all_trades
+            return list(all_trades)
+
+
+def _trade_key(trade: MinimalisticTrade) -> tuple[str, str]:
+    return trade.orderUid.to_0x_hex().lower(), trade.txHash.to_0x_hex().lower()
+
+
 def get_trades_by_owner(
     owner: ChecksumAddress,
 ) -> list[MinimalisticTrade]:
+    """
+    Trades of the owner, newest first.
+    Trades endpoint is sorted from the newest block, so the pagination stops at the first already seen trade.
+    """
+    cache = SeenTradesCache()
+    seen_keys = {_trade_key(trade) for trade in cache.get(owner)}
     # Using this until cowpy gets fixed (https://github.com/cowdao-grants/cow-py/issues/35)
-    response = ClientCoW().get(
-        "/xdai/api/v1/trades",
+    items = paginate_endpoint(
+        "/xdai/api/v2/trades",
         params={"owner": owner},
+        stop=lambda item: (item["orderUid"].lower(), item["txHash"].lower())
+        in seen_keys,
     )
-    return [MinimalisticTrade.model_validate(i) for i in response]
+    return cache.add_newer(owner, [MinimalisticTrade.model_validate(i) for i in items])
 
 
 @tenacity.retry(
@@ -414,16 +752,22 @@ def get_trades_by_order_uid(
     return [MinimalisticTrade.model_validate(i) for i in response]
 
 
-@tenacity.retry(
-    stop=stop_after_attempt(3),
-    wait=wait_fixed(1),
-    after=lambda x: logger.debug(f"get_orders_by_owner failed, {x.attempt_number=}."),
-)
 def get_orders_by_owner(
     owner: ChecksumAddress,
+    created_after: DatetimeUTC | None = None,
 ) -> list[Order]:
-    """Retrieves all orders with pagination."""
-    items = paginate_endpoint(f"/xdai/api/v1/account/{owner}/orders")
+    """Retrieves all orders with pagination, newest first, optionally only the ones created after the given time."""
+    items = paginate_endpoint(
+        f"/xdai/api/v1/account/{owner}/orders",
+        stop=(
+            (
+                lambda item: DatetimeUTC.to_datetime_utc(item["creationDate"])
+                < created_after
+            )
+            if created_after is not None
+            else None
+        ),
+    )
     return [Order.model_validate(i) for i in items]
 
 
@@ -450,21 +794,71 @@ async def get_order_by_uid_no_retry(
 @tenacity.retry(
     stop=stop_after_attempt(3),
     wait=wait_fixed(1),
-    after=lambda x: logger.debug(f"paginate_endpoint failed, {x.attempt_number=}."),
+    after=lambda x: logger.debug(f"_get_page failed, {x.attempt_number=}."),
 )
-def paginate_endpoint(endpoint: str, limit: int = 1000) -> list[t.Any]:
-    offset = 0
-    results: list[t.Any] = []
-
-    while True:
-        items = ClientCoW().get(endpoint, params={"offset": offset, "limit": limit})
-        if not items:
-            break
-        assert isinstance(items, list), f"Expected a list of items, got: {items}"
-        results.extend(items)
-        offset += limit
-
-    return results
+def _get_page(
+    endpoint: str, params: dict[str, t.Any], offset: int, limit: int
+) -> list[t.Any]:
+    items = ClientCoW().get(
+        endpoint, params=params | {"offset": offset, "limit": limit}
+    )
+    assert isinstance(items, list), f"Expected a list of items, got: {items}"
+    return items
+
+
+def iter_endpoint(
+    endpoint: str,
+    params: dict[str, t.Any] | None = None,
+    limit: int = 1000,
+    prefetch: int = PAGINATION_PREFETCH,
+    stop: t.Callable[[t.Any], bool] | None = None,
+) -> t.Iterator[t.Any]:
+    """
+    Streams the items of a paginated endpoint.
+    The first page is fetched alone, only after a full page the next `prefetch` pages are fetched in the background,
+    so the common case of a single page costs a single request.
+    Stops before the first item matching `stop`, so with the newest-first endpoints, it can stop e.g. at items older than some time.
+    """
+    params = params or {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=prefetch) as executor:
+        pages = deque([executor.submit(_get_page, endpoint, params, 0, limit)])
+        next_page = 1
+        try:
+            while pages:
+                items = pages.popleft().result()
+                stop_index = next(
+                    (
+                        i
+                        for i, item in enumerate(items)
+                        if stop is not None and stop(item)
+                    ),
+                    None,
+                )
+                if stop_index is None and len(items) == limit:
+                    # Fetch the following pages while the items of this one are being consumed.
+                    while len(pages) < prefetch:
+                        pages.append(
+                            executor.submit(
+                                _get_page, endpoint, params, next_page * limit, limit
+                            )
+                        )
+                        next_page += 1
+                yield from items[:stop_index]
+                if stop_index is not None or len(items) < limit:
+                    return
+        finally:
+            # Don't wait for the pages that aren't needed anymore.
+            for page_future in pages:
+                page_future.cancel()
+
+
+def paginate_endpoint(
+    endpoint: str,
+    limit: int = 1000,
+    params: dict[str, t.Any] | None = None,
+    stop: t.Callable[[t.Any], bool] | None = None,
+) -> list[t.Any]:
+    return list(iter_endpoint(endpoint, params=params, limit=limit, stop=stop))
 
 
 async def cancel_order(
@@ -21,6 +21,12 @@ class MinimalisticTrade(BaseModel):
     txHash: HexBytes
 
 
+class CowQuoteRequest(BaseModel):
+    sell_amount: Wei
+    sell_token: VerifiedChecksumAddress
+    buy_token: VerifiedChecksumAddress
+
+
 class EthFlowData(BaseModel):
     refundTxHash: Optional[HexBytes]
     userValidTo: int
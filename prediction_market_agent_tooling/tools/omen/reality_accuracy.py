@@ -9,6 +9,9 @@ from prediction_market_agent_tooling.markets.omen.omen_subgraph_handler import (
 )
 from prediction_market_agent_tooling.tools.utils import utcnow
 
+# User's responses are fetched concurrently in slices of this duration.
+REALITY_RESPONSES_TIME_SLICE = timedelta(days=30)
+
 
 class RealityAccuracyReport(BaseModel):
     total: int
@@ -24,11 +27,17 @@ def reality_accuracy(user: ChecksumAddress, since: timedelta) -> RealityAccuracy
     start_from = now - since
 
     # Get all question ids where we placed the higher bond.
-    user_responses = OmenSubgraphHandler().get_responses(
-        limit=None,
-        user=user,
-        question_finalized_before=now,
-        question_finalized_after=start_from,
+    user_responses = OmenSubgraphHandler().query_time_sliced(
+        fetch=lambda slice_start, slice_end: OmenSubgraphHandler().get_responses(
+            limit=None,
+            user=user,
+            question_finalized_before=slice_end,
+            question_finalized_after=slice_start,
+        ),
+        start_time=start_from,
+        end_time=now,
+        slice_duration=REALITY_RESPONSES_TIME_SLICE,
+        key=lambda response: response.id,
     )
     unique_question_ids = set(r.question.questionId for r in user_responses)
 
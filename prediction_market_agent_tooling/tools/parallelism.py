@@ -1,8 +1,11 @@
-from typing import Callable, Generator, TypeVar
+import asyncio
+import threading
+from typing import Any, Callable, Coroutine, Generator, TypeVar
 
 from loky import get_reusable_executor
 
 from prediction_market_agent_tooling.loggers import patch_logger
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
 
 A = TypeVar("A")
 B = TypeVar("B")
@@ -31,3 +34,25 @@ def par_generator(
     executor = get_reusable_executor(max_workers=max_workers, initializer=patch_logger)
     for res in executor.map(func, items):
         yield res
+
+
+class BackgroundEventLoop(metaclass=SingletonMeta):
+    """
+    Event loop running forever in a daemon thread, so that sync code can call async APIs without `asyncio.run`,
+    which creates and closes a new loop on every call, together with all the async clients bound to it.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="background-event-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coroutine: Coroutine[Any, Any, B]) -> B:
+        """Runs the coroutine in the background loop and blocks until it's done."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "Can not wait for the background event loop from inside of it."
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
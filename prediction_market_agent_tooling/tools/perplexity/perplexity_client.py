@@ -8,6 +8,16 @@ from prediction_market_agent_tooling.tools.perplexity.perplexity_models import (
     PerplexityRequestParameters,
     PerplexityResponse,
 )
+from prediction_market_agent_tooling.tools.research_client import (
+    CoalescingTTLCache,
+    ResearchHttpClient,
+    normalise_query_params,
+)
+
+# Responses are shared between all `PerplexityModel` instances, keyed by the full request payload.
+PERPLEXITY_RESPONSE_CACHE: CoalescingTTLCache[PerplexityResponse] = CoalescingTTLCache(
+    maxsize=1000, ttl=60 * 60
+)
 
 
 class PerplexityModel:
@@ -28,6 +38,34 @@ class PerplexityModel:
         model_settings: Optional[PerplexityModelSettings],
         model_request_parameters: PerplexityRequestParameters,
     ) -> PerplexityResponse:
+        payload = self._build_payload(
+            messages, model_settings, model_request_parameters
+        )
+        return await PERPLEXITY_RESPONSE_CACHE.aget_or_compute(
+            normalise_query_params(payload),
+            lambda: self._post_async(payload),
+        )
+
+    def request_sync(
+        self,
+        messages: List[dict[str, str]],
+        model_settings: Optional[PerplexityModelSettings],
+        model_request_parameters: PerplexityRequestParameters,
+    ) -> PerplexityResponse:
+        payload = self._build_payload(
+            messages, model_settings, model_request_parameters
+        )
+        return PERPLEXITY_RESPONSE_CACHE.get_or_compute(
+            normalise_query_params(payload),
+            lambda: self._post_sync(payload),
+        )
+
+    def _build_payload(
+        self,
+        messages: List[dict[str, str]],
+        model_settings: Optional[PerplexityModelSettings],
+        model_request_parameters: PerplexityRequestParameters,
+    ) -> Dict[str, Any]:
         payload: Dict[str, Any] = {"model": self.model_name, "messages": messages}
 
         if model_settings:
@@ -48,39 +86,69 @@ class PerplexityModel:
         # Add remaining Perplexity parameters to payload
         payload.update(params_dict)
 
+        return payload
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key.get_secret_value()}",
+            "Content-Type": "application/json",
+        }
+
+    async def _post_async(self, payload: Dict[str, Any]) -> PerplexityResponse:
         try:
-            async with httpx.AsyncClient(timeout=180) as client:
-                response = await client.post(
+            response = (
+                await ResearchHttpClient()
+                .get_async_client()
+                .post(
                     self.completition_endpoint,
-                    headers={
-                        "Authorization": f"Bearer {self.api_key.get_secret_value()}",
-                        "Content-Type": "application/json",
-                    },
+                    headers=self._headers(),
                     json=payload,
                 )
-                response.raise_for_status()
-                result: dict[str, Any] = response.json()
+            )
+            return self._parse_response(response)
+        except Exception as e:
+            raise self._wrap_error(e) from e
 
-                choices = result.get("choices", [])
-                if not choices:
-                    raise ValueError("Invalid response: no choices")
+    def _post_sync(self, payload: Dict[str, Any]) -> PerplexityResponse:
+        try:
+            response = (
+                ResearchHttpClient()
+                .get_client()
+                .post(
+                    self.completition_endpoint,
+                    headers=self._headers(),
+                    json=payload,
+                )
+            )
+            return self._parse_response(response)
+        except Exception as e:
+            raise self._wrap_error(e) from e
 
-                content = choices[0].get("message", {}).get("content")
-                if not content:
-                    raise ValueError("Invalid response: no content")
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> PerplexityResponse:
+        response.raise_for_status()
+        result: dict[str, Any] = response.json()
 
-                return PerplexityResponse(
-                    content=content,
-                    citations=result.get("citations", []),
-                    usage=result.get("usage", {}),
-                )
-        except httpx.HTTPStatusError as e:
-            raise ValueError(
+        choices = result.get("choices", [])
+        if not choices:
+            raise ValueError("Invalid response: no choices")
+
+        content = choices[0].get("message", {}).get("content")
+        if not content:
+            raise ValueError("Invalid response: no content")
+
+        return PerplexityResponse(
+            content=content,
+            citations=result.get("citations", []),
+            usage=result.get("usage", {}),
+        )
+
+    @staticmethod
+    def _wrap_error(e: Exception) -> ValueError:
+        if isinstance(e, httpx.HTTPStatusError):
+            return ValueError(
                 f"HTTP error from Perplexity API: {e.response.status_code} - {e.response.text}"
-            ) from e
-        except httpx.RequestError as e:
-            raise ValueError(f"Request error to Perplexity API: {str(e)}") from e
-        except Exception as e:
-            raise ValueError(
-                f"Unexpected error in Perplexity API request: {str(e)}"
-            ) from e
+            )
+        elif isinstance(e, httpx.RequestError):
+            return ValueError(f"Request error to Perplexity API: {str(e)}")
+        return ValueError(f"Unexpected error in Perplexity API request: {str(e)}")
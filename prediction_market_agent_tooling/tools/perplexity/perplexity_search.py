@@ -1,4 +1,3 @@
-import asyncio
 import typing as t
 from datetime import date, timedelta
 
@@ -39,6 +38,85 @@ def perplexity_search(
     model_name: str = "sonar-pro",
     max_tokens: int = 2048,
 ) -> PerplexityResponse:
+    model, messages, model_settings, request_params = _prepare_perplexity_request(
+        query=query,
+        api_keys=api_keys,
+        search_context_size=search_context_size,
+        search_recency_filter=search_recency_filter,
+        search_filter_before_date=search_filter_before_date,
+        search_filter_after_date=search_filter_after_date,
+        search_return_related_questions=search_return_related_questions,
+        include_domains=include_domains,
+        temperature=temperature,
+        model_name=model_name,
+        max_tokens=max_tokens,
+    )
+    return model.request_sync(
+        messages=messages,
+        model_settings=model_settings,
+        model_request_parameters=request_params,
+    )
+
+
+@tenacity.retry(stop=tenacity.stop_after_attempt(3), wait=tenacity.wait_fixed(1))
+@db_cache(
+    max_age=timedelta(days=1),
+    ignore_args=["api_keys"],
+    log_error_on_unsavable_data=False,
+)
+async def aperplexity_search(
+    query: str,
+    api_keys: APIKeys,
+    search_context_size: t.Literal["low", "medium", "high"] = "medium",
+    search_recency_filter: (
+        t.Literal["any", "day", "week", "month", "year"] | None
+    ) = None,
+    search_filter_before_date: date | None = None,
+    search_filter_after_date: date | None = None,
+    search_return_related_questions: bool | None = None,
+    include_domains: list[str] | None = None,
+    temperature: float = 0,
+    model_name: str = "sonar-pro",
+    max_tokens: int = 2048,
+) -> PerplexityResponse:
+    model, messages, model_settings, request_params = _prepare_perplexity_request(
+        query=query,
+        api_keys=api_keys,
+        search_context_size=search_context_size,
+        search_recency_filter=search_recency_filter,
+        search_filter_before_date=search_filter_before_date,
+        search_filter_after_date=search_filter_after_date,
+        search_return_related_questions=search_return_related_questions,
+        include_domains=include_domains,
+        temperature=temperature,
+        model_name=model_name,
+        max_tokens=max_tokens,
+    )
+    return await model.request(
+        messages=messages,
+        model_settings=model_settings,
+        model_request_parameters=request_params,
+    )
+
+
+def _prepare_perplexity_request(
+    query: str,
+    api_keys: APIKeys,
+    search_context_size: t.Literal["low", "medium", "high"],
+    search_recency_filter: t.Literal["any", "day", "week", "month", "year"] | None,
+    search_filter_before_date: date | None,
+    search_filter_after_date: date | None,
+    search_return_related_questions: bool | None,
+    include_domains: list[str] | None,
+    temperature: float,
+    model_name: str,
+    max_tokens: int,
+) -> tuple[
+    PerplexityModel,
+    list[dict[str, str]],
+    PerplexityModelSettings,
+    PerplexityRequestParameters,
+]:
     # Create messages in ModelMessage format
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
@@ -69,10 +147,4 @@ def perplexity_search(
     )
 
     model = PerplexityModel(model_name=model_name, api_key=api_keys.perplexity_api_key)
-    return asyncio.run(
-        model.request(
-            messages=messages,
-            model_settings=model_settings,
-            model_request_parameters=request_params,
-        )
-    )
+    return model, messages, model_settings, request_params
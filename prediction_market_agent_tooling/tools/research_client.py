@@ -0,0 +1,156 @@
+import asyncio
+import json
+import threading
+import typing as t
+import weakref
+from concurrent.futures import Future
+
+import httpx
+from cachetools import TTLCache
+
+from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
+
+T = t.TypeVar("T")
+
+RESEARCH_LOG_PREFIX = "[research-client]"
+
+
+class ResearchHttpClient(metaclass=SingletonMeta):
+    """
+    Process-wide pooled HTTP clients shared by the research tools (Tavily, Perplexity, ...),
+    so consecutive searches re-use already opened TCP/TLS connections.
+
+    `httpx.AsyncClient` is bound to the event loop it was first used in, so the async clients are kept per loop.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 180,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+    ) -> None:
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.client = httpx.Client(timeout=timeout, limits=self.limits)
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+
+    def get_client(self) -> httpx.Client:
+        return self.client
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._async_clients[loop] = client
+        return client
+
+
+def normalise_query_params(params: t.Mapping[str, t.Any]) -> str:
+    """
+    Builds a stable cache key out of request parameters.
+    Queries differing only in casing or whitespace, or in the order of string-list arguments, result in the same key.
+    """
+    normalised: dict[str, t.Any] = {}
+    for key, value in sorted(params.items()):
+        if value is None:
+            continue
+        if key == "query" and isinstance(value, str):
+            value = " ".join(value.split()).casefold()
+        elif isinstance(value, (list, tuple, set, frozenset)) and all(
+            isinstance(v, str) for v in value
+        ):
+            # Lists of strings (e.g. domain filters) are order-insensitive, other lists (e.g. chat messages) are kept as they are.
+            value = sorted(value)
+        normalised[key] = value
+    return json.dumps(normalised, sort_keys=True, default=str)
+
+
+class CoalescingTTLCache(t.Generic[T]):
+    """
+    In-memory TTL cache that also coalesces concurrent identical requests:
+    while a value for the key is being computed, other callers wait for that computation instead of starting their own.
+
+    Failures are not cached, every waiting caller receives the exception of the shared computation.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 60 * 60) -> None:
+        self._cache: TTLCache[str, T] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future[T]] = {}
+        self._async_in_flight: dict[
+            tuple[asyncio.AbstractEventLoop, str], asyncio.Future[T]
+        ] = {}
+
+    def get_or_compute(self, key: str, compute: t.Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._cache:
+                logger.debug(f"{RESEARCH_LOG_PREFIX} Cache hit for {key}.")
+                return self._cache[key]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            logger.debug(f"{RESEARCH_LOG_PREFIX} Joining in-flight request for {key}.")
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._cache[key] = value
+            del self._in_flight[key]
+        future.set_result(value)
+        return value
+
+    async def aget_or_compute(
+        self, key: str, compute: t.Callable[[], t.Awaitable[T]]
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if key in self._cache:
+                logger.debug(f"{RESEARCH_LOG_PREFIX} Cache hit for {key}.")
+                return self._cache[key]
+            future = self._async_in_flight.get((loop, key))
+            owner = future is None
+            if future is None:
+                future = self._async_in_flight[(loop, key)] = loop.create_future()
+
+        if not owner:
+            logger.debug(f"{RESEARCH_LOG_PREFIX} Joining in-flight request for {key}.")
+            # Shield, so that cancellation of one waiter doesn't cancel the shared result.
+            return await asyncio.shield(future)
+
+        try:
+            value = await compute()
+        except BaseException as e:
+            with self._lock:
+                del self._async_in_flight[(loop, key)]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved in case nobody else was waiting for it.
+                future.exception()
+            raise
+        with self._lock:
+            self._cache[key] = value
+            del self._async_in_flight[(loop, key)]
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
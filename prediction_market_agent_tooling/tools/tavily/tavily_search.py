@@ -1,11 +1,24 @@
+import inspect
 import typing as t
 from datetime import date, timedelta
 
+import httpx
 import tenacity
 from tavily import TavilyClient
+from tavily.errors import (
+    BadRequestError,
+    ForbiddenError,
+    InvalidAPIKeyError,
+    UsageLimitExceededError,
+)
 
 from prediction_market_agent_tooling.config import APIKeys
 from prediction_market_agent_tooling.tools.caches.db_cache import db_cache
+from prediction_market_agent_tooling.tools.research_client import (
+    CoalescingTTLCache,
+    ResearchHttpClient,
+    normalise_query_params,
+)
 from prediction_market_agent_tooling.tools.tavily.tavily_models import (
     TavilyResponse,
     TavilyResult,
@@ -13,6 +26,17 @@ from prediction_market_agent_tooling.tools.tavily.tavily_models import (
 
 DEFAULT_SCORE_THRESHOLD = 0.75  # Based on some empirical testing, anything lower wasn't very relevant to the question being asked
 
+TAVILY_API_URL = "https://api.tavily.com"
+TAVILY_TIMEOUT = 60
+# Default sent by `TavilyClient.search`, which has to be overridden when searching by dates.
+TAVILY_DEFAULT_DAYS: int = (
+    inspect.signature(TavilyClient.search).parameters["days"].default
+)
+# Agents often research the same question for related markets within a single run.
+TAVILY_RESPONSE_CACHE: CoalescingTTLCache[dict[str, t.Any]] = CoalescingTTLCache(
+    maxsize=1000, ttl=60 * 60
+)
+
 
 @db_cache(
     max_age=timedelta(days=1),
@@ -65,6 +89,57 @@ def tavily_search(
     return response_parsed
 
 
+@db_cache(
+    max_age=timedelta(days=1),
+    ignore_args=["api_keys"],
+    log_error_on_unsavable_data=False,
+)
+async def atavily_search(
+    query: str,
+    search_depth: t.Literal["basic", "advanced"] = "advanced",
+    topic: t.Literal["general", "news"] = "general",
+    news_since: date | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    max_results: int = 5,
+    include_domains: t.Sequence[str] | None = None,
+    exclude_domains: t.Sequence[str] | None = None,
+    include_answer: bool = True,
+    include_raw_content: bool = True,
+    include_images: bool = True,
+    use_cache: bool = False,
+    api_keys: APIKeys | None = None,
+) -> TavilyResponse:
+    """
+    Async variant of `tavily_search`.
+    """
+    if topic == "news" and news_since is None:
+        raise ValueError("When topic is 'news', news_since must be provided")
+    if topic == "general" and news_since is not None:
+        raise ValueError("When topic is 'general', news_since must be None")
+
+    days = None if news_since is None else (date.today() - news_since).days
+    response = await _atavily_search(
+        query=query,
+        search_depth=search_depth,
+        topic=topic,
+        max_results=max_results,
+        days=days,
+        start_date=start_date,
+        end_date=end_date,
+        include_domains=include_domains,
+        exclude_domains=exclude_domains,
+        include_answer=include_answer,
+        include_raw_content=include_raw_content,
+        include_images=include_images,
+        use_cache=use_cache,
+        api_keys=api_keys,
+    )
+    response_parsed = TavilyResponse.model_validate(response)
+
+    return response_parsed
+
+
 @tenacity.retry(stop=tenacity.stop_after_attempt(3), wait=tenacity.wait_fixed(1))
 def _tavily_search(
     query: str,
@@ -83,30 +158,69 @@ def _tavily_search(
     api_keys: APIKeys | None = None,
 ) -> dict[str, t.Any]:
     """
-    Internal minimalistic wrapper around Tavily's search method, that will retry if the call fails.
+    Internal minimalistic wrapper around Tavily's search endpoint, that will retry if the call fails.
+    Requests go through the shared pooled client and identical concurrent queries are coalesced into one.
     """
-    tavily = TavilyClient(
-        api_key=(api_keys or APIKeys()).tavily_api_key.get_secret_value()
+    payload = _tavily_search_payload(
+        query=query,
+        search_depth=search_depth,
+        topic=topic,
+        days=days,
+        start_date=start_date,
+        end_date=end_date,
+        max_results=max_results,
+        include_domains=include_domains,
+        exclude_domains=exclude_domains,
+        include_answer=include_answer,
+        include_raw_content=include_raw_content,
+        include_images=include_images,
+        use_cache=use_cache,
     )
+    api_key = (api_keys or APIKeys()).tavily_api_key.get_secret_value()
 
-    # Optional args can only be specified if not None, otherwise Tavily
-    # will throw an error. Tavily rejects combining days with start_date/end_date,
-    # and the client always sends days=7 by default, so we must explicitly
-    # override it to None when using start_date/end_date.
-    kwargs: dict[str, t.Any] = {}
-    if start_date is not None or end_date is not None:
-        kwargs["days"] = None
-        if start_date is not None:
-            kwargs["start_date"] = start_date.isoformat()
-        if end_date is not None:
-            kwargs["end_date"] = end_date.isoformat()
-    elif days:
-        kwargs["days"] = days
+    def _post() -> dict[str, t.Any]:
+        response = (
+            ResearchHttpClient()
+            .get_client()
+            .post(
+                f"{TAVILY_API_URL}/search",
+                json=payload,
+                headers=_tavily_headers(api_key),
+                timeout=TAVILY_TIMEOUT,
+            )
+        )
+        return _parse_tavily_response(response)
 
-    response: dict[str, t.Any] = tavily.search(
+    return TAVILY_RESPONSE_CACHE.get_or_compute(normalise_query_params(payload), _post)
+
+
+@tenacity.retry(stop=tenacity.stop_after_attempt(3), wait=tenacity.wait_fixed(1))
+async def _atavily_search(
+    query: str,
+    search_depth: t.Literal["basic", "advanced"],
+    topic: t.Literal["general", "news"],
+    days: int | None,
+    start_date: date | None,
+    end_date: date | None,
+    max_results: int,
+    include_domains: t.Sequence[str] | None,
+    exclude_domains: t.Sequence[str] | None,
+    include_answer: bool,
+    include_raw_content: bool,
+    include_images: bool,
+    use_cache: bool,
+    api_keys: APIKeys | None = None,
+) -> dict[str, t.Any]:
+    """
+    Async variant of `_tavily_search`, sharing the same response cache.
+    """
+    payload = _tavily_search_payload(
         query=query,
         search_depth=search_depth,
         topic=topic,
+        days=days,
+        start_date=start_date,
+        end_date=end_date,
         max_results=max_results,
         include_domains=include_domains,
         exclude_domains=exclude_domains,
@@ -114,9 +228,103 @@ def _tavily_search(
         include_raw_content=include_raw_content,
         include_images=include_images,
         use_cache=use_cache,
-        **kwargs,
     )
-    return response
+    api_key = (api_keys or APIKeys()).tavily_api_key.get_secret_value()
+
+    async def _post() -> dict[str, t.Any]:
+        response = (
+            await ResearchHttpClient()
+            .get_async_client()
+            .post(
+                f"{TAVILY_API_URL}/search",
+                json=payload,
+                headers=_tavily_headers(api_key),
+                timeout=TAVILY_TIMEOUT,
+            )
+        )
+        return _parse_tavily_response(response)
+
+    return await TAVILY_RESPONSE_CACHE.aget_or_compute(
+        normalise_query_params(payload), _post
+    )
+
+
+def _tavily_search_payload(
+    query: str,
+    search_depth: t.Literal["basic", "advanced"],
+    topic: t.Literal["general", "news"],
+    days: int | None,
+    start_date: date | None,
+    end_date: date | None,
+    max_results: int,
+    include_domains: t.Sequence[str] | None,
+    exclude_domains: t.Sequence[str] | None,
+    include_answer: bool,
+    include_raw_content: bool,
+    include_images: bool,
+    use_cache: bool,
+) -> dict[str, t.Any]:
+    # Mirrors the request body built by `TavilyClient.search`, kept in sync by the pinned tavily-python version and tests.
+    payload: dict[str, t.Any] = {
+        "query": query,
+        "search_depth": search_depth,
+        "topic": topic,
+        "time_range": None,
+        "days": TAVILY_DEFAULT_DAYS,
+        "include_answer": include_answer,
+        "include_raw_content": include_raw_content,
+        "max_results": max_results,
+        "include_domains": list(include_domains) if include_domains else None,
+        "exclude_domains": list(exclude_domains) if exclude_domains else None,
+        "include_images": include_images,
+        "use_cache": use_cache,
+    }
+
+    # Tavily rejects combining days with start_date/end_date,
+    # and it defaults to days=7, so we must explicitly
+    # override it to None when using start_date/end_date.
+    if start_date is not None or end_date is not None:
+        payload["days"] = None
+        if start_date is not None:
+            payload["start_date"] = start_date.isoformat()
+        if end_date is not None:
+            payload["end_date"] = end_date.isoformat()
+    elif days:
+        payload["days"] = days
+
+    return payload
+
+
+def _tavily_headers(api_key: str) -> dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}",
+    }
+
+
+def _parse_tavily_response(response: httpx.Response) -> dict[str, t.Any]:
+    # Same error mapping as in `TavilyClient`, so callers can keep catching Tavily's exceptions.
+    if response.status_code == 200:
+        result: dict[str, t.Any] = response.json()
+        result["results"] = result.get("results", [])
+        return result
+
+    detail = ""
+    try:
+        detail = response.json().get("detail", {}).get("error", None)
+    except Exception:
+        pass
+
+    if response.status_code == 429:
+        raise UsageLimitExceededError(detail)
+    elif response.status_code in [403, 432, 433]:
+        raise ForbiddenError(detail)
+    elif response.status_code == 401:
+        raise InvalidAPIKeyError(detail)
+    elif response.status_code == 400:
+        raise BadRequestError(detail)
+    response.raise_for_status()
+    raise ValueError(f"Unexpected response from Tavily: {response.status_code}")
 
 
 def get_relevant_news_since(
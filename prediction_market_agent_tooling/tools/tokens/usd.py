@@ -1,11 +1,17 @@
-from cachetools import TTLCache, cached
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
 from prediction_market_agent_tooling.gtypes import (
     USD,
     ChecksumAddress,
     CollateralToken,
+    Wei,
     xDai,
 )
+from prediction_market_agent_tooling.loggers import logger
 from prediction_market_agent_tooling.markets.omen.omen_constants import (
     SDAI_CONTRACT_ADDRESS,
     WRAPPED_XDAI_CONTRACT_ADDRESS,
@@ -15,8 +21,18 @@ from prediction_market_agent_tooling.markets.polymarket.polymarket_contracts imp
 )
 from prediction_market_agent_tooling.tools.contract import ContractERC4626OnGnosisChain
 from prediction_market_agent_tooling.tools.cow.cow_order import (
-    get_buy_token_amount_else_raise,
+    NoLiquidityAvailableOnCowException,
+    get_quotes,
 )
+from prediction_market_agent_tooling.tools.cow.models import CowQuoteRequest
+from prediction_market_agent_tooling.tools.singleton import SingletonMeta
+
+# A short cache to not spam CoW and prevent timeouts, but still have relatively fresh data.
+USD_RATE_TTL = timedelta(minutes=5)
+# Rates older than the TTL are still used right away, while they are being refreshed in the background.
+USD_RATE_MAX_STALENESS = timedelta(minutes=30)
+# ERC4626 vaults with a USD stablecoin as their asset, their rate is taken directly from the vault instead of calling CoW.
+STABLECOIN_ERC4626_VAULTS = [SDAI_CONTRACT_ADDRESS]
 
 
 def get_usd_in_xdai(amount: USD) -> xDai:
@@ -39,45 +55,148 @@ def get_token_in_usd(amount: CollateralToken, token_address: ChecksumAddress) ->
     return USD(amount.value * rate.value)
 
 
-# A short cache to not spam CoW and prevent timeouts, but still have relatively fresh data.
-@cached(TTLCache(maxsize=100, ttl=5 * 60))
 def get_single_token_to_usd_rate(token_address: ChecksumAddress) -> USD:
-    # (w)xDai and USDC are stablecoins pegged to USD, so use it to estimate USD worth.
-    if token_address in [WRAPPED_XDAI_CONTRACT_ADDRESS, USDCeContract().address]:
-        return USD(1.0)
-    # sDai is ERC4626 with wxDai as asset, we can take the rate directly from there instead of calling CoW.
-    if SDAI_CONTRACT_ADDRESS == token_address:
-        return USD(
-            ContractERC4626OnGnosisChain(address=SDAI_CONTRACT_ADDRESS)
-            .convertToAssets(CollateralToken(1).as_wei)
-            .as_token.value
-        )
-    in_wei = get_buy_token_amount_else_raise(
-        sell_amount=CollateralToken(1).as_wei,
-        sell_token=token_address,
-        buy_token=WRAPPED_XDAI_CONTRACT_ADDRESS,
-    )
-    in_token = in_wei.as_token
-    return USD(in_token.value)
+    return TokenUSDRateOracle().get_token_to_usd_rates([token_address])[token_address]
 
 
-# A short cache to not spam CoW and prevent timeouts, but still have relatively fresh data.
-@cached(TTLCache(maxsize=100, ttl=5 * 60))
 def get_single_usd_to_token_rate(token_address: ChecksumAddress) -> CollateralToken:
-    # (w)xDai and USDC are stablecoins pegged to USD, so use it to estimate USD worth.
-    if token_address in [WRAPPED_XDAI_CONTRACT_ADDRESS, USDCeContract().address]:
-        return CollateralToken(1.0)
-    # sDai is ERC4626 with wxDai as asset, we can take the rate directly from there instead of calling CoW.
-    if SDAI_CONTRACT_ADDRESS == token_address:
-        return CollateralToken(
-            ContractERC4626OnGnosisChain(address=SDAI_CONTRACT_ADDRESS)
-            .convertToShares(CollateralToken(1).as_wei)
-            .as_token.value
+    return TokenUSDRateOracle().get_usd_to_token_rates([token_address])[token_address]
+
+
+def fetch_token_to_usd_rates(
+    token_addresses: t.Sequence[ChecksumAddress],
+) -> dict[ChecksumAddress, USD]:
+    """
+    Fetches USD value of 1 token for all the tokens in one pass:
+    ERC4626 vaults are read in a single batched RPC request and the rest is quoted on CoW concurrently.
+    """
+    rates: dict[ChecksumAddress, USD] = {}
+    vaults: list[ChecksumAddress] = []
+    quoted: list[ChecksumAddress] = []
+    for token_address in token_addresses:
+        # (w)xDai and USDC are stablecoins pegged to USD, so use it to estimate USD worth.
+        if token_address in [WRAPPED_XDAI_CONTRACT_ADDRESS, USDCeContract().address]:
+            rates[token_address] = USD(1.0)
+        elif token_address in STABLECOIN_ERC4626_VAULTS:
+            vaults.append(token_address)
+        else:
+            quoted.append(token_address)
+
+    if vaults:
+        web3 = ContractERC4626OnGnosisChain.get_web3()
+        with web3.batch_requests() as batch:
+            for vault in vaults:
+                batch.add(
+                    ContractERC4626OnGnosisChain(address=vault)
+                    .get_web3_contract(web3)
+                    .functions.convertToAssets(CollateralToken(1).as_wei.value)
+                )
+            # Contract calls in the batch are already decoded into their return values.
+            assets = t.cast(list[int], batch.execute())
+        for vault, vault_assets in zip(vaults, assets):
+            rates[vault] = USD(Wei(vault_assets).as_token.value)
+
+    if quoted:
+        quotes = get_quotes(
+            [
+                CowQuoteRequest(
+                    sell_amount=CollateralToken(1).as_wei,
+                    sell_token=token_address,
+                    buy_token=WRAPPED_XDAI_CONTRACT_ADDRESS,
+                )
+                for token_address in quoted
+            ]
+        )
+        for token_address, quote in zip(quoted, quotes):
+            if quote is None:
+                raise NoLiquidityAvailableOnCowException(
+                    f"Could not get USD rate of {token_address}, no liquidity on CoW."
+                )
+            rates[token_address] = USD(Wei(quote.quote.buyAmount.root).as_token.value)
+
+    return rates
+
+
+class TokenUSDRateOracle(metaclass=SingletonMeta):
+    """
+    Cached USD rates of tokens, resolving all the missing tokens of a lookup in one batched fetch.
+
+    Only the token -> USD rate is cached, USD -> token rate is its inverse.
+    Rates older than `ttl` are returned right away and refreshed in the background (stale-while-revalidate),
+    only rates older than `max_staleness` (or missing ones) block the caller.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta = USD_RATE_TTL,
+        max_staleness: timedelta = USD_RATE_MAX_STALENESS,
+    ) -> None:
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self._lock = threading.Lock()
+        # Rate and the monotonic time it was fetched at.
+        self._rates: dict[ChecksumAddress, tuple[USD, float]] = {}
+        self._refreshing: set[ChecksumAddress] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="usd-rate-refresh"
         )
-    in_wei = get_buy_token_amount_else_raise(
-        sell_amount=CollateralToken(1).as_wei,
-        sell_token=WRAPPED_XDAI_CONTRACT_ADDRESS,
-        buy_token=token_address,
-    )
-    in_token = in_wei.as_token
-    return CollateralToken(in_token.value)
+
+    def get_token_to_usd_rates(
+        self, token_addresses: t.Iterable[ChecksumAddress]
+    ) -> dict[ChecksumAddress, USD]:
+        rates: dict[ChecksumAddress, USD] = {}
+        missing: list[ChecksumAddress] = []
+        stale: list[ChecksumAddress] = []
+        now = time.monotonic()
+        with self._lock:
+            for token_address in dict.fromkeys(token_addresses):
+                cached = self._rates.get(token_address)
+                if (
+                    cached is None
+                    or now - cached[1] > self.max_staleness.total_seconds()
+                ):
+                    missing.append(token_address)
+                    continue
+                rates[token_address] = cached[0]
+                if (
+                    now - cached[1] > self.ttl.total_seconds()
+                    and token_address not in self._refreshing
+                ):
+                    stale.append(token_address)
+                    self._refreshing.add(token_address)
+
+        if stale:
+            self._executor.submit(self._refresh, stale)
+        if missing:
+            rates.update(self._fetch(missing))
+        return rates
+
+    def get_usd_to_token_rates(
+        self, token_addresses: t.Iterable[ChecksumAddress]
+    ) -> dict[ChecksumAddress, CollateralToken]:
+        return {
+            token_address: CollateralToken(1 / rate.value)
+            for token_address, rate in self.get_token_to_usd_rates(
+                token_addresses
+            ).items()
+        }
+
+    def _fetch(
+        self, token_addresses: list[ChecksumAddress]
+    ) -> dict[ChecksumAddress, USD]:
+        rates = fetch_token_to_usd_rates(token_addresses)
+        now = time.monotonic()
+        with self._lock:
+            for token_address, rate in rates.items():
+                self._rates[token_address] = (rate, now)
+        return rates
+
+    def _refresh(self, token_addresses: list[ChecksumAddress]) -> None:
+        try:
+            self._fetch(token_addresses)
+        except Exception as e:
+            # Stale rates are kept, the refresh will be retried on the next lookup.
+            logger.warning(f"Failed to refresh USD rates of {token_addresses}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(token_addresses)
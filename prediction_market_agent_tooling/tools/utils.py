@@ -7,8 +7,10 @@ from math import prod
 from typing import Any, Callable, NoReturn, Optional, Type, TypeVar, cast
 
 import httpx
+import numpy as np
 import pytz
 import requests
+from numpy.typing import ArrayLike, NDArray
 from pydantic import BaseModel, ValidationError
 from pydantic_ai.models import KnownModelName
 from scipy.optimize import newton
@@ -249,7 +251,7 @@ def calculate_sell_amount_in_collateral(
     amount of shares. Returns None if the amount can't be computed.
 
     Taken from https://github.com/protofire/omen-exchange/blob/29d0ab16bdafa5cc0d37933c1c7608a055400c73/app/src/util/tools/fpmm/trading/index.ts#L99
-    Simplified for binary markets.
+    Binary markets are solved in closed form, see `calculate_binary_sell_amounts_in_collateral`.
     """
 
     if shares_to_sell == 0:
@@ -264,6 +266,19 @@ def calculate_sell_amount_in_collateral(
     holdings = pool_balances[outcome_index]
     other_holdings = [v for i, v in enumerate(pool_balances) if i != outcome_index]
 
+    if len(other_holdings) == 1:
+        return CollateralToken(
+            float(
+                calculate_binary_sell_amounts_in_collateral(
+                    shares_to_sell=shares_to_sell.value,
+                    holdings=holdings.value,
+                    other_holdings=other_holdings[0].value,
+                    bet_proportion_fees=fees.bet_proportion,
+                    absolute_fees=fees.absolute,
+                )
+            )
+        )
+
     def f(r: float) -> float:
         R = (r + fees.absolute) / (1 - fees.bet_proportion)
 
@@ -282,6 +297,45 @@ def calculate_sell_amount_in_collateral(
     return CollateralToken(float(amount_to_sell) * 0.999999)  # Avoid rounding errors
 
 
+def calculate_binary_sell_amounts_in_collateral(
+    shares_to_sell: ArrayLike,
+    holdings: ArrayLike,
+    other_holdings: ArrayLike,
+    bet_proportion_fees: ArrayLike = 0.0,
+    absolute_fees: ArrayLike = 0.0,
+) -> NDArray[np.float64]:
+    """
+    Vectorised `calculate_sell_amount_in_collateral` for binary markets, arguments are broadcast against each other,
+    so e.g. all the positions of an account can be valued at once.
+
+    With two outcomes, the sell equation `(h_other - R) * (h + s - R) = h * h_other` is quadratic in `R` (collateral received including the fees),
+    and the amount is its smaller root, the same one Newton's method finds starting from zero.
+    """
+    s, h, h_other, fee_proportion, fee_absolute = np.broadcast_arrays(
+        *(
+            np.asarray(x, dtype=np.float64)
+            for x in (
+                shares_to_sell,
+                holdings,
+                other_holdings,
+                bet_proportion_fees,
+                absolute_fees,
+            )
+        )
+    )
+    if np.any(h <= 0) or np.any(h_other <= 0):
+        raise ValueError("All pool balances must be greater than 0")
+
+    b = h + h_other + s
+    # Smaller root written as `c / (b/2 + sqrt(...))`, because `b/2 - sqrt(...)` loses precision for small sells.
+    R = 2 * h_other * s / (b + np.sqrt(b**2 - 4 * h_other * s))
+    amount_to_sell = R * (1 - fee_proportion) - fee_absolute
+    result: NDArray[np.float64] = np.where(
+        s == 0, 0.0, amount_to_sell * 0.999999  # Avoid rounding errors
+    )
+    return result
+
+
 def extract_error_from_retry_error(e: BaseException | RetryError) -> BaseException:
     if (
         isinstance(e, RetryError)
@@ -0,0 +1,81 @@
+import time
+from math import prod
+
+import numpy as np
+import typer
+from scipy.optimize import newton
+
+from prediction_market_agent_tooling.gtypes import OutcomeToken
+from prediction_market_agent_tooling.markets.market_fees import MarketFees
+from prediction_market_agent_tooling.tools.utils import (
+    calculate_binary_sell_amounts_in_collateral,
+    calculate_sell_amount_in_collateral,
+)
+
+
+def newton_sell_amount(
+    shares_to_sell: float,
+    outcome_index: int,
+    pool_balances: list[float],
+    fees: MarketFees,
+) -> float:
+    # Scalar root finding used before the closed form, as the reference.
+    holdings = pool_balances[outcome_index]
+    other_holdings = [v for i, v in enumerate(pool_balances) if i != outcome_index]
+
+    def f(r: float) -> float:
+        R = (r + fees.absolute) / (1 - fees.bet_proportion)
+        return prod(h - R for h in other_holdings) * (
+            holdings + shares_to_sell - R
+        ) - prod(pool_balances)
+
+    return float(newton(f, 0)) * 0.999999
+
+
+def main(n_positions: int = 10_000, seed: int = 0) -> None:
+    """
+    Compares valuation of `n_positions` binary positions one by one with the Newton solver used before,
+    one by one with the closed form, and all at once with the vectorised closed form.
+    """
+    rng = np.random.default_rng(seed)
+    shares = rng.uniform(0.01, 100, size=n_positions)
+    holdings = rng.uniform(1, 1000, size=n_positions)
+    other_holdings = rng.uniform(1, 1000, size=n_positions)
+    fees = MarketFees.get_zero_fees(bet_proportion=0.02)
+
+    start = time.perf_counter()
+    newton_one_by_one = [
+        newton_sell_amount(
+            shares_to_sell=s, outcome_index=0, pool_balances=[h, o], fees=fees
+        )
+        for s, h, o in zip(shares, holdings, other_holdings)
+    ]
+    newton_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    closed_form_one_by_one = [
+        calculate_sell_amount_in_collateral(
+            shares_to_sell=OutcomeToken(s),
+            outcome_index=0,
+            pool_balances=[OutcomeToken(h), OutcomeToken(o)],
+            fees=fees,
+        ).value
+        for s, h, o in zip(shares, holdings, other_holdings)
+    ]
+    closed_form_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorised = calculate_binary_sell_amounts_in_collateral(
+        shares, holdings, other_holdings, bet_proportion_fees=fees.bet_proportion
+    )
+    vectorised_seconds = time.perf_counter() - start
+
+    assert np.allclose(newton_one_by_one, closed_form_one_by_one)
+    assert np.allclose(newton_one_by_one, vectorised)
+    print(f"Newton, one by one: {newton_seconds:.4f}s")
+    print(f"Closed form, one by one: {closed_form_seconds:.4f}s")
+    print(f"Closed form, vectorised: {vectorised_seconds:.4f}s")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -4,6 +4,7 @@ from web3 import Web3
 from prediction_market_agent_tooling.config import APIKeys
 from prediction_market_agent_tooling.gtypes import Wei, private_key_type
 from prediction_market_agent_tooling.loggers import logger
+from prediction_market_agent_tooling.markets.omen.data_models import OmenMarketId
 from prediction_market_agent_tooling.markets.omen.omen_contracts import (
     OmenThumbnailMapping,
 )
@@ -22,7 +23,8 @@ def main(
     """
     keys = APIKeys(BET_FROM_PRIVATE_KEY=private_key_type(private_key))
 
-    markets = OmenSubgraphHandler().get_omen_markets(
+    markets = OmenSubgraphHandler().get_omen_markets_projected(
+        OmenMarketId,
         limit=None,
         creator=keys.bet_from_address,
         liquidity_bigger_than=Wei(0),
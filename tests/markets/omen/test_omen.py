@@ -1,5 +1,6 @@
 import sys
 from typing import Sequence
+from unittest.mock import MagicMock, patch
 
 import numpy as np
 import pytest
@@ -7,11 +8,18 @@ from eth_account import Account
 from eth_typing import ChecksumAddress, HexAddress, HexStr
 from web3 import Web3
 
-from prediction_market_agent_tooling.gtypes import USD, CollateralToken, OutcomeToken
+from prediction_market_agent_tooling.gtypes import (
+    USD,
+    CollateralToken,
+    OutcomeStr,
+    OutcomeToken,
+)
 from prediction_market_agent_tooling.markets.agent_market import FilterBy, SortBy
 from prediction_market_agent_tooling.markets.omen.data_models import (
     OmenBet,
     OmenMarket,
+    OmenPosition,
+    OmenUserPosition,
     OutcomeWei,
     calculate_marginal_prices,
 )
@@ -24,6 +32,7 @@ from prediction_market_agent_tooling.markets.omen.omen_subgraph_handler import (
     OmenSubgraphHandler,
 )
 from prediction_market_agent_tooling.tools.contract import ContractOnGnosisChain
+from prediction_market_agent_tooling.tools.hexbytes_custom import HexBytes
 from prediction_market_agent_tooling.tools.transaction_cache import (
     TransactionBlockCache,
 )
@@ -136,15 +145,13 @@ def test_get_positions_1() -> None:
     Uses a mocked USD conversion to avoid flaky failures from live CoW API.
     The full integration version lives in tests_integration/markets/omen/test_get_positions.py.
     """
-    from unittest.mock import patch
-
     # Pick a user that has active positions
     user_address = Web3.to_checksum_address(
         "0xf758C18402ddEf2d231911C4C326Aa46510788f0"
     )
     with patch(
-        "prediction_market_agent_tooling.markets.omen.omen.get_token_in_usd",
-        side_effect=lambda x, _: USD(x.value),
+        "prediction_market_agent_tooling.markets.omen.omen.OmenAgentMarket.get_token_in_usd_rates",
+        side_effect=lambda markets: {m.id: USD(1) for m in markets},
     ):
         positions = OmenAgentMarket.get_positions(user_id=user_address)
         liquid_positions = OmenAgentMarket.get_positions(
@@ -166,8 +173,8 @@ def test_get_positions_1() -> None:
     )
 
     with patch(
-        "prediction_market_agent_tooling.markets.omen.omen.get_token_in_usd",
-        side_effect=lambda x, _: USD(x.value),
+        "prediction_market_agent_tooling.markets.omen.omen.OmenAgentMarket.get_token_in_usd_rates",
+        side_effect=lambda markets: {m.id: USD(1) for m in markets},
     ):
         large_positions = OmenAgentMarket.get_positions(
             user_id=user_address, larger_than=min_amount_position_ot
@@ -333,3 +340,86 @@ def pick_binary_market(
         collateral_token_address_in=collateral_token_address_in,
         include_categorical_markets=False,
     )[0]
+
+
+def test_get_sell_values_of_positions_falls_back_to_chain() -> None:
+    local_market, chain_market, closed_market = MagicMock(), MagicMock(), MagicMock()
+    local_market.get_sell_values_of_outcome_tokens.return_value = {
+        "Yes": CollateralToken(1)
+    }
+    chain_market.get_sell_values_of_outcome_tokens.side_effect = ValueError(
+        "All pool balances must be greater than 0"
+    )
+    chain_market.get_sell_value_of_outcome_token.return_value = CollateralToken(2)
+    closed_market.can_be_traded.return_value = False
+
+    sell_values = OmenAgentMarket._get_sell_values_of_positions(
+        [
+            (local_market, {OutcomeStr("Yes"): OutcomeToken(3)}),
+            (chain_market, {OutcomeStr("No"): OutcomeToken(3)}),
+            (closed_market, {OutcomeStr("No"): OutcomeToken(3)}),
+        ]
+    )
+
+    assert sell_values == [
+        {"Yes": CollateralToken(1)},
+        {"No": CollateralToken(2)},
+        {"No": CollateralToken(3)},
+    ]
+    local_market.get_sell_value_of_outcome_token.assert_not_called()
+
+
+def test_get_positions_for_markets_queries_only_given_markets() -> None:
+    market, other_market = MagicMock(spec=OmenAgentMarket), MagicMock(
+        spec=OmenAgentMarket
+    )
+    for m, i in [(market, 1), (other_market, 2)]:
+        m.id = f"0x{i:040x}"
+        m.condition = MagicMock(id=HexBytes(f"0x{i:064x}"))
+        m.get_liquidatable_amount.return_value = OutcomeToken(0.1)
+        m.can_be_traded.return_value = True
+    market.index_set_to_outcome_str.return_value = OutcomeStr("Yes")
+    position = OmenPosition(
+        id=HexBytes("0x" + "aa" * 32),
+        conditionIds=[market.condition.id],
+        collateralTokenAddress=HexAddress(HexStr("0x" + "bb" * 20)),
+        indexSets=[1],
+    )
+    user_address = Web3.to_checksum_address("0x" + "cc" * 20)
+
+    with patch(
+        "prediction_market_agent_tooling.markets.omen.omen.OmenSubgraphHandler"
+    ) as sgh_class, patch.object(
+        OmenAgentMarket,
+        "_get_sell_values_of_positions",
+        return_value=[{OutcomeStr("Yes"): CollateralToken(1)}],
+    ), patch.object(
+        OmenAgentMarket, "get_token_in_usd_rates", return_value={market.id: USD(2)}
+    ):
+        sgh = sgh_class.return_value
+        sgh.get_positions.return_value = [position]
+        sgh.get_user_positions.return_value = [
+            OmenUserPosition(
+                id=HexBytes("0x" + "dd" * 32),
+                position=position,
+                balance=OutcomeWei(0),
+                wrappedBalance=OutcomeWei(0),
+                totalBalance=OutcomeToken(3).as_outcome_wei,
+            )
+        ]
+        positions = OmenAgentMarket.get_positions_for_markets(
+            user_id=user_address, markets=[market, other_market]
+        )
+
+    # User's positions are queried only within the conditions of the given markets, not the whole wallet.
+    sgh.get_positions.assert_called_once_with(
+        condition_id_in=[market.condition.id, other_market.condition.id]
+    )
+    assert sgh.get_user_positions.call_args.kwargs["position_id_in"] == [position.id]
+    assert positions[other_market.id] is None
+    assert check_not_none(positions[market.id]).amounts_ot == {
+        OutcomeStr("Yes"): OutcomeToken(3)
+    }
+    assert check_not_none(positions[market.id]).amounts_current == {
+        OutcomeStr("Yes"): USD(2)
+    }
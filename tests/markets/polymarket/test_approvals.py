@@ -0,0 +1,124 @@
+import typing as t
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import SecretStr
+
+from prediction_market_agent_tooling.config import APIKeys
+from prediction_market_agent_tooling.gtypes import USD, Wei, private_key_type
+from prediction_market_agent_tooling.markets.polymarket.approvals import (
+    ApprovalStateCache,
+    PolymarketApprovalState,
+)
+from prediction_market_agent_tooling.markets.polymarket.clob_manager import (
+    POLYMARKET_EXCHANGES,
+    ClobManager,
+)
+
+OWNER = APIKeys(
+    BET_FROM_PRIVATE_KEY=private_key_type("0x" + "11" * 32)
+).bet_from_address
+
+
+@pytest.fixture(params=["memory", "database"])
+def approvals(request: pytest.FixtureRequest, tmp_path: t.Any) -> ApprovalStateCache:
+    return ApprovalStateCache(
+        SecretStr(f"sqlite:///{tmp_path}/approvals.db")
+        if request.param == "database"
+        else None
+    )
+
+
+@pytest.fixture
+def db_approvals(tmp_path: t.Any) -> ApprovalStateCache:
+    return ApprovalStateCache(SecretStr(f"sqlite:///{tmp_path}/approvals.db"))
+
+
+def test_allowance_is_decreased_by_trades(approvals: ApprovalStateCache) -> None:
+    spender = POLYMARKET_EXCHANGES[0]
+    assert not approvals.is_approved(OWNER, spender, Wei(1))
+
+    approvals.set_approved(OWNER, spender, Wei(100))
+    assert approvals.is_approved(OWNER, spender, Wei(10))
+
+    approvals.record_spent(OWNER, [spender], Wei(95))
+    assert not approvals.is_approved(OWNER, spender, Wei(10))
+    assert approvals.is_approved(OWNER, spender, Wei(5))
+
+
+def test_state_is_persisted(db_approvals: ApprovalStateCache) -> None:
+    spender = POLYMARKET_EXCHANGES[0]
+    db_approvals.set_approved(OWNER, spender, Wei(100))
+    assert db_approvals.is_approved(OWNER, spender, Wei(10))
+
+    db_approvals.invalidate(OWNER)
+    assert not db_approvals.is_approved(OWNER, spender, Wei(10))
+
+
+def test_spending_by_other_process_is_seen(db_approvals: ApprovalStateCache) -> None:
+    spender = POLYMARKET_EXCHANGES[0]
+    db_approvals.set_approved(OWNER, spender, Wei(100))
+
+    # Another process sharing the wallet and the database spends most of the allowance.
+    db_approvals._persist(
+        PolymarketApprovalState(
+            id=db_approvals._key(OWNER, spender),
+            usdc_allowance_wei=str(5),
+            ctf_approved=True,
+        )
+    )
+
+    assert not db_approvals.is_approved(OWNER, spender, Wei(10))
+    db_approvals.record_spent(OWNER, [spender], Wei(3))
+    assert not db_approvals.is_approved(OWNER, spender, Wei(3))
+    assert db_approvals.is_approved(OWNER, spender, Wei(2))
+
+
+@patch("prediction_market_agent_tooling.markets.polymarket.clob_manager.RPCConfig")
+@patch("prediction_market_agent_tooling.markets.polymarket.clob_manager.ClobSession")
+@patch(
+    "prediction_market_agent_tooling.markets.polymarket.clob_manager.PolymarketConditionalTokenContract"
+)
+@patch("prediction_market_agent_tooling.markets.polymarket.clob_manager.USDCeContract")
+@patch(
+    "prediction_market_agent_tooling.markets.polymarket.clob_manager.handle_allowance"
+)
+@patch(
+    "prediction_market_agent_tooling.markets.polymarket.clob_manager.ApprovalStateCache"
+)
+def test_steady_state_orders_do_not_check_approvals(
+    mock_approvals_cls: MagicMock,
+    mock_handle_allowance: MagicMock,
+    mock_usdc_cls: MagicMock,
+    mock_ctf_cls: MagicMock,
+    mock_session_cls: MagicMock,
+    mock_rpc_config_cls: MagicMock,
+    approvals: ApprovalStateCache,
+) -> None:
+    mock_approvals_cls.return_value = approvals
+    mock_handle_allowance.return_value = Wei(int(100 * 1e6))
+    mock_session_cls.return_value.get_client.return_value.post_order.return_value = {
+        "errorMsg": "",
+        "orderID": "1",
+        "transactionsHashes": [],
+        "status": "matched",
+        "success": True,
+    }
+    manager = ClobManager(
+        APIKeys(BET_FROM_PRIVATE_KEY=private_key_type("0x" + "11" * 32))
+    )
+
+    manager.prewarm_approvals()
+    assert mock_handle_allowance.call_count == len(POLYMARKET_EXCHANGES)
+    assert mock_ctf_cls.return_value.approve_if_not_approved.call_count == len(
+        POLYMARKET_EXCHANGES
+    )
+
+    for _ in range(3):
+        manager.place_buy_market_order(token_id=1, usdc_amount=USD(10))
+    assert mock_handle_allowance.call_count == len(POLYMARKET_EXCHANGES)
+
+    # Allowance got spent below the threshold, so it's re-checked on-chain.
+    manager.place_buy_market_order(token_id=1, usdc_amount=USD(70))
+    manager.place_buy_market_order(token_id=1, usdc_amount=USD(10))
+    assert mock_handle_allowance.call_count == 2 * len(POLYMARKET_EXCHANGES)
@@ -0,0 +1,104 @@
+import threading
+import time
+import typing as t
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from prediction_market_agent_tooling.markets.polymarket.clob_manager import ClobSession
+from prediction_market_agent_tooling.markets.polymarket.data_models import (
+    PolymarketGammaMarket,
+    PolymarketGammaResponseDataItem,
+    PolymarketGammaTag,
+)
+from prediction_market_agent_tooling.tools.hexbytes_custom import HexBytes
+from prediction_market_agent_tooling.tools.utils import utcnow
+from tests.utils import LocalJsonRequest, LocalJsonServer
+
+SPORTS_FEE_BPS = 200
+
+
+class FakeClob:
+    """
+    Local stand-in for the CLOB's fee-rate endpoint: sports tokens (< 1000) have a fee, everything else is free.
+    """
+
+    def __init__(self, delay: float = 0.1) -> None:
+        self.requested_token_ids: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._server = LocalJsonServer(self._route)
+        self.url = self._server.url
+
+    def _route(self, request: LocalJsonRequest) -> tuple[int, t.Any]:
+        token_id = int(parse_qs(urlparse(request.path).query)["token_id"][0])
+        with self._lock:
+            self.requested_token_ids.append(token_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return 200, {"base_fee": SPORTS_FEE_BPS if token_id < 1000 else 0}
+
+    def close(self) -> None:
+        self._server.close()
+
+
+@pytest.fixture
+def fake_clob() -> t.Generator[FakeClob, None, None]:
+    clob = FakeClob()
+    yield clob
+    clob.close()
+
+
+def _gamma_item(
+    id: int, token_id: int, tags: list[str]
+) -> PolymarketGammaResponseDataItem:
+    return PolymarketGammaResponseDataItem(
+        id=str(id),
+        slug=f"event-{id}",
+        title=f"Event {id}",
+        archived=False,
+        closed=False,
+        active=True,
+        markets=[
+            PolymarketGammaMarket(
+                conditionId=HexBytes(id.to_bytes(32, "big")),
+                outcomes='["Yes","No"]',
+                marketMakerAddress="0xABC",
+                createdAt=utcnow(),
+                archived=False,
+                clobTokenIds=f"[{token_id}, {token_id + 1}]",
+                question=f"Question {id}?",
+            )
+        ],
+        tags=[PolymarketGammaTag(label=tag, slug=tag) for tag in tags],
+    )
+
+
+def test_fee_rates_are_resolved_once_per_category(fake_clob: FakeClob) -> None:
+    items = (
+        [_gamma_item(i, i, ["sports"]) for i in range(1, 100)]
+        + [_gamma_item(i, 10_000 + i, ["politics"]) for i in range(100, 200)]
+        # Events without tags can not be grouped, so they are resolved one by one.
+        + [_gamma_item(i, 20_000 + i, []) for i in range(200, 205)]
+    )
+    session = ClobSession(host=fake_clob.url)
+
+    start = time.monotonic()
+    fees = session.get_fee_rates_for_gamma_items(items)
+    elapsed = time.monotonic() - start
+
+    assert len(fake_clob.requested_token_ids) == 7
+    assert fake_clob.max_in_flight > 1
+    # 7 lookups with 0.1s latency each, done concurrently.
+    assert elapsed < 0.5
+    assert fees["1"] == fees["99"] == SPORTS_FEE_BPS / 100 / 100
+    assert fees["100"] == fees["204"] == 0
+
+    # Second listing is served from the category cache.
+    session.get_fee_rates_for_gamma_items([_gamma_item(300, 300, ["sports"])])
+    assert len(fake_clob.requested_token_ids) == 7
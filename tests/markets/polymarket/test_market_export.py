@@ -1,14 +1,23 @@
 import json
+import sys
+import typing as t
 from datetime import timedelta
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from prediction_market_agent_tooling.gtypes import USD, OutcomeStr, Probability
 from prediction_market_agent_tooling.markets.data_models import Resolution
 from prediction_market_agent_tooling.markets.market_fees import MarketFees
 from prediction_market_agent_tooling.markets.polymarket.market_export import (
+    ExportCheckpoint,
+    ExportFormat,
     MarketExportData,
     export_market,
     export_markets_batch,
     export_markets_to_json,
+    stream_export_markets,
 )
 from prediction_market_agent_tooling.markets.polymarket.polymarket import (
     PolymarketAgentMarket,
@@ -16,6 +25,8 @@ from prediction_market_agent_tooling.markets.polymarket.polymarket import (
 from prediction_market_agent_tooling.tools.utils import utcnow
 from tests.markets.polymarket.conftest import MOCK_CONDITION_ID
 
+MARKET_EXPORT = "prediction_market_agent_tooling.markets.polymarket.market_export"
+
 
 def _make_market(**overrides: object) -> PolymarketAgentMarket:
     now = utcnow()
@@ -199,3 +210,107 @@ def test_export_market_condition_id_format() -> None:
     market = _make_market()
     exported = export_market(market)
     assert exported.condition_id.startswith("0x")
+
+
+def _gamma_pages(
+    n_pages: int, page_size: int, fail_at_page: int | None = None
+) -> t.Callable[..., t.Iterator[tuple[int, list[MagicMock]]]]:
+    def iter_pages(
+        start_offset: int = 0, **kwargs: t.Any
+    ) -> t.Iterator[tuple[int, list[MagicMock]]]:
+        for offset in range(start_offset, n_pages * page_size, page_size):
+            if fail_at_page is not None and offset == fail_at_page * page_size:
+                raise RuntimeError("Connection lost")
+            items = [MagicMock(id=f"id-{i}") for i in range(offset, offset + page_size)]
+            yield offset + page_size, items
+
+    return iter_pages
+
+
+def _export_items(items: list[MagicMock], *args: t.Any) -> list[MarketExportData]:
+    return [export_market(_make_market(id=item.id)) for item in items]
+
+
+@patch(f"{MARKET_EXPORT}._export_gamma_items", side_effect=_export_items)
+@patch(
+    f"{MARKET_EXPORT}.PolymarketAgentMarket._fetch_conditions_and_fees",
+    return_value=({}, {}),
+)
+def test_stream_export_ndjson_resumes_after_failure(
+    mock_fetch: MagicMock, mock_export: MagicMock, tmp_path: Path
+) -> None:
+    output_path = str(tmp_path / "markets.ndjson")
+
+    with patch(
+        f"{MARKET_EXPORT}.iter_polymarkets_pages",
+        side_effect=_gamma_pages(n_pages=3, page_size=3, fail_at_page=2),
+    ):
+        with pytest.raises(RuntimeError):
+            stream_export_markets(output_path)
+    # Simulate a line that was being written when the export got interrupted.
+    with open(output_path, "a") as f:
+        f.write('{"source": "polym')
+
+    with patch(
+        f"{MARKET_EXPORT}.iter_polymarkets_pages",
+        side_effect=_gamma_pages(n_pages=3, page_size=3),
+    ) as mock_iter:
+        checkpoint = stream_export_markets(output_path)
+
+    assert mock_iter.call_args.kwargs["start_offset"] == 6
+    assert checkpoint.finished
+    assert checkpoint.exported_markets == 9
+    with open(output_path) as f:
+        market_ids = [
+            MarketExportData.model_validate_json(line).market_id for line in f
+        ]
+    assert market_ids == [f"id-{i}" for i in range(9)]
+
+
+@patch(f"{MARKET_EXPORT}._export_gamma_items", side_effect=_export_items)
+@patch(
+    f"{MARKET_EXPORT}.PolymarketAgentMarket._fetch_conditions_and_fees",
+    return_value=({}, {}),
+)
+def test_stream_export_parquet(
+    mock_fetch: MagicMock, mock_export: MagicMock, tmp_path: Path
+) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    output_path = str(tmp_path / "markets.parquet")
+
+    with patch(
+        f"{MARKET_EXPORT}.iter_polymarkets_pages",
+        side_effect=_gamma_pages(n_pages=4, page_size=3, fail_at_page=3),
+    ):
+        with pytest.raises(RuntimeError):
+            stream_export_markets(
+                output_path, export_format=ExportFormat.PARQUET, parquet_rows_per_part=4
+            )
+    checkpoint = ExportCheckpoint.load(output_path)
+    # Second page completed the first part, the third page is in the unfinished part.
+    assert checkpoint is not None
+    assert checkpoint.offset == 6 and checkpoint.parquet_parts == 1
+
+    with patch(
+        f"{MARKET_EXPORT}.iter_polymarkets_pages",
+        side_effect=_gamma_pages(n_pages=4, page_size=3),
+    ):
+        stream_export_markets(
+            output_path, export_format=ExportFormat.PARQUET, parquet_rows_per_part=4
+        )
+
+    table = pq.read_table(output_path)
+    assert sorted(table.column("market_id").to_pylist()) == sorted(
+        f"id-{i}" for i in range(12)
+    )
+    assert dict(table.column("probabilities")[0].as_py()) == {"Yes": 0.6, "No": 0.4}
+
+
+def test_stream_export_parquet_without_pyarrow(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="extras `parquet`"):
+        stream_export_markets(
+            str(tmp_path / "markets.parquet"), export_format=ExportFormat.PARQUET
+        )
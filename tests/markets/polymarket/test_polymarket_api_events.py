@@ -1,15 +1,29 @@
+import threading
+import time
+import typing as t
 from unittest.mock import MagicMock, patch
 
 import pytest
 import tenacity
 
 from prediction_market_agent_tooling.markets.polymarket.api import (
+    GAMMA_EVENT_CACHE,
+    get_gamma_event_by_condition_id,
     get_gamma_event_by_id,
     get_gamma_event_by_slug,
+    get_gamma_events_by_slugs,
 )
 from prediction_market_agent_tooling.markets.polymarket.data_models import (
     PolymarketGammaResponseDataItem,
 )
+from prediction_market_agent_tooling.tools.hexbytes_custom import HexBytes
+
+
+@pytest.fixture(autouse=True)
+def clear_event_cache() -> t.Generator[None, None, None]:
+    GAMMA_EVENT_CACHE.clear()
+    yield
+    GAMMA_EVENT_CACHE.clear()
 
 
 def _mock_event_json() -> dict[str, object]:
@@ -81,3 +95,42 @@ def test_get_gamma_event_by_slug_empty_raises(mock_client_cls: MagicMock) -> Non
 
     with pytest.raises(tenacity.RetryError):
         get_gamma_event_by_slug("nonexistent-slug")
+
+
+@patch("prediction_market_agent_tooling.markets.polymarket.api.HttpxCachedClient")
+def test_events_are_shared_between_getters(mock_client_cls: MagicMock) -> None:
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def get(url: str, params: dict[str, str]) -> MagicMock:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        event = _mock_event_json() | {
+            "id": params["slug"].removeprefix("slug-"),
+            "slug": params["slug"],
+        }
+        mock_response = MagicMock()
+        mock_response.json.return_value = [event]
+        return mock_response
+
+    client = mock_client_cls.return_value.get_client.return_value
+    client.get.side_effect = get
+    slugs = [f"slug-{i}" for i in range(20)]
+
+    events = get_gamma_events_by_slugs(slugs + slugs[:5])
+
+    assert list(events) == slugs
+    assert client.get.call_count == len(slugs)
+    assert max_in_flight > 1
+
+    # Subsequent lookups by any of the keys are served from the cache.
+    assert get_gamma_event_by_slug("slug-3").id == "3"
+    assert get_gamma_event_by_id("7").slug == "slug-7"
+    assert get_gamma_event_by_condition_id(HexBytes("0xabc123")).markets is not None
+    assert client.get.call_count == len(slugs)
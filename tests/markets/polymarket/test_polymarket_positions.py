@@ -147,7 +147,7 @@ def test_get_token_balance_no(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.PolymarketSubgraphHandler"
 )
 @patch(
-    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_event_by_slug"
+    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_events_by_slugs"
 )
 @patch(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.get_user_positions"
@@ -166,7 +166,7 @@ def test_get_positions_empty(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.PolymarketSubgraphHandler"
 )
 @patch(
-    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_event_by_slug"
+    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_events_by_slugs"
 )
 @patch(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.get_user_positions"
@@ -184,7 +184,7 @@ def test_get_positions_groups_by_condition_id(
         _make_position_response(cid1, "Yes", 0, size=10.0, current_value=8.0),
         _make_position_response(cid1, "No", 1, size=5.0, current_value=3.0),
     ]
-    mock_get_event.return_value = mock_gamma_response
+    mock_get_event.side_effect = lambda slugs: {s: mock_gamma_response for s in slugs}
     mock_subgraph_cls.return_value.get_conditions.return_value = [mock_condition_model]
 
     result = list(PolymarketAgentMarket.get_positions(user_id=MOCK_USER_ID))
@@ -200,7 +200,7 @@ def test_get_positions_groups_by_condition_id(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.PolymarketSubgraphHandler"
 )
 @patch(
-    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_event_by_slug"
+    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_events_by_slugs"
 )
 @patch(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.get_user_positions"
@@ -218,7 +218,7 @@ def test_get_positions_larger_than_filters(
         _make_position_response(cid1, "Yes", 0, size=0.5, current_value=0.3),
         _make_position_response(cid1, "No", 1, size=0.2, current_value=0.1),
     ]
-    mock_get_event.return_value = mock_gamma_response
+    mock_get_event.side_effect = lambda slugs: {s: mock_gamma_response for s in slugs}
     mock_subgraph_cls.return_value.get_conditions.return_value = [mock_condition_model]
 
     result = list(
@@ -234,7 +234,7 @@ def test_get_positions_larger_than_filters(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.PolymarketSubgraphHandler"
 )
 @patch(
-    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_event_by_slug"
+    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_events_by_slugs"
 )
 @patch(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.get_user_positions"
@@ -253,7 +253,7 @@ def test_get_positions_liquid_only_skips_non_tradable(
 
     # Make the market closed so can_be_traded() returns False
     mock_gamma_response.closed = True
-    mock_get_event.return_value = mock_gamma_response
+    mock_get_event.side_effect = lambda slugs: {s: mock_gamma_response for s in slugs}
     mock_subgraph_cls.return_value.get_conditions.return_value = [mock_condition_model]
 
     result = list(
@@ -318,7 +318,7 @@ def test_liquidate_no_positions_does_nothing(
 # ── get_binary_market ────────────────────────────────────────────────────
 
 
-@patch("prediction_market_agent_tooling.markets.polymarket.polymarket.ClobManager")
+@patch("prediction_market_agent_tooling.markets.polymarket.polymarket.ClobSession")
 @patch(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.PolymarketSubgraphHandler"
 )
@@ -328,13 +328,15 @@ def test_liquidate_no_positions_does_nothing(
 def test_get_binary_market(
     mock_get_event: MagicMock,
     mock_subgraph_cls: MagicMock,
-    mock_clob_cls: MagicMock,
+    mock_clob_session_cls: MagicMock,
     mock_gamma_response: MagicMock,
     mock_condition_model: MagicMock,
 ) -> None:
     mock_get_event.return_value = mock_gamma_response
     mock_subgraph_cls.return_value.get_conditions.return_value = [mock_condition_model]
-    mock_clob_cls.return_value.get_token_fee_rate.return_value = 0.01
+    mock_clob_session_cls.return_value.get_fee_rates_for_gamma_items.side_effect = (
+        lambda items: {i.id: 0.01 for i in items}
+    )
 
     market = PolymarketAgentMarket.get_binary_market(id=MOCK_CONDITION_ID.to_0x_hex())
 
@@ -342,7 +344,9 @@ def test_get_binary_market(
     assert market.id == MOCK_CONDITION_ID.to_0x_hex()
     assert market.condition_id == MOCK_CONDITION_ID
     mock_get_event.assert_called_once_with(MOCK_CONDITION_ID)
-    mock_clob_cls.return_value.get_token_fee_rate.assert_called_once_with(111)
+    mock_clob_session_cls.return_value.get_fee_rates_for_gamma_items.assert_called_once_with(
+        [mock_gamma_response]
+    )
 
 
 # ── Multi-inner-market tests ───────────────────────────────────────────
@@ -352,7 +356,7 @@ def test_get_binary_market(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.PolymarketSubgraphHandler"
 )
 @patch(
-    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_event_by_slug"
+    "prediction_market_agent_tooling.markets.polymarket.polymarket.get_gamma_events_by_slugs"
 )
 @patch(
     "prediction_market_agent_tooling.markets.polymarket.polymarket.get_user_positions"
@@ -375,7 +379,9 @@ def test_get_positions_multi_inner_market(
             cid2, "Yes", 0, size=5.0, current_value=3.0, event_slug="who-wins"
         ),
     ]
-    mock_get_event.return_value = mock_multi_market_gamma_response
+    mock_get_event.side_effect = lambda slugs: {
+        s: mock_multi_market_gamma_response for s in slugs
+    }
     mock_subgraph_cls.return_value.get_conditions.return_value = list(
         mock_multi_condition_dict.values()
     )
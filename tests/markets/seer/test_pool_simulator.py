@@ -0,0 +1,121 @@
+import math
+
+import pytest
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import Wei
+from prediction_market_agent_tooling.markets.seer.pool_simulator import (
+    MAX_SQRT_RATIO,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MIN_TICK,
+    Q96,
+    ConcentratedLiquidityPool,
+    get_sqrt_ratio_at_tick,
+)
+from prediction_market_agent_tooling.markets.seer.subgraph_data_models import SwaprTick
+
+TOKEN0 = Web3.to_checksum_address("0x" + "01" * 20)
+TOKEN1 = Web3.to_checksum_address("0x" + "02" * 20)
+FEE = 3000
+L1 = 10**21
+L2 = 2 * 10**21
+
+
+def sqrt_price(tick: int) -> float:
+    return float(1.0001 ** (tick / 2))
+
+
+def make_pool(ticks: dict[int, int], fee: int = FEE) -> ConcentratedLiquidityPool:
+    return ConcentratedLiquidityPool(
+        token0=TOKEN0,
+        token1=TOKEN1,
+        sqrt_price_x96=Q96,
+        liquidity=sum(net for tick, net in ticks.items() if tick <= 0),
+        tick=0,
+        fee=fee,
+        ticks=[
+            SwaprTick(tickIdx=tick, liquidityNet=net) for tick, net in ticks.items()
+        ],
+    )
+
+
+def test_get_sqrt_ratio_at_tick() -> None:
+    assert get_sqrt_ratio_at_tick(0) == Q96
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    for tick in [-50_000, -600, -1, 1, 600, 50_000]:
+        assert get_sqrt_ratio_at_tick(tick) / Q96 == pytest.approx(
+            sqrt_price(tick), rel=1e-12
+        )
+    with pytest.raises(ValueError):
+        get_sqrt_ratio_at_tick(MAX_TICK + 1)
+
+
+def test_quote_within_single_range() -> None:
+    pool = make_pool({-600: L1, 600: -L1})
+    amount_in = 10**18
+
+    amount_in_less_fee = amount_in * (1 - FEE / 1_000_000)
+    next_sqrt_price = 1 + amount_in_less_fee / L1
+    expected = L1 * (1 - 1 / next_sqrt_price)
+
+    assert pool.quote_exact_input(TOKEN1, Wei(amount_in)).value == pytest.approx(
+        expected, rel=1e-9
+    )
+
+
+def test_quote_crossing_ticks() -> None:
+    pool = make_pool({-600: L1, 600: L2 - L1, 1200: -L2})
+    amount_in = 5 * 10**19
+    amount_in_less_fee = amount_in * (1 - FEE / 1_000_000)
+
+    # First range is swapped through completely, rest goes into the deeper range.
+    first_range_in = L1 * (sqrt_price(600) - 1)
+    assert amount_in_less_fee > first_range_in
+    next_sqrt_price = sqrt_price(600) + (amount_in_less_fee - first_range_in) / L2
+    expected = L1 * (1 - 1 / sqrt_price(600)) + L2 * (
+        1 / sqrt_price(600) - 1 / next_sqrt_price
+    )
+
+    assert pool.quote_exact_input(TOKEN1, Wei(amount_in)).value == pytest.approx(
+        expected, rel=1e-6
+    )
+
+
+def test_quote_crossing_ticks_is_symmetric() -> None:
+    pool = make_pool({-600: L1, 600: L2 - L1, 1200: -L2})
+    mirrored_pool = make_pool({-1200: L2, -600: L1 - L2, 600: -L1})
+    amount_in = Wei(5 * 10**19)
+
+    assert mirrored_pool.quote_exact_input(TOKEN0, amount_in).value == pytest.approx(
+        pool.quote_exact_input(TOKEN1, amount_in).value, rel=1e-9
+    )
+
+
+def test_quote_is_capped_by_liquidity() -> None:
+    pool = make_pool({-600: L1, 600: -L1})
+    token0_in_range = L1 * (1 - 1 / sqrt_price(600))
+
+    amount_out = pool.quote_exact_input(TOKEN1, Wei(10**30))
+    assert amount_out.value == pytest.approx(token0_in_range, rel=1e-9)
+    assert pool.quote_exact_input(TOKEN1, Wei(10**31)) == amount_out
+
+
+def test_price_impact() -> None:
+    pool = make_pool({-600: L1, 600: -L1})
+    assert pool.spot_price(TOKEN0) == pytest.approx(1)
+
+    impacts = [
+        pool.price_impact(TOKEN1, Wei(amount)) for amount in [10**15, 10**18, 10**19]
+    ]
+    # Small swaps only pay the fee.
+    assert impacts[0] == pytest.approx(FEE / 1_000_000, rel=1e-2)
+    assert impacts == sorted(impacts)
+    assert not math.isclose(impacts[0], impacts[-1])
+
+
+def test_unknown_token() -> None:
+    pool = make_pool({-600: L1, 600: -L1})
+    with pytest.raises(ValueError):
+        pool.quote_exact_input(Web3.to_checksum_address("0x" + "03" * 20), Wei(10**18))
@@ -0,0 +1,196 @@
+import typing as t
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import Wei
+from prediction_market_agent_tooling.markets.agent_market import FilterBy, SortBy
+from prediction_market_agent_tooling.markets.base_subgraph_handler import LazyModel
+from prediction_market_agent_tooling.markets.seer import seer
+from prediction_market_agent_tooling.markets.seer.data_models import (
+    SeerMarketWithQuestions,
+)
+from prediction_market_agent_tooling.markets.seer.seer import SeerAgentMarket
+from prediction_market_agent_tooling.markets.seer.swap_router import (
+    SwapVenue,
+    VenueQuote,
+)
+
+SELL_TOKEN = Web3.to_checksum_address("0x" + "aa" * 20)
+BUY_TOKEN = Web3.to_checksum_address("0x" + "bb" * 20)
+
+
+def _raw_seer_market(i: int, outcomes_supply: int) -> dict[str, t.Any]:
+    # Shape of a market as returned by the subgraph, with its questions attached.
+    return {
+        "id": f"0x{i:040x}",
+        "creator": "0x" + "ab" * 20,
+        "marketName": f"Will {i} happen?",
+        "outcomes": ["Yes", "No", "Invalid result"],
+        "wrappedTokens": ["0x" + f"{j:040x}" for j in range(3)],
+        "parentOutcome": 0,
+        "parentMarket": None,
+        "templateId": 2,
+        "collateralToken": "0x" + "cd" * 20,
+        "conditionId": "0x" + f"{i:064x}",
+        "openingTs": 1800000000,
+        "blockTimestamp": 1700000000,
+        "hasAnswers": False,
+        "payoutReported": False,
+        "payoutNumerators": [],
+        "outcomesSupply": str(outcomes_supply),
+        "questions": [],
+    }
+
+
+class FakeSeerSubgraphHandler:
+    lazy_markets: list[LazyModel[SeerMarketWithQuestions]] = []
+
+    def get_markets_lazy(
+        self, **kwargs: t.Any
+    ) -> list[LazyModel[SeerMarketWithQuestions]]:
+        return self.lazy_markets
+
+
+def test_get_markets_drops_markets_without_outcome_supply_before_validation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    FakeSeerSubgraphHandler.lazy_markets = [
+        LazyModel(
+            _raw_seer_market(i, outcomes_supply=10**18 if i % 2 else 0),
+            SeerMarketWithQuestions,
+        )
+        for i in range(10)
+    ]
+    monkeypatch.setattr(seer, "SeerSubgraphHandler", FakeSeerSubgraphHandler)
+    monkeypatch.setattr(
+        SeerAgentMarket,
+        "from_data_model_with_subgraph",
+        staticmethod(
+            lambda model, seer_subgraph, must_have_prices: Mock(
+                id=model.id.to_0x_hex(), has_liquidity=Mock(return_value=True)
+            )
+        ),
+    )
+
+    markets = SeerAgentMarket.get_markets(
+        limit=10, sort_by=SortBy.NONE, filter_by=FilterBy.OPEN
+    )
+
+    assert [m.id for m in markets] == [
+        m.validate().id.to_0x_hex() for m in FakeSeerSubgraphHandler.lazy_markets[1::2]
+    ]
+    # Markets without outcome tokens were never validated.
+    assert all(m._validated is None for m in FakeSeerSubgraphHandler.lazy_markets[::2])
+
+
+class FakeSwapRouter:
+    def __init__(self, best_venue: SwapVenue) -> None:
+        self.best_venue = best_venue
+        self.executed: list[SwapVenue] = []
+
+    def get_quotes(self, **kwargs: t.Any) -> list[VenueQuote]:
+        return []
+
+    def choose(self, quotes: list[VenueQuote]) -> Mock:
+        return Mock(venue=self.best_venue)
+
+    def execute(self, venue: SwapVenue, swap: t.Callable[[], str]) -> str:
+        self.executed.append(venue)
+        return swap()
+
+
+@pytest.mark.parametrize(
+    "best_venue, cow_error, pool_error, has_liquidity, expected_venues, expected_result",
+    [
+        (SwapVenue.COW, None, None, True, [SwapVenue.COW], "cow"),
+        (SwapVenue.SWAPR, None, None, True, [SwapVenue.SWAPR], "pool"),
+        (
+            SwapVenue.SWAPR,
+            None,
+            ValueError("pool failed"),
+            True,
+            [SwapVenue.SWAPR, SwapVenue.COW],
+            "cow",
+        ),
+        (
+            SwapVenue.COW,
+            TimeoutError("order expired"),
+            None,
+            True,
+            [SwapVenue.COW, SwapVenue.SWAPR],
+            "pool",
+        ),
+        # Not enough balance isn't retried at the other venue.
+        (
+            SwapVenue.COW,
+            TimeoutError("InsufficientBalance"),
+            None,
+            True,
+            [SwapVenue.COW],
+            TimeoutError,
+        ),
+        # Pools aren't tried without liquidity.
+        (
+            SwapVenue.COW,
+            TimeoutError("order expired"),
+            None,
+            False,
+            [SwapVenue.COW],
+            TimeoutError,
+        ),
+        # Only the expected CoW errors are retried.
+        (
+            SwapVenue.COW,
+            ValueError("unexpected"),
+            None,
+            True,
+            [SwapVenue.COW],
+            ValueError,
+        ),
+        (
+            SwapVenue.SWAPR,
+            TimeoutError("order expired"),
+            ValueError("pool failed"),
+            True,
+            [SwapVenue.SWAPR, SwapVenue.COW],
+            TimeoutError,
+        ),
+    ],
+)
+def test_swap_tokens_with_fallback(
+    monkeypatch: pytest.MonkeyPatch,
+    best_venue: SwapVenue,
+    cow_error: Exception | None,
+    pool_error: Exception | None,
+    has_liquidity: bool,
+    expected_venues: list[SwapVenue],
+    expected_result: str | type[Exception],
+) -> None:
+    router = FakeSwapRouter(best_venue)
+    monkeypatch.setattr(seer, "SeerSwapRouter", lambda: router)
+    market = Mock(spec=SeerAgentMarket)
+    market.id = "0x" + "11" * 20
+    market._swap_tokens_via_cow = Mock(side_effect=cow_error, return_value="cow")
+    market._swap_tokens_via_pool = Mock(side_effect=pool_error, return_value="pool")
+    market.has_liquidity = Mock(return_value=has_liquidity)
+    market._can_fall_back_to = partial(SeerAgentMarket._can_fall_back_to, market)
+
+    def swap() -> str:
+        return SeerAgentMarket._swap_tokens_with_fallback(
+            market,
+            sell_token=SELL_TOKEN,
+            buy_token=BUY_TOKEN,
+            amount_wei=Wei(1),
+            api_keys=Mock(),
+            web3=None,
+        )
+
+    if isinstance(expected_result, str):
+        assert swap() == expected_result
+    else:
+        with pytest.raises(expected_result):
+            swap()
+    assert router.executed == expected_venues
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import Wei
+from prediction_market_agent_tooling.markets.seer import swap_router
+from prediction_market_agent_tooling.markets.seer.swap_router import (
+    VENUE_PRIORS,
+    SeerSwapRouter,
+    SwapVenue,
+    VenueHistory,
+    VenueQuote,
+)
+from prediction_market_agent_tooling.tools.cow.cow_order import (
+    NoLiquidityAvailableOnCowException,
+)
+
+SELL_TOKEN = Web3.to_checksum_address("0x" + "aa" * 20)
+BUY_TOKEN = Web3.to_checksum_address("0x" + "bb" * 20)
+
+
+def _quote(venue: SwapVenue, amount_out: int, history: VenueHistory) -> VenueQuote:
+    return VenueQuote(
+        venue=venue,
+        amount_out=Wei(amount_out),
+        fill_probability=history.fill_probability(venue),
+        expected_latency=history.expected_latency(venue),
+    )
+
+
+def test_venue_history() -> None:
+    history = VenueHistory(maxlen=10)
+    assert history.fill_probability(SwapVenue.COW) == pytest.approx(
+        VENUE_PRIORS[SwapVenue.COW].fill_probability
+    )
+    assert (
+        history.expected_latency(SwapVenue.COW) == VENUE_PRIORS[SwapVenue.COW].latency
+    )
+
+    for _ in range(10):
+        history.record(SwapVenue.COW, filled=False, latency=timedelta(minutes=2))
+    assert history.fill_probability(SwapVenue.COW) < 0.3
+    assert history.expected_latency(SwapVenue.COW) > timedelta(minutes=1)
+    # Other venues aren't affected.
+    assert history.fill_probability(SwapVenue.SWAPR) == pytest.approx(
+        VENUE_PRIORS[SwapVenue.SWAPR].fill_probability
+    )
+
+
+def test_choose_venue() -> None:
+    history = VenueHistory(maxlen=11)
+    router = SeerSwapRouter(history)
+
+    # Similar quotes, the pool settles faster and more reliably.
+    best = router.choose(
+        [
+            _quote(SwapVenue.COW, 1_000_000, history),
+            _quote(SwapVenue.SWAPR, 990_000, history),
+        ]
+    )
+    assert best is not None and best.venue == SwapVenue.SWAPR
+
+    # Better price is worth the wait.
+    best = router.choose(
+        [
+            _quote(SwapVenue.COW, 1_050_000, history),
+            _quote(SwapVenue.SWAPR, 990_000, history),
+        ]
+    )
+    assert best is not None and best.venue == SwapVenue.COW
+
+    # Unless the CoW orders keep expiring.
+    for _ in range(11):
+        history.record(SwapVenue.COW, filled=False, latency=timedelta(minutes=2))
+    best = router.choose(
+        [
+            _quote(SwapVenue.COW, 1_050_000, history),
+            _quote(SwapVenue.SWAPR, 990_000, history),
+        ]
+    )
+    assert best is not None and best.venue == SwapVenue.SWAPR
+
+    assert router.choose([]) is None
+
+
+def test_get_quotes_skips_failed_venues(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def no_liquidity(**kwargs: object) -> None:
+        raise NoLiquidityAvailableOnCowException("NoLiquidity")
+
+    quoter = Mock()
+    quoter.return_value.quote_exact_input_single.return_value = (Wei(5), Wei(0))
+    monkeypatch.setattr(swap_router, "get_quote_async_no_retry", no_liquidity)
+    monkeypatch.setattr(swap_router, "SwaprQuoterContract", quoter)
+
+    router = SeerSwapRouter(VenueHistory(maxlen=12))
+    quotes = router.get_quotes(SELL_TOKEN, BUY_TOKEN, Wei(10))
+
+    assert [(q.venue, q.amount_out) for q in quotes] == [(SwapVenue.SWAPR, Wei(5))]
+
+
+def test_execute_records_outcome() -> None:
+    history = VenueHistory(maxlen=13)
+    router = SeerSwapRouter(history)
+
+    assert router.execute(SwapVenue.SWAPR, lambda: "0xhash") == "0xhash"
+
+    def failing_swap() -> str:
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        router.execute(SwapVenue.COW, failing_swap)
+
+    assert history.fill_probability(SwapVenue.SWAPR) > history.fill_probability(
+        SwapVenue.COW
+    )
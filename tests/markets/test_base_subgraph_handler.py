@@ -0,0 +1,259 @@
+import threading
+import time
+import typing as t
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from pydantic import BaseModel
+from subgrounds.query import (
+    Argument,
+    DataRequest,
+    Document,
+    InputValue,
+    Query,
+    Selection,
+)
+from subgrounds.schema import TypeMeta
+
+from prediction_market_agent_tooling.markets.base_subgraph_handler import (
+    BaseSubgraphHandler,
+    fields_for_model,
+    split_time_window,
+)
+from prediction_market_agent_tooling.markets.omen.data_models import (
+    Condition,
+    OmenMarket,
+    OmenMarketId,
+)
+from prediction_market_agent_tooling.tools.datetime_utc import DatetimeUTC
+from prediction_market_agent_tooling.tools.utils import utc_datetime
+
+START = utc_datetime(2024, 1, 1)
+
+
+class Item(BaseModel):
+    id: str
+    timestamp: DatetimeUTC
+
+
+def test_split_time_window() -> None:
+    end = START + timedelta(days=25)
+    slices = split_time_window(
+        START, DatetimeUTC.from_datetime(end), timedelta(days=10)
+    )
+    assert slices == [
+        (START, START + timedelta(days=10)),
+        (START + timedelta(days=10), START + timedelta(days=20)),
+        (START + timedelta(days=20), end),
+    ]
+    assert split_time_window(START, START, timedelta(days=1)) == [(START, START)]
+    with pytest.raises(ValueError):
+        split_time_window(START, START, timedelta(0))
+
+
+def test_query_time_sliced(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BET_FROM_PRIVATE_KEY", "0x" + "11" * 32)
+    # Item every 12 hours, also exactly at the boundaries of the slices.
+    items = [
+        Item(
+            id=str(i),
+            timestamp=DatetimeUTC.from_datetime(START + timedelta(hours=12 * i)),
+        )
+        for i in range(60)
+    ]
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def fetch(start: DatetimeUTC, end: DatetimeUTC) -> list[Item]:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return [i for i in items if start <= i.timestamp <= end]
+
+    result = BaseSubgraphHandler().query_time_sliced(
+        fetch=fetch,
+        start_time=START,
+        end_time=items[-1].timestamp,
+        slice_duration=timedelta(days=3),
+        key=lambda item: item.id,
+    )
+
+    assert result == items
+    assert max_in_flight > 1
+
+
+class FakeFieldPath:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __getattr__(self, name: str) -> "FakeFieldPath":
+        return FakeFieldPath(f"{self.path}.{name}")
+
+
+class OmenMarketCondition(OmenMarketId):
+    condition: Condition | None
+
+
+def test_fields_for_model() -> None:
+    fields = fields_for_model(FakeFieldPath("markets"), OmenMarketId)
+    assert [f.path for f in fields] == ["markets.id"]
+
+    nested_fields = fields_for_model(FakeFieldPath("markets"), OmenMarketCondition)
+    assert [f.path for f in nested_fields] == [
+        "markets.id",
+        "markets.condition.id",
+        "markets.condition.outcomeSlotCount",
+    ]
+
+    full_fields = {
+        f.path for f in fields_for_model(FakeFieldPath("markets"), OmenMarket)
+    }
+    assert {
+        "markets.question.title",
+        "markets.outcomeTokenMarginalPrices",
+    } <= full_fields
+
+
+def _raw_omen_market(i: int) -> dict[str, t.Any]:
+    # Shape of a market as returned by the subgraph.
+    return {
+        "id": f"0x{i:040x}",
+        "title": f"Will {i} happen?",
+        "creator": "0x" + "ab" * 20,
+        "category": "crypto",
+        "collateralVolume": "1000000000000000000",
+        "liquidityParameter": "2000000000000000000",
+        "usdVolume": "1.5",
+        "collateralToken": "0x" + "cd" * 20,
+        "outcomes": ["Yes", "No"],
+        "outcomeTokenAmounts": ["1000000000000000000", "3000000000000000000"],
+        "outcomeTokenMarginalPrices": ["0.75", "0.25"],
+        "fee": "20000000000000000",
+        "resolutionTimestamp": None,
+        "answerFinalizedTimestamp": None,
+        "currentAnswer": None,
+        "creationTimestamp": 1700000000,
+        "condition": {"id": "0x" + f"{i:064x}", "outcomeSlotCount": 2},
+        "question": {
+            "id": "0x" + f"{i:064x}",
+            "title": f"Will {i} happen?",
+            "data": f'Will {i} happen?␟"Yes","No"␟crypto␟en',
+            "templateId": 2,
+            "outcomes": ["Yes", "No"],
+            "isPendingArbitration": False,
+            "timeout": 86400,
+            "openingTimestamp": 1800000000,
+            "answerFinalizedTimestamp": None,
+            "currentAnswer": None,
+        },
+    }
+
+
+def test_do_query_lazy_validation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BET_FROM_PRIVATE_KEY", "0x" + "11" * 32)
+    raw_markets = [_raw_omen_market(i) for i in range(3000)]
+    handler = BaseSubgraphHandler()
+    monkeypatch.setattr(
+        handler.sg, "query_json", lambda fields: [{"markets": raw_markets}]
+    )
+
+    start = time.monotonic()
+    markets = handler.do_query(fields=[], pydantic_model=OmenMarket)
+    eager_elapsed = time.monotonic() - start
+    assert markets == [OmenMarket.model_validate(m) for m in raw_markets]
+
+    start = time.monotonic()
+    lazy_markets = handler.do_query_lazy(fields=[], pydantic_model=OmenMarket)
+    # Filter on the raw data, as a caller would, and validate only the survivors.
+    selected = [
+        m.validate() for m in lazy_markets if m.raw["title"].endswith("0 happen?")
+    ]
+    lazy_elapsed = time.monotonic() - start
+
+    assert selected == markets[::10]
+    assert selected[0] is lazy_markets[0].validate()
+    assert lazy_elapsed < eager_elapsed
+
+
+def _field_meta(name: str, type_name: str, kind: str) -> TypeMeta.FieldMeta:
+    return TypeMeta.FieldMeta(
+        name=name, description="", args=[], type={"name": type_name, "kind": kind}
+    )
+
+
+def _market_request(market_id: str, block: dict[str, int] | None) -> DataRequest:
+    arguments = [Argument("id", InputValue.String(market_id))]
+    if block is not None:
+        arguments.append(
+            Argument(
+                "block",
+                InputValue.Object({k: InputValue.Int(v) for k, v in block.items()}),
+            )
+        )
+    selection = Selection(
+        _field_meta("market", "Market", "OBJECT"),
+        arguments=arguments,
+        selection=[Selection(_field_meta("id", "ID", "SCALAR"))],
+    )
+    return DataRequest(
+        documents=[Document("http://subgraph", Query(selection=[selection]))]
+    )
+
+
+class CachedSubgraphHandler(BaseSubgraphHandler):
+    QUERY_CACHE_TTLS = {"market": timedelta(seconds=0.2)}
+
+
+def test_query_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BET_FROM_PRIVATE_KEY", "0x" + "11" * 32)
+    handler = CachedSubgraphHandler()
+    handler.query_cache.clear()
+    sent: list[Mock] = []
+
+    def query_json(fields: list[Mock]) -> list[dict[str, t.Any]]:
+        sent.append(fields[0])
+        return [{"market": {"id": fields[0].market_id}}]
+
+    monkeypatch.setattr(handler, "_query_json_uncached", query_json)
+    monkeypatch.setattr(
+        handler.sg,
+        "mk_request",
+        lambda fields: _market_request(fields[0].market_id, fields[0].block),
+    )
+
+    def query(market_id: str, block: dict[str, int] | None = None) -> None:
+        fields = [Mock(market_id=market_id, block=block)]
+        assert handler.sg.query_json(fields) == [{"market": {"id": market_id}}]
+
+    query("0xa")
+    query("0xa")
+    query("0xb")
+    assert [f.market_id for f in sent] == ["0xa", "0xb"]
+
+    # Results of the latest block expire.
+    time.sleep(0.3)
+    query("0xa")
+    assert [f.market_id for f in sent] == ["0xa", "0xb", "0xa"]
+
+    # Pinned to a specific block, cached indefinitely; unlike queries relative to the latest block.
+    query("0xa", block={"number": 5})
+    query("0xa", block={"number_gte": 5})
+    time.sleep(0.3)
+    sent.clear()
+    query("0xa", block={"number": 5})
+    query("0xa", block={"number_gte": 5})
+    query("0xa", block={"number_gte": 5})
+    assert [f.block for f in sent] == [{"number_gte": 5}]
+
+    # Query classes without TTL aren't cached.
+    monkeypatch.setattr(handler, "QUERY_CACHE_TTLS", {})
+    sent.clear()
+    query("0xa")
+    query("0xa")
+    assert len(sent) == 2
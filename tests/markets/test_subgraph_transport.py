@@ -0,0 +1,93 @@
+import threading
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from subgrounds.errors import GraphQLError
+
+from prediction_market_agent_tooling.markets.subgraph_transport import (
+    PooledSubgraphTransport,
+    TransportSubgrounds,
+    endpoint_name,
+)
+from tests.utils import LocalJsonRequest, LocalJsonServer
+
+
+class FakeSubgraph:
+    """
+    Local stand-in for a subgraph endpoint, answering every query with its id, or with an error for `fail` queries.
+    """
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.client_ports: set[int] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._server = LocalJsonServer(
+            self._route, path="/api/secret-key/subgraphs/id/abc"
+        )
+        self.url = self._server.url
+
+    def _route(self, request: LocalJsonRequest) -> tuple[int, t.Any]:
+        with self._lock:
+            self.client_ports.add(request.client_port)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        query = request.body["query"]
+        if query == "http-error":
+            return 500, None
+        if query == "fail":
+            return 200, {"errors": ["invalid query"]}
+        return 200, {"data": {"result": query}}
+
+    def close(self) -> None:
+        self._server.close()
+
+
+@pytest.fixture
+def fake_subgraph() -> t.Generator[FakeSubgraph, None, None]:
+    subgraph = FakeSubgraph()
+    yield subgraph
+    subgraph.close()
+
+
+def test_endpoint_name_hides_api_key() -> None:
+    assert (
+        endpoint_name("https://gateway.thegraph.com/api/secret-key/subgraphs/id/abc")
+        == "gateway.thegraph.com/abc"
+    )
+
+
+def test_pooled_transport(fake_subgraph: FakeSubgraph) -> None:
+    transport = PooledSubgraphTransport(max_concurrent_requests_per_endpoint=3)
+    sg = TransportSubgrounds(transport=transport)
+
+    # Sequential requests re-use the same connection.
+    for i in range(5):
+        assert sg._fetch(fake_subgraph.url, {"query": str(i)}) == {"result": str(i)}
+    assert len(fake_subgraph.client_ports) == 1
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(
+            executor.map(
+                lambda i: sg._fetch(fake_subgraph.url, {"query": str(i)}), range(20)
+            )
+        )
+    assert results == [{"result": str(i)} for i in range(20)]
+    assert fake_subgraph.max_in_flight == 3
+
+    with pytest.raises(GraphQLError):
+        sg._fetch(fake_subgraph.url, {"query": "fail"})
+    with pytest.raises(httpx.HTTPStatusError):
+        sg._fetch(fake_subgraph.url, {"query": "http-error"})
+
+    stats = transport.latency_stats()[endpoint_name(fake_subgraph.url)]
+    assert stats.requests == 27
+    assert stats.failures == 1
+    assert stats.max_seconds >= stats.mean_seconds >= 0.05
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+import typing as t
+from unittest.mock import Mock
+
+import pytest
+
+from prediction_market_agent_tooling.deploy.agent import (
+    DeployablePredictionAgent,
+    DeployableTraderAgent,
+)
+from prediction_market_agent_tooling.deploy.betting_strategy import BettingStrategy
+from prediction_market_agent_tooling.gtypes import (
+    USD,
+    CollateralToken,
+    OutcomeStr,
+    Probability,
+)
+from prediction_market_agent_tooling.markets.agent_market import (
+    AgentMarket,
+    ProcessedMarket,
+)
+from prediction_market_agent_tooling.markets.data_models import (
+    CategoricalProbabilisticAnswer,
+    PlacedTrade,
+    Trade,
+    TradeType,
+)
+from prediction_market_agent_tooling.markets.market_type import MarketType
+
+
+class ConcurrentAgent(DeployablePredictionAgent):
+    bet_on_n_markets_per_run = 5
+    max_concurrent_markets = 3
+
+    def load(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.processed_ids: list[str] = []
+
+    async def abefore_process_markets(self, market_type: MarketType) -> None:
+        pass
+
+    async def aget_markets(self, market_type: MarketType) -> t.Sequence[AgentMarket]:
+        markets = []
+        for i in range(20):
+            market = Mock(spec=AgentMarket)
+            market.id = str(i)
+            market.url = f"https://example.com/{i}"
+            markets.append(market)
+        return markets
+
+    async def abefore_process_market(
+        self, market_type: MarketType, market: AgentMarket
+    ) -> None:
+        pass
+
+    async def aprocess_market(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        verify_market: bool = True,
+    ) -> ProcessedMarket | None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        # Skip every other market, to verify that only the successful ones are counted.
+        if int(market.id) % 2:
+            return None
+        self.processed_ids.append(market.id)
+        return ProcessedMarket(
+            answer=CategoricalProbabilisticAnswer(
+                probabilities={OutcomeStr("Yes"): Probability(1.0)},
+                confidence=1.0,
+            ),
+            trades=[],
+        )
+
+    async def aafter_process_market(
+        self,
+        market_type: MarketType,
+        market: AgentMarket,
+        processed_market: ProcessedMarket | None,
+    ) -> None:
+        pass
+
+
+class AsyncAnswerAgent(DeployablePredictionAgent):
+    async def aanswer_categorical_market(
+        self, market: AgentMarket
+    ) -> CategoricalProbabilisticAnswer | None:
+        return None
+
+
+class SyncHooksTraderAgent(DeployableTraderAgent):
+    def answer_categorical_market(
+        self, market: AgentMarket
+    ) -> CategoricalProbabilisticAnswer | None:
+        return CategoricalProbabilisticAnswer(
+            probabilities={
+                OutcomeStr("Yes"): Probability(0.8),
+                OutcomeStr("No"): Probability(0.2),
+            },
+            confidence=1.0,
+        )
+
+    def get_betting_strategy(self, market: AgentMarket) -> BettingStrategy:
+        strategy = Mock(spec=BettingStrategy)
+        strategy.is_market_supported.return_value = True
+        strategy.calculate_trades.return_value = [
+            Trade(trade_type=TradeType.BUY, outcome=OutcomeStr("Yes"), amount=USD(1))
+        ]
+        return strategy
+
+
+def test_arun_processes_markets_concurrently() -> None:
+    agent = ConcurrentAgent(enable_langfuse=False, store_predictions=False)
+    asyncio.run(agent.arun(MarketType.METACULUS))
+
+    assert 1 < agent.max_in_flight <= agent.max_concurrent_markets
+    assert len(agent.processed_ids) == agent.bet_on_n_markets_per_run
+
+
+def test_arun_rejects_unsupported_market() -> None:
+    agent = ConcurrentAgent(enable_langfuse=False, store_predictions=False)
+    with pytest.raises(ValueError):
+        asyncio.run(agent.arun(MarketType.OMEN))
+
+
+def test_async_answer_hook_enables_categorical_markets() -> None:
+    assert AsyncAnswerAgent(enable_langfuse=False).fetch_categorical_markets
+
+
+def test_trader_default_aprocess_market() -> None:
+    blocking_call_threads: list[threading.Thread] = []
+
+    def blocking(result: t.Any) -> t.Callable[..., t.Any]:
+        def call(*args: t.Any, **kwargs: t.Any) -> t.Any:
+            blocking_call_threads.append(threading.current_thread())
+            return result
+
+        return call
+
+    market = Mock(spec=AgentMarket)
+    market.id = "0"
+    market.url = "https://example.com/0"
+    market.question = "Will it happen?"
+    market.outcomes = [OutcomeStr("Yes"), OutcomeStr("No")]
+    market.parent = None
+    market.is_binary = False
+    market.is_scalar = False
+    market.get_liquidity.side_effect = blocking(CollateralToken(10))
+    market.get_user_id.side_effect = blocking("0x0")
+    market.get_position.side_effect = blocking(None)
+    market.can_be_traded.side_effect = blocking(True)
+    market.buy_tokens.side_effect = blocking("trade-id")
+
+    agent = SyncHooksTraderAgent(
+        enable_langfuse=False, store_predictions=False, store_trades=False
+    )
+    processed_market = asyncio.run(
+        agent.aprocess_market(MarketType.OMEN, market, verify_market=False)
+    )
+
+    assert processed_market is not None
+    assert processed_market.answer.probabilities[OutcomeStr("Yes")] == 0.8
+    assert processed_market.trades == [
+        PlacedTrade(
+            trade_type=TradeType.BUY,
+            outcome=OutcomeStr("Yes"),
+            amount=USD(1),
+            id="trade-id",
+        )
+    ]
+    assert agent.run_context.have_bet_on_market(market)
+    # None of the blocking market calls ran on the event loop's thread.
+    assert len(blocking_call_threads) == 5
+    assert threading.main_thread() not in blocking_call_threads
@@ -1,4 +1,7 @@
+import os
 import tempfile
+import threading
+import time
 from datetime import timedelta
 
 import pytest
@@ -365,3 +368,195 @@ def test_market_probable_resolution() -> None:
         active_flag_from_polymarket=True,
         fees=MarketFees(trading_fee_rate=0.1),
     ).probable_resolution == Resolution(outcome=OutcomeStr("Yes"), invalid=False)
+
+
+class SlowAgent(bm.AbstractBenchmarkedAgent):
+    def __init__(self, agent_name: str, max_workers: int) -> None:
+        super().__init__(agent_name=agent_name, max_workers=max_workers)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        # First `max_workers` calls wait for each other, so the test fails (instead of flaking) if they don't run concurrently.
+        self.barrier = threading.Barrier(max_workers, timeout=5)
+
+    def check_and_predict(self, market_question: str) -> bm.Prediction:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            wait_for_others = self.calls < self.barrier.parties
+            self.calls += 1
+        if wait_for_others:
+            self.barrier.wait()
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return bm.Prediction(is_predictable=False)
+
+
+def _open_market(question: str) -> PolymarketAgentMarket:
+    return PolymarketAgentMarket(
+        description=None,
+        id=question,
+        event_id="1",
+        volume=None,
+        url="url",
+        question=question,
+        outcomes=[OutcomeStr("Yes"), OutcomeStr("No")],
+        probabilities={
+            OutcomeStr("Yes"): Probability(0.1),
+            OutcomeStr("No"): Probability(0.9),
+        },
+        close_time=utcnow() + timedelta(hours=48),
+        resolution=None,
+        created_time=utcnow() - timedelta(hours=48),
+        outcome_token_pool=None,
+        condition_id=MOCK_CONDITION_ID,
+        liquidity_usd=USD(1),
+        token_ids=[1, 2],
+        closed_flag_from_polymarket=False,
+        active_flag_from_polymarket=True,
+        fees=MarketFees(trading_fee_rate=0.1),
+    )
+
+
+def test_benchmark_run_agents_concurrently() -> None:
+    agents = [SlowAgent("slow_1", max_workers=1), SlowAgent("slow_2", max_workers=3)]
+    markets = [_open_market(f"Question {i}?") for i in range(10)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = f"{tmpdir}/cache.json"
+        benchmarker = bm.Benchmarker(
+            markets=markets,
+            agents=list(agents),
+            cache_path=cache_path,
+            max_workers=8,
+            compact_every=4,
+        )
+        benchmarker.run_agents()
+
+        assert agents[0].max_in_flight == 1
+        assert agents[1].max_in_flight == 3
+        # Everything got compacted into the cache file at the end of the run.
+        assert not os.path.exists(bm.PredictionsCache.log_path(cache_path))
+        loaded = bm.PredictionsCache.load(cache_path)
+        assert all(len(loaded.predictions[a.agent_name]) == 10 for a in agents)
+
+
+def test_cache_log_replay() -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = f"{tmpdir}/cache.json"
+        cache = bm.PredictionsCache(predictions={})
+        cache.append(cache_path, "foo", "Q1?", bm.Prediction())
+        cache.save(cache_path)
+        cache.append(cache_path, "foo", "Q2?", bm.Prediction(is_predictable=False))
+        # Simulate a crash in the middle of writing an entry.
+        with open(bm.PredictionsCache.log_path(cache_path), "a") as f:
+            f.write('{"agent_name": "foo", "quest')
+
+        assert bm.PredictionsCache.exists(cache_path)
+        with open(bm.PredictionsCache.log_path(cache_path)) as f:
+            log_before_load = f.read()
+        loaded = bm.PredictionsCache.load(cache_path)
+        assert loaded == cache
+        # Loading doesn't rewrite anything on disk.
+        with open(bm.PredictionsCache.log_path(cache_path)) as f:
+            assert f.read() == log_before_load
+
+        # Entries appended after the recovery survive another crash.
+        loaded.append(cache_path, "foo", "Q3?", bm.Prediction())
+        assert bm.PredictionsCache.load(cache_path).has_market("foo", "Q3?")
+
+
+def _answer(p_yes: float, confidence: float) -> CategoricalProbabilisticAnswer:
+    return CategoricalProbabilisticAnswer(
+        probabilities={
+            OutcomeStr("Yes"): Probability(p_yes),
+            OutcomeStr("No"): Probability(1 - p_yes),
+        },
+        confidence=confidence,
+    )
+
+
+def test_compute_metrics() -> None:
+    # Market has p_yes=0.1.
+    markets = [_open_market(f"Question {i}?") for i in range(3)]
+    predictions = {
+        "good": {
+            "Question 0?": bm.Prediction(outcome_prediction=_answer(0.1, 0.9)),
+            "Question 1?": bm.Prediction(
+                outcome_prediction=_answer(0.2, 0.5), time=2.0
+            ),
+            "Question 2?": bm.Prediction(is_predictable=False, time=4.0),
+        },
+        "skipping": {m.question: bm.Prediction(is_predictable=False) for m in markets},
+    }
+    benchmarker = bm.Benchmarker(
+        markets=markets,
+        agents=[DummyAgent(), DummyAgentNoPrediction()],
+        metric_fns={"Answered": lambda predictions, markets: len(predictions)},
+    )
+    benchmarker.predictions = bm.PredictionsCache(
+        predictions={
+            "dummy": predictions["good"],
+            "dummy_no_prediction": predictions["skipping"],
+        }
+    )
+
+    metrics = benchmarker.compute_metrics()
+
+    assert metrics["Agents"] == ["dummy", "dummy_no_prediction"]
+    assert metrics["Answered"] == [3, 3]
+    assert metrics["MSE for `p_yes`"] == [pytest.approx(0.02), None]
+    assert metrics["Mean confidence"] == [pytest.approx(0.7), None]
+    assert metrics["% within +-0.05"] == [50.0, None]
+    assert metrics["% within +-0.2"] == [100.0, None]
+    assert metrics["% correct outcome"] == [100.0, None]
+    assert metrics["% precision for `yes`"] == [100.0, None]
+    assert metrics["confidence/p_yes error correlation"] == [
+        pytest.approx(-1.0),
+        None,
+    ]
+    assert metrics["Proportion answerable"] == [pytest.approx(2 / 3), 0.0]
+    assert metrics["Proportion answered"] == [pytest.approx(2 / 3), 0.0]
+    assert metrics["Mean time (s)"] == [3.0, None]
+
+
+def test_compute_metrics_reads_each_market_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    n_markets, n_agents = 300, 30
+    market = _open_market("Question?")
+    markets = [
+        market.model_copy(update={"question": f"Question {i}?"})
+        for i in range(n_markets)
+    ]
+    agents = [SlowAgent(f"agent_{i}", max_workers=1) for i in range(n_agents)]
+    prediction = bm.Prediction(outcome_prediction=_answer(0.3, 0.5), time=1.0)
+    benchmarker = bm.Benchmarker(markets=markets, agents=list(agents))
+    benchmarker.predictions = bm.PredictionsCache(
+        predictions={
+            a.agent_name: {m.question: prediction for m in markets} for a in agents
+        }
+    )
+
+    resolution_reads = 0
+    probable_resolution = PolymarketAgentMarket.probable_resolution
+
+    def counting_probable_resolution(self: PolymarketAgentMarket) -> Resolution:
+        nonlocal resolution_reads
+        resolution_reads += 1
+        resolution: Resolution = probable_resolution.fget(self)  # type: ignore[attr-defined]
+        return resolution
+
+    monkeypatch.setattr(
+        PolymarketAgentMarket,
+        "probable_resolution",
+        property(counting_probable_resolution),
+    )
+
+    metrics = benchmarker.compute_metrics()
+
+    assert metrics["MSE for `p_yes`"] == [pytest.approx(n_markets * 0.08)] * n_agents
+    # Market data is materialised once for all the agents, not once per agent.
+    assert resolution_reads == n_markets
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 from web3 import Web3
 
@@ -10,6 +11,7 @@ from prediction_market_agent_tooling.deploy.betting_strategy import (
     FullBinaryKellyBettingStrategy,
     GuaranteedLossError,
     SimpleBinaryKellyBettingStrategy,
+    _BinaryKellyBettingStrategy,
 )
 from prediction_market_agent_tooling.gtypes import (
     USD,
@@ -19,6 +21,7 @@ from prediction_market_agent_tooling.gtypes import (
     HexStr,
     OutcomeStr,
     OutcomeToken,
+    OutcomeWei,
     Probability,
 )
 from prediction_market_agent_tooling.markets.agent_market import AgentMarket
@@ -438,3 +441,212 @@ def test_kelly_bet_not_capped_when_profitable() -> None:
     # The key test: verify that it's close to what Kelly actually calculated
     # (not significantly capped due to profitability issues)
     print(f"Kelly calculated bet amount: {trade.amount.value}")  # For debugging
+
+
+def test_fit_positions_to_budget() -> None:
+    targets = np.array([10.0, 20.0, 5.0, 3.0])
+    existing = np.array([0.0, 15.0, 8.0, 0.0])
+
+    fitted = BettingStrategy.fit_positions_to_budget(targets, existing, USD(5))
+
+    assert np.isclose(np.maximum(fitted - existing, 0).sum(), 5)
+    # Selling market is kept and no buying market is sold.
+    assert fitted[2] == targets[2]
+    assert np.all(fitted <= targets)
+    assert np.all(fitted[[0, 1, 3]] >= existing[[0, 1, 3]])
+    # Market with the existing position is the first one to stop buying.
+    assert fitted[1] == existing[1]
+    assert np.isclose(fitted[0] / targets[0], fitted[3] / targets[3])
+
+    assert np.array_equal(
+        BettingStrategy.fit_positions_to_budget(targets, existing, USD(100)), targets
+    )
+
+
+def mock_profitable_binary_market(market_id: str, yes_pool: float) -> Mock:
+    mock_market = Mock(spec=AgentMarket)
+    mock_market.id = market_id
+    mock_market.outcomes = [OMEN_TRUE_OUTCOME, OMEN_FALSE_OUTCOME]
+    mock_market.is_binary = True
+    mock_market.fees = MarketFees.get_zero_fees()
+    mock_market.get_buy_token_amount.side_effect = lambda amount, outcome: (
+        OutcomeToken(amount.value * 1.05)
+    )
+    mock_market.get_token_in_usd = lambda x: USD(x.value)
+    mock_market.get_in_usd = lambda x: USD(x.value)
+    mock_market.get_usd_in_token = lambda x: CollateralToken(x.value)
+    mock_market.get_liquidity.return_value = CollateralToken(1000)
+    mock_market.get_outcome_token_pool_by_outcome.side_effect = lambda outcome: (
+        OutcomeToken(yes_pool if outcome == OMEN_TRUE_OUTCOME else 500)
+    )
+    mock_market.probability_for_market_outcome.return_value = Probability(0.5)
+    mock_market.market_outcome_for_probability_key.side_effect = lambda x: x
+    return mock_market
+
+
+def test_kelly_calculate_trades_many_fits_total_budget() -> None:
+    strategy = FullBinaryKellyBettingStrategy(max_position_amount=USD(20))
+    markets = [
+        mock_profitable_binary_market("market_1", yes_pool=500),
+        mock_profitable_binary_market("market_2", yes_pool=300),
+    ]
+    answers = [
+        CategoricalProbabilisticAnswer(
+            probabilities={
+                OMEN_TRUE_OUTCOME: Probability(0.7),
+                OMEN_FALSE_OUTCOME: Probability(0.3),
+            },
+            confidence=1.0,
+        )
+    ] * len(markets)
+
+    unconstrained = strategy.calculate_trades_many([None, None], answers, markets)
+    assert unconstrained == [
+        strategy.calculate_trades(None, answer, market)
+        for answer, market in zip(answers, markets)
+    ]
+    unconstrained_amounts = [trades[0].amount.value for trades in unconstrained]
+    assert sum(unconstrained_amounts) > 10
+
+    constrained = strategy.calculate_trades_many(
+        [None, None], answers, markets, total_budget=USD(10)
+    )
+    constrained_amounts = [trades[0].amount.value for trades in constrained]
+    assert all(trades[0].trade_type == TradeType.BUY for trades in constrained)
+    assert np.isclose(sum(constrained_amounts), 10)
+    # Without existing positions, the Kelly bets are scaled down proportionally.
+    assert np.isclose(
+        constrained_amounts[0] / constrained_amounts[1],
+        unconstrained_amounts[0] / unconstrained_amounts[1],
+    )
+
+    with pytest.raises(ValueError):
+        strategy.calculate_trades_many([None], answers, markets)
+
+
+def random_binary_pool_balances(rng: np.random.Generator) -> list[OutcomeWei]:
+    return [OutcomeToken(x).as_outcome_wei for x in rng.uniform(0.1, 1000, size=2)]
+
+
+def max_reachable_price_impact(
+    outcome_idx: int, pool_balances: list[OutcomeWei], fees: MarketFees
+) -> float:
+    # Paid price approaches `1 / (1 - fee)` as the bet grows.
+    expected_price = AgentMarket.compute_fpmm_probabilities(pool_balances)[outcome_idx]
+    return 1 / (1 - fees.bet_proportion) / expected_price - 1
+
+
+def test_binary_bet_amount_for_price_impact_matches_numerical_search() -> None:
+    # Randomised property check over many pools, fees and price impact targets.
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        pool_balances = random_binary_pool_balances(rng)
+        outcome_idx = int(rng.integers(0, 2))
+        fees = MarketFees.get_zero_fees(bet_proportion=float(rng.uniform(0, 0.05)))
+        # Price impact of any bet is at least the proportional fee.
+        max_price_impact = float(rng.uniform(0.06, 2))
+
+        analytic = (
+            _BinaryKellyBettingStrategy.calculate_binary_bet_amount_for_price_impact(
+                outcome_idx, pool_balances, fees, max_price_impact
+            )
+        )
+        numerical = _BinaryKellyBettingStrategy.calculate_bet_amount_for_price_impact_numerically(
+            outcome_idx, pool_balances, fees, max_price_impact
+        )
+
+        assert np.isclose(analytic.value, numerical.value, rtol=1e-5)
+        if max_price_impact < max_reachable_price_impact(
+            outcome_idx, pool_balances, fees
+        ):
+            assert np.isclose(
+                _BinaryKellyBettingStrategy.calculate_price_impact_for_bet_amount(
+                    outcome_idx, analytic, pool_balances, fees
+                ),
+                max_price_impact,
+                rtol=1e-9,
+            )
+
+
+def test_binary_bet_amount_for_price_impact_with_absolute_fees() -> None:
+    rng = np.random.default_rng(1)
+    checked = 0
+    for _ in range(200):
+        pool_balances = random_binary_pool_balances(rng)
+        outcome_idx = int(rng.integers(0, 2))
+        fees = MarketFees.get_zero_fees(
+            bet_proportion=float(rng.uniform(0, 0.05)),
+            absolute=float(rng.uniform(0, 0.01)),
+        )
+        max_price_impact = float(
+            rng.uniform(0.06, 0.95)
+            * max_reachable_price_impact(outcome_idx, pool_balances, fees)
+        )
+
+        bet_amount = (
+            _BinaryKellyBettingStrategy.calculate_binary_bet_amount_for_price_impact(
+                outcome_idx, pool_balances, fees, max_price_impact
+            )
+        )
+
+        if bet_amount == 0:
+            # Target is below the price impact of the fees alone.
+            continue
+        checked += 1
+        # Absolute fee makes tiny bets expensive too, so this is the largest bet hitting the target.
+        assert np.isclose(
+            _BinaryKellyBettingStrategy.calculate_price_impact_for_bet_amount(
+                outcome_idx, bet_amount, pool_balances, fees
+            ),
+            max_price_impact,
+            rtol=1e-6,
+        )
+        assert (
+            _BinaryKellyBettingStrategy.calculate_price_impact_for_bet_amount(
+                outcome_idx, bet_amount * 1.01, pool_balances, fees
+            )
+            > max_price_impact
+        )
+    assert checked > 150
+
+
+def test_binary_bet_amount_for_price_impact_below_fees() -> None:
+    pool_balances = [OutcomeToken(10).as_outcome_wei, OutcomeToken(20).as_outcome_wei]
+    fees = MarketFees.get_zero_fees(bet_proportion=0.02, absolute=0.01)
+    assert (
+        _BinaryKellyBettingStrategy.calculate_binary_bet_amount_for_price_impact(
+            0, pool_balances, fees, max_price_impact=0.01
+        )
+        == 0
+    )
+
+
+def test_bet_amount_for_price_impact_falls_back_for_categorical_pools() -> None:
+    mock_market = Mock(spec=AgentMarket)
+    mock_market.fees = MarketFees.get_zero_fees(bet_proportion=0.02)
+    mock_market.outcome_token_pool = {
+        OutcomeStr("a"): OutcomeToken(10),
+        OutcomeStr("b"): OutcomeToken(20),
+        OutcomeStr("c"): OutcomeToken(30),
+    }
+    mock_market.get_outcome_index.return_value = 1
+
+    with patch.object(
+        _BinaryKellyBettingStrategy,
+        "calculate_binary_bet_amount_for_price_impact",
+        side_effect=AssertionError("Closed form is only for binary pools."),
+    ):
+        bet_amount = _BinaryKellyBettingStrategy.calculate_bet_amount_for_price_impact(
+            mock_market, OutcomeStr("b"), max_price_impact=0.5
+        )
+
+    assert np.isclose(
+        _BinaryKellyBettingStrategy.calculate_price_impact_for_bet_amount(
+            1,
+            bet_amount,
+            [i.as_outcome_wei for i in mock_market.outcome_token_pool.values()],
+            mock_market.fees,
+        ),
+        0.5,
+        rtol=1e-6,
+    )
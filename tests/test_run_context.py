@@ -0,0 +1,135 @@
+import asyncio
+import time
+import typing as t
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from prediction_market_agent_tooling.deploy.agent import DeployableTraderAgent
+from prediction_market_agent_tooling.deploy.betting_strategy import BettingStrategy
+from prediction_market_agent_tooling.deploy.run_context import AgentRunContext
+from prediction_market_agent_tooling.deploy.trade_interval import TradeInterval
+from prediction_market_agent_tooling.gtypes import USD, CollateralToken
+from prediction_market_agent_tooling.markets.agent_market import AgentMarket
+from prediction_market_agent_tooling.markets.market_type import MarketType
+from prediction_market_agent_tooling.tools.custom_exceptions import OutOfFundsError
+from prediction_market_agent_tooling.tools.utils import utcnow
+
+
+def _market(id: str) -> AgentMarket:
+    market = Mock(spec=AgentMarket)
+    market.id = id
+    return market
+
+
+def test_record_trades_invalidates_affected_data() -> None:
+    market = _market("a")
+    context = AgentRunContext(
+        recently_bet_on={"a": False},
+        positions={"a": None},
+        token_usd_rates={"a": USD(2)},
+        trade_balance=USD(10),
+    )
+    assert context.has_position(market)
+    assert context.get_token_in_usd(market, CollateralToken(3)) == USD(6)
+    assert context.have_bet_on_market(market) is False
+    assert context.have_bet_on_market(_market("b")) is None
+
+    context.record_trades(market)
+
+    assert not context.has_position(market)
+    assert context.trade_balance is None
+    assert context.have_bet_on_market(market)
+
+
+def test_prefetch_markets_data(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BET_FROM_PRIVATE_KEY", "0x" + "11" * 32)
+    now = utcnow()
+    market_class = Mock()
+    market_class.markets_bet_on_since.return_value = {
+        "a": now - timedelta(days=1),
+        "b": now - timedelta(days=1),
+    }
+    market_class.get_positions_for_markets.side_effect = NotImplementedError
+    market_class.get_token_in_usd_rates.return_value = {
+        "a": USD(1),
+        "b": USD(1),
+        "c": USD(1),
+    }
+    market_type = Mock(spec=MarketType)
+    market_type.market_class = market_class
+    intervals = {"a": timedelta(days=2), "b": timedelta(hours=1), "c": timedelta(0)}
+    trade_interval = Mock(spec=TradeInterval)
+    trade_interval.get.side_effect = lambda market: intervals[market.id]
+
+    agent = DeployableTraderAgent(enable_langfuse=False)
+    agent.same_market_trade_interval = trade_interval
+    agent.prefetch_markets_data(market_type, [_market("a"), _market("b"), _market("c")])
+
+    # Bets are fetched once over the widest interval and each market is checked against its own.
+    market_class.markets_bet_on_since.assert_called_once()
+    assert market_class.markets_bet_on_since.call_args.kwargs["since"] == timedelta(
+        days=2
+    )
+    assert agent.run_context.recently_bet_on == {"a": True, "b": False, "c": False}
+    assert agent.run_context.positions == {}
+    assert agent.run_context.token_usd_rates == {
+        "a": USD(1),
+        "b": USD(1),
+        "c": USD(1),
+    }
+
+
+class FixedBetTraderAgent(DeployableTraderAgent):
+    def get_betting_strategy(self, market: AgentMarket) -> BettingStrategy:
+        strategy = Mock(spec=BettingStrategy)
+        strategy.is_market_supported.return_value = True
+        strategy.maximum_possible_bet_amount = USD(1)
+        return strategy
+
+
+def test_concurrent_balance_checks_reserve_the_balance(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("BET_FROM_PRIVATE_KEY", "0x" + "11" * 32)
+    market_type = Mock(spec=MarketType)
+    market_type.is_blockchain_market = False
+    balance_fetches = 0
+
+    def get_trade_balance(api_keys: t.Any) -> USD:
+        nonlocal balance_fetches
+        balance_fetches += 1
+        time.sleep(0.05)
+        return USD(2.5)
+
+    markets = []
+    for id in "abc":
+        market = Mock(spec=AgentMarket)
+        market.id = id
+        market.get_trade_balance.side_effect = get_trade_balance
+        markets.append(market)
+
+    agent = FixedBetTraderAgent(enable_langfuse=False)
+
+    async def check_all() -> list[BaseException | None]:
+        return await asyncio.gather(
+            *[agent.abefore_process_market(market_type, m) for m in markets],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(check_all())
+
+    # The balance covers only two bets, so the third concurrently checked market must not pass too.
+    assert sum(isinstance(r, OutOfFundsError) for r in results) == 1
+    assert sum(r is None for r in results) == 2
+    assert balance_fetches == 1
+
+    # Once a market is processed without trading, its reservation is available again.
+    passed_market = markets[[r is None for r in results].index(True)]
+    agent.run_context.release_trade_balance(passed_market)
+    agent.before_process_market(market_type, passed_market)
+    # Recorded trades invalidate the balance, so it's fetched again.
+    agent.run_context.record_trades(passed_market)
+    agent.before_process_market(market_type, passed_market)
+    assert balance_fetches == 2
@@ -22,6 +22,8 @@ from prediction_market_agent_tooling.tools.betting_strategies.kelly_criterion im
     get_kelly_bet_simplified,
     get_kelly_bets_categorical_full,
     get_kelly_bets_categorical_simplified,
+    get_kelly_bets_full_many,
+    get_kelly_bets_simplified_many,
 )
 from prediction_market_agent_tooling.tools.betting_strategies.utils import (
     BinaryKellyBet,
@@ -476,3 +478,74 @@ def test_compare_kellys_full(estimated_p_yes: Probability, confidence: float) ->
             fees=market.fees,
         )
         _compare_bets(estimated_p_yes, market, categorical_bets, binary_bet, 0.99)
+
+
+def test_kelly_bets_many_match_single_bets() -> None:
+    rng = np.random.default_rng(0)
+    n = 200
+    market_p_yes = rng.uniform(0, 1, size=n).tolist()
+    estimated_p_yes = rng.uniform(0, 1, size=n).tolist()
+    confidences = rng.uniform(0, 1, size=n).tolist()
+    yes_pools = [OutcomeToken(x) for x in rng.uniform(1, 1000, size=n)]
+    no_pools = [OutcomeToken(x) for x in rng.uniform(1, 1000, size=n)]
+    # Include a market without a budget and a market with equal pools.
+    max_bets = [CollateralToken(x) for x in rng.uniform(0, 10, size=n)]
+    max_bets[0] = CollateralToken(0)
+    no_pools[1] = yes_pools[1]
+    fees = [MarketFees.get_zero_fees(bet_proportion=0.02)] * n
+
+    simplified = get_kelly_bets_simplified_many(
+        max_bets=max_bets,
+        market_p_yes=market_p_yes,
+        estimated_p_yes=estimated_p_yes,
+        confidences=confidences,
+    )
+    full = get_kelly_bets_full_many(
+        yes_outcome_pool_sizes=yes_pools,
+        no_outcome_pool_sizes=no_pools,
+        estimated_p_yes=estimated_p_yes,
+        confidences=confidences,
+        max_bets=max_bets,
+        fees=fees,
+    )
+
+    for i in range(n):
+        expected_simplified = get_kelly_bet_simplified(
+            max_bet=max_bets[i],
+            market_p_yes=market_p_yes[i],
+            estimated_p_yes=estimated_p_yes[i],
+            confidence=confidences[i],
+        )
+        expected_full = get_kelly_bet_full(
+            yes_outcome_pool_size=yes_pools[i],
+            no_outcome_pool_size=no_pools[i],
+            estimated_p_yes=estimated_p_yes[i],
+            confidence=confidences[i],
+            max_bet=max_bets[i],
+            fees=fees[i],
+        )
+        for bet, expected in [
+            (simplified[i], expected_simplified),
+            (full[i], expected_full),
+        ]:
+            assert bet.direction == expected.direction
+            assert np.isclose(bet.size.value, expected.size.value)
+
+
+def test_kelly_bets_many_validate_inputs() -> None:
+    with pytest.raises(ValueError):
+        get_kelly_bets_simplified_many(
+            max_bets=[CollateralToken(1)],
+            market_p_yes=[0.5],
+            estimated_p_yes=[1.1],
+            confidences=[1.0],
+        )
+    with pytest.raises(RuntimeError):
+        get_kelly_bets_full_many(
+            yes_outcome_pool_sizes=[OutcomeToken(10)],
+            no_outcome_pool_sizes=[OutcomeToken(20)],
+            estimated_p_yes=[0.5],
+            confidences=[1.0],
+            max_bets=[CollateralToken(1)],
+            fees=[MarketFees(bet_proportion=0.0, absolute=0.01)],
+        )
@@ -0,0 +1,295 @@
+import asyncio
+import threading
+import typing as t
+from datetime import timedelta
+
+import pytest
+from cowdao_cowpy.common.chains import Chain
+from cowdao_cowpy.cow.swap import CompletedOrder
+from cowdao_cowpy.order_book.api import OrderBookApi
+from cowdao_cowpy.order_book.config import OrderBookAPIConfigFactory
+from cowdao_cowpy.order_book.generated.model import UID, OrderStatus
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import Wei
+from prediction_market_agent_tooling.tools.cow import cow_order
+from prediction_market_agent_tooling.tools.cow.cow_order import (
+    CowOrderPoller,
+    OrderStatusError,
+    PooledRequestStrategy,
+    get_quote,
+    get_quotes,
+    get_trades_by_owner,
+    iter_endpoint,
+    paginate_endpoint,
+    wait_for_order_completion,
+)
+from prediction_market_agent_tooling.tools.cow.models import CowQuoteRequest
+from tests.utils import LocalJsonRequest, LocalJsonServer
+
+TOKEN_A = Web3.to_checksum_address("0x" + "aa" * 20)
+TOKEN_B = Web3.to_checksum_address("0x" + "bb" * 20)
+ILLIQUID_TOKEN = Web3.to_checksum_address("0x" + "cc" * 20)
+
+
+class FakeOrderBook:
+    """
+    Local stand-in for CoW's quote endpoint, quoting every pair at the price of 2, except for the illiquid token.
+    """
+
+    def __init__(self) -> None:
+        self.client_ports: set[int] = set()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = LocalJsonServer(self._route)
+        self.url = self._server.url
+
+    def _route(self, request: LocalJsonRequest) -> tuple[int, t.Any]:
+        body = request.body
+        with self._lock:
+            self.client_ports.add(request.client_port)
+            self.requests += 1
+        if body["sellToken"].lower() == ILLIQUID_TOKEN.lower():
+            return 400, {"errorType": "NoLiquidity", "description": "no route found"}
+        return 200, {
+            "quote": {
+                "sellToken": body["sellToken"],
+                "buyToken": body["buyToken"],
+                "sellAmount": body["sellAmountBeforeFee"],
+                "buyAmount": str(2 * int(body["sellAmountBeforeFee"])),
+                "validTo": 2000000000,
+                "appData": "0x" + "00" * 32,
+                "feeAmount": "0",
+                "kind": "sell",
+                "partiallyFillable": False,
+            },
+            "expiration": "2030-01-01T00:00:00Z",
+            "verified": True,
+        }
+
+    def close(self) -> None:
+        self._server.close()
+
+
+@pytest.fixture
+def fake_order_book(
+    monkeypatch: pytest.MonkeyPatch,
+) -> t.Generator[FakeOrderBook, None, None]:
+    order_book = FakeOrderBook()
+    config = OrderBookAPIConfigFactory.get_config("prod", Chain.GNOSIS.chain_id)
+    config.config_map = {k: order_book.url for k in config.config_map}
+    api = OrderBookApi(config)
+    api.request_builder.strategy = PooledRequestStrategy()
+    monkeypatch.setattr(cow_order, "get_order_book_api", lambda env, chain: api)
+    yield order_book
+    order_book.close()
+
+
+def test_quotes_reuse_connections(fake_order_book: FakeOrderBook) -> None:
+    for i in range(1, 4):
+        quote = get_quote(Wei(i), sell_token=TOKEN_A, buy_token=TOKEN_B)
+        assert quote.quote.buyAmount.root == str(2 * i)
+    # Sequential quotes went over a single connection.
+    assert len(fake_order_book.client_ports) == 1
+
+    quotes = get_quotes(
+        [
+            CowQuoteRequest(sell_amount=Wei(i), sell_token=TOKEN_A, buy_token=TOKEN_B)
+            for i in range(1, 11)
+        ]
+        + [
+            CowQuoteRequest(
+                sell_amount=Wei(1), sell_token=ILLIQUID_TOKEN, buy_token=TOKEN_B
+            )
+        ]
+    )
+
+    assert [q.quote.buyAmount.root if q else None for q in quotes] == [
+        str(2 * i) for i in range(1, 11)
+    ] + [None]
+    # Missing liquidity isn't retried.
+    assert fake_order_book.requests == 3 + 11
+
+
+OWNER_A = "0x" + "a1" * 20
+OWNER_B = "0x" + "b1" * 20
+
+
+def make_uid(digest: int, owner: str) -> str:
+    return "0x" + f"{digest:064x}" + owner[2:] + "ffffffff"
+
+
+class FakeOrderStatuses:
+    """
+    Local stand-in for CoW's order endpoints, every lookup of an order moves it to its next status.
+    """
+
+    def __init__(self, statuses: dict[str, list[OrderStatus]]) -> None:
+        self.statuses = statuses
+        self.paths: list[str] = []
+        self._lock = threading.Lock()
+        self._server = LocalJsonServer(self._route)
+        self.url = self._server.url
+
+    def _next_order(self, uid: str) -> dict[str, t.Any]:
+        status = (
+            self.statuses[uid].pop(0)
+            if len(self.statuses[uid]) > 1
+            else self.statuses[uid][0]
+        )
+        return {
+            "creationDate": "2025-01-01T00:00:00Z",
+            "owner": "0x" + uid[66:106],
+            "uid": uid,
+            "executedSellAmount": "0",
+            "executedSellAmountBeforeFees": "0",
+            "executedBuyAmount": "0",
+            "executedFeeAmount": "0",
+            "invalidated": False,
+            "status": status.value,
+            "class": "market",
+        }
+
+    def _route(self, request: LocalJsonRequest) -> tuple[int, t.Any]:
+        path = request.path.split("?")[0]
+        with self._lock:
+            self.paths.append(path)
+            if "/account/" in path:
+                owner = path.split("/")[-2]
+                return 200, [
+                    self._next_order(uid)
+                    for uid in self.statuses
+                    if uid[66:106] == owner[2:]
+                ]
+            return 200, self._next_order(path.split("/")[-1])
+
+    def order(self, uid: str) -> CompletedOrder:
+        return CompletedOrder(uid=UID(uid), url=f"{self.url}/api/v1/orders/{uid}")
+
+    def close(self) -> None:
+        self._server.close()
+
+
+def test_order_poller() -> None:
+    fulfilled, cancelled, pending, other_owner = (
+        make_uid(1, OWNER_A),
+        make_uid(2, OWNER_A),
+        make_uid(3, OWNER_A),
+        make_uid(4, OWNER_B),
+    )
+    statuses = FakeOrderStatuses(
+        {
+            fulfilled: [OrderStatus.open, OrderStatus.open, OrderStatus.fulfilled],
+            cancelled: [OrderStatus.open, OrderStatus.cancelled],
+            pending: [OrderStatus.open],
+            other_owner: [OrderStatus.presignaturePending, OrderStatus.fulfilled],
+        }
+    )
+    poller = CowOrderPoller(
+        min_interval=timedelta(milliseconds=10),
+        max_interval=timedelta(milliseconds=50),
+    )
+    try:
+        futures = {
+            uid: poller.track(statuses.order(uid), timeout=timedelta(seconds=1))
+            for uid in [fulfilled, cancelled, other_owner]
+        }
+        futures[pending] = poller.track(
+            statuses.order(pending), timeout=timedelta(milliseconds=300)
+        )
+
+        assert futures[fulfilled].result(timeout=5).status == OrderStatus.fulfilled
+        assert futures[other_owner].result(timeout=5).status == OrderStatus.fulfilled
+        with pytest.raises(OrderStatusError):
+            futures[cancelled].result(timeout=5)
+        with pytest.raises(TimeoutError):
+            futures[pending].result(timeout=5)
+    finally:
+        statuses.close()
+
+    # Orders of the same owner were looked up together.
+    assert any("/account/" in path for path in statuses.paths)
+    assert not poller._orders
+
+
+def test_wait_for_order_completion() -> None:
+    uid = make_uid(5, OWNER_A)
+    statuses = FakeOrderStatuses({uid: [OrderStatus.fulfilled]})
+    try:
+        order_metadata = asyncio.run(
+            wait_for_order_completion(statuses.order(uid), timeout=timedelta(seconds=5))
+        )
+    finally:
+        statuses.close()
+    assert order_metadata.uid.root == uid
+
+
+class FakeClientCoW:
+    """
+    Serves the items as a paginated endpoint, newest first.
+    """
+
+    items: list[dict[str, t.Any]] = []
+    offsets: list[int] = []
+
+    def get(self, endpoint: str, params: dict[str, t.Any]) -> list[dict[str, t.Any]]:
+        FakeClientCoW.offsets.append(params["offset"])
+        return FakeClientCoW.items[
+            params["offset"] : params["offset"] + params["limit"]
+        ]
+
+
+@pytest.fixture
+def fake_client_cow(monkeypatch: pytest.MonkeyPatch) -> type[FakeClientCoW]:
+    FakeClientCoW.items = []
+    FakeClientCoW.offsets = []
+    monkeypatch.setattr(cow_order, "ClientCoW", FakeClientCoW)
+    return FakeClientCoW
+
+
+def test_paginate_endpoint(fake_client_cow: type[FakeClientCoW]) -> None:
+    fake_client_cow.items = [{"id": i} for i in range(25)]
+
+    assert paginate_endpoint("/items", limit=10) == fake_client_cow.items
+    # First page was fetched alone, the following ones were prefetched after it came back full.
+    assert fake_client_cow.offsets[0] == 0
+    assert {0, 10, 20} <= set(fake_client_cow.offsets) <= {0, 10, 20, 30}
+
+    fake_client_cow.offsets.clear()
+    items = iter_endpoint("/items", limit=10, prefetch=1, stop=lambda i: i["id"] >= 12)
+    assert [i["id"] for i in items] == list(range(12))
+    assert fake_client_cow.offsets == [0, 10]
+
+    # Single short page or stopping within the first page costs a single request.
+    fake_client_cow.offsets.clear()
+    assert paginate_endpoint("/items", limit=100) == fake_client_cow.items
+    assert fake_client_cow.offsets == [0]
+    fake_client_cow.offsets.clear()
+    assert len(paginate_endpoint("/items", limit=10, stop=lambda i: i["id"] >= 5)) == 5
+    assert fake_client_cow.offsets == [0]
+
+
+def make_trade(i: int) -> dict[str, t.Any]:
+    return {
+        "sellToken": TOKEN_A,
+        "buyToken": TOKEN_B,
+        "orderUid": make_uid(i, OWNER_A),
+        "txHash": f"0x{i:064x}",
+    }
+
+
+def test_trades_are_fetched_incrementally(
+    fake_client_cow: type[FakeClientCoW],
+) -> None:
+    owner = Web3.to_checksum_address("0x" + "d1" * 20)
+    fake_client_cow.items = [make_trade(i) for i in range(2500, 0, -1)]
+    assert len(get_trades_by_owner(owner)) == 2500
+
+    fake_client_cow.offsets.clear()
+    fake_client_cow.items = [make_trade(i) for i in range(2502, 0, -1)]
+    trades = get_trades_by_owner(owner)
+    assert [trade.txHash.to_0x_hex() for trade in trades] == [
+        i["txHash"] for i in fake_client_cow.items
+    ]
+    # Only the first page was needed for the new trades.
+    assert fake_client_cow.offsets == [0]
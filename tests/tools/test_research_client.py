@@ -0,0 +1,284 @@
+import asyncio
+import json
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import Mock
+
+import httpx
+import pytest
+import requests
+import tavily.tavily
+from pydantic import SecretStr
+from tavily import TavilyClient
+
+from prediction_market_agent_tooling.config import APIKeys
+from prediction_market_agent_tooling.tools.perplexity import perplexity_client
+from prediction_market_agent_tooling.tools.perplexity.perplexity_client import (
+    PerplexityModel,
+)
+from prediction_market_agent_tooling.tools.perplexity.perplexity_models import (
+    PerplexityModelSettings,
+    PerplexityRequestParameters,
+)
+from prediction_market_agent_tooling.tools.research_client import (
+    CoalescingTTLCache,
+    normalise_query_params,
+)
+from prediction_market_agent_tooling.tools.tavily import tavily_search
+from prediction_market_agent_tooling.tools.tavily.tavily_search import TAVILY_API_URL
+from tests.utils import LocalJsonRequest, LocalJsonServer
+
+
+class StubServer:
+    """
+    Local stand-in for the Tavily and Perplexity APIs, counting received requests.
+    """
+
+    def __init__(self, delay: float = 0.2) -> None:
+        self.requests: list[dict[str, t.Any]] = []
+        self.delay = delay
+        self._server = LocalJsonServer(self._route)
+        self.url = self._server.url
+
+    def _route(self, request: LocalJsonRequest) -> tuple[int, t.Any]:
+        self.requests.append(request.body)
+        time.sleep(self.delay)
+        if request.path == "/search":
+            return 200, {
+                "query": request.body["query"],
+                "answer": None,
+                "images": [],
+                "results": [],
+                "response_time": self.delay,
+            }
+        return 200, {
+            "choices": [{"message": {"content": "stub answer"}}],
+            "citations": [],
+            "usage": {"total_tokens": 1},
+        }
+
+    def close(self) -> None:
+        self._server.close()
+
+
+@pytest.fixture
+def stub_server(monkeypatch: pytest.MonkeyPatch) -> t.Generator[StubServer, None, None]:
+    server = StubServer()
+    monkeypatch.setattr(tavily_search, "TAVILY_API_URL", server.url)
+    tavily_search.TAVILY_RESPONSE_CACHE.clear()
+    perplexity_client.PERPLEXITY_RESPONSE_CACHE.clear()
+    yield server
+    server.close()
+
+
+def _tavily(query: str) -> dict[str, t.Any]:
+    return tavily_search._tavily_search(
+        query=query,
+        search_depth="basic",
+        topic="general",
+        days=None,
+        start_date=None,
+        end_date=None,
+        max_results=5,
+        include_domains=["b.com", "a.com"],
+        exclude_domains=None,
+        include_answer=True,
+        include_raw_content=False,
+        include_images=False,
+        use_cache=False,
+        api_keys=APIKeys(TAVILY_API_KEY=SecretStr("test")),
+    )
+
+
+def test_normalise_query_params() -> None:
+    assert normalise_query_params(
+        {"query": "  Will  X happen? ", "domains": ["b.com", "a.com"], "days": None}
+    ) == normalise_query_params(
+        {"domains": ["a.com", "b.com"], "query": "will x HAPPEN?"}
+    )
+    assert normalise_query_params({"query": "a"}) != normalise_query_params(
+        {"query": "b"}
+    )
+
+
+def test_coalescing_cache_failure_is_not_cached() -> None:
+    cache: CoalescingTTLCache[int] = CoalescingTTLCache()
+
+    def fail() -> int:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("key", fail)
+    assert cache.get_or_compute("key", lambda: 1) == 1
+    assert cache.get_or_compute("key", lambda: 2) == 1
+
+
+def test_tavily_concurrent_identical_queries_are_coalesced(
+    stub_server: StubServer,
+) -> None:
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(
+            executor.map(_tavily, ["Will X happen?", "will x happen?  "] * 5)
+        )
+
+    assert len(stub_server.requests) == 1
+    assert all(r == results[0] for r in results)
+    # Subsequent call is served from the TTL cache.
+    _tavily("Will X happen?")
+    assert len(stub_server.requests) == 1
+    _tavily("Will Y happen?")
+    assert len(stub_server.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_tavily_async_concurrent_identical_queries_are_coalesced(
+    stub_server: StubServer,
+) -> None:
+    kwargs: dict[str, t.Any] = dict(
+        search_depth="basic",
+        topic="general",
+        days=None,
+        start_date=None,
+        end_date=None,
+        max_results=5,
+        include_domains=None,
+        exclude_domains=None,
+        include_answer=True,
+        include_raw_content=False,
+        include_images=False,
+        use_cache=False,
+        api_keys=APIKeys(TAVILY_API_KEY=SecretStr("test")),
+    )
+    await asyncio.gather(
+        *[
+            tavily_search._atavily_search(query="Will Z happen?", **kwargs)
+            for _ in range(5)
+        ]
+    )
+    assert len(stub_server.requests) == 1
+
+
+def test_perplexity_sync_and_async_share_cache(stub_server: StubServer) -> None:
+    model = PerplexityModel(
+        "sonar",
+        api_key=SecretStr("test"),
+        completition_endpoint=f"{stub_server.url}/chat/completions",
+    )
+    params = PerplexityRequestParameters(
+        search_context_size="low",
+        search_recency_filter=None,
+        search_return_related_questions=None,
+        search_domain_filter=None,
+        search_after_date_filter=None,
+        search_before_date_filter=None,
+    )
+    messages = [{"role": "user", "content": "Will X happen?"}]
+
+    sync_response = model.request_sync(messages, PerplexityModelSettings(), params)
+    async_response = asyncio.run(
+        model.request(messages, PerplexityModelSettings(), params)
+    )
+
+    assert sync_response == async_response
+    assert sync_response.content == "stub answer"
+    assert len(stub_server.requests) == 1
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, days",
+    [
+        (None, None, None),
+        (None, None, 3),
+        (date(2024, 1, 1), None, None),
+        (date(2024, 1, 1), date(2024, 2, 1), None),
+    ],
+)
+def test_tavily_payload_matches_library(
+    monkeypatch: pytest.MonkeyPatch,
+    start_date: date | None,
+    end_date: date | None,
+    days: int | None,
+) -> None:
+    sent: list[tuple[dict[str, t.Any], dict[str, str]]] = []
+
+    def post(url: str, data: str, headers: dict[str, str], **_: t.Any) -> Mock:
+        sent.append((json.loads(data), headers))
+        return Mock(status_code=200, json=lambda: {"results": []})
+
+    monkeypatch.setattr(tavily.tavily.requests, "post", post)
+
+    # Same call that was used with the library client before requests were sent through the pooled client.
+    kwargs: dict[str, t.Any] = {}
+    if start_date is not None or end_date is not None:
+        kwargs["days"] = None
+        if start_date is not None:
+            kwargs["start_date"] = start_date.isoformat()
+        if end_date is not None:
+            kwargs["end_date"] = end_date.isoformat()
+    elif days:
+        kwargs["days"] = days
+    TavilyClient(api_key="test").search(
+        query="Will X happen?",
+        search_depth="advanced",
+        topic="news",
+        max_results=3,
+        include_domains=["a.com"],
+        exclude_domains=None,
+        include_answer=True,
+        include_raw_content=True,
+        include_images=False,
+        use_cache=True,
+        **kwargs,
+    )
+
+    [(library_payload, library_headers)] = sent
+    assert library_payload == tavily_search._tavily_search_payload(
+        query="Will X happen?",
+        search_depth="advanced",
+        topic="news",
+        days=days,
+        start_date=start_date,
+        end_date=end_date,
+        max_results=3,
+        include_domains=["a.com"],
+        exclude_domains=None,
+        include_answer=True,
+        include_raw_content=True,
+        include_images=False,
+        use_cache=True,
+    )
+    assert library_headers == tavily_search._tavily_headers("test")
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 403, 429, 432, 433, 500])
+def test_tavily_errors_match_library(
+    monkeypatch: pytest.MonkeyPatch, status_code: int
+) -> None:
+    body = {"detail": {"error": "boom"}}
+    library_response = requests.Response()
+    library_response.status_code = status_code
+    library_response._content = json.dumps(body).encode()
+    monkeypatch.setattr(
+        tavily.tavily.requests, "post", lambda *args, **kwargs: library_response
+    )
+
+    with pytest.raises(Exception) as library_error:
+        TavilyClient(api_key="test").search(query="Will X happen?")
+    with pytest.raises(Exception) as our_error:
+        tavily_search._parse_tavily_response(
+            httpx.Response(
+                status_code,
+                json=body,
+                request=httpx.Request("POST", f"{TAVILY_API_URL}/search"),
+            )
+        )
+
+    if status_code == 500:
+        # Unmapped statuses are raised by the respective HTTP library.
+        assert isinstance(library_error.value, requests.HTTPError)
+        assert isinstance(our_error.value, httpx.HTTPStatusError)
+    else:
+        assert type(our_error.value) is type(library_error.value)
+        assert str(our_error.value) == str(library_error.value)
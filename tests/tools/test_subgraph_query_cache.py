@@ -0,0 +1,39 @@
+import typing as t
+from datetime import timedelta
+
+from pydantic import SecretStr
+
+from prediction_market_agent_tooling.tools.caches.subgraph_query_cache import (
+    SubgraphQueryCache,
+    subgraph_query_hash,
+)
+
+
+def test_subgraph_query_cache_is_persisted(tmp_path: t.Any) -> None:
+    db_url = SecretStr(f"sqlite:///{tmp_path}/subgraph_query_cache.db")
+    cache = SubgraphQueryCache(db_url)
+    latest = subgraph_query_hash([("http://subgraph", "query { markets { id } }", {})])
+    pinned = subgraph_query_hash(
+        [("http://subgraph", "query { markets(block: {number: 5}) { id } }", {})]
+    )
+    expired = subgraph_query_hash(
+        [("http://subgraph", "query { questions { id } }", {})]
+    )
+    result = [{"markets": [{"id": "0xa"}]}]
+
+    cache.set(latest, result, timedelta(minutes=5))
+    cache.set(pinned, result, None)
+    cache.set(expired, result, timedelta(seconds=-1))
+
+    cached = cache.get(latest)
+    assert cached == result
+    # Callers get their own copy.
+    assert cached is not None
+    cached[0]["markets"].clear()
+    assert cache.get(latest) == result
+
+    # Simulate restart of the process.
+    restarted = SubgraphQueryCache(db_url)
+    assert restarted.get(latest) == result
+    assert restarted.get(pinned) == result
+    assert restarted.get(expired) is None
@@ -1,9 +1,13 @@
+from math import prod
+
 import numpy as np
 import pytest
+from scipy.optimize import newton
 
 from prediction_market_agent_tooling.gtypes import OutcomeToken
 from prediction_market_agent_tooling.markets.market_fees import MarketFees
 from prediction_market_agent_tooling.tools.utils import (
+    calculate_binary_sell_amounts_in_collateral,
     calculate_sell_amount_in_collateral,
 )
 
@@ -95,3 +99,87 @@ def test_calculate_sell_amount_in_collateral_5() -> None:
         fees=MarketFees.get_zero_fees(),
     )
     assert collateral == 0
+
+
+def newton_sell_amount(
+    shares_to_sell: float,
+    outcome_index: int,
+    pool_balances: list[float],
+    fees: MarketFees,
+) -> float:
+    # Scalar root finding used before the closed form, as the reference.
+    holdings = pool_balances[outcome_index]
+    other_holdings = [v for i, v in enumerate(pool_balances) if i != outcome_index]
+
+    def f(r: float) -> float:
+        R = (r + fees.absolute) / (1 - fees.bet_proportion)
+        return prod(h - R for h in other_holdings) * (
+            holdings + shares_to_sell - R
+        ) - prod(pool_balances)
+
+    return float(newton(f, 0)) * 0.999999
+
+
+def test_binary_sell_amount_matches_newton() -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        pool_balances = list(rng.uniform(0.01, 1000, size=2))
+        shares = float(rng.uniform(1e-6, 1000))
+        outcome_index = int(rng.integers(0, 2))
+        fees = MarketFees.get_zero_fees(
+            bet_proportion=float(rng.uniform(0, 0.1)),
+            absolute=float(rng.uniform(0, 0.001)),
+        )
+        collateral = calculate_sell_amount_in_collateral(
+            shares_to_sell=OutcomeToken(shares),
+            outcome_index=outcome_index,
+            pool_balances=[OutcomeToken(b) for b in pool_balances],
+            fees=fees,
+        )
+        assert np.isclose(
+            collateral.value,
+            newton_sell_amount(shares, outcome_index, pool_balances, fees),
+            rtol=1e-9,
+            atol=1e-12,
+        )
+
+
+def test_binary_sell_amounts_are_vectorised() -> None:
+    rng = np.random.default_rng(1)
+    shares = rng.uniform(0, 100, size=1000)
+    shares[0] = 0
+    holdings = rng.uniform(1, 1000, size=1000)
+    other_holdings = rng.uniform(1, 1000, size=1000)
+
+    amounts = calculate_binary_sell_amounts_in_collateral(
+        shares, holdings, other_holdings, bet_proportion_fees=0.02
+    )
+
+    assert amounts.shape == (1000,)
+    assert amounts[0] == 0
+    for i in [1, 500, 999]:
+        assert np.isclose(
+            amounts[i],
+            newton_sell_amount(
+                shares[i],
+                0,
+                [holdings[i], other_holdings[i]],
+                MarketFees.get_zero_fees(bet_proportion=0.02),
+            ),
+            rtol=1e-9,
+        )
+
+    with pytest.raises(ValueError):
+        calculate_binary_sell_amounts_in_collateral(shares, holdings, 0)
+
+
+def test_categorical_sell_amount_matches_newton() -> None:
+    pool_balances = [10.0, 15.0, 20.0]
+    fees = MarketFees.get_zero_fees(bet_proportion=0.02)
+    collateral = calculate_sell_amount_in_collateral(
+        shares_to_sell=OutcomeToken(5),
+        outcome_index=1,
+        pool_balances=[OutcomeToken(b) for b in pool_balances],
+        fees=fees,
+    )
+    assert np.isclose(collateral.value, newton_sell_amount(5, 1, pool_balances, fees))
@@ -0,0 +1,141 @@
+import threading
+import time
+import typing as t
+from datetime import timedelta
+
+import pytest
+from cowdao_cowpy.order_book.generated.model import OrderQuoteResponse
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import USD, ChecksumAddress, Wei
+from prediction_market_agent_tooling.markets.omen.omen_constants import (
+    WRAPPED_XDAI_CONTRACT_ADDRESS,
+)
+from prediction_market_agent_tooling.tools.cow.cow_order import (
+    NoLiquidityAvailableOnCowException,
+)
+from prediction_market_agent_tooling.tools.cow.models import CowQuoteRequest
+from prediction_market_agent_tooling.tools.tokens import usd
+from prediction_market_agent_tooling.tools.tokens.usd import (
+    TokenUSDRateOracle,
+    fetch_token_to_usd_rates,
+)
+
+GNO = Web3.to_checksum_address("0x" + "01" * 20)
+WETH = Web3.to_checksum_address("0x" + "02" * 20)
+
+
+class FakeRates:
+    def __init__(self, rates: dict[ChecksumAddress, float]) -> None:
+        self.rates = rates
+        self.batches: list[list[ChecksumAddress]] = []
+        self.refreshed = threading.Event()
+
+    def __call__(
+        self, token_addresses: t.Sequence[ChecksumAddress]
+    ) -> dict[ChecksumAddress, USD]:
+        self.batches.append(list(token_addresses))
+        self.refreshed.set()
+        return {token: USD(self.rates[token]) for token in token_addresses}
+
+
+def test_rates_are_fetched_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = FakeRates({GNO: 100.0, WETH: 2000.0})
+    monkeypatch.setattr(usd, "fetch_token_to_usd_rates", fake)
+    oracle = TokenUSDRateOracle(ttl=timedelta(minutes=1))
+
+    assert oracle.get_token_to_usd_rates([GNO, WETH, GNO]) == {
+        GNO: USD(100.0),
+        WETH: USD(2000.0),
+    }
+    assert fake.batches == [[GNO, WETH]]
+
+    # Both directions are served from the cache.
+    assert oracle.get_usd_to_token_rates([WETH])[WETH].value == pytest.approx(1 / 2000)
+    assert oracle.get_token_to_usd_rates([GNO]) == {GNO: USD(100.0)}
+    assert fake.batches == [[GNO, WETH]]
+
+
+def test_stale_rates_are_refreshed_in_background(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = FakeRates({GNO: 100.0})
+    monkeypatch.setattr(usd, "fetch_token_to_usd_rates", fake)
+    oracle = TokenUSDRateOracle(
+        ttl=timedelta(milliseconds=10), max_staleness=timedelta(seconds=10)
+    )
+    oracle.get_token_to_usd_rates([GNO])
+    fake.refreshed.clear()
+    fake.rates[GNO] = 110.0
+    time.sleep(0.05)
+
+    # Stale rate is returned right away, while it's being refreshed.
+    assert oracle.get_token_to_usd_rates([GNO]) == {GNO: USD(100.0)}
+    assert fake.refreshed.wait(timeout=5)
+    for _ in range(100):
+        if oracle.get_token_to_usd_rates([GNO]) == {GNO: USD(110.0)}:
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("Rate wasn't refreshed.")
+    assert len(fake.batches) == 2
+
+
+def test_too_old_rates_are_fetched_right_away(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = FakeRates({GNO: 100.0})
+    monkeypatch.setattr(usd, "fetch_token_to_usd_rates", fake)
+    oracle = TokenUSDRateOracle(
+        ttl=timedelta(milliseconds=1), max_staleness=timedelta(milliseconds=1)
+    )
+    oracle.get_token_to_usd_rates([GNO])
+    fake.rates[GNO] = 110.0
+    time.sleep(0.01)
+
+    assert oracle.get_token_to_usd_rates([GNO]) == {GNO: USD(110.0)}
+    assert fake.batches == [[GNO], [GNO]]
+
+
+def make_quote(request: CowQuoteRequest, buy_amount: int) -> OrderQuoteResponse:
+    return OrderQuoteResponse.model_validate(
+        {
+            "quote": {
+                "sellToken": request.sell_token,
+                "buyToken": request.buy_token,
+                "sellAmount": str(request.sell_amount.value),
+                "buyAmount": str(buy_amount),
+                "validTo": 2000000000,
+                "appData": "0x" + "00" * 32,
+                "feeAmount": "0",
+                "kind": "sell",
+                "partiallyFillable": False,
+            },
+            "expiration": "2030-01-01T00:00:00Z",
+            "verified": True,
+        }
+    )
+
+
+def test_fetch_quotes_only_non_stable_tokens(monkeypatch: pytest.MonkeyPatch) -> None:
+    requests: list[CowQuoteRequest] = []
+
+    def get_quotes(
+        quote_requests: list[CowQuoteRequest],
+    ) -> list[OrderQuoteResponse | None]:
+        requests.extend(quote_requests)
+        return [
+            make_quote(r, 100 * 10**18) if r.sell_token == GNO else None
+            for r in quote_requests
+        ]
+
+    monkeypatch.setattr(usd, "get_quotes", get_quotes)
+
+    assert fetch_token_to_usd_rates([WRAPPED_XDAI_CONTRACT_ADDRESS, GNO]) == {
+        WRAPPED_XDAI_CONTRACT_ADDRESS: USD(1.0),
+        GNO: USD(100.0),
+    }
+    assert [(r.sell_token, r.sell_amount) for r in requests] == [(GNO, Wei(10**18))]
+
+    with pytest.raises(NoLiquidityAvailableOnCowException):
+        fetch_token_to_usd_rates([GNO, WETH])
@@ -1,3 +1,8 @@
+import json
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 from web3 import Web3
 from web3.types import RPCEndpoint
 
@@ -19,3 +24,62 @@ def advance_chain_time(web3: Web3, seconds: int, keys: APIKeys) -> None:
     """Advance the local chain's timestamp by the given number of seconds and mine a block."""
     web3.provider.make_request(RPCEndpoint("evm_increaseTime"), [seconds])
     mint_new_block(keys, web3)
+
+
+class LocalJsonRequest(t.NamedTuple):
+    method: str
+    # Path including the query string.
+    path: str
+    body: t.Any
+    client_port: int
+
+
+class LocalJsonServer:
+    """
+    Local HTTP server standing in for an external JSON API in tests.
+    Every request is answered with the status and JSON body returned by `route`, a `None` body is sent as an empty one.
+    Connections are kept alive, so that tests can check their re-use.
+    """
+
+    def __init__(
+        self,
+        route: t.Callable[[LocalJsonRequest], tuple[int, t.Any]],
+        path: str = "",
+    ) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self._respond("GET")
+
+            def do_POST(self) -> None:
+                self._respond("POST")
+
+            def _respond(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                status, response = route(
+                    LocalJsonRequest(
+                        method=method,
+                        path=self.path,
+                        body=body,
+                        client_port=self.client_address[1],
+                    )
+                )
+                encoded = b"" if response is None else json.dumps(response).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, format: str, *args: t.Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,58 @@
+import pytest
+from web3 import Web3
+
+from prediction_market_agent_tooling.gtypes import Wei
+from prediction_market_agent_tooling.markets.agent_market import (
+    ConditionalFilterType,
+    FilterBy,
+    QuestionType,
+    SortBy,
+)
+from prediction_market_agent_tooling.markets.seer.data_models import (
+    QuoteExactInputSingleParams,
+)
+from prediction_market_agent_tooling.markets.seer.pool_simulator import (
+    ConcentratedLiquidityPool,
+)
+from prediction_market_agent_tooling.markets.seer.seer_contracts import (
+    SwaprQuoterContract,
+)
+from prediction_market_agent_tooling.markets.seer.seer_subgraph_handler import (
+    SeerSubgraphHandler,
+)
+
+
+@pytest.mark.parametrize("amount_in", [Wei(10**15), Wei(10**18)])
+def test_simulated_quote_matches_quoter(
+    seer_subgraph_handler_test: SeerSubgraphHandler, amount_in: Wei
+) -> None:
+    market = seer_subgraph_handler_test.get_markets(
+        filter_by=FilterBy.OPEN,
+        sort_by=SortBy.HIGHEST_LIQUIDITY,
+        limit=1,
+        question_type=QuestionType.BINARY,
+        conditional_filter_type=ConditionalFilterType.ALL,
+    )[0]
+    outcome_token = Web3.to_checksum_address(market.wrapped_tokens[0])
+    collateral_token = market.collateral_token_contract_address_checksummed
+    pool = seer_subgraph_handler_test.get_pool_by_token(
+        token_address=outcome_token, collateral_address=collateral_token
+    )
+    assert pool is not None
+    simulator = ConcentratedLiquidityPool.from_subgraph(
+        pool,
+        seer_subgraph_handler_test.get_ticks_for_pool(
+            Web3.to_checksum_address(pool.id.to_0x_hex())
+        ),
+    )
+
+    simulated = simulator.quote_exact_input(collateral_token, amount_in)
+    quoted, _ = SwaprQuoterContract().quote_exact_input_single(
+        QuoteExactInputSingleParams(
+            token_in=collateral_token,
+            token_out=outcome_token,
+            amount_in=amount_in,
+        )
+    )
+    # Subgraph can lag a few blocks behind the chain.
+    assert simulated.value == pytest.approx(quoted.value, rel=1e-3)